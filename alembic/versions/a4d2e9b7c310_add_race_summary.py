@@ -0,0 +1,52 @@
+"""Add race_summary table
+
+Stores the homepage summary of each race (podium, winner, fastest lap, laps
+completed and driver-team mapping), written by ingestion so the homepage no
+longer aggregates lap_times per request.
+
+Revision ID: a4d2e9b7c310
+Revises: f9c1e7a3b2d4
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2e9b7c310'
+down_revision: Union[str, None] = 'f9c1e7a3b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create race_summary table."""
+    op.create_table(
+        'race_summary',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('round', sa.Integer(), nullable=False),
+        sa.Column('race_id', sa.String(), nullable=False),
+        sa.Column('race_name', sa.String(length=100), nullable=True),
+        sa.Column('winner_code', sa.String(length=3), nullable=True),
+        sa.Column('winner_team', sa.String(length=50), nullable=True),
+        sa.Column('podium', sa.JSON(), nullable=True),
+        sa.Column('fastest_lap_driver', sa.String(length=3), nullable=True),
+        sa.Column('fastest_lap_ms', sa.Integer(), nullable=True),
+        sa.Column('fastest_lap_number', sa.Integer(), nullable=True),
+        sa.Column('laps_completed', sa.Integer(), nullable=True),
+        sa.Column('team_map', sa.JSON(), nullable=True),
+        sa.Column('source', sa.String(length=20), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        # Also serves "latest race" reads (ORDER BY season DESC, round DESC)
+        sa.UniqueConstraint('season', 'round', name='uq_race_summary'),
+    )
+
+
+def downgrade() -> None:
+    """Drop race_summary table."""
+    op.drop_table('race_summary')
@@ -0,0 +1,48 @@
+"""Store the standings' race context at ingest
+
+Standings reads rebuilt `last_race` and `race_summaries` from every race and
+qualifying classification of the season, plus the race metadata and a
+calendar count, on each request. race_summary now also keeps each race's
+date, circuit, pole and top-10 results, and driver_standings the calendar
+race counts at the time of the update, so reads only fetch stored rows.
+
+Existing rows get the new columns empty; run `theundercut
+refresh-race-summaries <season>` and `theundercut rebuild-standings <season>`
+to fill them.
+
+Revision ID: b7e1f3a9c5d2
+Revises: f4c2a8d6e91b
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1f3a9c5d2'
+down_revision: Union[str, None] = 'f4c2a8d6e91b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the race context columns to race_summary and the counts to driver_standings."""
+    op.add_column('race_summary', sa.Column('race_date', sa.String(length=10), nullable=True))
+    op.add_column('race_summary', sa.Column('circuit', sa.String(length=100), nullable=True))
+    op.add_column('race_summary', sa.Column('pole', sa.String(length=3), nullable=True))
+    op.add_column('race_summary', sa.Column('results', sa.JSON(), nullable=True))
+    op.add_column('driver_standings', sa.Column('races_completed', sa.Integer(), nullable=True))
+    op.add_column('driver_standings', sa.Column('races_remaining', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the race context columns."""
+    op.drop_column('driver_standings', 'races_remaining')
+    op.drop_column('driver_standings', 'races_completed')
+    op.drop_column('race_summary', 'results')
+    op.drop_column('race_summary', 'pole')
+    op.drop_column('race_summary', 'circuit')
+    op.drop_column('race_summary', 'race_date')
@@ -0,0 +1,72 @@
+"""Add season aggregate tables
+
+Creates core.season_driver_aggregates and core.season_constructor_aggregates
+holding per-season Drive Grade totals/averages, component averages and
+strategy factor averages. Ingestion refreshes the affected season after each
+race.
+
+Revision ID: b7e3f1c8d925
+Revises: a4d2e9b7c310
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3f1c8d925'
+down_revision: Union[str, None] = 'a4d2e9b7c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _aggregate_columns() -> list:
+    return [
+        sa.Column('races', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_grade', sa.Float(), nullable=True),
+        sa.Column('average_grade', sa.Float(), nullable=True),
+        sa.Column('avg_consistency', sa.Float(), nullable=True),
+        sa.Column('avg_team_strategy', sa.Float(), nullable=True),
+        sa.Column('avg_racecraft', sa.Float(), nullable=True),
+        sa.Column('avg_penalties', sa.Float(), nullable=True),
+        sa.Column('strategy_races', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('avg_strategy_score', sa.Float(), nullable=True),
+        sa.Column('avg_pit_timing', sa.Float(), nullable=True),
+        sa.Column('avg_tire_selection', sa.Float(), nullable=True),
+        sa.Column('avg_safety_car', sa.Float(), nullable=True),
+        sa.Column('avg_weather', sa.Float(), nullable=True),
+        sa.Column('calibration_profile', sa.String(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Create the season aggregate tables."""
+    op.create_table(
+        'season_driver_aggregates',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('driver_code', sa.String(length=3), nullable=False),
+        sa.Column('team', sa.String(), nullable=True),
+        *_aggregate_columns(),
+        sa.UniqueConstraint('season', 'driver_code', name='uq_season_driver_aggregate'),
+        schema='core',
+    )
+    op.create_table(
+        'season_constructor_aggregates',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('team', sa.String(), nullable=False),
+        *_aggregate_columns(),
+        sa.UniqueConstraint('season', 'team', name='uq_season_constructor_aggregate'),
+        schema='core',
+    )
+
+
+def downgrade() -> None:
+    """Drop the season aggregate tables."""
+    op.drop_table('season_constructor_aggregates', schema='core')
+    op.drop_table('season_driver_aggregates', schema='core')
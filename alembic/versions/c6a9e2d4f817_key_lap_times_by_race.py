@@ -0,0 +1,118 @@
+"""Key lap_times and stints by core.races id
+
+Adds a NOT NULL integer `race_key` foreign key to core.races on both
+partitioned tables and moves their indexes onto it: the covering unique lap
+key becomes (season, race_key, driver, lap), the `since=` index (season,
+race_key, lap) and the stint index (season, race_key, driver, stint_no).
+Reads and the ingest/live-poller upserts use those; the string race_id stays
+as a compatibility column.
+
+Laps can be stored before a race's reference rows exist, so rounds without a
+core.races row first get a placeholder (slug "season-round", as ingestion's
+fallback), the same row `services.race_keys.ensure_race_key` adds for new
+laps. Keys are backfilled as in the f9c1e7a3b2d4 partition migration: the
+oldest core.races row of each (season, round).
+
+Revision ID: c6a9e2d4f817
+Revises: b7e1f3a9c5d2
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a9e2d4f817'
+down_revision: Union[str, None] = 'b7e1f3a9c5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('lap_times', 'stints')
+
+# One core.races row per (season, round), as in f9c1e7a3b2d4.
+RACE_KEYS = """
+    SELECT DISTINCT ON (se.year, ra.round_number)
+        ra.id, se.year, ra.round_number
+    FROM core.races ra
+    JOIN core.seasons se ON se.id = ra.season_id
+    ORDER BY se.year, ra.round_number, ra.id
+"""
+
+STORED_ROUNDS = """
+    SELECT DISTINCT season, round FROM lap_times WHERE round IS NOT NULL
+    UNION
+    SELECT DISTINCT season, round FROM stints WHERE round IS NOT NULL
+"""
+
+
+def _add_placeholder_races() -> None:
+    op.execute(f"""
+        INSERT INTO core.seasons (year, status)
+        SELECT DISTINCT s.season, 'active'
+        FROM ({STORED_ROUNDS}) s
+        WHERE NOT EXISTS (SELECT 1 FROM core.seasons se WHERE se.year = s.season)
+    """)
+    op.execute(f"""
+        INSERT INTO core.races (season_id, round_number, slug, session_type)
+        SELECT se.id, s.round, s.season || '-' || s.round, 'R'
+        FROM ({STORED_ROUNDS}) s
+        JOIN core.seasons se ON se.year = s.season
+        WHERE NOT EXISTS (
+            SELECT 1 FROM core.races ra
+            WHERE ra.season_id = se.id AND ra.round_number = s.round
+        )
+        ON CONFLICT (slug) DO NOTHING
+    """)
+
+
+def upgrade() -> None:
+    """Add, backfill and index race_key on lap_times and stints."""
+    _add_placeholder_races()
+    for table in TABLES:
+        op.add_column(table, sa.Column('race_key', sa.Integer(), nullable=True))
+        op.execute(f"""
+            UPDATE {table} t SET race_key = r.id
+            FROM ({RACE_KEYS}) r
+            WHERE r.year = t.season AND r.round_number = t.round
+        """)
+        # Fails on rows whose race_id never parsed into a round; fix those first
+        op.alter_column(table, 'race_key', nullable=False)
+        op.create_foreign_key(
+            f'fk_{table}_race_key', table, 'races', ['race_key'], ['id'], referent_schema='core'
+        )
+
+    op.drop_index('uq_lap_race_driver_lap', table_name='lap_times')
+    op.drop_index('ix_lap_times_race_lap', table_name='lap_times')
+    op.drop_index('ix_stints_race_driver', table_name='stints')
+    op.execute("""
+        CREATE UNIQUE INDEX uq_lap_times_race_key_driver_lap
+        ON lap_times (season, race_key, driver, lap)
+        INCLUDE (lap_ms, compound, stint_no, pit)
+    """)
+    op.create_index('ix_lap_times_race_key_lap', 'lap_times', ['season', 'race_key', 'lap'])
+    op.create_index(
+        'ix_stints_race_key_driver', 'stints', ['season', 'race_key', 'driver', 'stint_no']
+    )
+    op.execute("ANALYZE lap_times")
+    op.execute("ANALYZE stints")
+
+
+def downgrade() -> None:
+    """Restore the race_id indexes and drop race_key (placeholder races are kept)."""
+    op.drop_index('ix_stints_race_key_driver', table_name='stints')
+    op.drop_index('ix_lap_times_race_key_lap', table_name='lap_times')
+    op.drop_index('uq_lap_times_race_key_driver_lap', table_name='lap_times')
+    op.execute("""
+        CREATE UNIQUE INDEX uq_lap_race_driver_lap
+        ON lap_times (season, race_id, driver, lap)
+        INCLUDE (lap_ms, compound, stint_no, pit)
+    """)
+    op.create_index('ix_lap_times_race_lap', 'lap_times', ['season', 'race_id', 'lap'])
+    op.create_index('ix_stints_race_driver', 'stints', ['season', 'race_id', 'driver', 'stint_no'])
+    for table in TABLES:
+        op.drop_constraint(f'fk_{table}_race_key', table, type_='foreignkey')
+        op.drop_column(table, 'race_key')
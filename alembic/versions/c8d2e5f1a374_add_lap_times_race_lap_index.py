@@ -0,0 +1,32 @@
+"""Add lap_times (season, race_id, lap) index
+
+Backs `since=` delta reads of a race's laps (`/laps?since=<lap>`), which
+filter on lap number across every driver; the unique lap key leads with the
+driver and cannot range-scan laps. Created on the partitioned parent, so
+every season partition gets it.
+
+Revision ID: c8d2e5f1a374
+Revises: b7e3f1c8d925
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2e5f1a374'
+down_revision: Union[str, None] = 'b7e3f1c8d925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the race/lap index on lap_times."""
+    op.create_index('ix_lap_times_race_lap', 'lap_times', ['season', 'race_id', 'lap'])
+
+
+def downgrade() -> None:
+    """Drop the race/lap index."""
+    op.drop_index('ix_lap_times_race_lap', table_name='lap_times')
@@ -0,0 +1,49 @@
+"""Store championship points as floats
+
+Half-points races (e.g. Spa 2021) award 12.5/9/7.5... points, which the
+Integer columns truncated, so the stored standings never matched Jolpica's.
+Widens session_classifications.points and the standings point columns to
+double precision.
+
+Revision ID: d1a6c4e8f253
+Revises: c8d2e5f1a374
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a6c4e8f253'
+down_revision: Union[str, None] = 'c8d2e5f1a374'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POINT_COLUMNS = (
+    ('session_classifications', 'points'),
+    ('driver_standings', 'points'),
+    ('driver_standings', 'round_points'),
+    ('constructor_standings', 'points'),
+    ('constructor_standings', 'round_points'),
+)
+
+
+def upgrade() -> None:
+    """Change the point columns to Float."""
+    for table, column in POINT_COLUMNS:
+        op.alter_column(table, column, type_=sa.Float(), existing_type=sa.Integer())
+
+
+def downgrade() -> None:
+    """Change the point columns back to Integer (half points are rounded)."""
+    for table, column in POINT_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Integer(),
+            existing_type=sa.Float(),
+            postgresql_using=f'{column}::integer',
+        )
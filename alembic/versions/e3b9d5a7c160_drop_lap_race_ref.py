@@ -0,0 +1,48 @@
+"""Drop the unused race_ref column from lap_times and stints
+
+f9c1e7a3b2d4 added an integer `race_ref` foreign key to core.races next to
+the string race_id, but every read still joins on race_id (filtered by
+season for partition pruning), so the column only cost an UPDATE per ingest.
+
+Revision ID: e3b9d5a7c160
+Revises: d1a6c4e8f253
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9d5a7c160'
+down_revision: Union[str, None] = 'd1a6c4e8f253'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop race_ref (and its foreign key) from both partitioned tables."""
+    op.drop_column('lap_times', 'race_ref')
+    op.drop_column('stints', 'race_ref')
+
+
+def downgrade() -> None:
+    """Re-add race_ref and backfill it from each row's season and round."""
+    for table in ('lap_times', 'stints'):
+        op.add_column(
+            table,
+            sa.Column(
+                'race_ref',
+                sa.Integer(),
+                sa.ForeignKey('core.races.id', ondelete='SET NULL'),
+                nullable=True,
+            ),
+        )
+        op.execute(f"""
+            UPDATE {table} t SET race_ref = ra.id
+            FROM core.races ra
+            JOIN core.seasons se ON se.id = ra.season_id
+            WHERE se.year = t.season AND ra.round_number = t.round
+        """)
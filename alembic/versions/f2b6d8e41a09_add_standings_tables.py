@@ -0,0 +1,83 @@
+"""Add driver and constructor standings tables
+
+Stores championship standings per season and round, computed from race and
+sprint rows in session_classifications during ingestion. Standings reads
+become one indexed query instead of three Jolpica calls.
+
+Revision ID: f2b6d8e41a09
+Revises: e8f4c3d56a23
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d8e41a09'
+down_revision: Union[str, None] = 'e8f4c3d56a23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create driver_standings and constructor_standings tables."""
+    op.create_table(
+        'driver_standings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('round', sa.Integer(), nullable=False),
+        sa.Column('driver_code', sa.String(length=3), nullable=False),
+        sa.Column('driver_name', sa.String(length=100), nullable=True),
+        sa.Column('team', sa.String(length=50), nullable=True),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('round_points', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('races', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('poles', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('start_pos_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('finish_pos_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('positions_gained', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('recent_points', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('season', 'round', 'driver_code', name='uq_driver_standing'),
+    )
+    op.create_index(
+        'ix_driver_standing_season_round',
+        'driver_standings',
+        ['season', 'round', 'position'],
+    )
+
+    op.create_table(
+        'constructor_standings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('round', sa.Integer(), nullable=False),
+        sa.Column('team', sa.String(length=50), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('round_points', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('positions_gained', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('recent_points', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('season', 'round', 'team', name='uq_constructor_standing'),
+    )
+    op.create_index(
+        'ix_constructor_standing_season_round',
+        'constructor_standings',
+        ['season', 'round', 'position'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the standings tables."""
+    op.drop_index('ix_constructor_standing_season_round', table_name='constructor_standings')
+    op.drop_table('constructor_standings')
+    op.drop_index('ix_driver_standing_season_round', table_name='driver_standings')
+    op.drop_table('driver_standings')
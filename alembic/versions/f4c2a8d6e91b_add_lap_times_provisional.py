@@ -0,0 +1,36 @@
+"""Flag provisional lap_times rows written by the live poller
+
+The final ingest used to decide whether to replace a race's laps from the
+live poller's Redis state, which expires; without it the provisional rows
+(no compound, no pit flag) were kept for good. Rows now carry the flag
+themselves, so the handover reads it from the table.
+
+Revision ID: f4c2a8d6e91b
+Revises: e3b9d5a7c160
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c2a8d6e91b'
+down_revision: Union[str, None] = 'e3b9d5a7c160'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add lap_times.provisional; every existing row is final."""
+    op.add_column(
+        'lap_times',
+        sa.Column('provisional', sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    """Drop lap_times.provisional."""
+    op.drop_column('lap_times', 'provisional')
@@ -0,0 +1,181 @@
+"""Partition lap_times and stints by season with integer race keys
+
+Rebuilds both tables as declaratively partitioned tables (RANGE on season,
+one partition per season) and adds integer `season`/`round` columns plus a
+`race_ref` foreign key to core.races. The string race_id stays as the API
+key for now.
+
+Unique indexes on a partitioned table must contain the partition key, so
+the lap key becomes (season, race_id, driver, lap). It INCLUDEs lap_ms,
+compound, stint_no and pit so per-race lap reads are index-only scans in a
+single partition. Old seasons can then be detached
+(`ALTER TABLE lap_times DETACH PARTITION lap_times_y2019`) and archived.
+
+Ingestion creates the partitions for a new season before it stores laps.
+
+Revision ID: f9c1e7a3b2d4
+Revises: f2b6d8e41a09
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9c1e7a3b2d4'
+down_revision: Union[str, None] = 'f2b6d8e41a09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LAP_COLUMNS = "race_id, driver, lap, lap_ms, compound, stint_no, pit"
+STINT_COLUMNS = "race_id, driver, stint_no, compound, laps, avg_lap_ms"
+
+# One core.races row per (season, round); race_id is "season-round".
+RACE_KEYS = """
+    SELECT DISTINCT ON (se.year, ra.round_number)
+        ra.id, se.year, ra.round_number
+    FROM core.races ra
+    JOIN core.seasons se ON se.id = ra.season_id
+    ORDER BY se.year, ra.round_number, ra.id
+"""
+
+
+def _legacy_seasons() -> list[int]:
+    rows = op.get_bind().execute(sa.text("""
+        SELECT DISTINCT CAST(split_part(race_id, '-', 1) AS INTEGER) FROM lap_times_legacy
+        UNION
+        SELECT DISTINCT CAST(split_part(race_id, '-', 1) AS INTEGER) FROM stints_legacy
+    """))
+    return sorted(row[0] for row in rows)
+
+
+def _rename_to_legacy(table: str) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+    op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey")
+
+
+def _create_partitions(table: str, seasons: list[int]) -> None:
+    for season in seasons:
+        op.execute(
+            f"CREATE TABLE {table}_y{season} PARTITION OF {table} "
+            f"FOR VALUES FROM ({season}) TO ({season + 1})"
+        )
+
+
+def _copy_from_legacy(table: str, columns: str) -> None:
+    legacy_columns = ", ".join(f"l.{name.strip()}" for name in columns.split(","))
+    op.execute(f"""
+        INSERT INTO {table} (id, season, round, race_ref, {columns})
+        SELECT l.id, k.season, k.round, r.id, {legacy_columns}
+        FROM {table}_legacy l
+        CROSS JOIN LATERAL (
+            SELECT
+                CAST(split_part(l.race_id, '-', 1) AS INTEGER) AS season,
+                CAST(split_part(l.race_id, '-', 2) AS INTEGER) AS round
+        ) k
+        LEFT JOIN ({RACE_KEYS}) r ON r.year = k.season AND r.round_number = k.round
+    """)
+    # Keep the id sequence: hand it to the new table before the old one goes
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {table}_legacy")
+
+
+def upgrade() -> None:
+    """Rebuild lap_times and stints as season-partitioned tables."""
+    op.drop_index('uq_lap_race_driver_lap', table_name='lap_times')
+    _rename_to_legacy('lap_times')
+    _rename_to_legacy('stints')
+    seasons = _legacy_seasons()
+
+    op.execute("""
+        CREATE TABLE lap_times (
+            id INTEGER NOT NULL DEFAULT nextval('lap_times_id_seq'),
+            season INTEGER NOT NULL,
+            round INTEGER,
+            race_ref INTEGER REFERENCES core.races (id) ON DELETE SET NULL,
+            race_id VARCHAR NOT NULL,
+            driver VARCHAR(3) NOT NULL,
+            lap INTEGER,
+            lap_ms INTEGER,
+            compound VARCHAR(10),
+            stint_no INTEGER,
+            pit BOOLEAN,
+            CONSTRAINT lap_times_pkey PRIMARY KEY (id, season)
+        ) PARTITION BY RANGE (season)
+    """)
+    op.execute("""
+        CREATE TABLE stints (
+            id INTEGER NOT NULL DEFAULT nextval('stints_id_seq'),
+            season INTEGER NOT NULL,
+            round INTEGER,
+            race_ref INTEGER REFERENCES core.races (id) ON DELETE SET NULL,
+            race_id VARCHAR NOT NULL,
+            driver VARCHAR(3) NOT NULL,
+            stint_no INTEGER,
+            compound VARCHAR(10),
+            laps INTEGER,
+            avg_lap_ms INTEGER,
+            CONSTRAINT stints_pkey PRIMARY KEY (id, season)
+        ) PARTITION BY RANGE (season)
+    """)
+    _create_partitions('lap_times', seasons)
+    _create_partitions('stints', seasons)
+
+    _copy_from_legacy('lap_times', LAP_COLUMNS)
+    _copy_from_legacy('stints', STINT_COLUMNS)
+
+    # Indexes are built after the copy; created on the parent, they cascade
+    # to every partition (and to partitions added later).
+    op.execute("""
+        CREATE UNIQUE INDEX uq_lap_race_driver_lap
+        ON lap_times (season, race_id, driver, lap)
+        INCLUDE (lap_ms, compound, stint_no, pit)
+    """)
+    op.create_index('ix_stints_race_driver', 'stints', ['season', 'race_id', 'driver', 'stint_no'])
+    op.execute("ANALYZE lap_times")
+    op.execute("ANALYZE stints")
+
+
+def _restore_plain_table(table: str, ddl: str, columns: str) -> None:
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+    op.execute(ddl)
+    op.execute(f"INSERT INTO {table} (id, {columns}) SELECT id, {columns} FROM {table}_partitioned")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {table}_partitioned")
+
+
+def downgrade() -> None:
+    """Copy the rows back into plain, unpartitioned tables."""
+    op.drop_index('ix_stints_race_driver', table_name='stints')
+    op.drop_index('uq_lap_race_driver_lap', table_name='lap_times')
+    _restore_plain_table('lap_times', """
+        CREATE TABLE lap_times (
+            id INTEGER NOT NULL DEFAULT nextval('lap_times_id_seq'),
+            race_id VARCHAR NOT NULL,
+            driver VARCHAR(3) NOT NULL,
+            lap INTEGER,
+            lap_ms INTEGER,
+            compound VARCHAR(10),
+            stint_no INTEGER,
+            pit BOOLEAN,
+            CONSTRAINT lap_times_pkey PRIMARY KEY (id)
+        )
+    """, LAP_COLUMNS)
+    _restore_plain_table('stints', """
+        CREATE TABLE stints (
+            id INTEGER NOT NULL DEFAULT nextval('stints_id_seq'),
+            race_id VARCHAR NOT NULL,
+            driver VARCHAR(3) NOT NULL,
+            stint_no INTEGER,
+            compound VARCHAR(10),
+            laps INTEGER,
+            avg_lap_ms INTEGER,
+            CONSTRAINT stints_pkey PRIMARY KEY (id)
+        )
+    """, STINT_COLUMNS)
+    op.create_index('uq_lap_race_driver_lap', 'lap_times', ['race_id', 'driver', 'lap'], unique=True)
@@ -2,11 +2,31 @@
 Single source of truth for the SQLAlchemy engine and session factory.
 Other modules should *only* import SessionLocal (for ORM sessions) or
 engine (for low‑level SQL).
+
+API routes that run on the event loop use the async engine instead
+(`get_async_db`), created lazily so workers and the CLI never need asyncpg.
+
+Read-only API routes depend on `get_read_db` / `get_async_read_db`, which use
+the replica at DATABASE_READ_URL when one is configured and the primary
+otherwise.
 """
 
+from typing import Any, AsyncIterator, Callable, Optional, Union
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
 
+from theundercut.adapters.redis_cache import async_redis_client, redis_client
 from theundercut.config import get_settings
 
 settings = get_settings()
@@ -21,3 +41,174 @@ def get_db():
         yield db          # FastAPI receives the actual Session here
     finally:
         db.close()
+
+
+# --- Read replica -------------------------------------------------------------
+read_engine = (
+    create_engine(settings.database_read_url, pool_pre_ping=True, future=True)
+    if settings.database_read_url
+    else engine
+)
+ReadSessionLocal = (
+    scoped_session(sessionmaker(bind=read_engine, autoflush=False, future=True))
+    if read_engine is not engine
+    else SessionLocal
+)
+
+PRIMARY_PIN_PREFIX = "db:primary"
+
+
+def replica_configured() -> bool:
+    return read_engine is not engine
+
+
+def primary_pin_key(season: int) -> str:
+    """Redis key that routes a season's reads to the primary while it exists."""
+    return f"{PRIMARY_PIN_PREFIX}:{season}"
+
+
+def pin_reads_to_primary(season: int) -> None:
+    """
+    Send reads of `season` to the primary for the replica lag window.
+
+    Call after committing a write that readers must see right away (ingestion,
+    admin status changes). Otherwise the next request could read a replica
+    that has not replayed the write yet and cache the stale result.
+    """
+    redis_client.setex(primary_pin_key(season), settings.read_after_write_seconds, "1")
+
+
+def _pinned_season(conn: HTTPConnection) -> Optional[str]:
+    return conn.path_params.get("season")
+
+
+def _reads_pinned(conn: HTTPConnection) -> bool:
+    season = _pinned_season(conn)
+    if season is None:
+        return False
+    try:
+        return bool(redis_client.exists(primary_pin_key(season)))
+    except RedisError:
+        return True  # Cannot tell whether a write is in flight: use the primary
+
+
+async def _reads_pinned_async(conn: HTTPConnection) -> bool:
+    season = _pinned_season(conn)
+    if season is None:
+        return False
+    try:
+        return bool(await async_redis_client.exists(primary_pin_key(season)))
+    except RedisError:
+        return True
+
+
+def get_read_db(conn: HTTPConnection):
+    """get_db for read-only routes: the replica unless the season was just written."""
+    use_replica = replica_configured() and not _reads_pinned(conn)
+    db = (ReadSessionLocal if use_replica else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# --- Async engine (asyncpg) ---------------------------------------------------
+# Sync driver backends mapped to their async counterparts.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_read_engine: Optional[AsyncEngine] = None
+_async_read_session_factory: Optional[async_sessionmaker] = None
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL to the same database on its async driver."""
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return sa_url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(settings.database_url),
+            pool_pre_ping=True,
+        )
+    return _async_engine
+
+
+def get_async_read_engine() -> AsyncEngine:
+    """Async engine for the read replica (the primary's when none is configured)."""
+    global _async_read_engine
+    if not replica_configured():
+        return get_async_engine()
+    if _async_read_engine is None:
+        _async_read_engine = create_async_engine(
+            async_database_url(settings.database_read_url),
+            pool_pre_ping=True,
+        )
+    return _async_read_engine
+
+
+def _async_session_maker(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Open a new async ORM session on the shared async engine."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = _async_session_maker(get_async_engine())
+    return _async_session_factory()
+
+
+def AsyncReadSessionLocal() -> AsyncSession:
+    """Open a new async ORM session on the read replica."""
+    global _async_read_session_factory
+    if not replica_configured():
+        return AsyncSessionLocal()
+    if _async_read_session_factory is None:
+        _async_read_session_factory = _async_session_maker(get_async_read_engine())
+    return _async_read_session_factory()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(conn: HTTPConnection) -> AsyncIterator[AsyncSession]:
+    """get_async_db for read-only routes: the replica unless the season was just written."""
+    use_replica = replica_configured() and not await _reads_pinned_async(conn)
+    async with (AsyncReadSessionLocal if use_replica else AsyncSessionLocal)() as db:
+        yield db
+
+
+async def run_sync_db(
+    db: Union[AsyncSession, Session],
+    fn: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a sync ORM builder (`fn(session, *args, **kwargs)`) for an async route.
+
+    With an AsyncSession the builder runs through `run_sync`, on the
+    event-loop thread: only the waits on asyncpg yield to other requests,
+    while row processing and the builder's own Python work hold the loop for
+    as long as they take. Builders passed here should therefore keep to
+    queries and light shaping; Redis, RQ and HTTP calls belong in the
+    threadpool (`run_in_threadpool`) after this returns. A plain Session
+    (e.g. a dependency override) runs in the threadpool instead.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -5,6 +5,7 @@ Lightweight OpenF1 fallback if FastF1 is missing a session.
 from __future__ import annotations
 
 import logging
+import time
 from functools import lru_cache
 from typing import Dict, List, Optional
 
@@ -15,6 +16,23 @@ logger = logging.getLogger(__name__)
 
 _API = "https://api.openf1.org/v1"
 _TIMEOUT = 30
+# Shared clients doing bulk reads (testing days, live polls)
+OPENF1_TIMEOUT = 60
+OPENF1_MAX_RETRIES = 3
+
+
+def openf1_get(client: httpx.Client, endpoint: str, params: Dict) -> List[Dict]:
+    """GET an OpenF1 endpoint, backing off and retrying on 429."""
+    for attempt in range(OPENF1_MAX_RETRIES):
+        resp = client.get(f"{_API}/{endpoint}", params=params)
+        if resp.status_code == 429 and attempt < OPENF1_MAX_RETRIES - 1:
+            time.sleep(float(resp.headers.get("Retry-After") or attempt + 1))
+            continue
+        if resp.status_code == 404:
+            return []
+        resp.raise_for_status()
+        return resp.json()
+    return []
 
 
 @lru_cache(maxsize=8)
@@ -54,7 +72,7 @@ def _normalize_session_type(session_type: str) -> str:
     return _SESSION_NAME_MAP.get(session_type, session_type)
 
 
-def _get_session_key(year: int, rnd: int, session_type: str = "Race") -> int | None:
+def get_session_key(year: int, rnd: int, session_type: str = "Race") -> int | None:
     """
     Map (year, round, session_type) to OpenF1 session_key.
 
@@ -98,7 +116,7 @@ class OpenF1Provider:
     def _get_session_key(self, session_type: str) -> int | None:
         """Get session_key for the given session type, with caching."""
         if session_type not in self._session_cache:
-            self._session_cache[session_type] = _get_session_key(
+            self._session_cache[session_type] = get_session_key(
                 self.season, self.rnd, session_type
             )
         return self._session_cache[session_type]
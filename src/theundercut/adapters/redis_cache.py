@@ -3,6 +3,7 @@ Central Redis client—import this anywhere you need Redis.
 """
 
 import redis
+import redis.asyncio as aioredis
 
 from theundercut.config import get_settings
 
@@ -12,3 +13,17 @@ redis_client: redis.Redis = redis.from_url(
     settings.redis_url,
     decode_responses=True,
 )
+
+# Raw-bytes client for binary values such as precompressed response bodies.
+redis_binary_client: redis.Redis = redis.from_url(
+    settings.redis_url,
+    decode_responses=False,
+)
+
+# Async client for the async API routes. Every route shares this one
+# connection pool; connections are opened lazily on first use.
+async_redis_pool: aioredis.ConnectionPool = aioredis.ConnectionPool.from_url(
+    settings.redis_url,
+    decode_responses=True,
+)
+async_redis_client: aioredis.Redis = aioredis.Redis(connection_pool=async_redis_pool)
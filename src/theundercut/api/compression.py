@@ -0,0 +1,146 @@
+"""
+Serve precompressed response variants stored next to cached payloads.
+
+Variants are produced once when a cache entry is filled (see
+`services.cache.store_encoded_variants`); requests then only pick the one the
+client's Accept-Encoding allows instead of compressing on every hit.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from theundercut.api.etag import CACHE_CONTROL, encoding_etag
+from theundercut.services.cache import (
+    get_encoded_variant,
+    json_body,
+    store_encoded_variants,
+    supported_content_encodings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _accepted_codings(header: str) -> dict[str, float]:
+    codings: dict[str, float] = {}
+    for item in header.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[token] = quality
+    return codings
+
+
+def preferred_encoding(request: Request) -> Optional[str]:
+    """Pick the best precompressed coding the client accepts, if any."""
+    header = request.headers.get("accept-encoding")
+    if not header:
+        return None
+    codings = _accepted_codings(header)
+    wildcard = codings.get("*", 0.0)
+    for encoding in supported_content_encodings():
+        if codings.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def encoded_response(body: bytes, encoding: str, etag: Optional[str] = None) -> Response:
+    """Build a JSON response from an already-compressed body."""
+    headers = {"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    if etag:
+        headers["ETag"] = encoding_etag(etag, encoding)
+        headers["Cache-Control"] = CACHE_CONTROL
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_variant_response(
+    request: Request,
+    key: str,
+    client=None,
+    etag: Optional[str] = None,
+) -> Optional[Response]:
+    """Return the stored variant for the client's coding, or None on a miss."""
+    encoding = preferred_encoding(request)
+    if not encoding:
+        return None
+    try:
+        body = get_encoded_variant(key, encoding, client)
+    except Exception as exc:
+        logger.debug("Encoded variant lookup failed for %s: %s", key, exc)
+        return None
+    if not body:
+        return None
+    return encoded_response(body, encoding, etag)
+
+
+def store_variants_and_respond(
+    request: Request,
+    key: str,
+    ttl: int,
+    payload: Any,
+    client=None,
+    etag: Optional[str] = None,
+) -> Optional[Response]:
+    """
+    Store precompressed variants for a freshly built payload.
+
+    Returns the encoded response for this client when a variant matches its
+    Accept-Encoding, otherwise None (the caller returns the payload as usual).
+    """
+    try:
+        variants = store_encoded_variants(key, ttl, json_body(payload), client)
+    except Exception as exc:
+        logger.debug("Failed to store encoded variants for %s: %s", key, exc)
+        return None
+    encoding = preferred_encoding(request)
+    if encoding and encoding in variants:
+        return encoded_response(variants[encoding], encoding, etag)
+    return None
+
+
+async def cached_variant_response_async(
+    request: Request,
+    key: str,
+    client=None,
+    etag: Optional[str] = None,
+) -> Optional[Response]:
+    """cached_variant_response for async routes; the binary Redis read runs in the threadpool."""
+    if not preferred_encoding(request):
+        return None
+    return await run_in_threadpool(cached_variant_response, request, key, client, etag)
+
+
+async def store_variants_and_respond_async(
+    request: Request,
+    key: str,
+    ttl: int,
+    payload: Any,
+    client=None,
+    etag: Optional[str] = None,
+) -> Optional[Response]:
+    """store_variants_and_respond for async routes; compression runs in the threadpool."""
+    return await run_in_threadpool(
+        store_variants_and_respond, request, key, ttl, payload, client, etag
+    )
+
+
+__all__ = [
+    "preferred_encoding",
+    "encoded_response",
+    "cached_variant_response",
+    "cached_variant_response_async",
+    "store_variants_and_respond",
+    "store_variants_and_respond_async",
+]
@@ -0,0 +1,202 @@
+"""
+Strong ETags and conditional GET handling for the JSON API.
+
+Race-scoped endpoints derive their ETag from the request URL plus the race's
+generation counter, so an `If-None-Match` revalidation is answered with a 304
+before any DB query, cached-payload read or Pydantic serialization. Endpoints
+without a generation counter hash the cached payload bytes instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Optional, Sequence, Union
+
+from fastapi import Request, Response
+
+from theundercut.services.cache import (
+    get_race_generation,
+    get_race_generation_async,
+    get_race_generations,
+    get_race_generations_async,
+    get_season_generation_async,
+)
+
+logger = logging.getLogger(__name__)
+
+# Clients may keep the payload but must revalidate before reusing it.
+CACHE_CONTROL = "no-cache"
+
+
+def _quote(digest: str) -> str:
+    return f'"{digest[:32]}"'
+
+
+def compute_etag(*parts: Any) -> str:
+    """Build a strong ETag from arbitrary parts."""
+    material = "\x1f".join(str(part) for part in parts)
+    return _quote(hashlib.sha256(material.encode("utf-8")).hexdigest())
+
+
+def payload_etag(payload: Union[str, bytes]) -> str:
+    """Build a strong ETag from cached payload bytes."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return _quote(hashlib.sha256(payload).hexdigest())
+
+
+def encoding_etag(etag: str, encoding: str) -> str:
+    """Derive the validator for a content-encoded representation of a response."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _strip_encoding(tag: str) -> str:
+    for encoding in ("gzip", "br"):
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def _request_identity(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def race_etag(
+    request: Request,
+    season: int,
+    rnd: int,
+    *extra: Any,
+    client=None,
+) -> Optional[str]:
+    """
+    ETag for a race-scoped response, keyed on URL and race generation.
+
+    Returns None when the generation counter cannot be read, in which case the
+    endpoint simply serves the response without a validator.
+    """
+    try:
+        generation = get_race_generation(season, rnd, client)
+    except Exception as exc:
+        logger.debug("Race generation unavailable for %s-%s: %s", season, rnd, exc)
+        return None
+    return compute_etag(_request_identity(request), generation, *extra)
+
+
+async def race_etag_async(
+    request: Request,
+    season: int,
+    rnd: int,
+    *extra: Any,
+    client=None,
+) -> Optional[str]:
+    """race_etag for async routes (reads the generation on the async client)."""
+    try:
+        generation = await get_race_generation_async(season, rnd, client)
+    except Exception as exc:
+        logger.debug("Race generation unavailable for %s-%s: %s", season, rnd, exc)
+        return None
+    return compute_etag(_request_identity(request), generation, *extra)
+
+
+def season_etag(
+    request: Request,
+    season: int,
+    rounds: Sequence[int],
+    *extra: Any,
+    client=None,
+) -> Optional[str]:
+    """ETag for a multi-round response, keyed on URL and every round's generation."""
+    try:
+        generations = get_race_generations(season, rounds, client)
+    except Exception as exc:
+        logger.debug("Race generations unavailable for %s: %s", season, exc)
+        return None
+    return compute_etag(_request_identity(request), *zip(rounds, generations), *extra)
+
+
+async def season_etag_async(
+    request: Request,
+    season: int,
+    rounds: Sequence[int],
+    *extra: Any,
+    client=None,
+) -> Optional[str]:
+    """season_etag for async routes."""
+    try:
+        generations = await get_race_generations_async(season, rounds, client)
+    except Exception as exc:
+        logger.debug("Race generations unavailable for %s: %s", season, exc)
+        return None
+    return compute_etag(_request_identity(request), *zip(rounds, generations), *extra)
+
+
+async def whole_season_etag_async(
+    request: Request,
+    season: int,
+    *extra: Any,
+    client=None,
+) -> Optional[str]:
+    """
+    ETag for a response covering every round of a season.
+
+    Keyed on the season generation, which moves with any round's, so the
+    validator needs neither the round list nor a DB query.
+    """
+    try:
+        generation = await get_season_generation_async(season, client)
+    except Exception as exc:
+        logger.debug("Season generation unavailable for %s: %s", season, exc)
+        return None
+    return compute_etag(_request_identity(request), generation, *extra)
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Evaluate If-None-Match (weak comparison, as RFC 9110 requires)."""
+    if not etag:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Precompressed variants carry an encoding suffix; they validate the same
+    # underlying representation.
+    candidates = {
+        _strip_encoding(tag.strip().removeprefix("W/"))
+        for tag in header.split(",")
+        if tag.strip()
+    }
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Build the 304 response for a matching validator."""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: Optional[str]) -> None:
+    """Attach the validator headers to an outgoing response."""
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+__all__ = [
+    "compute_etag",
+    "payload_etag",
+    "encoding_etag",
+    "race_etag",
+    "race_etag_async",
+    "season_etag",
+    "season_etag_async",
+    "whole_season_etag_async",
+    "etag_matches",
+    "not_modified",
+    "set_etag",
+]
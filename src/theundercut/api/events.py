@@ -0,0 +1,142 @@
+"""
+Relay race events from Redis pub/sub to Server-Sent Events streams.
+
+Each API process holds a single pattern subscription to every race events
+channel (`services.race_events`), however many clients are connected. The
+broker formats each message once and hands it to the queues of the clients
+watching that race, so idle streams cost no Redis or database work beyond the
+one connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from theundercut.adapters.redis_cache import async_redis_client
+from theundercut.services.race_events import (
+    RACE_EVENTS_CHANNEL_PREFIX,
+    parse_race_events_channel,
+)
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per client; a client that falls further behind loses the oldest
+CLIENT_QUEUE_SIZE = 100
+# Comment line sent on idle streams so proxies keep the connection open
+HEARTBEAT_SECONDS = 15.0
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class RaceEventBroker:
+    """Fan race events out from one Redis subscription to per-client queues."""
+
+    def __init__(self, client=None, queue_size: int = CLIENT_QUEUE_SIZE):
+        self._client = client
+        self._queue_size = queue_size
+        self._subscribers: Dict[Tuple[int, int], Set[asyncio.Queue]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def client_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, season: int, rnd: int) -> asyncio.Queue:
+        """Register a client for one race; starts the listener on first use."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers[(season, rnd)].add(queue)
+        self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, season: int, rnd: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get((season, rnd))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[(season, rnd)]
+
+    def dispatch(self, channel: str, message: str) -> int:
+        """Format a published message once and queue it for that race's clients."""
+        race = parse_race_events_channel(channel)
+        queues = self._subscribers.get(race) if race else None
+        if not queues:
+            return 0
+        try:
+            payload = json.loads(message)
+            chunk = format_sse(payload["event"], payload.get("data"))
+        except (TypeError, ValueError, KeyError):
+            logger.warning("Ignoring malformed race event on %s", channel)
+            return 0
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(chunk)
+        return len(queues)
+
+    def _ensure_listener(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        client = self._client or async_redis_client
+        while True:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{RACE_EVENTS_CHANNEL_PREFIX}:*")
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Race event subscription failed, reconnecting: %s", exc)
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def stream(
+        self,
+        season: int,
+        rnd: int,
+        initial: Optional[str] = None,
+        heartbeat: float = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[str]:
+        """
+        Yield SSE chunks for one client until it disconnects.
+
+        `initial` (e.g. the current live snapshot) is sent first; idle periods
+        produce a comment line every `heartbeat` seconds.
+        """
+        queue = self.subscribe(season, rnd)
+        try:
+            if initial is not None:
+                yield initial
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(season, rnd, queue)
+
+
+race_event_broker = RaceEventBroker()
+
+
+__all__ = [
+    "CLIENT_QUEUE_SIZE",
+    "HEARTBEAT_SECONDS",
+    "RaceEventBroker",
+    "format_sse",
+    "race_event_broker",
+]
@@ -0,0 +1,46 @@
+"""
+`fields=` selection for heavy responses.
+
+Endpoints map the selected fields to the sections they have to load, so a
+narrow selection skips the queries and remote calls behind the other fields
+rather than just trimming the output.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+
+def parse_fields(
+    requested: Optional[List[str]],
+    allowed: Sequence[str],
+) -> Optional[Tuple[str, ...]]:
+    """
+    Normalize a `fields=` selection (repeated and/or comma-separated values).
+
+    Returns the selected fields in the endpoint's canonical order, or None when
+    nothing (or everything) was selected so the full response path is used.
+    Unknown fields are rejected with a 400.
+    """
+    if not requested:
+        return None
+    selected = {
+        field.strip()
+        for value in requested
+        for field in value.split(",")
+        if field.strip()
+    }
+    unknown = selected.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}",
+        )
+    if not selected or selected.issuperset(allowed):
+        return None
+    return tuple(field for field in allowed if field in selected)
+
+
+__all__ = ["parse_fields"]
@@ -5,7 +5,9 @@ from fastapi.staticfiles import StaticFiles
 
 from theundercut.api.v1 import analytics as analytics_api
 from theundercut.api.v1 import circuits as circuits_api
+from theundercut.api.v1 import export as export_api
 from theundercut.api.v1 import race as race_api          # JSON API
+from theundercut.api.v1 import season as season_api
 from theundercut.api.v1 import standings as standings_api
 from theundercut.api.v1 import strategy as strategy_api
 from theundercut.api.v1 import testing as testing_api
@@ -21,9 +23,11 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 app.include_router(race_api.router)
 app.include_router(analytics_api.router)
 app.include_router(standings_api.router)
+app.include_router(season_api.router)
 app.include_router(circuits_api.router)
 app.include_router(strategy_api.router)
 app.include_router(testing_api.router)
+app.include_router(export_api.router)
 
 # Server-rendered pages
 app.include_router(web_router)
@@ -2,18 +2,47 @@
 
 from __future__ import annotations
 
-import json
-from typing import Optional, List
+import datetime as dt
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from theundercut.adapters.db import get_db
-from theundercut.adapters.redis_cache import redis_client
-from theundercut.services.analytics import fetch_race_analytics
-from theundercut.services.cache import analytics_cache_key
+from theundercut.adapters.db import get_async_read_db, run_sync_db
+from theundercut.adapters.redis_cache import async_redis_client, redis_binary_client
+from theundercut.api.compression import cached_variant_response_async, store_variants_and_respond
+from theundercut.api.etag import (
+    etag_matches,
+    not_modified,
+    race_etag_async,
+    season_etag_async,
+    set_etag,
+    whole_season_etag_async,
+)
+from theundercut.api.fields import parse_fields
+from theundercut.services.analytics import (
+    ANALYTICS_FIELDS,
+    ANALYTICS_TABLE_FORMAT,
+    analytics_table_sections,
+    build_race_analytics_table,
+    build_race_analytics_tables,
+    season_analytics_rounds,
+    slice_race_analytics,
+)
+from theundercut.services.cache import (
+    analytics_cache_key,
+    analytics_response_cache_key,
+    fields_cache_key,
+    get_cached_payload_async,
+    get_cached_payloads_async,
+    load_cached_sections_async,
+    set_cached_payloads_async,
+)
 
 CACHE_TTL_SECONDS = 300
+MAX_BATCH_ROUNDS = 30
 
 router = APIRouter(
     prefix="/api/v1/analytics",
@@ -21,21 +50,237 @@ router = APIRouter(
 )
 
 
+async def _load_table_sections(
+    db: Union[AsyncSession, Session],
+    season: int,
+    rnd: int,
+    sections: Sequence[str],
+) -> Dict[str, Any]:
+    """Assemble a partial race table from per-section cache entries."""
+
+    async def _build(missing: List[str]) -> Dict[str, Any]:
+        tables = await run_sync_db(db, build_race_analytics_tables, season, [rnd], missing)
+        return {section: tables[rnd][section] for section in missing}
+
+    loaded = await load_cached_sections_async(
+        analytics_cache_key(season, rnd), sections, CACHE_TTL_SECONDS, _build, async_redis_client
+    )
+    return {
+        "format": ANALYTICS_TABLE_FORMAT,
+        "race": {"season": season, "round": rnd},
+        "last_updated": dt.datetime.utcnow().isoformat() + "Z",
+        **loaded,
+    }
+
+
+async def _get_analytics_fields_with_cache(
+    db: Union[AsyncSession, Session],
+    season: int,
+    rnd: int,
+    fields: Tuple[str, ...],
+    drivers: Optional[List[str]],
+    response_format: str,
+) -> Dict[str, Any]:
+    """
+    Analytics response restricted to `fields`, cached per selection.
+
+    Selections are cached unfiltered, keyed on the fields and format only; a
+    driver filter is sliced from the race table (the cached full table, or
+    the per-section entries the fields need) after the cache read, so each
+    filter does not get an entry of its own.
+    """
+    cache_key = f"{fields_cache_key(analytics_cache_key(season, rnd), fields)}:{response_format}"
+    table_key = analytics_cache_key(season, rnd)
+    if drivers:
+        table = await get_cached_payload_async(table_key, async_redis_client)
+    else:
+        cached, table = await get_cached_payloads_async(
+            [cache_key, table_key], async_redis_client
+        )
+        if cached:
+            return cached
+
+    if not table or table.get("format") != ANALYTICS_TABLE_FORMAT:
+        table = await _load_table_sections(db, season, rnd, analytics_table_sections(fields))
+
+    payload = await run_in_threadpool(
+        slice_race_analytics, table, drivers, columnar=response_format == "columnar", fields=fields
+    )
+    if not drivers:
+        await set_cached_payloads_async({cache_key: payload}, CACHE_TTL_SECONDS, async_redis_client)
+    return payload
+
+
+def _slice_full_response(
+    request: Request,
+    season: int,
+    rnd: int,
+    table: Dict[str, Any],
+    etag: Optional[str],
+) -> Any:
+    """Slice the unfiltered row response and store its precompressed variants."""
+    payload = slice_race_analytics(table)
+    encoded = store_variants_and_respond(
+        request,
+        analytics_response_cache_key(season, rnd),
+        CACHE_TTL_SECONDS,
+        payload,
+        redis_binary_client,
+        etag,
+    )
+    return encoded if encoded is not None else payload
+
+
+def _slice_races(
+    tables: Dict[int, Dict[str, Any]],
+    round_list: List[int],
+    drivers: Optional[List[str]],
+    columnar: bool,
+) -> List[Dict[str, Any]]:
+    return [slice_race_analytics(tables[rnd], drivers, columnar=columnar) for rnd in round_list]
+
+
+def _check_batch_size(round_list: List[int]) -> None:
+    if len(round_list) > MAX_BATCH_ROUNDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_ROUNDS} rounds can be requested at once",
+        )
+
+
 @router.get("/{season}/{round}")
-def get_race_analytics(
+async def get_race_analytics(
     season: int,
     round: int,
+    request: Request,
+    response: Response,
     drivers: Optional[List[str]] = Query(
         default=None,
-        description="Optional list of driver codes (e.g. VER, HAM) to filter",
+        description="Optional list of driver codes or car numbers (e.g. VER, 44) to filter",
+    ),
+    response_format: str = Query(
+        default="rows",
+        alias="format",
+        pattern="^(rows|columnar)$",
+        description="'columnar' returns one array per column for each driver",
     ),
-    db: Session = Depends(get_db),
+    fields: Optional[List[str]] = Query(
+        default=None,
+        description="Sections to include: laps, stints, driver_pace_grades (default: all)",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    key = analytics_cache_key(season, round, drivers)
-    cached = redis_client.get(key)
-    if cached:
-        return json.loads(cached)
+    """
+    Analytics for one race.
 
-    payload = fetch_race_analytics(db, season, round, drivers)
-    redis_client.setex(key, CACHE_TTL_SECONDS, json.dumps(payload))
-    return payload
+    Redis is read on the async client; decoding, slicing and precompression
+    run in the threadpool. A cache miss builds the race table through
+    `run_sync_db`, which on the async session runs on the event-loop thread
+    (see its docstring); the table is cached, so that cost is paid once per
+    race and generation.
+    """
+    selected = parse_fields(fields, ANALYTICS_FIELDS)
+
+    # Keyed on the race generation, so the table's last_updated stamp never
+    # changes the validator.
+    etag = await race_etag_async(request, season, round, client=async_redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    response.headers["Vary"] = "Accept-Encoding"
+
+    if selected:
+        return await _get_analytics_fields_with_cache(
+            db, season, round, selected, drivers, response_format
+        )
+
+    columnar = response_format == "columnar"
+
+    # The unfiltered row response is also stored precompressed.
+    precompressed = not drivers and not columnar
+    if precompressed:
+        variant = await cached_variant_response_async(
+            request, analytics_response_cache_key(season, round), redis_binary_client, etag
+        )
+        if variant is not None:
+            return variant
+
+    # One cached table per race; driver filters are sliced from it in memory.
+    key = analytics_cache_key(season, round)
+    table = await get_cached_payload_async(key, async_redis_client)
+    if not table or table.get("format") != ANALYTICS_TABLE_FORMAT:
+        table = await run_sync_db(db, build_race_analytics_table, season, round)
+        await set_cached_payloads_async({key: table}, CACHE_TTL_SECONDS, async_redis_client)
+
+    if precompressed:
+        return await run_in_threadpool(_slice_full_response, request, season, round, table, etag)
+    return await run_in_threadpool(slice_race_analytics, table, drivers, columnar=columnar)
+
+
+@router.get("/{season}")
+async def get_season_analytics(
+    season: int,
+    request: Request,
+    response: Response,
+    rounds: Optional[List[int]] = Query(
+        default=None,
+        description="Rounds to include; every round with lap data if omitted",
+    ),
+    drivers: Optional[List[str]] = Query(
+        default=None,
+        description="Optional list of driver codes or car numbers (e.g. VER, 44) to filter",
+    ),
+    response_format: str = Query(
+        default="rows",
+        alias="format",
+        pattern="^(rows|columnar)$",
+        description="'columnar' returns one array per column for each driver",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Analytics for several rounds of a season in one response.
+
+    Cached race tables are fetched with a single MGET; the misses are built
+    together (one query per table over all missing races) and written back in
+    one pipeline. Without `rounds` the ETag follows the season generation, so
+    a 304 is answered before the round list is queried.
+    """
+    if rounds:
+        round_list = sorted(set(rounds))
+        _check_batch_size(round_list)
+        etag = await season_etag_async(request, season, round_list, client=async_redis_client)
+    else:
+        etag = await whole_season_etag_async(request, season, client=async_redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if not rounds:
+        round_list = await run_sync_db(db, season_analytics_rounds, season)
+        _check_batch_size(round_list)
+
+    keys = [analytics_cache_key(season, rnd) for rnd in round_list]
+    tables = {}
+    misses = []
+    for rnd, table in zip(round_list, await get_cached_payloads_async(keys, async_redis_client)):
+        if table and table.get("format") == ANALYTICS_TABLE_FORMAT:
+            tables[rnd] = table
+        else:
+            misses.append(rnd)
+    if misses:
+        built = await run_sync_db(db, build_race_analytics_tables, season, misses)
+        await set_cached_payloads_async(
+            {analytics_cache_key(season, rnd): table for rnd, table in built.items()},
+            CACHE_TTL_SECONDS,
+            async_redis_client,
+        )
+        tables.update(built)
+
+    races = await run_in_threadpool(
+        _slice_races, tables, round_list, drivers, response_format == "columnar"
+    )
+    return {
+        "season": season,
+        "rounds": round_list,
+        "races": races,
+    }
@@ -7,19 +7,27 @@ import logging
 import time
 from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from collections import defaultdict
 
-from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
 from pydantic import BaseModel, Field, validator
 from sqlalchemy.orm import Session
 from sqlalchemy import text, desc
 import httpx
 
-from theundercut.adapters.db import get_db
-from theundercut.adapters.redis_cache import redis_client
+from theundercut.adapters.db import get_db, get_read_db
+from theundercut.adapters.redis_cache import redis_binary_client, redis_client
+from theundercut.api.compression import cached_variant_response, store_variants_and_respond
+from theundercut.api.fields import parse_fields
 from theundercut.config import get_settings
 from theundercut.models import Circuit, CircuitCharacteristics
+from theundercut.services.cache import (
+    decode_cache_payload,
+    encode_cache_payload,
+    fields_cache_key,
+    load_cached_sections,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +174,7 @@ def _fetch_circuit_results(circuit_id: str, limit: int = 30) -> List[Dict[str, A
     try:
         cached = redis_client.get(cache_key)
         if cached:
-            return json.loads(cached)
+            return decode_cache_payload(cached)
     except Exception as e:
         logger.warning(f"Redis error for circuit results {circuit_id}: {e}")
         # Continue without cache
@@ -210,7 +218,7 @@ def _fetch_circuit_results(circuit_id: str, limit: int = 30) -> List[Dict[str, A
         # Only cache if we got data (avoid caching transient failures)
         if result:
             try:
-                redis_client.setex(cache_key, HISTORICAL_CACHE_TTL_SECONDS, json.dumps(result))
+                redis_client.setex(cache_key, HISTORICAL_CACHE_TTL_SECONDS, encode_cache_payload(result))
             except Exception as e:
                 logger.warning(f"Redis write error for circuit results {circuit_id}: {e}")
         return result
@@ -592,7 +600,7 @@ def _verify_admin_key(x_admin_key: Optional[str] = Header(None)) -> str:
 
 @router.get("/characteristics")
 def list_circuits_with_characteristics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Dict[str, Any]:
     """
     List all circuits with their characteristics.
@@ -635,7 +643,7 @@ def list_circuits_with_characteristics(
 @router.get("/characteristics/compare")
 def compare_circuits(
     ids: str = Query(..., description="Comma-separated circuit IDs (2-5)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Dict[str, Any]:
     """
     Compare characteristics of 2-5 circuits side-by-side.
@@ -732,7 +740,7 @@ def rank_circuits(
     by: str = Query(..., description="Field to rank by (e.g., full_throttle_score, downforce_score)"),
     order: str = Query("desc", description="Sort order: asc or desc"),
     limit: int = Query(24, ge=1, le=50, description="Number of results to return"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Dict[str, Any]:
     """
     Rank circuits by a specific characteristic.
@@ -810,7 +818,7 @@ def rank_circuits(
 def get_circuit_characteristics(
     circuit_id: int,
     year: Optional[int] = Query(None, description="Get characteristics for specific layout year"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Dict[str, Any]:
     """
     Get characteristics for a specific circuit.
@@ -1021,9 +1029,9 @@ def _get_strategy_patterns(db: Session, circuit_id: str, season: int) -> List[Di
             SELECT driver, COUNT(DISTINCT stint_no) as stops,
                    STRING_AGG(DISTINCT compound, ',' ORDER BY compound) as compounds
             FROM stints
-            WHERE race_id = :race_id
+            WHERE season = :season AND race_id = :race_id
             GROUP BY driver
-        """), {"race_id": race_id})
+        """), {"season": season, "race_id": race_id})
 
         rows = result.fetchall()
         if not rows:
@@ -1049,71 +1057,80 @@ def _get_strategy_patterns(db: Session, circuit_id: str, season: int) -> List[Di
         return []
 
 
-@router.get("/{season}/{circuit_id}")
-def get_circuit_detail(
-    season: int,
-    circuit_id: str,
-    db: Session = Depends(get_db),
-) -> Dict[str, Any]:
-    """
-    Get comprehensive analytics for a specific circuit.
+# Sections of the circuit detail payload selectable with `fields=`.
+CIRCUIT_DETAIL_FIELDS = (
+    "circuit",
+    "race_info",
+    "lap_records",
+    "historical_winners",
+    "driver_stats",
+    "team_stats",
+    "strategy_patterns",
+)
+# Sections derived from the circuit's historical race results.
+_HISTORY_SECTIONS = {"race_info", "lap_records", "historical_winners", "driver_stats", "team_stats"}
 
-    Returns circuit info, race results, lap records, driver/team stats.
-    """
-    cache_key = f"circuit_detail:v1:{season}:{circuit_id}"
-    cached = redis_client.get(cache_key)
-    if cached:
-        return json.loads(cached)
 
-    # Fetch circuit info
-    circuit_info = _fetch_circuit_info(circuit_id)
-    if not circuit_info:
-        return {"error": "Circuit not found"}
+def _circuit_section(circuit_id: str, circuit_info: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": circuit_id,
+        "name": circuit_info.get("circuitName", ""),
+        "shortname": get_circuit_shortname(circuit_id),
+        "country": circuit_info.get("Location", {}).get("country", ""),
+        "city": circuit_info.get("Location", {}).get("locality", ""),
+        "lat": circuit_info.get("Location", {}).get("lat"),
+        "lng": circuit_info.get("Location", {}).get("long"),
+        "url": circuit_info.get("url", ""),
+    }
 
-    # Fetch historical results for this circuit
-    historical_races = _fetch_circuit_results(circuit_id, limit=30)
 
+def _race_info_section(
+    historical_races: List[Dict[str, Any]],
+    circuit_id: str,
+    season: int,
+) -> Optional[Dict[str, Any]]:
     # Get current season race info
     current_race = None
     for race in historical_races:
         if race.get("season") == str(season):
             current_race = race
             break
+    if not current_race:
+        return None
 
-    # Build race info
-    race_info = None
-    if current_race:
-        results = current_race.get("Results", [])
-        winner = results[0] if results else {}
-        fastest_lap_holder = None
-        fastest_lap_time = None
+    results = current_race.get("Results", [])
+    winner = results[0] if results else {}
+    fastest_lap_holder = None
+    fastest_lap_time = None
 
-        for r in results:
-            fl = r.get("FastestLap", {})
-            if fl.get("rank") == "1":
-                fastest_lap_holder = r.get("Driver", {}).get("code")
-                fastest_lap_time = fl.get("Time", {}).get("time")
-                break
+    for r in results:
+        fl = r.get("FastestLap", {})
+        if fl.get("rank") == "1":
+            fastest_lap_holder = r.get("Driver", {}).get("code")
+            fastest_lap_time = fl.get("Time", {}).get("time")
+            break
 
-        # Get pole position from qualifying
-        qual = _fetch_circuit_qualifying(circuit_id, season)
-        pole_sitter = None
-        if qual:
-            qual_results = qual.get("QualifyingResults", [])
-            if qual_results:
-                pole_sitter = qual_results[0].get("Driver", {}).get("code")
-
-        race_info = {
-            "round": _safe_int(current_race.get("round", 0)),
-            "date": current_race.get("date", ""),
-            "race_name": current_race.get("raceName", ""),
-            "winner": winner.get("Driver", {}).get("code"),
-            "winner_team": winner.get("Constructor", {}).get("name"),
-            "pole": pole_sitter,
-            "fastest_lap": fastest_lap_holder,
-            "fastest_lap_time": fastest_lap_time,
-        }
+    # Get pole position from qualifying
+    qual = _fetch_circuit_qualifying(circuit_id, season)
+    pole_sitter = None
+    if qual:
+        qual_results = qual.get("QualifyingResults", [])
+        if qual_results:
+            pole_sitter = qual_results[0].get("Driver", {}).get("code")
+
+    return {
+        "round": _safe_int(current_race.get("round", 0)),
+        "date": current_race.get("date", ""),
+        "race_name": current_race.get("raceName", ""),
+        "winner": winner.get("Driver", {}).get("code"),
+        "winner_team": winner.get("Constructor", {}).get("name"),
+        "pole": pole_sitter,
+        "fastest_lap": fastest_lap_holder,
+        "fastest_lap_time": fastest_lap_time,
+    }
 
+
+def _lap_records_section(historical_races: List[Dict[str, Any]], season: int) -> Dict[str, Any]:
     # Build lap records (all-time fastest from historical data)
     all_time_fastest = None
     season_fastest = None
@@ -1133,8 +1150,13 @@ def get_circuit_detail(
                     # Track all-time (simplified - just use most recent for now)
                     if not all_time_fastest:
                         all_time_fastest = record
+    return {
+        "all_time_fastest": all_time_fastest,
+        "season_fastest": season_fastest,
+    }
+
 
-    # Build historical winners
+def _historical_winners_section(historical_races: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     historical_winners = []
     for race in sorted(historical_races, key=lambda r: r.get("season", ""), reverse=True):
         results = race.get("Results", [])
@@ -1146,8 +1168,10 @@ def get_circuit_detail(
                 "driver_name": f"{winner.get('Driver', {}).get('givenName', '')} {winner.get('Driver', {}).get('familyName', '')}".strip(),
                 "team": winner.get("Constructor", {}).get("name"),
             })
+    return historical_winners[:15]  # Last 15 years
 
-    # Build driver stats at this circuit
+
+def _driver_stats_section(historical_races: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     driver_stats: Dict[str, Dict] = defaultdict(lambda: {
         "races": 0, "wins": 0, "podiums": 0, "points": 0, "finishes": []
     })
@@ -1179,8 +1203,10 @@ def get_circuit_detail(
                 "avg_finish": round(sum(stats["finishes"]) / len(stats["finishes"]), 1) if stats["finishes"] else 0,
             })
     driver_stats_list.sort(key=lambda d: (-d["wins"], -d["podiums"], d["avg_finish"]))
+    return driver_stats_list[:20]  # Top 20 drivers
+
 
-    # Build team stats
+def _team_stats_section(historical_races: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     team_stats: Dict[str, Dict] = defaultdict(lambda: {"races": 0, "wins": 0, "podiums": 0, "points": 0})
     for race in historical_races:
         teams_in_race = set()
@@ -1210,34 +1236,132 @@ def get_circuit_detail(
             "points": int(stats["points"]),
         })
     team_stats_list.sort(key=lambda t: (-t["wins"], -t["podiums"]))
+    return team_stats_list[:15]  # Top 15 teams
+
+
+def build_circuit_detail_sections(
+    db: Session,
+    season: int,
+    circuit_id: str,
+    sections: Sequence[str],
+    circuit_info: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the requested circuit detail sections (see CIRCUIT_DETAIL_FIELDS).
+
+    Remote lookups only happen for sections that need them: circuit info for
+    `circuit`, the historical results for the stats sections and qualifying
+    for `race_info`. A `circuit` section whose lookup failed is left out.
+    """
+    wanted = set(sections)
+    built: Dict[str, Any] = {}
+    if "circuit" in wanted:
+        if circuit_info is None:
+            circuit_info = _fetch_circuit_info(circuit_id)
+        if circuit_info:
+            built["circuit"] = _circuit_section(circuit_id, circuit_info)
+
+    if wanted & _HISTORY_SECTIONS:
+        # Fetch historical results for this circuit
+        historical_races = _fetch_circuit_results(circuit_id, limit=30)
+        if "race_info" in wanted:
+            built["race_info"] = _race_info_section(historical_races, circuit_id, season)
+        if "lap_records" in wanted:
+            built["lap_records"] = _lap_records_section(historical_races, season)
+        if "historical_winners" in wanted:
+            built["historical_winners"] = _historical_winners_section(historical_races)
+        if "driver_stats" in wanted:
+            built["driver_stats"] = _driver_stats_section(historical_races)
+        if "team_stats" in wanted:
+            built["team_stats"] = _team_stats_section(historical_races)
+
+    if "strategy_patterns" in wanted:
+        # Get strategy patterns from local data
+        built["strategy_patterns"] = _get_strategy_patterns(db, circuit_id, season)
+    return built
+
+
+@router.get("/{season}/{circuit_id}")
+def get_circuit_detail(
+    season: int,
+    circuit_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Query(
+        default=None,
+        description=f"Sections to include: {', '.join(CIRCUIT_DETAIL_FIELDS)} (default: all)",
+    ),
+    db: Session = Depends(get_read_db),
+) -> Dict[str, Any]:
+    """
+    Get comprehensive analytics for a specific circuit.
+
+    Returns circuit info, race results, lap records, driver/team stats.
+    `fields` limits the response to some sections and skips the lookups the
+    other sections would need.
+    """
+    selected = parse_fields(fields, CIRCUIT_DETAIL_FIELDS)
+    cache_key = f"circuit_detail:v1:{season}:{circuit_id}"
+    if selected:
+        return _get_circuit_detail_fields_with_cache(db, season, circuit_id, cache_key, selected)
 
-    # Get strategy patterns from local data
-    strategy_patterns = _get_strategy_patterns(db, circuit_id, season)
+    response.headers["Vary"] = "Accept-Encoding"
+    variant = cached_variant_response(request, cache_key, redis_binary_client)
+    if variant is not None:
+        return variant
+    cached = redis_client.get(cache_key)
+    if cached:
+        return decode_cache_payload(cached)
 
+    # Fetch circuit info
+    circuit_info = _fetch_circuit_info(circuit_id)
+    if not circuit_info:
+        return {"error": "Circuit not found"}
+
+    sections = build_circuit_detail_sections(
+        db, season, circuit_id, CIRCUIT_DETAIL_FIELDS, circuit_info=circuit_info
+    )
     payload = {
-        "circuit": {
-            "id": circuit_id,
-            "name": circuit_info.get("circuitName", ""),
-            "shortname": get_circuit_shortname(circuit_id),
-            "country": circuit_info.get("Location", {}).get("country", ""),
-            "city": circuit_info.get("Location", {}).get("locality", ""),
-            "lat": circuit_info.get("Location", {}).get("lat"),
-            "lng": circuit_info.get("Location", {}).get("long"),
-            "url": circuit_info.get("url", ""),
-        },
+        "circuit": sections["circuit"],
         "season": season,
-        "race_info": race_info,
-        "lap_records": {
-            "all_time_fastest": all_time_fastest,
-            "season_fastest": season_fastest,
-        },
-        "historical_winners": historical_winners[:15],  # Last 15 years
-        "driver_stats": driver_stats_list[:20],  # Top 20 drivers
-        "team_stats": team_stats_list[:15],  # Top 15 teams
-        "strategy_patterns": strategy_patterns,
+        **{field: sections[field] for field in CIRCUIT_DETAIL_FIELDS[1:]},
     }
 
-    redis_client.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(payload))
+    redis_client.setex(cache_key, CACHE_TTL_SECONDS, encode_cache_payload(payload))
+    variant = store_variants_and_respond(
+        request, cache_key, CACHE_TTL_SECONDS, payload, redis_binary_client
+    )
+    if variant is not None:
+        return variant
+    return payload
+
+
+def _get_circuit_detail_fields_with_cache(
+    db: Session,
+    season: int,
+    circuit_id: str,
+    base_key: str,
+    fields: Tuple[str, ...],
+) -> Dict[str, Any]:
+    """Circuit detail restricted to `fields`, built from per-section cache entries."""
+    cache_key = fields_cache_key(base_key, fields)
+    cached = redis_client.get(cache_key) or redis_client.get(base_key)
+    if cached:
+        payload = decode_cache_payload(cached)
+        return {"season": season, **{field: payload.get(field) for field in fields}}
+
+    sections = load_cached_sections(
+        base_key,
+        fields,
+        CACHE_TTL_SECONDS,
+        lambda missing: build_circuit_detail_sections(db, season, circuit_id, missing),
+        redis_client,
+    )
+    if "circuit" in fields and sections["circuit"] is None:
+        return {"error": "Circuit not found"}
+
+    payload = {"season": season, **sections}
+    redis_client.setex(cache_key, CACHE_TTL_SECONDS, encode_cache_payload(payload))
     return payload
 
 
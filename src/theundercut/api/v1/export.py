@@ -0,0 +1,314 @@
+"""
+Bulk lap-data export endpoints (Arrow IPC, Parquet, NDJSON, CSV).
+
+Exports stream straight from a server-side cursor. Every format serializes the
+same rows to the same bytes, so `Range: bytes=N-` requests resume a download
+by regenerating the export and skipping what the client already has; the ETag
+(row count + highest row id) lets clients guard the resume with If-Range. The
+export's byte length is cached per ETag, so a resume serializes it only once.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from theundercut.adapters.db import get_db
+from theundercut.adapters.redis_cache import redis_client
+from theundercut.api.etag import compute_etag
+from theundercut.services.cache import export_length_cache_key
+from theundercut.services.lap_export import (
+    ExportColumn,
+    POSITION_COLUMNS,
+    RACE_LAP_COLUMNS,
+    TESTING_LAP_COLUMNS,
+    arrow_stream,
+    csv_stream,
+    export_fingerprint,
+    iter_row_batches,
+    lap_positions_statement,
+    ndjson_stream,
+    project_columns,
+    race_laps_statement,
+    require_pyarrow,
+    testing_laps_statement,
+)
+from theundercut.services.race_keys import lookup_race_key
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+FILE_EXTENSIONS = {
+    "arrow": "arrows",
+    "parquet": "parquet",
+    "ndjson": "ndjson",
+    "csv": "csv",
+}
+EXPORT_FORMAT_PATTERN = "^(arrow|parquet|ndjson|csv)$"
+ARROW_FORMATS = {"arrow", "parquet"}
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Byte lengths outlive a typical interrupted download and its retries
+EXPORT_LENGTH_TTL_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/export",
+    tags=["export"],
+)
+
+
+def _projection(available, requested: Optional[List[str]]) -> List[ExportColumn]:
+    try:
+        return project_columns(available, requested)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _serialize(
+    columns: Sequence[ExportColumn],
+    batches: Iterator[list],
+    fmt: str,
+) -> Iterator[bytes]:
+    if fmt == "ndjson":
+        return ndjson_stream(columns, batches)
+    if fmt == "csv":
+        return csv_stream(columns, batches)
+    return arrow_stream(columns, batches, fmt)
+
+
+def _parse_range(header: Optional[str]) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """Parse a single `bytes=` range; multi-range or malformed headers are ignored."""
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip().replace(" ", ""))
+    if not match or match.group(0) == "bytes=-":
+        return None
+    start, end = match.groups()
+    return (int(start) if start else None, int(end) if end else None)
+
+
+def _resolve_range(
+    requested: Tuple[Optional[int], Optional[int]],
+    total: int,
+) -> Optional[Tuple[int, int]]:
+    """Turn a parsed range into inclusive byte offsets, or None if unsatisfiable."""
+    start, end = requested
+    if start is None:
+        # Suffix range: the last `end` bytes.
+        if not end:
+            return None
+        return max(total - end, 0), total - 1
+    if start >= total:
+        return None
+    if end is None or end >= total:
+        end = total - 1
+    if end < start:
+        return None
+    return start, end
+
+
+def _slice_stream(chunks: Iterator[bytes], start: int, end: int) -> Iterator[bytes]:
+    """Yield bytes `start..end` (inclusive) of a chunk stream."""
+    position = 0
+    for chunk in chunks:
+        chunk_end = position + len(chunk)
+        if chunk_end > start:
+            yield chunk[max(start - position, 0) : min(end - position + 1, len(chunk))]
+        position = chunk_end
+        if position > end:
+            break
+
+
+def _cached_length(etag: str) -> Optional[int]:
+    try:
+        value = redis_client.get(export_length_cache_key(etag))
+    except Exception as exc:  # pragma: no cover - cache should not block exports
+        logger.warning("Failed to read export length for %s: %s", etag, exc)
+        return None
+    return int(value) if value else None
+
+
+def _store_length(etag: str, total: int) -> None:
+    try:
+        redis_client.setex(export_length_cache_key(etag), EXPORT_LENGTH_TTL_SECONDS, total)
+    except Exception as exc:  # pragma: no cover - cache should not block exports
+        logger.warning("Failed to store export length for %s: %s", etag, exc)
+
+
+def _recording_length(chunks: Iterator[bytes], etag: str) -> Iterator[bytes]:
+    """Pass a full export through and cache its length once it completes."""
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        yield chunk
+    _store_length(etag, total)
+
+
+def _stream_export(
+    request: Request,
+    db: Session,
+    dataset: str,
+    stmt: Select,
+    columns: Sequence[ExportColumn],
+    fmt: str,
+    filename: str,
+) -> Response:
+    if fmt in ARROW_FORMATS:
+        try:
+            require_pyarrow()
+        except RuntimeError as exc:
+            raise HTTPException(status_code=501, detail=str(exc))
+
+    bind = db.get_bind()
+
+    def _body() -> Iterator[bytes]:
+        # The request session is closed once the endpoint returns, so the
+        # stream reads through its own session on the same engine.
+        with Session(bind=bind, future=True) as stream_db:
+            yield from _serialize(columns, iter_row_batches(stream_db, stmt), fmt)
+
+    etag = compute_etag(
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        *export_fingerprint(db, dataset, stmt),
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{FILE_EXTENSIONS[fmt]}"',
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+    }
+
+    requested = _parse_range(request.headers.get("range"))
+    if_range = request.headers.get("if-range")
+    if requested is not None and (if_range is None or if_range.strip() == etag):
+        total = _cached_length(etag)
+        if total is None:
+            total = sum(len(chunk) for chunk in _body())
+            _store_length(etag, total)
+        byte_range = _resolve_range(requested, total)
+        if byte_range is None:
+            return Response(
+                status_code=416,
+                headers={"Content-Range": f"bytes */{total}", "ETag": etag},
+            )
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            _slice_stream(_body(), start, end),
+            status_code=206,
+            media_type=MEDIA_TYPES[fmt],
+            headers=headers,
+        )
+
+    return StreamingResponse(
+        _recording_length(_body(), etag), media_type=MEDIA_TYPES[fmt], headers=headers
+    )
+
+
+def _range_filename(prefix: str, season: int, season_to: Optional[int], *parts) -> str:
+    seasons = f"{season}_{season_to}" if season_to and season_to != season else str(season)
+    return "-".join(str(part) for part in (prefix, seasons, *parts) if part is not None)
+
+
+def _round_suffix(round_from: Optional[int], round_to: Optional[int]) -> Optional[str]:
+    if round_from is None and round_to is None:
+        return None
+    if round_from == round_to:
+        return str(round_from)
+    return f"r{round_from or 1}_{round_to or 'end'}"
+
+
+@router.get("/laps")
+def export_race_laps(
+    request: Request,
+    season: int,
+    round: Optional[int] = Query(default=None, description="Round to export; whole season if omitted"),
+    season_to: Optional[int] = Query(default=None, description="Last season of a range (inclusive)"),
+    round_from: Optional[int] = Query(default=None, ge=1, description="First round of a range"),
+    round_to: Optional[int] = Query(default=None, ge=1, description="Last round of a range"),
+    drivers: Optional[List[str]] = Query(default=None, description="Driver values to include"),
+    columns: Optional[List[str]] = Query(default=None, description="Columns to include (default: all)"),
+    export_format: str = Query(default="arrow", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """
+    Export race lap times for a round, a season or season/round ranges.
+
+    Rows are read through a server-side cursor and streamed batch by batch as
+    Arrow IPC, Parquet, NDJSON or CSV. Round ranges apply to every season in
+    the season range.
+    """
+    projection = _projection(RACE_LAP_COLUMNS, columns)
+    stmt = race_laps_statement(
+        projection,
+        season,
+        round,
+        drivers,
+        season_to=season_to,
+        round_from=round_from,
+        round_to=round_to,
+        race_key=lookup_race_key(db, season, round) if round is not None else None,
+    )
+    if round is not None:
+        round_from = round_to = round
+    filename = _range_filename("laps", season, season_to, _round_suffix(round_from, round_to))
+    return _stream_export(request, db, "laps", stmt, projection, export_format, filename)
+
+
+@router.get("/positions")
+def export_lap_positions(
+    request: Request,
+    season: int,
+    season_to: Optional[int] = Query(default=None, description="Last season of a range (inclusive)"),
+    round_from: Optional[int] = Query(default=None, ge=1, description="First round of a range"),
+    round_to: Optional[int] = Query(default=None, ge=1, description="Last round of a range"),
+    drivers: Optional[List[str]] = Query(default=None, description="Driver codes to include"),
+    columns: Optional[List[str]] = Query(default=None, description="Columns to include (default: all)"),
+    export_format: str = Query(default="ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """Export per-lap race positions and gaps for season/round ranges."""
+    projection = _projection(POSITION_COLUMNS, columns)
+    stmt = lap_positions_statement(
+        projection,
+        season,
+        drivers,
+        season_to=season_to,
+        round_from=round_from,
+        round_to=round_to,
+    )
+    filename = _range_filename("positions", season, season_to, _round_suffix(round_from, round_to))
+    return _stream_export(request, db, "positions", stmt, projection, export_format, filename)
+
+
+@router.get("/testing-laps")
+def export_testing_laps(
+    request: Request,
+    season: int,
+    season_to: Optional[int] = Query(default=None, description="Last season of a range (inclusive)"),
+    event_id: Optional[str] = Query(default=None, description="Testing event id; all events if omitted"),
+    day: Optional[int] = Query(default=None, description="Testing day; all days if omitted"),
+    drivers: Optional[List[str]] = Query(default=None, description="Driver codes to include"),
+    columns: Optional[List[str]] = Query(default=None, description="Columns to include (default: all)"),
+    export_format: str = Query(default="arrow", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_db),
+):
+    """Export pre-season testing laps as Arrow IPC, Parquet, NDJSON or CSV."""
+    projection = _projection(TESTING_LAP_COLUMNS, columns)
+    stmt = testing_laps_statement(
+        projection, season, event_id, day, drivers, season_to=season_to
+    )
+    filename = _range_filename("testing-laps", season, season_to, event_id, day)
+    return _stream_export(request, db, "testing_laps", stmt, projection, export_format, filename)
@@ -1,25 +1,60 @@
 # src/theundercut/api/v1/race.py
+import asyncio
 import json
 import logging
 import datetime as dt
-from typing import Optional, Tuple, List
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, Sequence, Set, Tuple, List, Union
 
 import httpx
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-
-from theundercut.adapters.db import get_db
-from theundercut.adapters.redis_cache import redis_client
-from theundercut.models import LapTime, CalendarEvent, SessionClassification, Race, Circuit, Season
+from starlette.concurrency import run_in_threadpool
+
+from theundercut.adapters.db import (
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    pin_reads_to_primary,
+    run_sync_db,
+)
+from theundercut.adapters.redis_cache import async_redis_client, redis_client
+from theundercut.api.events import format_sse, race_event_broker
+from theundercut.api.etag import etag_matches, not_modified, race_etag, race_etag_async, set_etag
+from theundercut.api.fields import parse_fields
+from theundercut.models import (
+    LapTime,
+    LapPosition,
+    CalendarEvent,
+    SessionClassification,
+    Race,
+    Circuit,
+    Season,
+    Entry,
+    Driver,
+)
 from theundercut.services.cache import (
     session_cache_key,
     schedule_cache_key,
-    weekend_cache_key,
     history_cache_key,
+    live_cache_key,
+    fields_cache_key,
+    normalize_session_type,
+    decode_cache_payload,
+    encode_cache_payload,
+    read_cache_keys,
+    set_cached_payloads_async,
+    weekend_composite_keys,
     SESSION_CACHE_PREFIX,
 )
+from theundercut.services.ingest_queue import enqueue_session_ingest, ingest_job_id
+from theundercut.services.race_events import publish_session_status
+from theundercut.services.race_keys import lookup_race_key, race_rows_clause
 from theundercut.services.standings import fetch_season_standings
 
 logger = logging.getLogger(__name__)
@@ -91,9 +126,16 @@ SESSION_ALIAS_MAP = {
 }
 
 SESSION_BACKFILL_GRACE_MINUTES = 2
-SESSION_BACKFILL_LOCK_TTL_SECONDS = 300
 WEEKEND_CACHE_TTL_SECONDS = 300
+SESSION_RESULTS_CACHE_TTL_SECONDS = 7200
 HISTORY_CACHE_TTL_SECONDS = 3600
+# Wall-clock budget for the weekend's remote lookups (OpenF1 meeting, Jolpica
+# history). Lookups still running when it is spent are reported in meta.errors
+# and left out of the cache so a later request retries them.
+WEEKEND_REMOTE_BUDGET_SECONDS = 4.0
+
+# Sections of the weekend payload selectable with `fields=`.
+WEEKEND_FIELDS: Tuple[str, ...] = ("schedule", "timeline", "history", "sessions")
 
 
 # --- Pydantic models for responses ---
@@ -124,7 +166,7 @@ class SessionResult(BaseModel):
     time: Optional[str] = None
     gap: Optional[str] = None
     laps: Optional[int] = None
-    points: Optional[int] = None
+    points: Optional[float] = None
     q1_time: Optional[str] = None
     q2_time: Optional[str] = None
     q3_time: Optional[str] = None
@@ -154,6 +196,8 @@ class WeekendMeta(BaseModel):
     last_updated: str
     stale: bool
     errors: list[str]
+    # Session types whose ingestion was queued by this request (results follow).
+    pending: list[str] = []
 
 
 class WeekendTimeline(BaseModel):
@@ -402,20 +446,27 @@ def _build_timeline(events: List[CalendarEvent]) -> Optional[WeekendTimeline]:
     )
 
 
-def _load_schedule(db: Session, season: int, round_num: int) -> Tuple[List[CalendarEvent], Optional[RaceWeekendSchedule], Optional[WeekendTimeline]]:
-    events = (
+def _load_events(db: Session, season: int, round_num: int) -> List[CalendarEvent]:
+    return (
         db.query(CalendarEvent)
         .filter_by(season=season, round=round_num)
         .order_by(CalendarEvent.start_ts)
         .all()
     )
-    if not events:
-        return [], None, None
 
+
+def _build_schedule(
+    db: Session,
+    season: int,
+    round_num: int,
+    events: List[CalendarEvent],
+    circuit_info: Optional[dict] = None,
+) -> RaceWeekendSchedule:
     session_types = {event.session_type.lower() for event in events}
     is_sprint = "sprint" in session_types or "sprint qualifying" in session_types or "ss" in session_types
     sessions = [_event_to_session(event) for event in events]
-    circuit_info = _get_circuit_info(season, round_num, db)
+    if circuit_info is None:
+        circuit_info = _get_circuit_info(season, round_num, db)
     schedule = RaceWeekendSchedule(
         season=season,
         round=round_num,
@@ -426,19 +477,35 @@ def _load_schedule(db: Session, season: int, round_num: int) -> Tuple[List[Calen
         is_sprint_weekend=is_sprint,
         sessions=sessions,
     )
+    return schedule
+
+
+def _load_schedule(db: Session, season: int, round_num: int) -> Tuple[List[CalendarEvent], Optional[RaceWeekendSchedule], Optional[WeekendTimeline]]:
+    events = _load_events(db, season, round_num)
+    if not events:
+        return [], None, None
+    schedule = _build_schedule(db, season, round_num, events)
     timeline = _build_timeline(events)
     return events, schedule, timeline
 
 
-def _maybe_backfill_session_results(
+def _sessions_to_backfill(
     db: Session,
     season: int,
     round_num: int,
     events: List[CalendarEvent],
-) -> List[str]:
-    errors: List[str] = []
+    existing_types: Optional[Set[str]] = None,
+) -> List[Tuple[str, int, int, str]]:
+    """
+    Finished sessions that have no stored results yet, to queue for ingestion.
+
+    Returns (normalized type, season, round, session_type) tuples for
+    `_queue_session_backfills`. `existing_types` (session types known to have
+    results) saves the lookup query when the caller already has them.
+    """
+    due: List[Tuple[str, int, int, str]] = []
     if not events:
-        return errors
+        return due
 
     now = dt.datetime.now(dt.timezone.utc)
     event_lookup = {}
@@ -448,17 +515,18 @@ def _maybe_backfill_session_results(
             event_lookup[normalized] = event
 
     if not event_lookup:
-        return errors
-
-    existing_types = {
-        row[0]
-        for row in (
-            db.query(SessionClassification.session_type)
-            .filter_by(season=season, round=round_num)
-            .distinct()
-            .all()
-        )
-    }
+        return due
+
+    if existing_types is None:
+        existing_types = {
+            row[0]
+            for row in (
+                db.query(SessionClassification.session_type)
+                .filter_by(season=season, round=round_num)
+                .distinct()
+                .all()
+            )
+        }
 
     for normalized, event in event_lookup.items():
         if normalized in existing_types:
@@ -468,108 +536,496 @@ def _maybe_backfill_session_results(
             continue
         if end_time + dt.timedelta(minutes=SESSION_BACKFILL_GRACE_MINUTES) > now:
             continue
-        lock_key = f"weekend:auto_ingest:{season}:{round_num}:{normalized}"
-        if redis_client.get(lock_key):
-            continue
-        redis_client.setex(lock_key, SESSION_BACKFILL_LOCK_TTL_SECONDS, "1")
+        due.append((normalized, event.season, event.round, event.session_type))
+    return due
+
+
+def _queue_session_backfills(
+    due: Sequence[Tuple[str, int, int, str]],
+    pending: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Queue ingestion of the sessions `_sessions_to_backfill` found.
+
+    Jobs run on the RQ worker; the queued session types are appended to
+    `pending` and the request does not wait for them. Returns errors.
+    """
+    errors: List[str] = []
+    for normalized, season, round_num, session_type in due:
         try:
-            _trigger_session_ingest(event.season, event.round, event.session_type)
-            existing_types.add(normalized)
+            # Already-pending sessions are reported as pending too.
+            _trigger_session_ingest(season, round_num, session_type)
         except Exception as exc:  # pragma: no cover - defensive logging
             errors.append(f"ingest_failed:{normalized}:{exc}")
-            redis_client.delete(lock_key)
-        else:
-            redis_client.delete(lock_key)
-
+            continue
+        if pending is not None:
+            pending.append(normalized)
     return errors
 
 
-def _build_weekend_response(
+def _session_results_response(
+    season: int,
+    round_num: int,
+    normalized_type: str,
+    classifications: Sequence[SessionClassification],
+) -> Optional[SessionResultsResponse]:
+    if not classifications:
+        return None
+
+    is_qualifying = normalized_type == "qualifying"
+    results = [
+        SessionResult(
+            position=c.position,
+            driver_code=c.driver_code,
+            driver_name=c.driver_name,
+            team=c.team,
+            time=_format_lap_time(c.time_ms),
+            gap=_format_gap(c.gap_ms),
+            laps=c.laps,
+            points=c.points,
+            q1_time=_format_lap_time(c.q1_time_ms) if is_qualifying else None,
+            q2_time=_format_lap_time(c.q2_time_ms) if is_qualifying else None,
+            q3_time=_format_lap_time(c.q3_time_ms) if is_qualifying else None,
+            eliminated_in=c.eliminated_in if is_qualifying else None,
+        )
+        for c in classifications
+    ]
+    return SessionResultsResponse(
+        season=season,
+        round=round_num,
+        session_type=normalized_type,
+        results=results,
+    )
+
+
+def build_session_results(
     db: Session,
     season: int,
     round_num: int,
-) -> WeekendResponse:
-    last_updated = dt.datetime.utcnow().isoformat()
-    errors: List[str] = []
+    session_type: str,
+) -> Optional[SessionResultsResponse]:
+    """Build results for one session from stored classifications (None if absent)."""
+    normalized_type = normalize_session_type(session_type)
+    classifications = (
+        db.query(SessionClassification)
+        .filter_by(season=season, round=round_num, session_type=normalized_type)
+        .order_by(SessionClassification.position)
+        .all()
+    )
+    return _session_results_response(season, round_num, normalized_type, classifications)
+
+
+def build_session_results_by_type(
+    db: Session,
+    season: int,
+    round_num: int,
+    session_types: Sequence[str],
+) -> Dict[str, Optional[SessionResultsResponse]]:
+    """Build results for several sessions from one classification query."""
+    normalized = {stype: normalize_session_type(stype) for stype in session_types}
+    if not normalized:
+        return {}
+    by_type: Dict[str, List[SessionClassification]] = defaultdict(list)
+    rows = (
+        db.query(SessionClassification)
+        .filter(
+            SessionClassification.season == season,
+            SessionClassification.round == round_num,
+            SessionClassification.session_type.in_(set(normalized.values())),
+        )
+        .order_by(SessionClassification.session_type, SessionClassification.position)
+        .all()
+    )
+    for row in rows:
+        by_type[row.session_type].append(row)
+    return {
+        stype: _session_results_response(season, round_num, normalized_type, by_type.get(normalized_type, []))
+        for stype, normalized_type in normalized.items()
+    }
+
+
+def build_weekend_sections(
+    db: Session,
+    season: int,
+    round_num: int,
+    sections: Sequence[str],
+    errors: List[str],
+    backfill: bool = True,
+    session_types: Sequence[str] = SESSION_RESULTS_TO_FETCH,
+    circuit_info: Optional[dict] = None,
+    pending: Optional[List[str]] = None,
+    backfill_due: Optional[List[Tuple[str, int, int, str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the requested weekend sections (see WEEKEND_FIELDS).
+
+    Only the work the sections need is done: the timeline reads the calendar
+    events, the schedule adds circuit info (which may call OpenF1 unless
+    `circuit_info` is given), history adds the circuit history lookup
+    (Jolpica) and sessions read the classifications of every type in
+    `session_types` with one query and, with backfill, queue ingestion of
+    finished sessions without results (listed in `pending`). Failures are
+    appended to `errors`. With `backfill_due`, the sessions to queue are
+    appended there instead, for a caller that enqueues them off this thread.
+    """
+    wanted = set(sections)
+    built: Dict[str, Any] = {}
+    events: List[CalendarEvent] = []
     schedule = None
     timeline = None
+    needs_events = wanted & {"schedule", "timeline", "history"} or (
+        backfill and "sessions" in wanted
+    )
+    if needs_events:
+        try:
+            events = _load_events(db, season, round_num)
+            if events and wanted & {"schedule", "history"}:
+                schedule = _build_schedule(db, season, round_num, events, circuit_info)
+            if events and "timeline" in wanted:
+                timeline = _build_timeline(events)
+        except Exception as exc:
+            errors.append(f"schedule: {str(exc)}")
+
+    if "schedule" in wanted:
+        built["schedule"] = schedule
+    if "timeline" in wanted:
+        built["timeline"] = timeline
+    if "history" in wanted:
+        built["history"] = _load_circuit_history(
+            season,
+            round_num,
+            schedule.circuit_id if schedule else None,
+            schedule.circuit_name if schedule else None,
+            errors,
+        )
+    if "sessions" in wanted:
+        built["sessions"] = _load_weekend_sessions(
+            db, season, round_num, events, session_types, errors, backfill, pending, backfill_due
+        )
+    return built
+
+
+def _load_weekend_sessions(
+    db: Session,
+    season: int,
+    round_num: int,
+    events: List[CalendarEvent],
+    session_types: Sequence[str],
+    errors: List[str],
+    backfill: bool,
+    pending: Optional[List[str]] = None,
+    backfill_due: Optional[List[Tuple[str, int, int, str]]] = None,
+) -> Dict[str, Optional[SessionResultsResponse]]:
+    try:
+        results = build_session_results_by_type(db, season, round_num, session_types)
+    except Exception as exc:
+        errors.append(f"sessions: {str(exc)}")
+        return {stype: None for stype in session_types}
+    if not (backfill and events):
+        return results
+
+    # Types that were not queried are served from cache, so they have results.
+    known = {stype for stype, result in results.items() if result is not None}
+    known |= set(SESSION_RESULTS_TO_FETCH) - set(session_types)
     try:
-        events, schedule, timeline = _load_schedule(db, season, round_num)
-        if not events:
-            schedule = None
+        due = _sessions_to_backfill(db, season, round_num, events, known)
+        if backfill_due is not None:
+            backfill_due.extend(due)
         else:
-            errors.extend(_maybe_backfill_session_results(db, season, round_num, events))
+            errors.extend(_queue_session_backfills(due, pending))
     except Exception as exc:
         errors.append(f"schedule: {str(exc)}")
-    history = _load_circuit_history(db, season, round_num, schedule, errors)
+    return results
 
-    session_results: dict[str, Optional[SessionResultsResponse]] = {}
-    for stype in SESSION_RESULTS_TO_FETCH:
-        try:
-            classifications = (
-                db.query(SessionClassification)
-                .filter_by(season=season, round=round_num, session_type=stype)
-                .order_by(SessionClassification.position)
-                .all()
-            )
-            if classifications:
-                results = [
-                    SessionResult(
-                        position=c.position,
-                        driver_code=c.driver_code,
-                        driver_name=c.driver_name,
-                        team=c.team,
-                        time=_format_lap_time(c.time_ms),
-                        gap=_format_gap(c.gap_ms),
-                        laps=c.laps,
-                        points=c.points,
-                        q1_time=_format_lap_time(c.q1_time_ms) if stype == "qualifying" else None,
-                        q2_time=_format_lap_time(c.q2_time_ms) if stype == "qualifying" else None,
-                        q3_time=_format_lap_time(c.q3_time_ms) if stype == "qualifying" else None,
-                        eliminated_in=c.eliminated_in if stype == "qualifying" else None,
-                    )
-                    for c in classifications
-                ]
-                session_results[stype] = SessionResultsResponse(
-                    season=season,
-                    round=round_num,
-                    session_type=stype,
-                    results=results,
-                )
-            else:
-                session_results[stype] = None
-        except Exception as exc:
-            errors.append(f"{stype}: {str(exc)}")
-            session_results[stype] = None
 
+def build_weekend_response(
+    db: Session,
+    season: int,
+    round_num: int,
+    backfill: bool = True,
+) -> WeekendResponse:
+    """
+    Assemble the aggregated weekend payload.
+
+    backfill=False skips queueing ingestion of finished sessions; the
+    ingestion worker uses that when it warms the cache.
+    """
+    last_updated = dt.datetime.utcnow().isoformat()
+    errors: List[str] = []
+    pending: List[str] = []
+    sections = build_weekend_sections(
+        db, season, round_num, WEEKEND_FIELDS, errors, backfill, pending=pending
+    )
     return WeekendResponse(
-        schedule=schedule,
-        history=history,
-        sessions=session_results,
+        **sections,
         meta=WeekendMeta(
             last_updated=last_updated,
             stale=False,
             errors=errors,
+            pending=pending,
         ),
-        timeline=timeline,
     )
 
 
-def _get_weekend_with_cache(db: Session, season: int, round_num: Optional[int]) -> Optional[WeekendResponse]:
-    if not round_num or round_num <= 0:
+async def _fetch_meeting_circuit_info(season: int, rnd: int, meeting_key: int) -> Optional[dict]:
+    meeting = await run_in_threadpool(_fetch_openf1_meeting, meeting_key)
+    return _meeting_circuit_info(season, rnd, meeting) if meeting else None
+
+
+async def _fetch_weekend_history(
+    season: int,
+    rnd: int,
+    circuit_info: dict,
+    meeting_task: Optional["asyncio.Task"],
+    errors: List[str],
+) -> CircuitHistory:
+    if meeting_task is not None:
+        # Without a local circuit row the circuit comes from the OpenF1 meeting.
+        circuit_info = await meeting_task or circuit_info
+    # The thread may outlive a timed-out request, so it reports into its own list.
+    history_errors: List[str] = []
+    history = await run_in_threadpool(
+        _load_circuit_history,
+        season,
+        rnd,
+        circuit_info.get("circuit_id"),
+        circuit_info.get("circuit_name"),
+        history_errors,
+    )
+    errors.extend(history_errors)
+    return history
+
+
+async def build_weekend_sections_async(
+    db: Union[AsyncSession, Session],
+    season: int,
+    round_num: int,
+    sections: Sequence[str],
+    errors: List[str],
+    session_types: Sequence[str] = SESSION_RESULTS_TO_FETCH,
+    partial: Optional[Set[str]] = None,
+    pending: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    build_weekend_sections for async routes, with the remote lookups in parallel.
+
+    One quick query resolves the circuit from our tables. The remote lookups
+    then start in the threadpool: the OpenF1 meeting (only when the circuit is
+    not stored locally) and the Jolpica circuit history. They run while the
+    database sections are built through `run_sync_db`, so a cold weekend
+    costs about as much as its slowest part. On an AsyncSession that build
+    runs on the event-loop thread (see `run_sync_db`); the backfill jobs it
+    finds are enqueued afterwards in the threadpool, so Redis and RQ calls
+    do not run there too. Remote lookups get
+    WEEKEND_REMOTE_BUDGET_SECONDS in total. A lookup that has not finished by
+    then is reported in `errors`, its section is added to `partial`, and the
+    response uses what is known locally. Cancelling a lookup only stops the
+    wait: its threadpool call runs on under its own HTTP timeouts (10s per
+    OpenF1 request, up to 30s per Jolpica page) and still caches what it
+    fetched, so the next request usually finds it.
+    """
+    started = time.monotonic()
+    wanted = set(sections)
+    partial = partial if partial is not None else set()
+    circuit_info: Optional[dict] = None
+    meeting_task = history_task = None
+    if wanted & {"schedule", "history"}:
+        circuit_info, meeting_key = await run_sync_db(db, _local_circuit_info, season, round_num)
+        if meeting_key:
+            meeting_task = asyncio.ensure_future(
+                _fetch_meeting_circuit_info(season, round_num, meeting_key)
+            )
+        if "history" in wanted:
+            history_task = asyncio.ensure_future(
+                _fetch_weekend_history(season, round_num, circuit_info, meeting_task, errors)
+            )
+
+    remote = [task for task in (meeting_task, history_task) if task is not None]
+    local_sections = [section for section in sections if section != "history"]
+    built: Dict[str, Any] = {}
+    backfill_due: List[Tuple[str, int, int, str]] = []
+    try:
+        if local_sections:
+            built = await run_sync_db(
+                db,
+                build_weekend_sections,
+                season,
+                round_num,
+                local_sections,
+                errors,
+                session_types=session_types,
+                circuit_info=circuit_info,
+                pending=pending,
+                backfill_due=backfill_due,
+            )
+        if backfill_due:
+            errors.extend(await run_in_threadpool(_queue_session_backfills, backfill_due, pending))
+    except BaseException:
+        for task in remote:
+            task.cancel()
+        raise
+    if remote:
+        remaining = max(0.0, WEEKEND_REMOTE_BUDGET_SECONDS - (time.monotonic() - started))
+        _, unfinished = await asyncio.wait(remote, timeout=remaining)
+        for task in unfinished:
+            task.cancel()
+
+    if meeting_task is not None and "schedule" in wanted:
+        if not meeting_task.done() or meeting_task.cancelled():
+            errors.append(f"schedule: OpenF1 meeting lookup exceeded {WEEKEND_REMOTE_BUDGET_SECONDS}s")
+            partial.add("schedule")
+        elif meeting_task.exception() is not None:
+            errors.append(f"schedule: {meeting_task.exception()}")
+        elif meeting_task.result() and built.get("schedule") is not None:
+            built["schedule"] = built["schedule"].model_copy(update=meeting_task.result())
+    if history_task is not None:
+        if not history_task.done() or history_task.cancelled():
+            errors.append(f"history: lookup exceeded {WEEKEND_REMOTE_BUDGET_SECONDS}s")
+            partial.add("history")
+        elif history_task.exception() is not None:
+            errors.append(f"history: {history_task.exception()}")
+            partial.add("history")
+        else:
+            built["history"] = history_task.result()
+    return built
+
+
+def _dump_section(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {key: _dump_section(item) for key, item in value.items()}
+    return value
+
+
+def _decode_cached(value: Optional[str]) -> Any:
+    if not value:
         return None
-    cache_key = weekend_cache_key(season, round_num)
-    cached = redis_client.get(cache_key)
-    if cached:
-        try:
-            payload = json.loads(cached)
-            return WeekendResponse(**payload)
-        except Exception:
-            redis_client.delete(cache_key)
+    try:
+        return decode_cache_payload(value)
+    except Exception:
+        return None
+
+
+def _sections_from_cache(
+    keys: Dict[str, str],
+    values: Dict[str, Optional[str]],
+    fields: Sequence[str],
+) -> Tuple[Dict[str, Any], List[str], Dict[str, Any]]:
+    """
+    Resolve weekend sections from one composite cache read.
 
-    payload = _build_weekend_response(db, season, round_num)
-    redis_client.setex(cache_key, WEEKEND_CACHE_TTL_SECONDS, json.dumps(payload.model_dump()))
-    return payload
+    Returns (sections, missing sections, cached session results). Per-section
+    entries win; the schedule endpoint's entry also satisfies the schedule.
+    The session results endpoint's entries are returned so only the
+    uncached session types are rebuilt.
+    """
+    sections: Dict[str, Any] = {}
+    missing: List[str] = []
+    for field in fields:
+        entry = _decode_cached(values.get(keys[f"section:{field}"]))
+        if isinstance(entry, dict) and "value" in entry:
+            sections[field] = entry["value"]
+        elif field == "schedule" and _decode_cached(values.get(keys["schedule"])):
+            sections[field] = _decode_cached(values.get(keys["schedule"]))
+        else:
+            missing.append(field)
+    cached_sessions = {}
+    if "sessions" in missing:
+        for stype in SESSION_RESULTS_TO_FETCH:
+            results = _decode_cached(values.get(keys[f"session:{stype}"]))
+            if results:
+                cached_sessions[stype] = results
+    return sections, missing, cached_sessions
+
+
+async def _get_weekends_with_cache(
+    db: Union[AsyncSession, Session],
+    season: int,
+    round_nums: Sequence[int],
+    fields: Tuple[str, ...] = WEEKEND_FIELDS,
+) -> Dict[int, dict]:
+    """
+    Weekend payloads, restricted to `fields`, for one or more rounds.
+
+    Every key the payloads can be assembled from (full payloads, per-section
+    entries, the schedule and the per-session results of every round) is
+    read in one pipelined round trip, and everything built is written back in
+    one more. A partial selection is also served from the full payload.
+    """
+    full = fields == WEEKEND_FIELDS
+    keys_by_round = {
+        rnd: weekend_composite_keys(season, rnd, fields, SESSION_RESULTS_TO_FETCH)
+        for rnd in round_nums
+    }
+    payload_keys = {
+        rnd: keys["weekend"] if full else fields_cache_key(keys["weekend"], fields)
+        for rnd, keys in keys_by_round.items()
+    }
+    values = await read_cache_keys(
+        [key for keys in keys_by_round.values() for key in keys.values()]
+        + list(payload_keys.values()),
+        async_redis_client,
+    )
+
+    payloads: Dict[int, dict] = {}
+    writes: Dict[str, Any] = {}
+    for rnd, keys in keys_by_round.items():
+        cached = _decode_cached(values.get(payload_keys[rnd])) or _decode_cached(
+            values.get(keys["weekend"])
+        )
+        if isinstance(cached, dict):
+            payloads[rnd] = {field: cached.get(field) for field in (*fields, "meta")}
+            continue
+
+        last_updated = dt.datetime.utcnow().isoformat()
+        errors: List[str] = []
+        pending: List[str] = []
+        partial: Set[str] = set()
+        sections, missing, cached_sessions = _sections_from_cache(keys, values, fields)
+        if missing:
+            session_types = [
+                stype for stype in SESSION_RESULTS_TO_FETCH if stype not in cached_sessions
+            ]
+            built = await build_weekend_sections_async(
+                db,
+                season,
+                rnd,
+                missing,
+                errors,
+                session_types=session_types,
+                partial=partial,
+                pending=pending,
+            )
+            built = {name: _dump_section(value) for name, value in built.items()}
+            if "sessions" in built:
+                built["sessions"] = {
+                    stype: cached_sessions.get(stype, built["sessions"].get(stype))
+                    for stype in SESSION_RESULTS_TO_FETCH
+                }
+            writes.update(
+                {
+                    keys[f"section:{name}"]: {"value": value}
+                    for name, value in built.items()
+                    if name not in partial
+                }
+            )
+            for name in missing:
+                sections[name] = built.get(name)
+        payloads[rnd] = {
+            **{field: sections.get(field) for field in fields},
+            "meta": WeekendMeta(
+                last_updated=last_updated, stale=False, errors=errors, pending=pending
+            ).model_dump(),
+        }
+        if not partial and not errors:
+            # Full payload (or selection) first, then the section entries.
+            # A payload with errors is not cached (as the warmer does), so
+            # the next request retries what failed.
+            writes = {payload_keys[rnd]: payloads[rnd], **writes}
+
+    await set_cached_payloads_async(writes, WEEKEND_CACHE_TTL_SECONDS, async_redis_client)
+    return payloads
 
 
 def _build_next_race_preview(weekend: Optional[WeekendResponse]) -> Optional[NextRacePreview]:
@@ -612,8 +1068,14 @@ def _fetch_openf1_meeting(meeting_key: int) -> Optional[dict]:
     return None
 
 
-def _get_circuit_info(season: int, rnd: int, db: Session) -> dict:
-    """Get circuit info from Race and Circuit tables, falling back to OpenF1."""
+def _local_circuit_info(db: Session, season: int, rnd: int) -> Tuple[dict, Optional[int]]:
+    """
+    Circuit info from the Race and Circuit tables, without remote calls.
+
+    Returns (info, meeting_key). When the race is not stored locally, info is
+    a placeholder and meeting_key names the OpenF1 meeting to look up instead
+    (None when there is nothing to look up).
+    """
     # Try to get from Race table with Circuit join
     race = (
         db.query(Race, Circuit)
@@ -630,7 +1092,7 @@ def _get_circuit_info(season: int, rnd: int, db: Session) -> dict:
             "circuit_name": circuit_obj.name if circuit_obj else None,
             "circuit_country": circuit_obj.country if circuit_obj else None,
             "race_name": race_obj.slug.replace("-", " ").title() if race_obj.slug else None,
-        }
+        }, None
 
     # Fallback: use OpenF1 meeting data via calendar event meeting_key
     event = (
@@ -638,43 +1100,52 @@ def _get_circuit_info(season: int, rnd: int, db: Session) -> dict:
         .filter_by(season=season, round=rnd)
         .first()
     )
-    if event and event.meeting_key:
-        meeting = _fetch_openf1_meeting(event.meeting_key)
-        if meeting:
-            circuit_short = meeting.get("circuit_short_name") or ""
-            # Use explicit mapping first, then fall back to normalised short name
-            circuit_id = OPENF1_TO_JOLPICA_CIRCUIT.get(
-                circuit_short,
-                circuit_short.lower().replace(" ", "_").replace("-", "_") if circuit_short else f"circuit_{season}_{rnd}",
-            )
-            return {
-                "circuit_id": circuit_id,
-                "circuit_name": circuit_short or None,
-                "circuit_country": meeting.get("country_name") or None,
-                "race_name": meeting.get("meeting_name") or None,
-            }
-
     if event:
         return {
             "circuit_id": f"circuit_{season}_{rnd}",
             "circuit_name": None,
             "circuit_country": None,
             "race_name": None,
-        }
-    return {"circuit_id": None, "circuit_name": None, "circuit_country": None, "race_name": None}
+        }, event.meeting_key or None
+    return {"circuit_id": None, "circuit_name": None, "circuit_country": None, "race_name": None}, None
+
+
+def _meeting_circuit_info(season: int, rnd: int, meeting: dict) -> dict:
+    circuit_short = meeting.get("circuit_short_name") or ""
+    # Use explicit mapping first, then fall back to normalised short name
+    circuit_id = OPENF1_TO_JOLPICA_CIRCUIT.get(
+        circuit_short,
+        circuit_short.lower().replace(" ", "_").replace("-", "_") if circuit_short else f"circuit_{season}_{rnd}",
+    )
+    return {
+        "circuit_id": circuit_id,
+        "circuit_name": circuit_short or None,
+        "circuit_country": meeting.get("country_name") or None,
+        "race_name": meeting.get("meeting_name") or None,
+    }
+
+
+def _get_circuit_info(season: int, rnd: int, db: Session) -> dict:
+    """Get circuit info from Race and Circuit tables, falling back to OpenF1."""
+    info, meeting_key = _local_circuit_info(db, season, rnd)
+    if meeting_key:
+        meeting = _fetch_openf1_meeting(meeting_key)
+        if meeting:
+            return _meeting_circuit_info(season, rnd, meeting)
+    return info
 
 
 def _load_circuit_history(
-    db: Session,
     season: int,
     rnd: int,
-    schedule: Optional[RaceWeekendSchedule],
+    circuit_id: Optional[str],
+    circuit_name: Optional[str],
     errors: List[str],
 ) -> CircuitHistory:
-    circuit_id = schedule.circuit_id if schedule else f"circuit_{season}_{rnd}"
+    circuit_id = circuit_id or f"circuit_{season}_{rnd}"
     base_history = CircuitHistory(
         circuit_id=circuit_id,
-        circuit_name=schedule.circuit_name if schedule else None,
+        circuit_name=circuit_name,
         previous_year=None,
     )
     cache_key = history_cache_key(season, circuit_id)
@@ -701,15 +1172,72 @@ def _load_circuit_history(
         errors.append(f"history: {str(exc)}")
     return base_history
 
+def _lap_rows_to_columns(rows) -> dict[str, dict[str, list]]:
+    """Group (driver, lap, lap_ms) rows into per-driver arrays without row dicts."""
+    by_driver: dict[str, dict[str, list]] = {}
+    for driver, lap, lap_ms in rows:
+        columns = by_driver.get(driver)
+        if columns is None:
+            columns = by_driver[driver] = {"lap": [], "lap_ms": []}
+        columns["lap"].append(int(lap))
+        columns["lap_ms"].append(float(lap_ms))
+    return by_driver
+
+
+SEQUENCE_CURSOR_PREFIX = "seq:"
+
+
+def _parse_since(since: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Parse a delta cursor: a lap number ('12') or an ingest sequence ('seq:4711')."""
+    if not since:
+        return None
+    kind, value = "lap", since
+    if since.startswith(SEQUENCE_CURSOR_PREFIX):
+        kind, value = "seq", since[len(SEQUENCE_CURSOR_PREFIX):]
+    try:
+        return kind, int(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid cursor: {since!r}; expected a lap number or seq:N"
+        )
+
+
+def _since_filter(cursor: Tuple[str, int], lap_column, id_column):
+    kind, value = cursor
+    return (lap_column if kind == "lap" else id_column) > value
+
+
+def _next_cursor(since: Optional[str], row_ids: Sequence[int]) -> Optional[str]:
+    """
+    Sequence cursor covering every row the client now holds.
+
+    Row ids grow with each ingest (the final ingest re-inserts a race's laps),
+    so `seq:<highest id returned>` picks up exactly the rows written later.
+    """
+    return f"{SEQUENCE_CURSOR_PREFIX}{max(row_ids)}" if row_ids else since
+
+
 @router.get("/{season}/{round}/laps")
 def get_laps(
     season: int,
     round: int,
+    request: Request,
+    response: Response,
     drivers: list[str] = Query(
         default=None,
         description="Optional list of driver codes (e.g. VER, HAM) to filter laps",
     ),
-    db: Session = Depends(get_db),
+    response_format: str = Query(
+        default="rows",
+        alias="format",
+        pattern="^(rows|columnar)$",
+        description="'columnar' returns {driver: {lap: [...], lap_ms: [...]}}",
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="Only laps after this cursor: a lap number, or a previous response's next_cursor (seq:N)",
+    ),
+    db: Session = Depends(get_read_db),
 ):
     """
     Return lap-time records for a given race.
@@ -722,35 +1250,154 @@ def get_laps(
         FIA round number within that season
     drivers : list[str], optional
         One or more driver codes to filter; if omitted, returns all drivers
+    format : str, optional
+        "rows" (default) or "columnar"
+    since : str, optional
+        Delta cursor; the response becomes {since, next_cursor, laps}
 
     Returns
     -------
     list[dict]
-        Each item: {driver, lap, lap_ms}
+        Each item: {driver, lap, lap_ms}; with format=columnar a dict of
+        per-driver column arrays instead
     """
+    cursor = _parse_since(since)
+    etag = race_etag(request, season, round, client=redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     q = (
-        db.query(LapTime.driver, LapTime.lap, LapTime.lap_ms)
-        .filter(LapTime.race_id == f"{season}-{round}")
+        db.query(LapTime.driver, LapTime.lap, LapTime.lap_ms, LapTime.id)
+        .filter(race_rows_clause(LapTime, season, round, lookup_race_key(db, season, round)))
     )
     if drivers:
         q = q.filter(LapTime.driver.in_(drivers))
+    if cursor:
+        q = q.filter(_since_filter(cursor, LapTime.lap, LapTime.id))
 
     rows = (
         q.order_by(LapTime.driver, LapTime.lap)
         .all()
     )
+    lap_rows = [(d, l, ms) for d, l, ms, _ in rows]
 
-    return [
-        {"driver": d, "lap": int(l), "lap_ms": float(ms)}
-        for d, l, ms in rows
-    ]
+    if response_format == "columnar":
+        laps = _lap_rows_to_columns(lap_rows)
+    else:
+        laps = [
+            {"driver": d, "lap": int(l), "lap_ms": float(ms)}
+            for d, l, ms in lap_rows
+        ]
+    if cursor is None:
+        return laps
+    return {
+        "since": since,
+        "next_cursor": _next_cursor(since, [row_id for *_, row_id in rows]),
+        "laps": laps,
+    }
+
+
+@router.get("/{season}/{round}/positions")
+def get_lap_positions(
+    season: int,
+    round: int,
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(
+        default=None,
+        description="Only positions after this cursor: a lap number, or a previous response's next_cursor (seq:N)",
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Return per-lap race positions and gaps, ordered by lap and position.
+
+    With `since`, only rows after the cursor are returned (read through the
+    (race, lap) index); pass `next_cursor` back to keep polling. Gaps are
+    filled in by the final ingest, so refetch without `since` after the race's
+    `ingested` status event.
+    """
+    cursor = _parse_since(since)
+    etag = race_etag(request, season, round, client=redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    q = (
+        db.query(
+            Driver.code,
+            LapPosition.lap_number,
+            LapPosition.position,
+            LapPosition.gap_to_leader_ms,
+            LapPosition.gap_to_ahead_ms,
+            LapPosition.id,
+        )
+        .join(Race, LapPosition.race_id == Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .join(Entry, LapPosition.entry_id == Entry.id)
+        .join(Driver, Entry.driver_id == Driver.id)
+        .filter(Season.year == season, Race.round_number == round)
+    )
+    if cursor:
+        q = q.filter(_since_filter(cursor, LapPosition.lap_number, LapPosition.id))
+    rows = q.order_by(LapPosition.lap_number, LapPosition.position).all()
+
+    return {
+        "since": since,
+        "next_cursor": _next_cursor(since, [row.id for row in rows]),
+        "positions": [
+            {
+                "driver": code,
+                "lap": lap,
+                "position": position,
+                "gap_to_leader_ms": gap_to_leader,
+                "gap_to_ahead_ms": gap_to_ahead,
+            }
+            for code, lap, position, gap_to_leader, gap_to_ahead, _ in rows
+        ],
+    }
+
+
+@router.get("/{season}/{round}/live")
+async def get_live_snapshot(season: int, round: int):
+    """
+    Return the live race snapshot: latest completed lap, running order and
+    recent race control messages.
+
+    Served straight from Redis; the live poller advances it while the race is
+    live and the final ingest removes it.
+    """
+    cached = await async_redis_client.get(live_cache_key(season, round))
+    if not cached:
+        raise HTTPException(status_code=404, detail=f"No live session for {season} round {round}")
+    return decode_cache_payload(cached)
+
+
+@router.get("/{season}/{round}/events")
+async def stream_race_events(season: int, round: int):
+    """
+    Server-Sent Events stream of a race weekend's updates.
+
+    Events: `session_status` when a session goes live or is ingested,
+    `live_laps` with each live poll's new laps, running order and race control
+    messages, and `live_snapshot` first when a race is currently live. Clients
+    refetch the weekend or results on `session_status` instead of polling.
+    """
+    cached = await async_redis_client.get(live_cache_key(season, round))
+    initial = format_sse("live_snapshot", decode_cache_payload(cached)) if cached else None
+    return StreamingResponse(
+        race_event_broker.stream(season, round, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{season}/{round}/schedule", response_model=RaceWeekendSchedule)
 def get_race_schedule(
     season: int,
     round: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Return the race weekend schedule with session times and statuses.
@@ -780,12 +1427,44 @@ def get_race_schedule(
     return schedule
 
 
+def _load_session_results(
+    db: Session,
+    season: int,
+    round_num: int,
+    session_type: str,
+) -> SessionResultsResponse:
+    """Build a session's results, raising 404 when they are not available yet."""
+    results = build_session_results(db, season, round_num, session_type)
+    if results is not None:
+        return results
+
+    # Check if session exists but hasn't been ingested yet
+    event = (
+        db.query(CalendarEvent)
+        .filter_by(season=season, round=round_num)
+        .filter(CalendarEvent.session_type.ilike(f"%{session_type}%"))
+        .first()
+    )
+    if event and event.status != "ingested":
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "session_not_complete",
+                "message": f"{session_type} has not completed yet",
+                "scheduled_start": event.start_ts.isoformat() if event.start_ts else None,
+            }
+        )
+    raise HTTPException(status_code=404, detail=f"No results found for {session_type}")
+
+
 @router.get("/{season}/{round}/session/{session_type}/results", response_model=SessionResultsResponse)
-def get_session_results(
+async def get_session_results(
     season: int,
     round: int,
     session_type: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Return results for a specific session (FP1, FP2, FP3, qualifying, sprint, race).
@@ -804,100 +1483,93 @@ def get_session_results(
     SessionResultsResponse
         Session results with driver positions and times
     """
-    normalized_type = session_type.lower().replace(" ", "_")
+    etag = await race_etag_async(request, season, round, client=async_redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    normalized_type = normalize_session_type(session_type)
     cache_key = session_cache_key(season, round, normalized_type)
-    cached = redis_client.get(cache_key)
+    cached = await async_redis_client.get(cache_key)
     if cached:
-        return json.loads(cached)
-
-    # Query session classifications
-    classifications = (
-        db.query(SessionClassification)
-        .filter_by(season=season, round=round, session_type=normalized_type)
-        .order_by(SessionClassification.position)
-        .all()
-    )
+        return decode_cache_payload(cached)
 
-    if not classifications:
-        # Check if session exists but hasn't been ingested yet
-        event = (
-            db.query(CalendarEvent)
-            .filter_by(season=season, round=round)
-            .filter(CalendarEvent.session_type.ilike(f"%{session_type}%"))
-            .first()
-        )
-        if event and event.status != "ingested":
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "error": "session_not_complete",
-                    "message": f"{session_type} has not completed yet",
-                    "scheduled_start": event.start_ts.isoformat() if event.start_ts else None,
-                }
-            )
-        raise HTTPException(status_code=404, detail=f"No results found for {session_type}")
-
-    results = []
-    for cls in classifications:
-        result = SessionResult(
-            position=cls.position,
-            driver_code=cls.driver_code,
-            driver_name=cls.driver_name,
-            team=cls.team,
-            time=_format_lap_time(cls.time_ms),
-            gap=_format_gap(cls.gap_ms),
-            laps=cls.laps,
-            points=cls.points,
-        )
-        # Add qualifying-specific fields
-        if normalized_type == "qualifying":
-            result.q1_time = _format_lap_time(cls.q1_time_ms)
-            result.q2_time = _format_lap_time(cls.q2_time_ms)
-            result.q3_time = _format_lap_time(cls.q3_time_ms)
-            result.eliminated_in = cls.eliminated_in
-        results.append(result)
-
-    response = SessionResultsResponse(
-        season=season,
-        round=round,
-        session_type=normalized_type,
-        results=results,
-    )
+    results = await run_sync_db(db, _load_session_results, season, round, session_type)
 
     # Cache for 2 hours (completed sessions)
-    redis_client.setex(cache_key, 7200, json.dumps(response.model_dump()))
+    await async_redis_client.setex(
+        cache_key,
+        SESSION_RESULTS_CACHE_TTL_SECONDS,
+        encode_cache_payload(results.model_dump()),
+    )
 
-    return response
+    return results
 
 
 @router.get("/{season}/{round}/weekend", response_model=WeekendResponse)
-def get_race_weekend(
+async def get_race_weekend(
     season: int,
     round: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    fields: Optional[List[str]] = Query(
+        default=None,
+        description="Sections to include: schedule, timeline, history, sessions (default: all)",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Return aggregated race weekend data: schedule, history, and all session results.
     Single endpoint to reduce API calls from the frontend.
+
+    `fields` limits the response to some sections; sections that are not
+    requested are not loaded at all (e.g. `fields=timeline` skips the circuit
+    history lookup and the session classification queries).
     """
-    payload = _get_weekend_with_cache(db, season, round)
-    if payload is None:
+    selected = parse_fields(fields, WEEKEND_FIELDS)
+    # The timeline is derived from the clock, so the validator also rolls over
+    # with the weekend cache TTL.
+    time_bucket = int(time.time() // WEEKEND_CACHE_TTL_SECONDS)
+    etag = await race_etag_async(request, season, round, time_bucket, client=async_redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    if round <= 0:
         raise HTTPException(status_code=404, detail=f"No weekend found for {season}-{round}")
-    return payload
+    payloads = await _get_weekends_with_cache(db, season, [round], selected or WEEKEND_FIELDS)
+    if selected:
+        partial = JSONResponse(payloads[round])
+        set_etag(partial, etag)
+        return partial
+    return payloads[round]
 
 
 @router.get("/{season}/weekend/summary", response_model=WeekendSummaryResponse)
-def get_weekend_summary(
+async def get_weekend_summary(
     season: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    standings = fetch_season_standings(db, season)
+    """
+    Current display weekend plus the next weekend preview.
+
+    Both weekends are resolved from one pipelined cache read. Standings come
+    from the local tables, but fall back to Jolpica for seasons that have
+    none, so this route keeps a sync session and runs its work in the
+    threadpool.
+    """
+    standings = await run_sync_db(db, fetch_season_standings, season)
     races_completed = int(standings.get("races_completed", 0)) if standings else 0
     last_round = races_completed or None
     next_round = races_completed + 1 if races_completed else 1
 
-    last_weekend = _get_weekend_with_cache(db, season, last_round) if last_round else None
-    next_weekend = _get_weekend_with_cache(db, season, next_round)
+    rounds = [rnd for rnd in (last_round, next_round) if rnd]
+    weekends = {
+        rnd: WeekendResponse(**payload)
+        for rnd, payload in (await _get_weekends_with_cache(db, season, rounds)).items()
+    }
+    last_weekend = weekends.get(last_round) if last_round else None
+    next_weekend = weekends.get(next_round)
 
     if last_weekend and not last_weekend.schedule:
         last_weekend = None
@@ -932,10 +1604,9 @@ def get_weekend_summary(
     )
 
 
-def _trigger_session_ingest(season: int, round_num: int, session_label: str) -> None:
-    from theundercut.services.ingestion import ingest_session
-
-    ingest_session(season, round_num, session_label)
+def _trigger_session_ingest(season: int, round_num: int, session_label: str) -> bool:
+    """Queue the session's ingestion on the worker (False if already pending)."""
+    return enqueue_session_ingest(season, round_num, session_label)
 
 
 # --- Admin endpoints ---
@@ -973,16 +1644,19 @@ def mark_sessions_ingested(
 
     db.commit()
 
-    # Clear cache
+    # Clear cache; until the replica catches up, this season reads the primary
     try:
+        pin_reads_to_primary(season)
         invalidate_race_weekend_cache(season, round)
     except Exception:
         pass
+    for row in updated:
+        publish_session_status(season, round, row["session"], "ingested")
 
     return {"updated": updated, "count": len(updated)}
 
 
-@router.post("/{season}/{round}/ingest")
+@router.post("/{season}/{round}/ingest", status_code=202)
 def trigger_session_ingest(
     season: int,
     round: int,
@@ -993,19 +1667,22 @@ def trigger_session_ingest(
     Admin endpoint to manually trigger session ingestion.
 
     Use this to re-ingest a session after code fixes or when automatic
-    ingestion failed to store data properly.
+    ingestion failed to store data properly. The ingestion runs as an RQ job;
+    a session that is already queued or running is not queued twice.
     """
-    from theundercut.services.ingestion import ingest_session
-
     try:
-        ingest_session(season, round, session_type=session, force=force)
-        return {
-            "status": "success",
-            "message": f"Ingested {season}-{round} {session}",
-            "force": force,
-        }
+        queued = enqueue_session_ingest(season, round, session, force=force)
     except Exception as exc:
         raise HTTPException(
             status_code=500,
-            detail=f"Ingestion failed: {str(exc)}"
+            detail=f"Failed to queue ingestion: {str(exc)}"
         )
+    return {
+        "status": "pending",
+        "job_id": ingest_job_id(season, round, session),
+        "message": (
+            f"Queued {season}-{round} {session}" if queued
+            else f"{season}-{round} {session} is already pending"
+        ),
+        "force": force,
+    }
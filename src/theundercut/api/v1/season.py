@@ -0,0 +1,71 @@
+"""Season aggregate API endpoints."""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from theundercut.adapters.db import get_async_read_db, run_sync_db
+from theundercut.services.season_aggregates import load_season_aggregates
+
+
+# --- Pydantic models for responses ---
+
+class SeasonAggregateFields(BaseModel):
+    races: int
+    total_grade: Optional[float] = None
+    average_grade: Optional[float] = None
+    avg_consistency: Optional[float] = None
+    avg_team_strategy: Optional[float] = None
+    avg_racecraft: Optional[float] = None
+    avg_penalties: Optional[float] = None
+    strategy_races: int
+    avg_strategy_score: Optional[float] = None
+    avg_pit_timing: Optional[float] = None
+    avg_tire_selection: Optional[float] = None
+    avg_safety_car: Optional[float] = None
+    avg_weather: Optional[float] = None
+    calibration_profile: Optional[str] = None
+
+
+class DriverSeasonAggregate(SeasonAggregateFields):
+    driver_code: str
+    team: Optional[str] = None
+
+
+class ConstructorSeasonAggregate(SeasonAggregateFields):
+    team: str
+
+
+class SeasonAggregatesResponse(BaseModel):
+    season: int
+    updated_at: Optional[str] = None
+    drivers: List[DriverSeasonAggregate]
+    constructors: List[ConstructorSeasonAggregate]
+
+
+router = APIRouter(
+    prefix="/api/v1/season",
+    tags=["season"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/{season}/aggregates", response_model=SeasonAggregatesResponse)
+async def get_season_aggregates(
+    season: int,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Season leaderboards of Drive Grade and strategy scores per driver and team.
+
+    Served from the precomputed aggregate tables that ingestion refreshes after
+    each race.
+    """
+    payload = await run_sync_db(db, load_season_aggregates, season)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"No season aggregates for {season}")
+    return payload
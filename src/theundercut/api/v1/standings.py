@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-import json
-
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from theundercut.adapters.db import get_db
+from theundercut.adapters.db import get_read_db
 from theundercut.adapters.redis_cache import redis_client
+from theundercut.services.cache import (
+    decode_cache_payload,
+    encode_cache_payload,
+    standings_cache_key,
+)
 from theundercut.services.standings import fetch_season_standings
 
 CACHE_TTL_SECONDS = 600  # 10 minutes
@@ -20,17 +23,17 @@ router = APIRouter(
 
 
 @router.get("/{season}")
-def get_season_standings(season: int, db: Session = Depends(get_db)):
+def get_season_standings(season: int, db: Session = Depends(get_read_db)):
     """
     Get driver and constructor championship standings for a season.
 
     Returns points, wins, last-5 performance, positions gained, and more.
     """
-    cache_key = f"standings:v1:{season}"
+    cache_key = standings_cache_key(season)
     cached = redis_client.get(cache_key)
     if cached:
-        return json.loads(cached)
+        return decode_cache_payload(cached)
 
     payload = fetch_season_standings(db, season)
-    redis_client.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(payload))
+    redis_client.setex(cache_key, CACHE_TTL_SECONDS, encode_cache_payload(payload))
     return payload
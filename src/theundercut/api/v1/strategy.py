@@ -6,12 +6,26 @@ from __future__ import annotations
 import json
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from theundercut.adapters.db import get_db
-from theundercut.adapters.redis_cache import redis_client
+from theundercut.adapters.db import get_async_read_db, get_read_db, run_sync_db
+from theundercut.adapters.redis_cache import async_redis_client, redis_client
+from theundercut.api.etag import (
+    etag_matches,
+    not_modified,
+    race_etag_async,
+    season_etag_async,
+    set_etag,
+)
+from theundercut.services.cache import (
+    get_cached_payload_async,
+    get_cached_payloads_async,
+    set_cached_payloads_async,
+    strategy_cache_key,
+)
 from theundercut.models import (
     StrategyScore,
     StrategyDecision,
@@ -22,6 +36,7 @@ from theundercut.models import (
 )
 
 CACHE_TTL_SECONDS = 300
+MAX_BATCH_ROUNDS = 30
 
 
 # --- Pydantic models for responses ---
@@ -55,6 +70,12 @@ class RaceStrategyScoresResponse(BaseModel):
     scores: List[DriverStrategyScore]
 
 
+class SeasonStrategyScoresResponse(BaseModel):
+    season: int
+    rounds: List[int]
+    races: List[RaceStrategyScoresResponse]
+
+
 class DriverStrategyDetailResponse(BaseModel):
     season: int
     round: int
@@ -75,49 +96,25 @@ def _strategy_cache_key(season: int, rnd: int, driver: Optional[str] = None) ->
     return f"strategy:{season}:{rnd}"
 
 
-@router.get("/{season}/{round}", response_model=RaceStrategyScoresResponse)
-def get_race_strategy_scores(
-    season: int,
-    round: int,
-    include_decisions: bool = Query(
-        default=False,
-        description="Include individual decision records in response",
-    ),
-    db: Session = Depends(get_db),
-):
-    """
-    Get strategy scores for all drivers in a race.
-
-    Parameters
-    ----------
-    season : int
-        Championship year (e.g., 2024)
-    round : int
-        FIA round number within that season
-    include_decisions : bool
-        If True, include decision records for each driver
-
-    Returns
-    -------
-    RaceStrategyScoresResponse
-        Strategy scores for all drivers in the race
-    """
-    cache_key = _strategy_cache_key(season, round)
-    if not include_decisions:
-        cached = redis_client.get(cache_key)
-        if cached:
-            return json.loads(cached)
-
-    # Get race
-    race = (
+def _find_race(db: Session, season: int, rnd: int) -> Optional[Race]:
+    return (
         db.query(Race)
         .join(Season, Race.season_id == Season.id)
-        .filter(Season.year == season, Race.round_number == round)
+        .filter(Season.year == season, Race.round_number == rnd)
         .first()
     )
 
+
+def build_race_strategy_scores(
+    db: Session,
+    season: int,
+    rnd: int,
+    include_decisions: bool = False,
+) -> Optional[RaceStrategyScoresResponse]:
+    """Build strategy scores for every driver in a race (None if there are none)."""
+    race = _find_race(db, season, rnd)
     if not race:
-        raise HTTPException(status_code=404, detail=f"Race not found for {season} round {round}")
+        return None
 
     # Get all entries with strategy scores
     entries_with_scores = (
@@ -128,12 +125,8 @@ def get_race_strategy_scores(
         .order_by(StrategyScore.total_score.desc())
         .all()
     )
-
     if not entries_with_scores:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No strategy scores found for {season} round {round}. Scores may not have been computed yet.",
-        )
+        return None
 
     scores = []
     for entry, strategy_score, driver in entries_with_scores:
@@ -159,29 +152,202 @@ def get_race_strategy_scores(
                 for d in decision_records
             ]
 
-        scores.append(DriverStrategyScore(
-            driver_code=driver.code,
-            total_score=strategy_score.total_score,
-            pit_timing_score=strategy_score.pit_timing_score,
-            tire_selection_score=strategy_score.tire_selection_score,
-            safety_car_score=strategy_score.safety_car_score,
-            weather_score=strategy_score.weather_score,
-            calibration_profile=strategy_score.calibration_profile,
-            calibration_version=strategy_score.calibration_version,
-            decisions=decisions,
-        ))
-
-    response = RaceStrategyScoresResponse(
+        scores.append(_driver_strategy_score(driver, strategy_score, decisions))
+
+    return RaceStrategyScoresResponse(
         season=season,
-        round=round,
+        round=rnd,
         scores=scores,
     )
 
+
+def _driver_strategy_score(
+    driver: Driver,
+    strategy_score: StrategyScore,
+    decisions: Optional[List[StrategyDecisionResponse]] = None,
+) -> DriverStrategyScore:
+    return DriverStrategyScore(
+        driver_code=driver.code,
+        total_score=strategy_score.total_score,
+        pit_timing_score=strategy_score.pit_timing_score,
+        tire_selection_score=strategy_score.tire_selection_score,
+        safety_car_score=strategy_score.safety_car_score,
+        weather_score=strategy_score.weather_score,
+        calibration_profile=strategy_score.calibration_profile,
+        calibration_version=strategy_score.calibration_version,
+        decisions=decisions,
+    )
+
+
+def _season_rounds(db: Session, season: int) -> List[int]:
+    rows = (
+        db.query(Race.round_number)
+        .join(Season, Race.season_id == Season.id)
+        .filter(Season.year == season)
+        .distinct()
+        .order_by(Race.round_number)
+        .all()
+    )
+    return [rnd for (rnd,) in rows]
+
+
+def build_season_strategy_scores(
+    db: Session,
+    season: int,
+    rounds: List[int],
+) -> dict[int, RaceStrategyScoresResponse]:
+    """
+    Build strategy scores for several rounds with one query.
+
+    Rounds without computed scores are left out of the result.
+    """
+    if not rounds:
+        return {}
+    rows = (
+        db.query(Race.round_number, StrategyScore, Driver)
+        .join(Entry, Entry.id == StrategyScore.entry_id)
+        .join(Driver, Entry.driver_id == Driver.id)
+        .join(Race, Entry.race_id == Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .filter(Season.year == season, Race.round_number.in_(rounds))
+        .order_by(Race.round_number, StrategyScore.total_score.desc())
+        .all()
+    )
+    scores: dict[int, List[DriverStrategyScore]] = {}
+    for rnd, strategy_score, driver in rows:
+        scores.setdefault(rnd, []).append(_driver_strategy_score(driver, strategy_score))
+    return {
+        rnd: RaceStrategyScoresResponse(season=season, round=rnd, scores=race_scores)
+        for rnd, race_scores in scores.items()
+    }
+
+
+@router.get("/{season}", response_model=SeasonStrategyScoresResponse)
+async def get_season_strategy_scores(
+    season: int,
+    request: Request,
+    response: Response,
+    rounds: Optional[List[int]] = Query(
+        default=None,
+        description="Rounds to include; every round of the season if omitted",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Get strategy scores for several rounds of a season in one request.
+
+    Cached race scores are fetched with a single MGET and the misses are
+    filled with one query over all missing rounds. Rounds without computed
+    scores are omitted from `races`.
+    """
+    round_list = (
+        sorted(set(rounds)) if rounds else await run_sync_db(db, _season_rounds, season)
+    )
+    if len(round_list) > MAX_BATCH_ROUNDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_ROUNDS} rounds can be requested at once",
+        )
+
+    etag = await season_etag_async(request, season, round_list, client=async_redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    keys = [strategy_cache_key(season, rnd) for rnd in round_list]
+    races = {}
+    misses = []
+    for rnd, cached in zip(round_list, await get_cached_payloads_async(keys, async_redis_client)):
+        if cached:
+            races[rnd] = cached
+        else:
+            misses.append(rnd)
+    if misses:
+        scores_by_round = await run_sync_db(db, build_season_strategy_scores, season, misses)
+        built = {rnd: scores.model_dump() for rnd, scores in scores_by_round.items()}
+        await set_cached_payloads_async(
+            {strategy_cache_key(season, rnd): payload for rnd, payload in built.items()},
+            CACHE_TTL_SECONDS,
+            async_redis_client,
+        )
+        races.update(built)
+
+    return {
+        "season": season,
+        "rounds": round_list,
+        "races": [races[rnd] for rnd in round_list if rnd in races],
+    }
+
+
+def _load_race_strategy_scores(
+    db: Session,
+    season: int,
+    rnd: int,
+    include_decisions: bool,
+) -> RaceStrategyScoresResponse:
+    """Build a race's strategy scores, raising 404 when the race or scores are missing."""
+    scores = build_race_strategy_scores(db, season, rnd, include_decisions)
+    if scores is None:
+        if _find_race(db, season, rnd) is None:
+            raise HTTPException(status_code=404, detail=f"Race not found for {season} round {rnd}")
+        raise HTTPException(
+            status_code=404,
+            detail=f"No strategy scores found for {season} round {rnd}. Scores may not have been computed yet.",
+        )
+    return scores
+
+
+@router.get("/{season}/{round}", response_model=RaceStrategyScoresResponse)
+async def get_race_strategy_scores(
+    season: int,
+    round: int,
+    request: Request,
+    response: Response,
+    include_decisions: bool = Query(
+        default=False,
+        description="Include individual decision records in response",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Get strategy scores for all drivers in a race.
+
+    Parameters
+    ----------
+    season : int
+        Championship year (e.g., 2024)
+    round : int
+        FIA round number within that season
+    include_decisions : bool
+        If True, include decision records for each driver
+
+    Returns
+    -------
+    RaceStrategyScoresResponse
+        Strategy scores for all drivers in the race
+    """
+    etag = await race_etag_async(request, season, round, client=async_redis_client)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    cache_key = _strategy_cache_key(season, round)
+    if not include_decisions:
+        cached = await get_cached_payload_async(cache_key, async_redis_client)
+        if cached:
+            return cached
+
+    scores = await run_sync_db(
+        db, _load_race_strategy_scores, season, round, include_decisions
+    )
+
     # Cache only if decisions not included (simpler cache)
     if not include_decisions:
-        redis_client.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(response.model_dump()))
+        await set_cached_payloads_async(
+            {cache_key: scores.model_dump()}, CACHE_TTL_SECONDS, async_redis_client
+        )
 
-    return response
+    return scores
 
 
 @router.get("/{season}/{round}/{driver}", response_model=DriverStrategyDetailResponse)
@@ -189,7 +355,7 @@ def get_driver_strategy_score(
     season: int,
     round: int,
     driver: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get detailed strategy score for a specific driver in a race.
@@ -299,7 +465,7 @@ def get_strategy_comparison(
     drivers: List[str] = Query(
         description="List of driver codes to compare (e.g., VER, HAM)",
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Compare strategy scores between specific drivers.
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
-import json
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-
-from theundercut.adapters.db import get_db
-from theundercut.adapters.redis_cache import redis_client
+from sqlalchemy import and_, case, func, select, tuple_
+from starlette.concurrency import run_in_threadpool
+
+from theundercut.adapters.db import get_async_read_db, run_sync_db
+from theundercut.adapters.redis_cache import async_redis_client, redis_binary_client
+from theundercut.api.compression import (
+    cached_variant_response_async,
+    store_variants_and_respond_async,
+)
+from theundercut.api.etag import etag_matches, not_modified, payload_etag, set_etag
 from theundercut.models import TestingEvent, TestingSession, TestingLap, TestingStint
+from theundercut.services.cache import decode_cache_payload, encode_cache_payload
 
 logger = logging.getLogger(__name__)
 
@@ -46,21 +53,146 @@ def _testing_day_cache_key(season: int, event_id: str, day: int, drivers: Option
     return f"testing:day:{season}:{event_id}:{day}:{driver_hash}"
 
 
-def _testing_laps_cache_key(season: int, event_id: str, day: int, drivers: Optional[List[str]], offset: int, limit: int) -> str:
+def _testing_laps_cache_key(
+    season: int,
+    event_id: str,
+    day: int,
+    drivers: Optional[List[str]],
+    offset: int,
+    limit: int,
+    after: Optional[Tuple[str, int]] = None,
+) -> str:
     """Cache key for paginated testing laps."""
     driver_hash = "_".join(sorted(drivers)) if drivers else "all"
-    return f"testing:laps:{season}:{event_id}:{day}:{driver_hash}:{offset}:{limit}"
+    page = f"after={after[0]}:{after[1]}" if after else offset
+    return f"testing:laps:{season}:{event_id}:{day}:{driver_hash}:{page}:{limit}"
+
+
+def _parse_lap_cursor(after: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Parse a 'DRIVER:LAP' keyset cursor (as returned in next_cursor)."""
+    if not after:
+        return None
+    driver, _, lap = after.partition(":")
+    try:
+        return driver.upper(), int(lap)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after!r}; expected DRIVER:LAP")
 
 
 @router.get("/{season}")
-def get_testing_events(
+async def get_testing_events(
     season: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> Dict[str, Any]:
     """Get all testing events for a season."""
     # Note: Caching disabled for this endpoint as testing data changes infrequently
     # and cache invalidation was causing issues. The database query is fast enough.
+    return await run_sync_db(db, _load_testing_events, season)
+
+
+@router.get("/{season}/{event_id}/{day}")
+async def get_testing_day(
+    season: int,
+    event_id: str,
+    day: int,
+    request: Request,
+    response: Response,
+    drivers: Optional[List[str]] = Query(
+        default=None,
+        description="Optional list of driver codes to filter (e.g., VER, HAM)",
+    ),
+    include_laps: bool = Query(
+        default=False,
+        description="Include full lap data in response (can be large)",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Dict[str, Any]:
+    """Get detailed testing data for a specific day."""
+    cache_key = _testing_day_cache_key(season, event_id, day, drivers)
+    if not include_laps:
+        cached = await async_redis_client.get(cache_key)
+        if cached:
+            etag = payload_etag(cached)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            set_etag(response, etag)
+            return await run_in_threadpool(decode_cache_payload, cached)
+
+    payload, status = await run_sync_db(
+        db, _load_testing_day, season, event_id, day, drivers, include_laps
+    )
 
+    # Cache (skip if including laps - those are fetched via separate endpoint)
+    if not include_laps:
+        ttl = COMPLETED_CACHE_TTL_SECONDS if status == "completed" else CACHE_TTL_SECONDS
+        encoded = await run_in_threadpool(encode_cache_payload, payload)
+        await async_redis_client.setex(cache_key, ttl, encoded)
+        set_etag(response, payload_etag(encoded))
+
+    return payload
+
+
+@router.get("/{season}/{event_id}/{day}/laps")
+async def get_testing_laps(
+    season: int,
+    event_id: str,
+    day: int,
+    request: Request,
+    response: Response,
+    drivers: Optional[List[str]] = Query(
+        default=None,
+        description="Optional list of driver codes to filter",
+    ),
+    offset: int = Query(default=0, ge=0, description="Pagination offset"),
+    limit: int = Query(default=500, ge=1, le=1000, description="Max laps to return"),
+    after: Optional[str] = Query(
+        default=None,
+        description="Keyset cursor (DRIVER:LAP) from next_cursor; replaces offset",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Dict[str, Any]:
+    """
+    Get paginated lap data for a testing day.
+
+    Pages are ordered by (driver, lap_number). Follow `next_cursor` with
+    `after=` to page by key instead of offset, so deep pages do not scan the
+    laps before them.
+    """
+    cursor = _parse_lap_cursor(after)
+    cache_key = _testing_laps_cache_key(season, event_id, day, drivers, offset, limit, cursor)
+    response.headers["Vary"] = "Accept-Encoding"
+    cached = await async_redis_client.get(cache_key)
+    if cached:
+        etag = payload_etag(cached)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        variant = await cached_variant_response_async(request, cache_key, redis_binary_client, etag)
+        if variant is not None:
+            return variant
+        return await run_in_threadpool(decode_cache_payload, cached)
+
+    payload, status = await run_sync_db(
+        db, _load_testing_laps, season, event_id, day, drivers, offset, limit, cursor
+    )
+
+    # Cache with appropriate TTL
+    ttl = COMPLETED_CACHE_TTL_SECONDS if status == "completed" else CACHE_TTL_SECONDS
+    encoded = await run_in_threadpool(encode_cache_payload, payload)
+    await async_redis_client.setex(cache_key, ttl, encoded)
+    etag = payload_etag(encoded)
+    set_etag(response, etag)
+
+    variant = await store_variants_and_respond_async(
+        request, cache_key, ttl, payload, redis_binary_client, etag
+    )
+    if variant is not None:
+        return variant
+    return payload
+
+
+def _load_testing_events(db: Session, season: int) -> Dict[str, Any]:
+    """Build the season's testing events payload."""
     # Query testing events for the season
     stmt = select(TestingEvent).where(TestingEvent.season == season).order_by(TestingEvent.start_date)
     events = db.execute(stmt).scalars().all()
@@ -79,36 +211,19 @@ def get_testing_events(
             "status": event.status,
         })
 
-    payload = {
+    return {
         "season": season,
         "events": events_data,
     }
 
-    return payload
-
 
-@router.get("/{season}/{event_id}/{day}")
-def get_testing_day(
+def _find_testing_session(
+    db: Session,
     season: int,
     event_id: str,
     day: int,
-    drivers: Optional[List[str]] = Query(
-        default=None,
-        description="Optional list of driver codes to filter (e.g., VER, HAM)",
-    ),
-    include_laps: bool = Query(
-        default=False,
-        description="Include full lap data in response (can be large)",
-    ),
-    db: Session = Depends(get_db),
-) -> Dict[str, Any]:
-    """Get detailed testing data for a specific day."""
-    cache_key = _testing_day_cache_key(season, event_id, day, drivers)
-    if not include_laps:
-        cached = redis_client.get(cache_key)
-        if cached:
-            return json.loads(cached)
-
+) -> Tuple[TestingEvent, TestingSession]:
+    """Look up a testing event and its session for a day, raising 404 if either is missing."""
     # Find the testing event
     event_stmt = select(TestingEvent).where(
         TestingEvent.season == season,
@@ -128,6 +243,19 @@ def get_testing_day(
 
     if not session:
         raise HTTPException(status_code=404, detail=f"Testing day {day} not found for event {event_id}")
+    return event, session
+
+
+def _load_testing_day(
+    db: Session,
+    season: int,
+    event_id: str,
+    day: int,
+    drivers: Optional[List[str]],
+    include_laps: bool,
+) -> Tuple[Dict[str, Any], str]:
+    """Build a testing day payload; returns (payload, session status)."""
+    event, session = _find_testing_session(db, season, event_id, day)
 
     # Build driver results
     results = _build_driver_results(db, session.id, drivers)
@@ -149,51 +277,21 @@ def get_testing_day(
     if include_laps:
         payload["laps"] = _fetch_laps(db, session.id, drivers, offset=0, limit=5000)
 
-    # Cache (skip if including laps - those are fetched via separate endpoint)
-    if not include_laps:
-        ttl = COMPLETED_CACHE_TTL_SECONDS if session.status == "completed" else CACHE_TTL_SECONDS
-        redis_client.setex(cache_key, ttl, json.dumps(payload))
-
-    return payload
+    return payload, session.status
 
 
-@router.get("/{season}/{event_id}/{day}/laps")
-def get_testing_laps(
+def _load_testing_laps(
+    db: Session,
     season: int,
     event_id: str,
     day: int,
-    drivers: Optional[List[str]] = Query(
-        default=None,
-        description="Optional list of driver codes to filter",
-    ),
-    offset: int = Query(default=0, ge=0, description="Pagination offset"),
-    limit: int = Query(default=500, ge=1, le=1000, description="Max laps to return"),
-    db: Session = Depends(get_db),
-) -> Dict[str, Any]:
-    """Get paginated lap data for a testing day."""
-    cache_key = _testing_laps_cache_key(season, event_id, day, drivers, offset, limit)
-    cached = redis_client.get(cache_key)
-    if cached:
-        return json.loads(cached)
-
-    # Find the testing event and session
-    event_stmt = select(TestingEvent).where(
-        TestingEvent.season == season,
-        TestingEvent.event_id == event_id,
-    )
-    event = db.execute(event_stmt).scalar_one_or_none()
-
-    if not event:
-        raise HTTPException(status_code=404, detail=f"Testing event not found: {event_id}")
-
-    session_stmt = select(TestingSession).where(
-        TestingSession.event_id == event.id,
-        TestingSession.day == day,
-    )
-    session = db.execute(session_stmt).scalar_one_or_none()
-
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Testing day {day} not found for event {event_id}")
+    drivers: Optional[List[str]],
+    offset: int,
+    limit: int,
+    after: Optional[Tuple[str, int]] = None,
+) -> Tuple[Dict[str, Any], str]:
+    """Build a page of testing laps; returns (payload, session status)."""
+    _, session = _find_testing_session(db, season, event_id, day)
 
     # Get total count
     count_stmt = select(func.count(TestingLap.id)).where(TestingLap.session_id == session.id)
@@ -202,76 +300,69 @@ def get_testing_laps(
     total = db.execute(count_stmt).scalar() or 0
 
     # Fetch laps
-    laps = _fetch_laps(db, session.id, drivers, offset, limit)
+    laps = _fetch_laps(db, session.id, drivers, offset, limit, after)
+    next_cursor = None
+    if len(laps) == limit:
+        next_cursor = f"{laps[-1]['driver']}:{laps[-1]['lap_number']}"
 
     payload = {
         "total": total,
         "offset": offset,
         "limit": limit,
         "laps": laps,
+        "next_cursor": next_cursor,
     }
-
-    # Cache with appropriate TTL
-    ttl = COMPLETED_CACHE_TTL_SECONDS if session.status == "completed" else CACHE_TTL_SECONDS
-    redis_client.setex(cache_key, ttl, json.dumps(payload))
-
-    return payload
+    return payload, session.status
 
 
 def _build_driver_results(db: Session, session_id: int, drivers: Optional[List[str]]) -> List[Dict[str, Any]]:
     """Build driver results with best lap and stints."""
-    # Get all drivers who have laps in this session
-    driver_stmt = select(TestingLap.driver, TestingLap.team).where(
-        TestingLap.session_id == session_id
-    ).distinct()
+    # One pass over the day's laps: each driver's lap count, and their laps
+    # ranked valid-and-timed first, fastest first (rank 1 = best lap)
+    timed = and_(TestingLap.lap_time_ms.isnot(None), TestingLap.is_valid == True)
+    ranked = select(
+        TestingLap.driver,
+        TestingLap.team,
+        TestingLap.lap_time_ms,
+        TestingLap.compound,
+        timed.label("timed"),
+        func.count(TestingLap.id).over(partition_by=TestingLap.driver).label("total_laps"),
+        func.row_number().over(
+            partition_by=TestingLap.driver,
+            order_by=(case((timed, 0), else_=1), TestingLap.lap_time_ms, TestingLap.lap_number),
+        ).label("lap_rank"),
+    ).where(TestingLap.session_id == session_id)
     if drivers:
-        driver_stmt = driver_stmt.where(TestingLap.driver.in_(drivers))
+        ranked = ranked.where(TestingLap.driver.in_(drivers))
+    ranked = ranked.subquery()
+    driver_rows = db.execute(select(ranked).where(ranked.c.lap_rank == 1)).all()
 
-    driver_rows = db.execute(driver_stmt).all()
+    stints_stmt = select(TestingStint).where(
+        TestingStint.session_id == session_id,
+    ).order_by(TestingStint.driver, TestingStint.stint_number)
+    if drivers:
+        stints_stmt = stints_stmt.where(TestingStint.driver.in_(drivers))
+    stints_by_driver: Dict[str, List[Dict[str, Any]]] = {}
+    for stint in db.execute(stints_stmt).scalars():
+        stints_by_driver.setdefault(stint.driver, []).append({
+            "stint_number": stint.stint_number,
+            "compound": stint.compound,
+            "lap_count": stint.lap_count,
+            "avg_pace_ms": stint.avg_pace_ms,
+            "avg_pace_formatted": _format_lap_time(stint.avg_pace_ms),
+        })
 
     results = []
-    for driver_code, team in driver_rows:
-        # Get best lap for this driver
-        best_lap_stmt = select(TestingLap).where(
-            TestingLap.session_id == session_id,
-            TestingLap.driver == driver_code,
-            TestingLap.lap_time_ms.isnot(None),
-            TestingLap.is_valid == True,
-        ).order_by(TestingLap.lap_time_ms).limit(1)
-        best_lap = db.execute(best_lap_stmt).scalar_one_or_none()
-
-        # Get total laps
-        total_laps_stmt = select(func.count(TestingLap.id)).where(
-            TestingLap.session_id == session_id,
-            TestingLap.driver == driver_code,
-        )
-        total_laps = db.execute(total_laps_stmt).scalar() or 0
-
-        # Get stints
-        stints_stmt = select(TestingStint).where(
-            TestingStint.session_id == session_id,
-            TestingStint.driver == driver_code,
-        ).order_by(TestingStint.stint_number)
-        stints = db.execute(stints_stmt).scalars().all()
-
-        stints_data = []
-        for stint in stints:
-            stints_data.append({
-                "stint_number": stint.stint_number,
-                "compound": stint.compound,
-                "lap_count": stint.lap_count,
-                "avg_pace_ms": stint.avg_pace_ms,
-                "avg_pace_formatted": _format_lap_time(stint.avg_pace_ms),
-            })
-
+    for row in driver_rows:
+        best_ms = row.lap_time_ms if row.timed else None
         results.append({
-            "driver": driver_code,
-            "team": team,
-            "best_lap_ms": best_lap.lap_time_ms if best_lap else None,
-            "best_lap_formatted": _format_lap_time(best_lap.lap_time_ms) if best_lap else None,
-            "best_lap_compound": best_lap.compound if best_lap else None,
-            "total_laps": total_laps,
-            "stints": stints_data,
+            "driver": row.driver,
+            "team": row.team,
+            "best_lap_ms": best_ms,
+            "best_lap_formatted": _format_lap_time(best_ms),
+            "best_lap_compound": row.compound if row.timed else None,
+            "total_laps": row.total_laps,
+            "stints": stints_by_driver.get(row.driver, []),
         })
 
     # Sort by best lap time and add position + gaps
@@ -291,8 +382,15 @@ def _build_driver_results(db: Session, session_id: int, drivers: Optional[List[s
     return results
 
 
-def _fetch_laps(db: Session, session_id: int, drivers: Optional[List[str]], offset: int, limit: int) -> List[Dict[str, Any]]:
-    """Fetch paginated laps for a session."""
+def _fetch_laps(
+    db: Session,
+    session_id: int,
+    drivers: Optional[List[str]],
+    offset: int,
+    limit: int,
+    after: Optional[Tuple[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch paginated laps for a session (by offset, or after a (driver, lap) key)."""
     stmt = select(TestingLap).where(
         TestingLap.session_id == session_id
     ).order_by(TestingLap.driver, TestingLap.lap_number)
@@ -300,7 +398,12 @@ def _fetch_laps(db: Session, session_id: int, drivers: Optional[List[str]], offs
     if drivers:
         stmt = stmt.where(TestingLap.driver.in_(drivers))
 
-    stmt = stmt.offset(offset).limit(limit)
+    if after:
+        # Seeks along uq_testing_lap (session_id, driver, lap_number)
+        stmt = stmt.where(tuple_(TestingLap.driver, TestingLap.lap_number) > after)
+    else:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(limit)
     laps = db.execute(stmt).scalars().all()
 
     return [
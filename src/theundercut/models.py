@@ -11,6 +11,7 @@ from sqlalchemy import (
     Date,
     UniqueConstraint,
     Index,
+    select,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -27,21 +28,71 @@ class CalendarEvent(Base):
     meeting_key  = Column(Integer)                       # OpenF1 join‑key
     status       = Column(String, default="scheduled")   # scheduled | running | ingested
 
+def _race_id_part(index: int):
+    """Column default deriving season (0) or round (1) from the row's race_id."""
+    def _default(context):
+        race_id = context.get_current_parameters().get("race_id") or ""
+        parts = race_id.split("-", 1)
+        return int(parts[index]) if len(parts) == 2 and parts[index].isdigit() else None
+    return _default
+
+
+def _race_key_default(context):
+    """Column default looking up the core.races id of the row's race_id."""
+    parts = (context.get_current_parameters().get("race_id") or "").split("-", 1)
+    if len(parts) != 2 or not all(part.isdigit() for part in parts):
+        return None
+    return context.connection.scalar(
+        select(Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .where(Season.year == int(parts[0]), Race.round_number == int(parts[1]))
+        .order_by(Race.id)
+        .limit(1)
+    )
+
+
+# lap_times and stints are range-partitioned by season in Postgres (see the
+# f9c1e7a3b2d4 migration). The database primary key is (id, season) and every
+# unique index leads with season; the ORM keeps `id` as its identity.
+# Rows are keyed by `race_key` (core.races.id), NOT NULL in Postgres: writers
+# resolve it with `services.race_keys.ensure_race_key`, and ORM inserts look
+# it up from race_id. The string race_id is kept for compatibility only.
 class LapTime(Base):
     __tablename__ = "lap_times"
+    __table_args__ = (
+        # Covering: per-race lap reads are index-only scans within a partition
+        Index(
+            "uq_lap_times_race_key_driver_lap",
+            "season", "race_key", "driver", "lap",
+            unique=True,
+            postgresql_include=["lap_ms", "compound", "stint_no", "pit"],
+        ),
+        # `since=<lap>` delta reads range-scan one race's laps across drivers
+        Index("ix_lap_times_race_key_lap", "season", "race_key", "lap"),
+    )
     id         = Column(Integer, primary_key=True)
-    race_id    = Column(String, nullable=False)          # season‑round "2024-5"
+    season     = Column(Integer, nullable=False, default=_race_id_part(0))  # Partition key
+    round      = Column(Integer, default=_race_id_part(1))
+    race_key   = Column(Integer, ForeignKey("core.races.id"), default=_race_key_default)
+    race_id    = Column(String, nullable=False)          # season‑round "2024-5" (compatibility)
     driver     = Column(String(3), nullable=False)
     lap        = Column(Integer)
     lap_ms     = Column(Integer)
     compound   = Column(String(10))
     stint_no   = Column(Integer)
     pit        = Column(Boolean)
+    provisional = Column(Boolean, nullable=False, default=False)  # Live poller row, replaced by the final ingest
 
 class Stint(Base):
     __tablename__ = "stints"
+    __table_args__ = (
+        Index("ix_stints_race_key_driver", "season", "race_key", "driver", "stint_no"),
+    )
     id        = Column(Integer, primary_key=True)
-    race_id   = Column(String, nullable=False)
+    season    = Column(Integer, nullable=False, default=_race_id_part(0))  # Partition key
+    round     = Column(Integer, default=_race_id_part(1))
+    race_key  = Column(Integer, ForeignKey("core.races.id"), default=_race_key_default)
+    race_id   = Column(String, nullable=False)  # compatibility
     driver    = Column(String(3), nullable=False)
     stint_no  = Column(Integer)
     compound  = Column(String(10))
@@ -140,6 +191,67 @@ class DriverMetrics(Base):
     created_at      = Column(DateTime(timezone=True))
 
 
+class SeasonDriverAggregate(Base):
+    """Season totals and averages of a driver's Drive Grade and strategy scores.
+
+    Refreshed for the affected season after each race ingest, so season
+    leaderboards are one read instead of a scan of every race.
+    """
+    __tablename__ = "season_driver_aggregates"
+    __table_args__ = (
+        UniqueConstraint("season", "driver_code", name="uq_season_driver_aggregate"),
+        {"schema": "core"},
+    )
+
+    id                  = Column(Integer, primary_key=True)
+    season              = Column(Integer, nullable=False)
+    driver_code         = Column(String(3), nullable=False)
+    team                = Column(String)       # Team of the driver's latest race
+    races               = Column(Integer, nullable=False, default=0)  # Races with a Drive Grade
+    total_grade         = Column(Float)
+    average_grade       = Column(Float)
+    avg_consistency     = Column(Float)
+    avg_team_strategy   = Column(Float)
+    avg_racecraft       = Column(Float)
+    avg_penalties       = Column(Float)
+    strategy_races      = Column(Integer, nullable=False, default=0)  # Races with a strategy score
+    avg_strategy_score  = Column(Float)
+    avg_pit_timing      = Column(Float)
+    avg_tire_selection  = Column(Float)
+    avg_safety_car      = Column(Float)
+    avg_weather         = Column(Float)
+    calibration_profile = Column(String)
+    updated_at          = Column(DateTime(timezone=True))
+
+
+class SeasonConstructorAggregate(Base):
+    """Season aggregates per team, over all of its drivers' races (see SeasonDriverAggregate)."""
+    __tablename__ = "season_constructor_aggregates"
+    __table_args__ = (
+        UniqueConstraint("season", "team", name="uq_season_constructor_aggregate"),
+        {"schema": "core"},
+    )
+
+    id                  = Column(Integer, primary_key=True)
+    season              = Column(Integer, nullable=False)
+    team                = Column(String, nullable=False)
+    races               = Column(Integer, nullable=False, default=0)  # Distinct races with a Drive Grade
+    total_grade         = Column(Float)
+    average_grade       = Column(Float)
+    avg_consistency     = Column(Float)
+    avg_team_strategy   = Column(Float)
+    avg_racecraft       = Column(Float)
+    avg_penalties       = Column(Float)
+    strategy_races      = Column(Integer, nullable=False, default=0)
+    avg_strategy_score  = Column(Float)
+    avg_pit_timing      = Column(Float)
+    avg_tire_selection  = Column(Float)
+    avg_safety_car      = Column(Float)
+    avg_weather         = Column(Float)
+    calibration_profile = Column(String)
+    updated_at          = Column(DateTime(timezone=True))
+
+
 class StrategyEvent(Base):
     __tablename__ = "strategy_events"
     __table_args__ = {"schema": "core"}
@@ -340,7 +452,7 @@ class SessionClassification(Base):
     time_ms       = Column(Float)   # Best lap time (practice) or classified time (race)
     gap_ms        = Column(Float)   # Gap to leader
     laps          = Column(Integer)
-    points        = Column(Integer) # For race/sprint sessions
+    points        = Column(Float)   # For race/sprint sessions (half points exist)
     # Qualifying-specific fields
     q1_time_ms    = Column(Float)
     q2_time_ms    = Column(Float)
@@ -351,6 +463,96 @@ class SessionClassification(Base):
     amended       = Column(Boolean, default=False)  # True if post-race penalty changed classification
 
 
+class DriverStanding(Base):
+    """Driver championship standings after each round.
+
+    Derived from race and sprint rows in session_classifications and updated
+    by ingestion, so standings reads never wait on Jolpica. `recent_points`
+    holds the driver's last five round totals for the pts_last_5 metric;
+    `races_completed`/`races_remaining` are the calendar counts when the
+    round was written.
+    """
+    __tablename__ = "driver_standings"
+    __table_args__ = (
+        UniqueConstraint("season", "round", "driver_code", name="uq_driver_standing"),
+        Index("ix_driver_standing_season_round", "season", "round", "position"),
+    )
+
+    id                = Column(Integer, primary_key=True)
+    season            = Column(Integer, nullable=False)
+    round             = Column(Integer, nullable=False)
+    driver_code       = Column(String(3), nullable=False)
+    driver_name       = Column(String(100))
+    team              = Column(String(50))
+    position          = Column(Integer, nullable=False)
+    points            = Column(Float, nullable=False, default=0)  # Cumulative, race + sprint
+    round_points      = Column(Float, nullable=False, default=0)
+    wins              = Column(Integer, nullable=False, default=0)
+    races             = Column(Integer, nullable=False, default=0)
+    poles             = Column(Integer, nullable=False, default=0)
+    start_pos_total   = Column(Integer, nullable=False, default=0)  # Qualifying position as grid proxy
+    finish_pos_total  = Column(Integer, nullable=False, default=0)
+    positions_gained  = Column(Integer, nullable=False, default=0)
+    recent_points     = Column(JSON)
+    races_completed   = Column(Integer)
+    races_remaining   = Column(Integer)
+    updated_at        = Column(DateTime(timezone=True))
+
+
+class ConstructorStanding(Base):
+    """Constructor championship standings after each round (see DriverStanding)."""
+    __tablename__ = "constructor_standings"
+    __table_args__ = (
+        UniqueConstraint("season", "round", "team", name="uq_constructor_standing"),
+        Index("ix_constructor_standing_season_round", "season", "round", "position"),
+    )
+
+    id                = Column(Integer, primary_key=True)
+    season            = Column(Integer, nullable=False)
+    round             = Column(Integer, nullable=False)
+    team              = Column(String(50), nullable=False)
+    position          = Column(Integer, nullable=False)
+    points            = Column(Float, nullable=False, default=0)
+    round_points      = Column(Float, nullable=False, default=0)
+    wins              = Column(Integer, nullable=False, default=0)
+    positions_gained  = Column(Integer, nullable=False, default=0)
+    recent_points     = Column(JSON)
+    updated_at        = Column(DateTime(timezone=True))
+
+
+class RaceSummary(Base):
+    """Per-race summary for the homepage: podium, winner, fastest lap, team mapping.
+
+    Written by ingestion after each race so the homepage is one indexed read
+    instead of re-aggregating lap_times on every render. The date, circuit,
+    pole and top-10 `results` are the standings' `last_race`/`race_summaries`.
+    """
+    __tablename__ = "race_summary"
+    __table_args__ = (
+        UniqueConstraint("season", "round", name="uq_race_summary"),
+    )
+
+    id                 = Column(Integer, primary_key=True)
+    season             = Column(Integer, nullable=False)
+    round              = Column(Integer, nullable=False)
+    race_id            = Column(String, nullable=False)   # season-round "2024-5"
+    race_name          = Column(String(100))
+    winner_code        = Column(String(3))
+    winner_team        = Column(String(50))
+    podium             = Column(JSON)      # [{position, driver, team}]
+    fastest_lap_driver = Column(String(3))
+    fastest_lap_ms     = Column(Integer)
+    fastest_lap_number = Column(Integer)
+    laps_completed     = Column(Integer)
+    team_map           = Column(JSON)      # {driver_code: team}
+    source             = Column(String(20))  # classification | laps
+    race_date          = Column(String(10))  # ISO date
+    circuit            = Column(String(100))
+    pole               = Column(String(3))
+    results            = Column(JSON)      # top 10 [{position, driver_code, grid, points, ...}]
+    updated_at         = Column(DateTime(timezone=True))
+
+
 # --- Enhanced Strategy Score tables -----------------------------------------------
 
 class StrategyScore(Base):
@@ -10,7 +10,9 @@ from rq_scheduler import Scheduler
 from theundercut.adapters.redis_cache import redis_client
 from theundercut.scheduler_jobs import (
     daily_calendar_sync,
+    daily_standings_check,
     mark_sessions_live,
+    poll_live_sessions,
     daily_testing_sync,
     _enqueue_upcoming_impl,
     _enqueue_testing_ingestion_impl,
@@ -34,9 +36,15 @@ if __name__ == "__main__":
     # Daily calendar refresh at 04:00 UTC
     scheduler.cron("0 4 * * *", func=daily_calendar_sync, repeat=None)
 
+    # Cross-check local standings against Jolpica at 06:00 UTC
+    scheduler.cron("0 6 * * *", func=daily_standings_check, repeat=None)
+
     # Mark sessions as live every minute (detects session starts)
     scheduler.cron("* * * * *", func=mark_sessions_live, repeat=None)
 
+    # Append laps published since the last poll while a race is live
+    scheduler.cron("* * * * *", func=poll_live_sessions, repeat=None)
+
     # Queue ingestion for completed sessions every 10 minutes
     scheduler.cron("*/10 * * * *", func=enqueue_upcoming, repeat=None)
 
@@ -5,14 +5,32 @@ These functions are called by the RQ Scheduler. They are extracted into
 a separate module to allow testing without importing the scheduler infrastructure.
 """
 import datetime as dt
+import time
+import uuid
+from typing import Optional
 
-from theundercut.adapters.db import SessionLocal
+from theundercut.adapters.db import SessionLocal, pin_reads_to_primary
+from theundercut.adapters.redis_cache import redis_client
 from theundercut.models import CalendarEvent, TestingEvent, TestingSession
 from theundercut.adapters.calendar_loader import sync_year
-from theundercut.services.cache import invalidate_race_weekend_cache
+from theundercut.services.cache import (
+    invalidate_race_weekend_cache,
+    invalidate_standings_cache,
+)
+from theundercut.services.race_events import publish_session_status
 from theundercut.services.testing_ingestion import sync_testing_events
 
 
+# How long after end_ts a race still marked live keeps being polled
+LIVE_POLL_OVERRUN = dt.timedelta(hours=2)
+# Held while a live poll runs, so a slow poll is skipped rather than overlapped,
+# and by the final ingest across its handover; the TTL frees it if the worker
+# dies mid-poll
+LIVE_POLL_LOCK_KEY = "live-poll:lock:v1"
+LIVE_POLL_LOCK_SECONDS = 300
+LIVE_POLL_LOCK_RETRY_SECONDS = 1
+
+
 def _utc_now() -> dt.datetime:
     """Return current UTC time as timezone-aware datetime."""
     return dt.datetime.now(dt.timezone.utc)
@@ -25,6 +43,33 @@ def daily_calendar_sync():
         sync_year(db, year)
 
 
+def daily_standings_check():
+    """
+    Cross-check the locally computed standings against Jolpica.
+
+    On a mismatch the season is rebuilt from its classifications, which picks
+    up amendments that arrived without a fresh ingest.
+    """
+    from theundercut.services.standings import cross_check_standings, update_standings
+
+    year = _utc_now().year
+    with SessionLocal() as db:
+        report = cross_check_standings(db, year)
+        if not report["checked"] or not (report["drivers"] or report["constructors"]):
+            return
+        update_standings(db, year)
+        db.commit()
+        print(
+            f"[scheduler] rebuilt {year} standings: {len(report['drivers'])} driver and "
+            f"{len(report['constructors'])} constructor totals differed from Jolpica"
+        )
+    try:
+        pin_reads_to_primary(year)
+        invalidate_standings_cache(year)
+    except Exception as exc:
+        print(f"[scheduler] cache invalidation failed: {exc}")
+
+
 def mark_sessions_live():
     """
     Mark sessions as 'live' when they start.
@@ -41,8 +86,10 @@ def mark_sessions_live():
             )
             .all()
         )
+        started = []
         for ev in rows:
             ev.status = "live"
+            started.append((ev.season, ev.round, ev.session_type))
             print(f"[scheduler] session live: {ev.season}-{ev.round}-{ev.session_type}")
             # Invalidate cache so frontend sees updated status
             try:
@@ -50,6 +97,69 @@ def mark_sessions_live():
             except Exception as exc:
                 print(f"[scheduler] cache invalidation failed: {exc}")
         db.commit()
+    for season, rnd, session_type in started:
+        publish_session_status(season, rnd, session_type, "live")
+
+
+def poll_live_sessions():
+    """
+    Ingest the laps of live races published since the previous poll.
+    Runs every minute; the final ingest queued for end_ts + 5 min takes over.
+    A run that finds the previous one still going is skipped.
+    """
+    token = acquire_live_poll_lock()
+    if token is None:
+        print("[scheduler] previous live poll still running; skipping")
+        return
+    try:
+        _poll_live_sessions_impl()
+    finally:
+        release_live_poll_lock(token)
+
+
+def acquire_live_poll_lock(wait_seconds: float = 0) -> Optional[str]:
+    """
+    Take the live poll lock, retrying for up to `wait_seconds`.
+
+    Returns the token to release it with, or None if it is still held.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_seconds
+    while not redis_client.set(LIVE_POLL_LOCK_KEY, token, nx=True, ex=LIVE_POLL_LOCK_SECONDS):
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(LIVE_POLL_LOCK_RETRY_SECONDS)
+    return token
+
+
+def release_live_poll_lock(token: str) -> None:
+    """Release the live poll lock if `token` still holds it."""
+    # Only release our own lock; one that expired may have been retaken
+    if redis_client.get(LIVE_POLL_LOCK_KEY) == token:
+        redis_client.delete(LIVE_POLL_LOCK_KEY)
+
+
+def _poll_live_sessions_impl():
+    from theundercut.services.live_ingestion import is_live_session_type, poll_live_session
+
+    now = _utc_now()
+    with SessionLocal() as db:
+        rows = (
+            db.query(CalendarEvent)
+            .filter(
+                CalendarEvent.status == "live",
+                CalendarEvent.start_ts <= now,
+                # Red flags can run a race past end_ts; the final ingest ends polling
+                CalendarEvent.end_ts >= now - LIVE_POLL_OVERRUN,
+            )
+            .all()
+        )
+        live = [(ev.season, ev.round, ev.session_type) for ev in rows if is_live_session_type(ev.session_type)]
+    for season, rnd, session_type in live:
+        try:
+            poll_live_session(season, rnd, session_type)
+        except Exception as exc:
+            print(f"[scheduler] live poll failed for {season}-{rnd}-{session_type}: {exc}")
 
 
 def _enqueue_upcoming_impl(scheduler):
@@ -76,6 +186,7 @@ def _enqueue_upcoming_impl(scheduler):
             )
             .all()
         )
+        started = []
         for ev in rows:
             job_id = f"{ev.season}-{ev.round}-{ev.session_type}"
             if scheduler.job_exists(job_id):
@@ -89,6 +200,7 @@ def _enqueue_upcoming_impl(scheduler):
                     invalidate_race_weekend_cache(ev.season, ev.round)
                 except Exception as exc:
                     print(f"[scheduler] cache invalidation failed: {exc}")
+                started.append((ev.season, ev.round, ev.session_type))
 
             scheduler.enqueue_at(
                 ev.end_ts + dt.timedelta(minutes=5),
@@ -101,6 +213,8 @@ def _enqueue_upcoming_impl(scheduler):
             print(f"[scheduler] queued {job_id}")
             # Status stays 'live' - ingestion job will set to 'ingested'
         db.commit()
+    for season, rnd, session_type in started:
+        publish_session_status(season, rnd, session_type, "live")
 
 
 def daily_testing_sync():
@@ -0,0 +1,156 @@
+"""
+Benchmark testing-day lap preparation: row-wise (iterrows) vs vectorised.
+
+Builds a synthetic FastF1-shaped laps frame for a multi-day test and times
+turning it into testing_laps and testing_stints records, without a database.
+
+    python -m theundercut.scripts.benchmark_testing_ingestion [--days 3] [--drivers 20] [--laps 150]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from theundercut.services.testing_ingestion import (
+    LAP_COLUMNS,
+    _prepare_testing_laps,
+    _records,
+    _summarise_stints,
+)
+
+COMPOUNDS = ["SOFT", "MEDIUM", "HARD", "C5", "INTERMEDIATE"]
+
+
+def synthetic_test(days: int, drivers: int, laps_per_driver: int, seed: int = 7) -> List[pd.DataFrame]:
+    """One FastF1-like laps frame per day (Timedelta times, ~3% missing laps/sectors)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(days):
+        n = drivers * laps_per_driver
+        lap_s = rng.normal(93.0, 2.5, n)
+        sectors = lap_s[:, None] * np.array([0.28, 0.40, 0.32])
+        missing = rng.random(n) < 0.03
+        stint = np.tile(np.arange(laps_per_driver) // 12 + 1, drivers)
+
+        def _td(seconds):
+            td = pd.to_timedelta(seconds, unit="s")
+            return td.where(~missing, pd.NaT)
+
+        frames.append(pd.DataFrame({
+            "Driver": np.repeat([f"D{i:02d}" for i in range(drivers)], laps_per_driver),
+            "Team": np.repeat([f"Team {i // 2}" for i in range(drivers)], laps_per_driver),
+            "LapNumber": np.tile(np.arange(1, laps_per_driver + 1), drivers).astype(float),
+            "LapTime": _td(lap_s),
+            "Compound": np.array(COMPOUNDS)[stint % len(COMPOUNDS)],
+            "Stint": stint.astype(float),
+            "Sector1Time": _td(sectors[:, 0]),
+            "Sector2Time": _td(sectors[:, 1]),
+            "Sector3Time": _td(sectors[:, 2]),
+            "IsAccurate": rng.random(n) > 0.1,
+        }))
+    return frames
+
+
+def rowwise_records(laps_df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
+    """The previous iterrows-based lap and stint record building, kept for comparison."""
+    laps = []
+    for _, row in laps_df.iterrows():
+        driver_raw = row.get("Driver")
+        if pd.isna(driver_raw) or driver_raw is None:
+            continue
+        driver = str(driver_raw).strip()
+        if not driver or driver == "nan" or driver == "None":
+            continue
+        lap_time = row.get("LapTime")
+        lap_time_ms = None
+        if pd.notna(lap_time):
+            if hasattr(lap_time, "total_seconds"):
+                lap_time_ms = lap_time.total_seconds() * 1000
+            else:
+                lap_time_ms = float(lap_time) if lap_time else None
+        s1, s2, s3 = row.get("Sector1Time"), row.get("Sector2Time"), row.get("Sector3Time")
+        is_valid = row.get("IsAccurate", True)
+        if pd.isna(is_valid):
+            is_valid = True
+        laps.append({
+            "driver": driver,
+            "team": str(row.get("Team", "")) if pd.notna(row.get("Team")) else None,
+            "lap_number": int(row.get("LapNumber", 0)) if pd.notna(row.get("LapNumber")) else 0,
+            "lap_time_ms": lap_time_ms,
+            "compound": str(row.get("Compound", "")) if pd.notna(row.get("Compound")) else None,
+            "stint_number": int(row.get("Stint", 0)) if pd.notna(row.get("Stint")) else None,
+            "sector_1_ms": s1.total_seconds() * 1000 if pd.notna(s1) and hasattr(s1, "total_seconds") else None,
+            "sector_2_ms": s2.total_seconds() * 1000 if pd.notna(s2) and hasattr(s2, "total_seconds") else None,
+            "sector_3_ms": s3.total_seconds() * 1000 if pd.notna(s3) and hasattr(s3, "total_seconds") else None,
+            "is_valid": bool(is_valid),
+        })
+
+    stint_data = (
+        laps_df
+        .groupby(["Driver", "Stint", "Compound", "Team"])
+        .agg(
+            start_lap=("LapNumber", "min"),
+            end_lap=("LapNumber", "max"),
+            lap_count=("LapNumber", "count"),
+            avg_pace=("LapTime", "mean"),
+        )
+        .reset_index()
+    )
+    stints = []
+    for _, row in stint_data.iterrows():
+        avg_pace = row.get("avg_pace")
+        stints.append({
+            "driver": str(row.get("Driver", "")),
+            "stint_number": int(row.get("Stint")),
+            "compound": str(row.get("Compound", "")),
+            "lap_count": int(row.get("lap_count", 0)),
+            "avg_pace_ms": avg_pace.total_seconds() * 1000 if pd.notna(avg_pace) else None,
+        })
+    return laps, stints
+
+
+def vectorised_records(laps_df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
+    laps = _prepare_testing_laps(laps_df)
+    return _records(laps[LAP_COLUMNS], 0), _records(_summarise_stints(laps), 0)
+
+
+def _time(fn: Callable, frames: List[pd.DataFrame], repeat: int) -> Tuple[float, int, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        lap_count = stint_count = 0
+        for frame in frames:
+            laps, stints = fn(frame)
+            lap_count += len(laps)
+            stint_count += len(stints)
+        best = min(best, time.perf_counter() - started)
+    return best, lap_count, stint_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--laps", type=int, default=150, help="Laps per driver per day")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = synthetic_test(args.days, args.drivers, args.laps)
+    total = sum(len(frame) for frame in frames)
+    print(f"Synthetic test: {args.days} days, {args.drivers} drivers, {total} laps")
+
+    rowwise, laps, stints = _time(rowwise_records, frames, args.repeat)
+    vectorised, v_laps, v_stints = _time(vectorised_records, frames, args.repeat)
+    assert (laps, stints) == (v_laps, v_stints), "implementations disagree on record counts"
+
+    print(f"  iterrows:   {rowwise * 1000:8.1f} ms  ({laps} laps, {stints} stints)")
+    print(f"  vectorised: {vectorised * 1000:8.1f} ms")
+    print(f"  speedup:    {rowwise / vectorised:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import datetime as dt
+from itertools import groupby
+from operator import itemgetter
 from statistics import mean
-from typing import Iterable, List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Sequence, Set
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -18,10 +20,11 @@ from theundercut.models import (
     Season,
     Driver,
 )
+from theundercut.services.race_keys import lookup_race_keys, race_column
 
 
-def _race_id(season: int, rnd: int) -> str:
-    return f"{season}-{rnd}"
+# Bumped whenever the cached table layout changes.
+ANALYTICS_TABLE_FORMAT = "columnar-v2"
 
 
 # Static F1 car number -> driver code mapping (2024 season)
@@ -39,71 +42,109 @@ F1_CAR_NUMBER_MAP: Dict[str, str] = {
 }
 
 
-def _build_car_number_to_code_map(db: Session, season: int, rnd: int) -> Dict[str, str]:
-    """Build a mapping from car number (as string) to driver code (e.g., '1' -> 'VER')."""
-    # Try to get mapping from database first
+def _build_car_number_to_code_maps(
+    db: Session, season: int, rounds: Sequence[int]
+) -> Dict[int, Dict[str, str]]:
+    """Build car number (as string) -> driver code maps for several rounds at once."""
+    # Try to get mappings from database first
     rows = (
-        db.query(Entry.car_number, Driver.code)
+        db.query(Race.round_number, Entry.car_number, Driver.code)
         .join(Driver, Entry.driver_id == Driver.id)
         .join(Race, Entry.race_id == Race.id)
         .join(Season, Race.season_id == Season.id)
-        .filter(Season.year == season, Race.round_number == rnd)
+        .filter(Season.year == season, Race.round_number.in_(rounds))
         .all()
     )
-    db_map = {str(car_num): code for car_num, code in rows if car_num is not None}
+    db_maps: Dict[int, Dict[str, str]] = {}
+    for rnd, car_num, code in rows:
+        if car_num is not None:
+            db_maps.setdefault(rnd, {})[str(car_num)] = code
 
-    # Fall back to static mapping if database is empty
-    if db_map:
-        return db_map
-    return F1_CAR_NUMBER_MAP.copy()
+    # Fall back to static mapping for rounds the database has no entries for
+    return {rnd: db_maps.get(rnd) or F1_CAR_NUMBER_MAP.copy() for rnd in rounds}
 
 
-def _normalise_laps(
+LAP_COLUMNS = ("driver", "lap", "lap_ms", "compound", "stint_no", "pit")
+STINT_COLUMNS = ("driver", "stint_no", "compound", "laps", "avg_lap_ms")
+
+# Independently built parts of a race table, and the response fields.
+# `car_numbers` is the car number -> code map the rows were built with, so
+# driver filters given as car numbers match the mapped rows.
+ANALYTICS_TABLE_SECTIONS = ("laps", "stints", "driver_metric_grades", "car_numbers")
+ANALYTICS_FIELDS = ("laps", "stints", "driver_pace_grades")
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+def _lap_columns(
     rows: Iterable, car_to_code: Dict[str, str]
-) -> List[Dict[str, Any]]:
-    laps: List[Dict[str, Any]] = []
+) -> Dict[str, List[Any]]:
+    """Turn lap rows into one list per column, mapping car numbers to codes."""
+    columns: Dict[str, List[Any]] = {name: [] for name in LAP_COLUMNS}
+    drivers = columns["driver"]
+    lap_numbers = columns["lap"]
+    lap_times = columns["lap_ms"]
+    compounds = columns["compound"]
+    stint_numbers = columns["stint_no"]
+    pits = columns["pit"]
     for driver, lap, lap_ms, compound, stint_no, pit in rows:
-        driver_code = car_to_code.get(str(driver), str(driver))
-        laps.append(
-            {
-                "driver": driver_code,
-                "lap": int(lap) if lap is not None else None,
-                "lap_ms": int(lap_ms) if lap_ms is not None else None,
-                "compound": compound,
-                "stint_no": int(stint_no) if stint_no is not None else None,
-                "pit": bool(pit) if pit is not None else False,
-            }
-        )
-    return laps
+        drivers.append(car_to_code.get(str(driver), str(driver)))
+        lap_numbers.append(_optional_int(lap))
+        lap_times.append(_optional_int(lap_ms))
+        compounds.append(compound)
+        stint_numbers.append(_optional_int(stint_no))
+        pits.append(bool(pit) if pit is not None else False)
+    return columns
 
 
-def _normalise_stints(
+def _stint_columns(
     rows: Iterable, car_to_code: Dict[str, str]
-) -> List[Dict[str, Any]]:
-    stints: List[Dict[str, Any]] = []
+) -> Dict[str, List[Any]]:
+    """Turn stint rows into one list per column, mapping car numbers to codes."""
+    columns: Dict[str, List[Any]] = {name: [] for name in STINT_COLUMNS}
+    drivers = columns["driver"]
+    stint_numbers = columns["stint_no"]
+    compounds = columns["compound"]
+    lap_counts = columns["laps"]
+    averages = columns["avg_lap_ms"]
     for driver, stint_no, compound, laps, avg_lap_ms in rows:
-        driver_code = car_to_code.get(str(driver), str(driver))
-        stints.append(
-            {
-                "driver": driver_code,
-                "stint_no": int(stint_no) if stint_no is not None else None,
-                "compound": compound,
-                "laps": int(laps) if laps is not None else None,
-                "avg_lap_ms": float(avg_lap_ms) if avg_lap_ms is not None else None,
-            }
-        )
-    return stints
+        drivers.append(car_to_code.get(str(driver), str(driver)))
+        stint_numbers.append(_optional_int(stint_no))
+        compounds.append(compound)
+        lap_counts.append(_optional_int(laps))
+        averages.append(float(avg_lap_ms) if avg_lap_ms is not None else None)
+    return columns
+
+
+def _select_rows(
+    columns: Dict[str, List[Any]],
+    names: Sequence[str],
+    drivers: Optional[Set[str]],
+) -> List[Dict[str, Any]]:
+    """Materialise row dicts from columns, keeping only the requested drivers."""
+    driver_column = columns["driver"]
+    if drivers is None:
+        indices: Iterable[int] = range(len(driver_column))
+    else:
+        indices = [i for i, code in enumerate(driver_column) if code in drivers]
+    return [{name: columns[name][i] for name in names} for i in indices]
 
 
-def _compute_driver_pace_grade_table(laps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _compute_driver_pace_grade_table(
+    drivers: Sequence[str],
+    lap_times: Sequence[Optional[int]],
+    include: Optional[Set[str]] = None,
+) -> List[Dict[str, Any]]:
     """Temporary heuristic until T6 precomputes richer metrics."""
     # Group lap_ms per driver ignoring invalid values
     per_driver: Dict[str, List[int]] = {}
-    for lap in laps:
-        lap_ms = lap["lap_ms"]
-        driver = lap["driver"]
+    for driver, lap_ms in zip(drivers, lap_times):
         if lap_ms is None or lap_ms <= 0:
             continue
+        if include is not None and driver not in include:
+            continue
         per_driver.setdefault(driver, []).append(lap_ms)
 
     if not per_driver:
@@ -138,10 +179,11 @@ def _compute_driver_pace_grade_table(laps: List[Dict[str, Any]]) -> List[Dict[st
 def _fetch_driver_metric_grades(
     db: Session,
     season: int,
-    rnd: int,
-) -> list[dict]:
+    rounds: Sequence[int],
+) -> Dict[int, list[dict]]:
     rows = (
         db.query(
+            Race.round_number,
             Driver.code,
             DriverMetrics.total_grade,
             DriverMetrics.consistency_score,
@@ -153,46 +195,97 @@ def _fetch_driver_metric_grades(
         .join(Driver, Entry.driver_id == Driver.id)
         .join(Race, Entry.race_id == Race.id)
         .join(Season, Race.season_id == Season.id)
-        .filter(Season.year == season, Race.round_number == rnd)
-        .order_by(Driver.code)
+        .filter(Season.year == season, Race.round_number.in_(rounds))
+        .order_by(Race.round_number, Driver.code)
         .all()
     )
-    return [
-        {
-            "driver": code,
-            "total_grade": float(total or 0.0),
-            "consistency": float(consistency or 0.0),
-            "team_strategy": float(strategy or 0.0),
-            "racecraft": float(racecraft or 0.0),
-            "penalties": float(penalties or 0.0),
-            "source": "drive_grade_db",
-        }
-        for code, total, consistency, strategy, racecraft, penalties in rows
-    ]
+    grades: Dict[int, list[dict]] = {rnd: [] for rnd in rounds}
+    for rnd, code, total, consistency, strategy, racecraft, penalties in rows:
+        grades[rnd].append(
+            {
+                "driver": code,
+                "total_grade": float(total or 0.0),
+                "consistency": float(consistency or 0.0),
+                "team_strategy": float(strategy or 0.0),
+                "racecraft": float(racecraft or 0.0),
+                "penalties": float(penalties or 0.0),
+                "source": "drive_grade_db",
+            }
+        )
+    return grades
 
 
-def fetch_race_analytics(
+def _columns_by_driver(
+    columns: Dict[str, List[Any]],
+    names: Sequence[str],
+    drivers: Optional[Set[str]],
+) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Split table columns into one set of arrays per driver.
+
+    Tables are ordered by driver, so each driver is a contiguous run and its
+    arrays are plain list slices.
+    """
+    driver_column = columns["driver"]
+    result: Dict[str, Dict[str, List[Any]]] = {}
+    start = 0
+    total = len(driver_column)
+    while start < total:
+        code = driver_column[start]
+        end = start + 1
+        while end < total and driver_column[end] == code:
+            end += 1
+        if drivers is None or code in drivers:
+            per_driver = result.setdefault(code, {name: [] for name in names})
+            for name in names:
+                per_driver[name].extend(columns[name][start:end])
+        start = end
+    return result
+
+
+def _group_by_race(rows: Iterable, races: Dict[Any, int]) -> Dict[int, List[tuple]]:
+    """Split (race, ...) rows ordered by race (see `race_column`) into per-round row lists."""
+    grouped: Dict[int, List[tuple]] = {}
+    for race, group in groupby(rows, key=itemgetter(0)):
+        grouped[races[race]] = [tuple(row[1:]) for row in group]
+    return grouped
+
+
+def build_race_analytics_tables(
     db: Session,
     season: int,
-    rnd: int,
-    drivers: Optional[Iterable[str]] = None,
-) -> Dict[str, Any]:
-    race_id = _race_id(season, rnd)
-
-    # Build car number -> driver code mapping
-    car_to_code = _build_car_number_to_code_map(db, season, rnd)
-    # Also build reverse mapping for filtering by driver code
-    code_to_car = {code: car for car, code in car_to_code.items()}
-
-    # Convert driver codes to car numbers for filtering
-    driver_car_numbers: Optional[List[str]] = None
-    if drivers:
-        driver_car_numbers = [
-            code_to_car.get(d, d) for d in drivers
-        ]
+    rounds: Sequence[int],
+    sections: Sequence[str] = ANALYTICS_TABLE_SECTIONS,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Build full-race analytics tables for several rounds of a season.
+
+    Laps, stints, car-number maps and metric grades are each read with one
+    query covering every requested round, so a season's worth of cache misses
+    costs four queries instead of four per race. `sections` limits the table
+    to some of ANALYTICS_TABLE_SECTIONS; the others are not queried.
+    """
+    rounds = sorted(set(rounds))
+    if not rounds:
+        return {}
+    wanted = set(sections)
+    race_keys = lookup_race_keys(db, season, rounds)
+    lap_race, lap_races = race_column(LapTime, season, rounds, race_keys)
+    stint_race, stint_races = race_column(Stint, season, rounds, race_keys)
+    car_maps = (
+        _build_car_number_to_code_maps(db, season, rounds)
+        if wanted & {"laps", "stints", "car_numbers"}
+        else {}
+    )
+    metric_grades = (
+        _fetch_driver_metric_grades(db, season, rounds)
+        if "driver_metric_grades" in wanted
+        else {}
+    )
 
     lap_stmt = (
         select(
+            lap_race,
             LapTime.driver,
             LapTime.lap,
             LapTime.lap_ms,
@@ -200,49 +293,173 @@ def fetch_race_analytics(
             LapTime.stint_no,
             LapTime.pit,
         )
-        .where(LapTime.race_id == race_id)
-        .order_by(LapTime.driver, LapTime.lap)
+        .where(LapTime.season == season, lap_race.in_(lap_races))
+        .order_by(lap_race, LapTime.driver, LapTime.lap)
     )
-    if driver_car_numbers:
-        lap_stmt = lap_stmt.where(LapTime.driver.in_(driver_car_numbers))
-
-    lap_rows = db.execute(lap_stmt).all()
-    laps = _normalise_laps(lap_rows, car_to_code)
-
     stint_stmt = (
         select(
+            stint_race,
             Stint.driver,
             Stint.stint_no,
             Stint.compound,
             Stint.laps,
             Stint.avg_lap_ms,
         )
-        .where(Stint.race_id == race_id)
-        .order_by(Stint.driver, Stint.stint_no)
+        .where(Stint.season == season, stint_race.in_(stint_races))
+        .order_by(stint_race, Stint.driver, Stint.stint_no)
+    )
+    laps_by_round = _group_by_race(db.execute(lap_stmt), lap_races) if "laps" in wanted else {}
+    stints_by_round = (
+        _group_by_race(db.execute(stint_stmt), stint_races) if "stints" in wanted else {}
+    )
+
+    last_updated = dt.datetime.utcnow().isoformat() + "Z"
+    tables: Dict[int, Dict[str, Any]] = {}
+    for rnd in rounds:
+        table: Dict[str, Any] = {
+            "format": ANALYTICS_TABLE_FORMAT,
+            "race": {"season": season, "round": rnd},
+            "last_updated": last_updated,
+        }
+        if "laps" in wanted:
+            table["laps"] = _lap_columns(laps_by_round.get(rnd, ()), car_maps[rnd])
+        if "stints" in wanted:
+            table["stints"] = _stint_columns(stints_by_round.get(rnd, ()), car_maps[rnd])
+        if "driver_metric_grades" in wanted:
+            table["driver_metric_grades"] = metric_grades[rnd]
+        if "car_numbers" in wanted:
+            table["car_numbers"] = car_maps[rnd]
+        tables[rnd] = table
+    return tables
+
+
+def analytics_table_sections(fields: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Table sections needed to answer the given response fields.
+
+    Pace grades come from the metric grades, or from the lap-time heuristic
+    when a race has none, so they need both the metric grades and the laps.
+    Sections are read in one MGET, so a cached laps section adds no round trip.
+    The car-number map comes along for driver filters.
+    """
+    wanted = set(fields or ANALYTICS_FIELDS)
+    needed = ({"laps", "stints"} & wanted) | {"car_numbers"}
+    if "driver_pace_grades" in wanted:
+        needed |= {"driver_metric_grades", "laps"}
+    return [section for section in ANALYTICS_TABLE_SECTIONS if section in needed]
+
+
+def build_race_analytics_table(
+    db: Session,
+    season: int,
+    rnd: int,
+) -> Dict[str, Any]:
+    """
+    Build the full-race analytics table in columnar form.
+
+    This is what gets cached (once per race); driver filters are applied to it
+    in memory by `slice_race_analytics` instead of re-querying the database.
+    """
+    return build_race_analytics_tables(db, season, [rnd])[rnd]
+
+
+def season_analytics_rounds(db: Session, season: int) -> List[int]:
+    """Rounds of a season that have lap data, in order."""
+    rounds = db.scalars(
+        select(LapTime.round)
+        .where(LapTime.season == season, LapTime.round.is_not(None))
+        .distinct()
     )
-    if driver_car_numbers:
-        stint_stmt = stint_stmt.where(Stint.driver.in_(driver_car_numbers))
+    return sorted(rounds)
 
-    stint_rows = db.execute(stint_stmt).all()
-    stints = _normalise_stints(stint_rows, car_to_code)
 
-    driver_metric_grades = _fetch_driver_metric_grades(db, season, rnd)
-    if driver_metric_grades:
-        driver_pace_grades = driver_metric_grades
-    else:
-        driver_pace_grades = [
-            {**grade, "source": "lap_time_heuristic"}
-            for grade in _compute_driver_pace_grade_table(laps)
+def _driver_pace_grades(
+    table: Dict[str, Any],
+    wanted: Optional[Set[str]],
+) -> List[Dict[str, Any]]:
+    metric_grades = table["driver_metric_grades"]
+    if metric_grades:
+        return [
+            grade for grade in metric_grades
+            if wanted is None or grade["driver"] in wanted
         ]
+    laps = table["laps"]
+    return [
+        {**grade, "source": "lap_time_heuristic"}
+        for grade in _compute_driver_pace_grade_table(
+            laps["driver"], laps["lap_ms"], wanted
+        )
+    ]
+
+
+def _requested_drivers(
+    table: Dict[str, Any], drivers: Optional[Iterable[str]]
+) -> Optional[Set[str]]:
+    """Driver filter matching both codes and car numbers (mapped as the rows were)."""
+    if not drivers:
+        return None
+    car_numbers = table.get("car_numbers") or {}
+    requested = {str(driver) for driver in drivers}
+    return requested | {car_numbers[driver] for driver in requested if driver in car_numbers}
 
-    response = {
-        "race": {"season": season, "round": rnd},
-        "last_updated": dt.datetime.utcnow().isoformat() + "Z",
-        "laps": laps,
-        "stints": stints,
-        "driver_pace_grades": driver_pace_grades,
+
+def slice_race_analytics(
+    table: Dict[str, Any],
+    drivers: Optional[Iterable[str]] = None,
+    columnar: bool = False,
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the analytics response from a cached race table.
+
+    With columnar=True, laps and stints come back as
+    `{driver: {column: [values, ...]}}` instead of one object per row.
+    `fields` limits the response to some of ANALYTICS_FIELDS; the table only
+    needs the sections `analytics_table_sections(fields)` lists.
+    """
+    wanted = _requested_drivers(table, drivers)
+    selected = set(fields or ANALYTICS_FIELDS)
+
+    payload: Dict[str, Any] = {
+        "race": table["race"],
+        "last_updated": table["last_updated"],
     }
-    return response
+    if columnar:
+        payload["format"] = "columnar"
+    if "laps" in selected:
+        payload["laps"] = (
+            _columns_by_driver(table["laps"], LAP_COLUMNS[1:], wanted)
+            if columnar
+            else _select_rows(table["laps"], LAP_COLUMNS, wanted)
+        )
+    if "stints" in selected:
+        payload["stints"] = (
+            _columns_by_driver(table["stints"], STINT_COLUMNS[1:], wanted)
+            if columnar
+            else _select_rows(table["stints"], STINT_COLUMNS, wanted)
+        )
+    if "driver_pace_grades" in selected:
+        payload["driver_pace_grades"] = _driver_pace_grades(table, wanted)
+    return payload
 
 
-__all__ = ["fetch_race_analytics"]
+def fetch_race_analytics(
+    db: Session,
+    season: int,
+    rnd: int,
+    drivers: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    table = build_race_analytics_table(db, season, rnd)
+    return slice_race_analytics(table, drivers)
+
+
+__all__ = [
+    "build_race_analytics_table",
+    "build_race_analytics_tables",
+    "analytics_table_sections",
+    "ANALYTICS_TABLE_SECTIONS",
+    "ANALYTICS_FIELDS",
+    "season_analytics_rounds",
+    "slice_race_analytics",
+    "fetch_race_analytics",
+]
@@ -4,10 +4,23 @@ Shared helpers for API/worker cache coordination.
 
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import base64
+import gzip
+import json
+import logging
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from theundercut.adapters.redis_cache import redis_client
+from starlette.concurrency import run_in_threadpool
 
+from theundercut.adapters.redis_cache import async_redis_client, redis_binary_client, redis_client
+
+try:  # Optional dependency: brotli variants are only produced when installed
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
 
 ANALYTICS_CACHE_PREFIX = "analytics:v1"
 SESSION_CACHE_PREFIX = "session:v1"
@@ -15,6 +28,137 @@ SCHEDULE_CACHE_PREFIX = "schedule:v1"
 WEEKEND_CACHE_PREFIX = "weekend:v1"
 HISTORY_CACHE_PREFIX = "history:v1"
 STRATEGY_CACHE_PREFIX = "strategy"
+STANDINGS_CACHE_PREFIX = "standings:v1"
+HOMEPAGE_CACHE_KEY = "homepage:v1"
+RACE_GENERATION_PREFIX = "generation:v1"
+LIVE_CACHE_PREFIX = "live:v1"
+EXPORT_LENGTH_PREFIX = "export-length:v1"
+
+# Payloads at or above this size (serialized JSON bytes) are stored compressed.
+CACHE_COMPRESSION_THRESHOLD_BYTES = 4096
+# Marker prefix for compressed entries. Anything without it is legacy plain
+# JSON, so entries written before the codec existed keep decoding.
+COMPRESSED_PAYLOAD_MARKER = "z1:"
+_ZLIB_LEVEL = 6
+
+# Response bodies below this size are not worth precompressing.
+PRECOMPRESS_MIN_BYTES = 1024
+ENCODED_VARIANT_SUFFIX = "enc"
+
+_codec_stats: Dict[str, int] = {
+    "payloads": 0,
+    "compressed_payloads": 0,
+    "raw_bytes": 0,
+    "stored_bytes": 0,
+}
+
+
+def encode_cache_payload(payload: Any) -> str:
+    """
+    Serialize a payload for Redis.
+
+    Small payloads are stored as compact JSON. Payloads over
+    CACHE_COMPRESSION_THRESHOLD_BYTES are zlib-compressed and base85-encoded
+    behind COMPRESSED_PAYLOAD_MARKER; the text encoding keeps them readable
+    through the shared decode_responses=True client.
+    """
+    raw = json.dumps(payload, separators=(",", ":"))
+    raw_size = len(raw.encode("utf-8"))
+    encoded = raw
+    if raw_size >= CACHE_COMPRESSION_THRESHOLD_BYTES:
+        compressed = zlib.compress(raw.encode("utf-8"), _ZLIB_LEVEL)
+        candidate = COMPRESSED_PAYLOAD_MARKER + base64.b85encode(compressed).decode("ascii")
+        if len(candidate) < raw_size:
+            encoded = candidate
+            _codec_stats["compressed_payloads"] += 1
+
+    stored_size = len(encoded)
+    _codec_stats["payloads"] += 1
+    _codec_stats["raw_bytes"] += raw_size
+    _codec_stats["stored_bytes"] += stored_size
+    if stored_size < raw_size:
+        logger.debug(
+            "Compressed cache payload %d -> %d bytes (saved %d)",
+            raw_size,
+            stored_size,
+            raw_size - stored_size,
+        )
+    return encoded
+
+
+def decode_cache_payload(value: Union[str, bytes]) -> Any:
+    """Decode a value written by encode_cache_payload (or legacy plain JSON)."""
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    if value.startswith(COMPRESSED_PAYLOAD_MARKER):
+        compressed = base64.b85decode(value[len(COMPRESSED_PAYLOAD_MARKER):])
+        return json.loads(zlib.decompress(compressed))
+    return json.loads(value)
+
+
+def cache_codec_stats() -> Dict[str, int]:
+    """Return process-wide codec counters, including total bytes saved."""
+    stats = dict(_codec_stats)
+    stats["bytes_saved"] = stats["raw_bytes"] - stats["stored_bytes"]
+    return stats
+
+
+def supported_content_encodings() -> Tuple[str, ...]:
+    """Content codings we precompress, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def encoded_variant_key(key: str, encoding: str) -> str:
+    """Build the Redis key for a precompressed variant of a cached response."""
+    return f"{key}:{ENCODED_VARIANT_SUFFIX}:{encoding}"
+
+
+def _compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the bytes deterministic for identical payloads
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=11)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def json_body(payload: Any) -> bytes:
+    """Serialize a JSON response body the way precompressed variants store it."""
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def store_encoded_variants(
+    key: str,
+    ttl: int,
+    body: bytes,
+    client=None,
+) -> Dict[str, bytes]:
+    """
+    Compress a serialized response body once per supported coding and store
+    each variant next to the cached payload with the same TTL.
+
+    Returns the variants that were written (empty for small bodies).
+    """
+    if len(body) < PRECOMPRESS_MIN_BYTES:
+        return {}
+    client = client or redis_binary_client
+    variants: Dict[str, bytes] = {}
+    for encoding in supported_content_encodings():
+        compressed = _compress_body(body, encoding)
+        client.setex(encoded_variant_key(key, encoding), ttl, compressed)
+        variants[encoding] = compressed
+    logger.debug(
+        "Stored precompressed variants for %s: %d raw -> %s",
+        key,
+        len(body),
+        {encoding: len(data) for encoding, data in variants.items()},
+    )
+    return variants
+
+
+def get_encoded_variant(key: str, encoding: str, client=None) -> Optional[bytes]:
+    """Fetch a precompressed variant stored by store_encoded_variants."""
+    return (client or redis_binary_client).get(encoded_variant_key(key, encoding))
 
 
 def analytics_cache_key(
@@ -24,7 +168,9 @@ def analytics_cache_key(
 ) -> str:
     """
     Build the canonical Redis key for race analytics payloads.
-    Drivers list is sorted so `/api/v1/analytics` can cache per filter combo.
+    `/api/v1/analytics` caches one full-race table under the unfiltered key and
+    slices driver filters in memory; drivers are still accepted (sorted) so
+    legacy per-filter keys can be addressed.
     """
     if drivers:
         driver_part = ",".join(sorted(set(drivers)))
@@ -33,6 +179,11 @@ def analytics_cache_key(
     return f"{ANALYTICS_CACHE_PREFIX}:{season}:{rnd}:{driver_part}"
 
 
+def analytics_response_cache_key(season: int, rnd: int) -> str:
+    """Key under which the unfiltered analytics response variants are stored."""
+    return f"{ANALYTICS_CACHE_PREFIX}:{season}:{rnd}:response"
+
+
 def invalidate_analytics_cache(season: int, rnd: int) -> None:
     """
     Remove all cached payloads for a race (covers every driver filter combo).
@@ -70,6 +221,24 @@ def history_cache_key(season: int, circuit_id: str) -> str:
     return f"{HISTORY_CACHE_PREFIX}:{season}:{circuit_id}"
 
 
+def live_cache_key(season: int, rnd: int) -> str:
+    """Build the Redis key for a race's live session snapshot."""
+    return f"{LIVE_CACHE_PREFIX}:{season}:{rnd}"
+
+
+def export_length_cache_key(etag: str) -> str:
+    """Build the Redis key holding the byte length of the export with this ETag."""
+    digest = etag.strip('"')
+    return f"{EXPORT_LENGTH_PREFIX}:{digest}"
+
+
+def invalidate_weekend_cache(season: int, rnd: int) -> None:
+    """Remove the aggregated weekend payload plus its field and section entries."""
+    weekend_key = weekend_cache_key(season, rnd)
+    keys = [weekend_key, *redis_client.scan_iter(match=f"{weekend_key}:*")]
+    redis_client.delete(*keys)
+
+
 def invalidate_session_cache(season: int, rnd: int, session_type: Optional[str] = None) -> None:
     """
     Remove cached session results for a race.
@@ -88,8 +257,7 @@ def invalidate_session_cache(season: int, rnd: int, session_type: Optional[str]
             redis_client.delete(*keys)
 
     # Also invalidate the aggregated weekend cache
-    weekend_key = weekend_cache_key(season, rnd)
-    redis_client.delete(weekend_key)
+    invalidate_weekend_cache(season, rnd)
 
 
 def invalidate_schedule_cache(season: int, rnd: int) -> None:
@@ -97,8 +265,7 @@ def invalidate_schedule_cache(season: int, rnd: int) -> None:
     key = schedule_cache_key(season, rnd)
     redis_client.delete(key)
     # Also invalidate the aggregated weekend cache
-    weekend_key = weekend_cache_key(season, rnd)
-    redis_client.delete(weekend_key)
+    invalidate_weekend_cache(season, rnd)
 
 
 def strategy_cache_key(season: int, rnd: int, driver: Optional[str] = None) -> str:
@@ -108,6 +275,26 @@ def strategy_cache_key(season: int, rnd: int, driver: Optional[str] = None) -> s
     return f"{STRATEGY_CACHE_PREFIX}:{season}:{rnd}"
 
 
+def standings_cache_key(season: int) -> str:
+    """Build the canonical Redis key for season standings."""
+    return f"{STANDINGS_CACHE_PREFIX}:{season}"
+
+
+def invalidate_standings_cache(season: int) -> None:
+    """Remove the cached standings payload for a season."""
+    redis_client.delete(standings_cache_key(season))
+
+
+def homepage_cache_key() -> str:
+    """Build the canonical Redis key for the homepage data."""
+    return HOMEPAGE_CACHE_KEY
+
+
+def invalidate_homepage_cache() -> None:
+    """Remove the cached homepage data."""
+    redis_client.delete(HOMEPAGE_CACHE_KEY)
+
+
 def invalidate_strategy_cache(season: int, rnd: int) -> None:
     """Remove all cached strategy score payloads for a race."""
     pattern = f"{STRATEGY_CACHE_PREFIX}:{season}:{rnd}*"
@@ -116,6 +303,247 @@ def invalidate_strategy_cache(season: int, rnd: int) -> None:
         redis_client.delete(*keys)
 
 
+def get_cached_payloads(keys: Sequence[str], client=None) -> List[Optional[Any]]:
+    """Read and decode several cached payloads with one MGET (None for misses)."""
+    if not keys:
+        return []
+    values = (client or redis_client).mget(list(keys))
+    return [decode_cache_payload(value) if value else None for value in values]
+
+
+def set_cached_payloads(entries: Dict[str, Any], ttl: int, client=None) -> None:
+    """Write several cached payloads in a single pipelined round trip."""
+    if not entries:
+        return
+    pipe = (client or redis_client).pipeline(transaction=False)
+    for key, payload in entries.items():
+        pipe.setex(key, ttl, encode_cache_payload(payload))
+    pipe.execute()
+
+
+async def read_cache_keys(keys: Sequence[str], client=None) -> Dict[str, Optional[str]]:
+    """Read the raw values of `keys` in one pipelined round trip on the async client."""
+    unique = list(dict.fromkeys(keys))
+    if not unique:
+        return {}
+    async with (client or async_redis_client).pipeline(transaction=False) as pipe:
+        for key in unique:
+            pipe.get(key)
+        values = await pipe.execute()
+    return dict(zip(unique, values))
+
+
+def _decode_values(values: Sequence[Optional[str]]) -> List[Optional[Any]]:
+    return [decode_cache_payload(value) if value else None for value in values]
+
+
+def _encode_entries(entries: Dict[str, Any]) -> Dict[str, str]:
+    return {key: encode_cache_payload(payload) for key, payload in entries.items()}
+
+
+async def get_cached_payload_async(key: str, client=None) -> Optional[Any]:
+    """Read one cached payload on the async client; decoding runs in the threadpool."""
+    value = await (client or async_redis_client).get(key)
+    if not value:
+        return None
+    return await run_in_threadpool(decode_cache_payload, value)
+
+
+async def get_cached_payloads_async(keys: Sequence[str], client=None) -> List[Optional[Any]]:
+    """get_cached_payloads for the async client; decoding runs in the threadpool."""
+    if not keys:
+        return []
+    values = await (client or async_redis_client).mget(list(keys))
+    if not any(values):
+        return [None] * len(values)
+    return await run_in_threadpool(_decode_values, values)
+
+
+async def set_cached_payloads_async(entries: Dict[str, Any], ttl: int, client=None) -> None:
+    """set_cached_payloads for the async client; encoding runs in the threadpool."""
+    if not entries:
+        return
+    encoded = await run_in_threadpool(_encode_entries, entries)
+    async with (client or async_redis_client).pipeline(transaction=False) as pipe:
+        for key, value in encoded.items():
+            pipe.setex(key, ttl, value)
+        await pipe.execute()
+
+
+def section_cache_key(base_key: str, section: str) -> str:
+    """Key of one independently cached section of a response."""
+    return f"{base_key}:section:{section}"
+
+
+def fields_cache_key(base_key: str, fields: Iterable[str]) -> str:
+    """Key of a response restricted to a `fields=` selection."""
+    return f"{base_key}:fields:{','.join(fields)}"
+
+
+def read_cached_sections(
+    base_key: str,
+    sections: Sequence[str],
+    client=None,
+) -> Tuple[Dict[str, Any], List[str]]:
+    """Read per-section cache entries with one MGET; returns (hits, missing sections)."""
+    client = client or redis_client
+    keys = [section_cache_key(base_key, section) for section in sections]
+    result: Dict[str, Any] = {}
+    missing: List[str] = []
+    for section, entry in zip(sections, get_cached_payloads(keys, client)):
+        if isinstance(entry, dict) and "value" in entry:
+            result[section] = entry["value"]
+        else:
+            missing.append(section)
+    return result, missing
+
+
+def store_cached_sections(
+    base_key: str,
+    built: Dict[str, Any],
+    ttl: int,
+    client=None,
+) -> None:
+    """Cache freshly built sections (values may be None)."""
+    set_cached_payloads(
+        {section_cache_key(base_key, section): {"value": value} for section, value in built.items()},
+        ttl,
+        client or redis_client,
+    )
+
+
+def load_cached_sections(
+    base_key: str,
+    sections: Sequence[str],
+    ttl: int,
+    build: Callable[[List[str]], Dict[str, Any]],
+    client=None,
+) -> Dict[str, Any]:
+    """
+    Resolve per-section cache entries, building only the missing sections.
+
+    Entries are read with one MGET. `build(missing)` returns {section: value}
+    for the misses; sections it leaves out (e.g. because an upstream call
+    failed) come back as None and are not cached. Cached values may be None.
+    """
+    result, missing = read_cached_sections(base_key, sections, client)
+    if missing:
+        built = build(missing)
+        store_cached_sections(base_key, built, ttl, client)
+        for section in missing:
+            result[section] = built.get(section)
+    return result
+
+
+async def load_cached_sections_async(
+    base_key: str,
+    sections: Sequence[str],
+    ttl: int,
+    build: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+    client=None,
+) -> Dict[str, Any]:
+    """load_cached_sections for async routes; `build` is awaited."""
+    keys = [section_cache_key(base_key, section) for section in sections]
+    result: Dict[str, Any] = {}
+    missing: List[str] = []
+    for section, entry in zip(sections, await get_cached_payloads_async(keys, client)):
+        if isinstance(entry, dict) and "value" in entry:
+            result[section] = entry["value"]
+        else:
+            missing.append(section)
+    if missing:
+        built = await build(missing)
+        await set_cached_payloads_async(
+            {section_cache_key(base_key, section): {"value": value} for section, value in built.items()},
+            ttl,
+            client,
+        )
+        for section in missing:
+            result[section] = built.get(section)
+    return result
+
+
+def weekend_composite_keys(
+    season: int,
+    rnd: int,
+    sections: Sequence[str],
+    session_types: Sequence[str],
+) -> Dict[str, str]:
+    """
+    Every cache key a weekend response can be assembled from, by role.
+
+    Roles: "weekend" (full payload), "schedule" (the schedule endpoint's entry),
+    "section:<name>" (per-section entries, including the circuit history) and
+    "session:<type>" (the session results endpoint's entries). Read them
+    together with `read_cache_keys`.
+    """
+    base_key = weekend_cache_key(season, rnd)
+    keys = {"weekend": base_key, "schedule": schedule_cache_key(season, rnd)}
+    keys.update({f"section:{section}": section_cache_key(base_key, section) for section in sections})
+    keys.update(
+        {f"session:{stype}": session_cache_key(season, rnd, stype) for stype in session_types}
+    )
+    return keys
+
+
+def race_generation_key(season: int, rnd: int) -> str:
+    """Build the Redis key for a race's data generation counter."""
+    return f"{RACE_GENERATION_PREFIX}:{season}:{rnd}"
+
+
+def season_generation_key(season: int) -> str:
+    """Build the Redis key for a season's generation, which moves with any of its rounds."""
+    return f"{RACE_GENERATION_PREFIX}:{season}"
+
+
+def get_race_generation(season: int, rnd: int, client=None) -> int:
+    """
+    Return the race's data generation (0 if never bumped).
+
+    The counter only moves when race data changes, so it can back ETags without
+    reading or hashing the cached payloads themselves.
+    """
+    value = (client or redis_client).get(race_generation_key(season, rnd))
+    return int(value) if value else 0
+
+
+async def get_race_generation_async(season: int, rnd: int, client=None) -> int:
+    """get_race_generation for the async client."""
+    value = await (client or async_redis_client).get(race_generation_key(season, rnd))
+    return int(value) if value else 0
+
+
+async def get_season_generation_async(season: int, client=None) -> int:
+    """Return the season's generation (0 if never bumped) on the async client."""
+    value = await (client or async_redis_client).get(season_generation_key(season))
+    return int(value) if value else 0
+
+
+def get_race_generations(season: int, rounds: Sequence[int], client=None) -> List[int]:
+    """Return the generations of several rounds with one MGET."""
+    if not rounds:
+        return []
+    values = (client or redis_client).mget([race_generation_key(season, rnd) for rnd in rounds])
+    return [int(value) if value else 0 for value in values]
+
+
+async def get_race_generations_async(season: int, rounds: Sequence[int], client=None) -> List[int]:
+    """get_race_generations for the async client."""
+    if not rounds:
+        return []
+    values = await (client or async_redis_client).mget(
+        [race_generation_key(season, rnd) for rnd in rounds]
+    )
+    return [int(value) if value else 0 for value in values]
+
+
+def bump_race_generation(season: int, rnd: int) -> int:
+    """Advance the race's (and its season's) data generation after its data changed."""
+    generation = int(redis_client.incr(race_generation_key(season, rnd)))
+    redis_client.incr(season_generation_key(season))
+    return generation
+
+
 def invalidate_race_weekend_cache(season: int, rnd: int) -> None:
     """
     Invalidate all caches for a race weekend.
@@ -125,9 +553,22 @@ def invalidate_race_weekend_cache(season: int, rnd: int) -> None:
     invalidate_session_cache(season, rnd)
     invalidate_schedule_cache(season, rnd)
     invalidate_strategy_cache(season, rnd)
+    bump_race_generation(season, rnd)
 
 
 __all__ = [
+    "encode_cache_payload",
+    "decode_cache_payload",
+    "cache_codec_stats",
+    "CACHE_COMPRESSION_THRESHOLD_BYTES",
+    "PRECOMPRESS_MIN_BYTES",
+    "supported_content_encodings",
+    "encoded_variant_key",
+    "json_body",
+    "store_encoded_variants",
+    "get_encoded_variant",
+    "analytics_response_cache_key",
+    "COMPRESSED_PAYLOAD_MARKER",
     "analytics_cache_key",
     "invalidate_analytics_cache",
     "ANALYTICS_CACHE_PREFIX",
@@ -135,14 +576,45 @@ __all__ = [
     "schedule_cache_key",
     "weekend_cache_key",
     "history_cache_key",
+    "live_cache_key",
+    "export_length_cache_key",
     "strategy_cache_key",
+    "standings_cache_key",
+    "invalidate_standings_cache",
+    "homepage_cache_key",
+    "invalidate_homepage_cache",
     "invalidate_session_cache",
     "invalidate_schedule_cache",
     "invalidate_strategy_cache",
     "invalidate_race_weekend_cache",
+    "invalidate_weekend_cache",
+    "section_cache_key",
+    "fields_cache_key",
+    "read_cache_keys",
+    "get_cached_payload_async",
+    "get_cached_payloads_async",
+    "set_cached_payloads_async",
+    "weekend_composite_keys",
+    "get_race_generation_async",
+    "get_race_generations_async",
+    "read_cached_sections",
+    "store_cached_sections",
+    "load_cached_sections",
+    "load_cached_sections_async",
+    "get_cached_payloads",
+    "set_cached_payloads",
+    "race_generation_key",
+    "season_generation_key",
+    "get_season_generation_async",
+    "get_race_generation",
+    "get_race_generations",
+    "bump_race_generation",
     "SESSION_CACHE_PREFIX",
     "SCHEDULE_CACHE_PREFIX",
     "WEEKEND_CACHE_PREFIX",
     "HISTORY_CACHE_PREFIX",
     "STRATEGY_CACHE_PREFIX",
+    "STANDINGS_CACHE_PREFIX",
+    "RACE_GENERATION_PREFIX",
+    "LIVE_CACHE_PREFIX",
 ]
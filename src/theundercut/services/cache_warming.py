@@ -0,0 +1,162 @@
+"""
+Write-through cache warming for freshly ingested races.
+
+The ingestion worker rebuilds the hot read payloads with the same builders the
+API uses and writes them straight to Redis, so the first visitors after a
+race or sprint lands hit a warm cache instead of paying for the rebuild.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from theundercut.adapters.redis_cache import redis_client
+from theundercut.services.cache import (
+    analytics_cache_key,
+    analytics_response_cache_key,
+    encode_cache_payload,
+    json_body,
+    session_cache_key,
+    standings_cache_key,
+    store_encoded_variants,
+    strategy_cache_key,
+    weekend_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sessions whose ingest rewarms the race caches (normalized session types).
+# Practice and qualifying only invalidate; their pages rebuild on demand.
+WARM_SESSION_TYPES = ("race", "sprint_race")
+
+
+def _warm_entry(
+    timings: Dict[str, Optional[float]],
+    name: str,
+    key: str,
+    ttl: int,
+    build: Callable[[], Any],
+    variants: Optional[Tuple[str, Callable[[Any], Any]]] = None,
+) -> None:
+    """
+    Build one payload and write it to Redis, recording the elapsed time in ms.
+
+    `variants` is an optional (key, response builder) pair; the response is
+    precompressed and stored under that key for the endpoints that serve it.
+    """
+    started = time.perf_counter()
+    try:
+        payload = build()
+        if payload is None:
+            timings[name] = None
+            return
+        if hasattr(payload, "model_dump"):
+            payload = payload.model_dump()
+        redis_client.setex(key, ttl, encode_cache_payload(payload))
+        if variants is not None:
+            variant_key, to_response = variants
+            store_encoded_variants(variant_key, ttl, json_body(to_response(payload)))
+    except Exception as exc:  # pragma: no cover - warming must not fail ingestion
+        logger.warning("Failed to warm %s cache (%s): %s", name, key, exc)
+        timings[name] = None
+        return
+    timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def warm_race_caches(db: Session, season: int, rnd: int) -> Dict[str, Optional[float]]:
+    """
+    Rebuild and store the cached payloads for a race weekend.
+
+    Covers the analytics table, every ingested session's results, the weekend
+    aggregate, race strategy scores and the season standings. A weekend with
+    failed sections is not stored, as the weekend endpoint does not cache
+    partial payloads either. Returns the build time in milliseconds per
+    payload (None when skipped or failed).
+    """
+    # Builders live next to their endpoints; import lazily to avoid a cycle
+    # between the API modules and the ingestion service.
+    from theundercut.api.v1 import analytics as analytics_api
+    from theundercut.api.v1 import race as race_api
+    from theundercut.api.v1 import standings as standings_api
+    from theundercut.api.v1 import strategy as strategy_api
+    from theundercut.services.analytics import (
+        build_race_analytics_table,
+        slice_race_analytics,
+    )
+    from theundercut.services.standings import fetch_season_standings
+
+    timings: Dict[str, Optional[float]] = {}
+    try:
+        redis_client.ping()
+    except Exception as exc:
+        logger.warning("Skipping cache warm for %s-%s; Redis unavailable: %s", season, rnd, exc)
+        return timings
+
+    _warm_entry(
+        timings,
+        "analytics",
+        analytics_cache_key(season, rnd),
+        analytics_api.CACHE_TTL_SECONDS,
+        lambda: build_race_analytics_table(db, season, rnd),
+        variants=(analytics_response_cache_key(season, rnd), slice_race_analytics),
+    )
+    for session_type in race_api.SESSION_RESULTS_TO_FETCH:
+        _warm_entry(
+            timings,
+            f"session:{session_type}",
+            session_cache_key(season, rnd, session_type),
+            race_api.SESSION_RESULTS_CACHE_TTL_SECONDS,
+            lambda session_type=session_type: race_api.build_session_results(
+                db, season, rnd, session_type
+            ),
+        )
+    def _complete_weekend():
+        weekend = race_api.build_weekend_response(db, season, rnd, backfill=False)
+        if weekend.meta.errors:
+            logger.info(
+                "Not warming weekend %s-%s; sections failed: %s",
+                season,
+                rnd,
+                "; ".join(weekend.meta.errors),
+            )
+            return None
+        return weekend
+
+    _warm_entry(
+        timings,
+        "weekend",
+        weekend_cache_key(season, rnd),
+        race_api.WEEKEND_CACHE_TTL_SECONDS,
+        _complete_weekend,
+    )
+    _warm_entry(
+        timings,
+        "strategy",
+        strategy_cache_key(season, rnd),
+        strategy_api.CACHE_TTL_SECONDS,
+        lambda: strategy_api.build_race_strategy_scores(db, season, rnd),
+    )
+    _warm_entry(
+        timings,
+        "standings",
+        standings_cache_key(season),
+        standings_api.CACHE_TTL_SECONDS,
+        lambda: fetch_season_standings(db, season),
+    )
+
+    logger.info(
+        "Warmed caches for %s-%s: %s",
+        season,
+        rnd,
+        ", ".join(
+            f"{name}={elapsed}ms" for name, elapsed in timings.items() if elapsed is not None
+        ),
+    )
+    return timings
+
+
+__all__ = ["WARM_SESSION_TYPES", "warm_race_caches"]
@@ -3,14 +3,30 @@ Homepage data service.
 
 Provides data for the homepage dashboard: current season, latest race info,
 podium finishers, and standings summary.
+
+Ingestion writes a race_summary row per race (`refresh_race_summary`), so the
+homepage is a single indexed read. The lap_times aggregation below is kept as
+the fallback for databases without summary rows.
 """
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
-from sqlalchemy import text
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 
-from theundercut.models import Race, Season, Entry, Driver, Team
+from theundercut.models import (
+    Race,
+    RaceSummary,
+    Season,
+    Entry,
+    Driver,
+    Team,
+    LapTime,
+    SessionClassification,
+)
+from theundercut.services.race_keys import lookup_race_key, race_rows_clause
+from theundercut.services.standings import race_summary_fields
 
 
 def get_current_season(db: Session) -> int:
@@ -20,15 +36,12 @@ def get_current_season(db: Session) -> int:
     Returns the most recent season that has lap_times data,
     defaulting to 2024 if no data found.
     """
-    # Use SUBSTR for SQLite compatibility (works in PostgreSQL too)
     result = db.execute(text("""
-        SELECT DISTINCT CAST(SUBSTR(race_id, 1, 4) AS INTEGER) as season
+        SELECT MAX(season) as season
         FROM lap_times
-        ORDER BY season DESC
-        LIMIT 1
     """))
     row = result.fetchone()
-    return row[0] if row else 2024
+    return row[0] if row and row[0] is not None else 2024
 
 
 def get_latest_race(db: Session, season: int) -> Optional[Dict[str, Any]]:
@@ -44,22 +57,21 @@ def get_latest_race(db: Session, season: int) -> Optional[Dict[str, Any]]:
         }
     """
     # Find the highest round with lap_times data
-    # Use SUBSTR for portability: extract round number after the dash
     result = db.execute(text("""
         SELECT
             lt.race_id,
-            CAST(SUBSTR(lt.race_id, 6) AS INTEGER) as round,
+            lt.round,
             ce.meeting_key
         FROM lap_times lt
         LEFT JOIN calendar_events ce
-            ON ce.season = :season
-            AND ce.round = CAST(SUBSTR(lt.race_id, 6) AS INTEGER)
+            ON ce.season = lt.season
+            AND ce.round = lt.round
             AND ce.session_type = 'Race'
-        WHERE lt.race_id LIKE :pattern
-        GROUP BY lt.race_id, ce.meeting_key
-        ORDER BY round DESC
+        WHERE lt.season = :season
+        GROUP BY lt.race_id, lt.round, ce.meeting_key
+        ORDER BY lt.round DESC
         LIMIT 1
-    """), {"season": season, "pattern": f"{season}-%"})
+    """), {"season": season})
 
     row = result.fetchone()
     if not row:
@@ -137,25 +149,22 @@ def get_podium(db: Session, race_id: str) -> List[Dict[str, Any]]:
             {"position": 3, "driver": "LEC", "team": "Ferrari"},
         ]
     """
-    # Get finishing order by counting laps completed and total time
-    result = db.execute(text("""
-        WITH driver_stats AS (
-            SELECT
-                driver,
-                COUNT(*) as laps_completed,
-                SUM(lap_ms) as total_time_ms
-            FROM lap_times
-            WHERE race_id = :race_id AND lap_ms IS NOT NULL
-            GROUP BY driver
+    season_value, round_value = _parse_race_id(race_id)
+    # Finishing order: most laps completed, then lowest total time
+    laps_completed = func.count()
+    total_time_ms = func.sum(LapTime.lap_ms)
+    result = db.execute(
+        select(LapTime.driver, laps_completed, total_time_ms)
+        .where(
+            race_rows_clause(
+                LapTime, season_value, round_value, lookup_race_key(db, season_value, round_value)
+            ),
+            LapTime.lap_ms.is_not(None),
         )
-        SELECT
-            driver,
-            laps_completed,
-            total_time_ms
-        FROM driver_stats
-        ORDER BY laps_completed DESC, total_time_ms ASC
-        LIMIT 3
-    """), {"race_id": race_id})
+        .group_by(LapTime.driver)
+        .order_by(laps_completed.desc(), total_time_ms)
+        .limit(3)
+    )
 
     rows = result.fetchall()
     team_map = _get_driver_team_map(db, race_id)
@@ -172,6 +181,86 @@ def get_podium(db: Session, race_id: str) -> List[Dict[str, Any]]:
     return podium
 
 
+def _classified_podium(db: Session, season: int, rnd: int) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Podium and driver-team map from the stored race classification."""
+    rows = (
+        db.query(SessionClassification)
+        .filter_by(season=season, round=rnd, session_type="race")
+        .all()
+    )
+    team_map = {row.driver_code: row.team or "Unknown" for row in rows}
+    classified = sorted((row for row in rows if row.position), key=lambda row: row.position)
+    podium = [
+        {"position": i + 1, "driver": row.driver_code, "team": row.team or "Unknown"}
+        for i, row in enumerate(classified[:3])
+    ]
+    return podium, team_map
+
+
+def refresh_race_summary(db: Session, season: int, rnd: int) -> Optional[Dict[str, Any]]:
+    """
+    Recompute and store the race_summary row for one race.
+
+    The podium comes from the race classification when it has positions and
+    from the lap-count heuristic (`get_podium`) otherwise. The standings'
+    race context (`race_summary_fields`) is stored alongside. Returns the
+    stored values, or None when the race has no data; the caller commits.
+    """
+    race_id = f"{season}-{rnd}"
+    race_laps = race_rows_clause(LapTime, season, rnd, lookup_race_key(db, season, rnd))
+    podium, team_map = _classified_podium(db, season, rnd)
+    source = "classification"
+    if not podium:
+        podium = get_podium(db, race_id)
+        team_map = _get_driver_team_map(db, race_id)
+        source = "laps"
+
+    fastest = db.execute(
+        select(LapTime.driver, LapTime.lap_ms, LapTime.lap)
+        .where(race_laps, LapTime.lap_ms > 0)
+        .order_by(LapTime.lap_ms)
+        .limit(1)
+    ).first()
+    laps_completed = db.scalar(
+        select(func.max(LapTime.lap)).where(race_laps)
+    )
+    if not podium and fastest is None:
+        return None
+
+    values = {
+        "race_id": race_id,
+        "race_name": _get_race_name(db, season, rnd),
+        "winner_code": podium[0]["driver"] if podium else None,
+        "winner_team": podium[0]["team"] if podium else None,
+        "podium": podium,
+        "fastest_lap_driver": fastest[0] if fastest else None,
+        "fastest_lap_ms": fastest[1] if fastest else None,
+        "fastest_lap_number": fastest[2] if fastest else None,
+        "laps_completed": laps_completed,
+        "team_map": team_map,
+        "source": source,
+        **race_summary_fields(db, season, rnd),
+        "updated_at": datetime.now(timezone.utc),
+    }
+    summary = db.query(RaceSummary).filter_by(season=season, round=rnd).one_or_none()
+    if summary is None:
+        summary = RaceSummary(season=season, round=rnd)
+        db.add(summary)
+    for key, value in values.items():
+        setattr(summary, key, value)
+    db.flush()
+    return values
+
+
+def get_latest_race_summary(db: Session) -> Optional[RaceSummary]:
+    """The most recent race's summary row (one read on the unique index)."""
+    return (
+        db.query(RaceSummary)
+        .order_by(RaceSummary.season.desc(), RaceSummary.round.desc())
+        .first()
+    )
+
+
 def get_homepage_data(db: Session) -> Dict[str, Any]:
     """
     Fetch all data needed for the homepage in a single call.
@@ -183,6 +272,19 @@ def get_homepage_data(db: Session) -> Dict[str, Any]:
             "podium": [...],
         }
     """
+    summary = get_latest_race_summary(db)
+    if summary is not None:
+        return {
+            "season": summary.season,
+            "latest_race": {
+                "race_id": summary.race_id,
+                "round": summary.round,
+                "name": summary.race_name or f"Round {summary.round}",
+                "season": summary.season,
+            },
+            "podium": summary.podium or [],
+        }
+
     season = get_current_season(db)
     latest_race = get_latest_race(db, season)
 
@@ -0,0 +1,100 @@
+"""
+Queue session ingestion on the RQ worker instead of running it in a request.
+
+Job ids match the scheduler's (`{season}-{round}-{session_type}`), so API and
+scheduler enqueues deduplicate against each other. A Redis pending marker set
+with NX makes concurrent requests enqueue a session at most once until its
+job finishes.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from rq import Queue
+
+from theundercut.adapters.redis_cache import redis_client
+from theundercut.services.cache import normalize_session_type
+
+logger = logging.getLogger(__name__)
+
+INGEST_QUEUE_NAME = "default"
+INGEST_PENDING_PREFIX = "ingest:pending:v1"
+# Outlives a normal FastF1 load; a crashed job's marker expires on its own.
+INGEST_PENDING_TTL_SECONDS = 1800
+INGEST_JOB_TIMEOUT_SECONDS = 1800
+_ACTIVE_JOB_STATUSES = {"queued", "started", "deferred", "scheduled"}
+
+
+def ingest_job_id(season: int, rnd: int, session_type: str) -> str:
+    """RQ job id for a session ingest (the scheduler uses the same ids)."""
+    return f"{season}-{rnd}-{session_type}"
+
+
+def ingest_pending_key(season: int, rnd: int, session_type: str) -> str:
+    """Redis key marking a session ingest as queued or running."""
+    return f"{INGEST_PENDING_PREFIX}:{season}:{rnd}:{normalize_session_type(session_type)}"
+
+
+def run_session_ingest(season: int, rnd: int, session_type: str, force: bool = False) -> None:
+    """RQ job: ingest the session, then clear its pending marker."""
+    from theundercut.services.ingestion import ingest_session
+
+    try:
+        ingest_session(season, rnd, session_type=session_type, force=force)
+    finally:
+        try:
+            redis_client.delete(ingest_pending_key(season, rnd, session_type))
+        except Exception as exc:  # pragma: no cover - marker expires anyway
+            logger.warning("Failed to clear pending marker for %s-%s %s: %s", season, rnd, session_type, exc)
+
+
+def enqueue_session_ingest(
+    season: int,
+    rnd: int,
+    session_type: str,
+    force: bool = False,
+    client=None,
+) -> bool:
+    """
+    Queue ingestion of one session and return immediately.
+
+    Returns True when a job was enqueued and False when one is already
+    pending, either through another request's marker or as a live job with
+    the same id (e.g. queued by the scheduler).
+    """
+    client = client or redis_client
+    job_id = ingest_job_id(season, rnd, session_type)
+    key = ingest_pending_key(season, rnd, session_type)
+    if not client.set(key, job_id, nx=True, ex=INGEST_PENDING_TTL_SECONDS):
+        return False
+    try:
+        queue = Queue(INGEST_QUEUE_NAME, connection=client)
+        existing = queue.fetch_job(job_id)
+        if existing is not None and existing.get_status(refresh=False) in _ACTIVE_JOB_STATUSES:
+            # That job does not clear our marker, so it must not outlive this call
+            client.delete(key)
+            return False
+        queue.enqueue(
+            run_session_ingest,
+            season,
+            rnd,
+            session_type,
+            force=force,
+            job_id=job_id,
+            job_timeout=INGEST_JOB_TIMEOUT_SECONDS,
+        )
+    except Exception:
+        client.delete(key)
+        raise
+    logger.info("Queued ingest job %s", job_id)
+    return True
+
+
+__all__ = [
+    "INGEST_QUEUE_NAME",
+    "ingest_job_id",
+    "ingest_pending_key",
+    "run_session_ingest",
+    "enqueue_session_ingest",
+]
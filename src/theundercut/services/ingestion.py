@@ -15,7 +15,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from theundercut.adapters.resolver import get_provider
-from theundercut.adapters.db import SessionLocal
+from theundercut.adapters.db import SessionLocal, pin_reads_to_primary
 from theundercut.models import (
     LapTime,
     Stint,
@@ -57,10 +57,18 @@ from theundercut.drive_grade.calibration import (
     set_active_calibration,
 )
 from theundercut.services.cache import (
+    bump_race_generation,
     invalidate_analytics_cache,
+    invalidate_homepage_cache,
     invalidate_session_cache,
     invalidate_strategy_cache,
 )
+from theundercut.services.cache_warming import WARM_SESSION_TYPES, warm_race_caches
+from theundercut.services.homepage import refresh_race_summary
+from theundercut.services.race_events import publish_session_status
+from theundercut.services.race_keys import ensure_race_key, lookup_race_key, race_rows_clause
+from theundercut.services.season_aggregates import refresh_season_aggregates
+from theundercut.services.standings import STANDINGS_SESSION_TYPES, update_standings
 from theundercut.drive_grade.strategy import (
     StrategyScoreEngine,
     StrategyEngineConfig,
@@ -138,12 +146,33 @@ def _calendar_session_aliases(session_type: str) -> list[str]:
     return seen or [normalized]
 
 
-def _store_laps(db: Session, race_id: str, df: pd.DataFrame) -> None:
+def _race_id_parts(race_id: str) -> tuple[int, int]:
+    season_str, round_str = race_id.split("-", 1)
+    return int(season_str), int(round_str)
+
+
+def ensure_season_partitions(db: Session, season: int) -> None:
+    """
+    Create the lap_times/stints partitions for a season if they are missing.
+
+    Postgres only; other backends (SQLite in tests) use plain tables.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in ("lap_times", "stints"):
+        db.execute(sa.text(
+            f"CREATE TABLE IF NOT EXISTS {table}_y{season} PARTITION OF {table} "
+            f"FOR VALUES FROM ({season}) TO ({season + 1})"
+        ))
+
+
+def _store_laps(db: Session, race_id: str, race_key: int, df: pd.DataFrame) -> None:
     """
     Clean, normalise and bulk-insert lap records.
-    If the unique index (race_id, driver, lap) already has a row,
+    If the unique index (season, race_key, driver, lap) already has a row,
     ON CONFLICT DO NOTHING prevents duplicates.
     """
+    season, rnd = _race_id_parts(race_id)
     cleaned = (
         df.rename(
             columns={
@@ -161,19 +190,25 @@ def _store_laps(db: Session, race_id: str, df: pd.DataFrame) -> None:
             stint_no=lambda d: d.stint_no.astype("Int64"),
             pit=lambda d: d.PitInTime.notna(),
             race_id=race_id,
+            race_key=race_key,
+            season=season,
+            round=rnd,
         )
         .fillna({"lap_ms": -1, "lap": -1, "stint_no": -1})
     )
 
     stmt = pg_insert(LapTime).values(
         cleaned[
-            ["race_id", "driver", "lap", "lap_ms", "compound", "stint_no", "pit"]
+            [
+                "season", "round", "race_key", "race_id",
+                "driver", "lap", "lap_ms", "compound", "stint_no", "pit",
+            ]
         ].to_dict("records")
     )
 
-    # If a row with same (race_id, driver, lap) exists, skip it.
+    # If a row with same (season, race_key, driver, lap) exists, skip it.
     stmt = stmt.on_conflict_do_nothing(
-        index_elements=["race_id", "driver", "lap"]
+        index_elements=["season", "race_key", "driver", "lap"]
     )
 
     db.execute(stmt)
@@ -278,7 +313,7 @@ def _store_session_classifications(
             points = None
             if is_race_or_sprint and "Points" in row:
                 try:
-                    points = int(row["Points"]) if not pd.isna(row["Points"]) else None
+                    points = float(row["Points"]) if not pd.isna(row["Points"]) else None
                 except (ValueError, TypeError):
                     pass
 
@@ -557,7 +592,8 @@ def _fix_numeric_driver_codes(
     return updated
 
 
-def _store_stints(db: Session, race_id: str, df: pd.DataFrame) -> None:
+def _store_stints(db: Session, race_id: str, race_key: int, df: pd.DataFrame) -> None:
+    season, rnd = _race_id_parts(race_id)
     df = (
         df.groupby(["Driver", "Stint", "Compound"])
         .agg(laps=("LapNumber", "count"), avg=("LapTime", "mean"))
@@ -571,14 +607,20 @@ def _store_stints(db: Session, race_id: str, df: pd.DataFrame) -> None:
         )
         .assign(
             race_id=race_id,
+            race_key=race_key,
+            season=season,
+            round=rnd,
             avg_lap_ms=lambda d: d.avg.dt.total_seconds() * 1000,
         )
     )
     db.bulk_insert_mappings(
         Stint,
-        df[["race_id", "driver", "stint_no", "compound", "laps", "avg_lap_ms"]].to_dict(
-            "records"
-        ),
+        df[
+            [
+                "season", "round", "race_key", "race_id",
+                "driver", "stint_no", "compound", "laps", "avg_lap_ms",
+            ]
+        ].to_dict("records"),
     )
 
 
@@ -1052,9 +1094,8 @@ def _compute_and_store_strategy_scores(
             compound_out=str(compound_out) if compound_out else None,
         ))
 
-    # Load stint data - stints use string race_id like "2024-5"
-    stint_race_id = f"{season}-{rnd}"
-    stints = db.query(Stint).filter(Stint.race_id == stint_race_id).all()
+    # Stints are keyed by the same core.races id
+    stints = db.query(Stint).filter(race_rows_clause(Stint, season, rnd, race_row.id)).all()
     stint_data = []
     for stint in stints:
         stint_data.append({
@@ -1411,17 +1452,14 @@ def _ensure_reference_entries(
     circuit_name = weekend.get("circuit") or weekend.get("race_name") or f"Round {round_value}"
     circuit_row = _get_or_create(db, Circuit, {"name": circuit_name})
     race_slug = weekend.get("slug") or slugify(weekend.get("race_name")) or f"{season_value}-{round_value}"
-    race_row = _get_or_create(
-        db,
-        Race,
-        {"slug": race_slug},
-        {
-            "season_id": season_row.id,
-            "round_number": round_value,
-            "circuit_id": circuit_row.id,
-            "session_type": "R",
-        },
-    )
+    # The round may already have a race row (e.g. the placeholder ensure_race_key
+    # adds for laps stored first); fill that in rather than adding a second one.
+    race_row = db.get(Race, ensure_race_key(db, season_value, round_value))
+    if race_row.slug == f"{season_value}-{round_value}" and race_slug != race_row.slug:
+        if db.query(Race.id).filter_by(slug=race_slug).first() is None:
+            race_row.slug = race_slug
+    if race_row.circuit_id is None:
+        race_row.circuit_id = circuit_row.id
     entry_map: dict[str, Entry] = {}
     for entry in weekend.get("drivers", []):
         driver_code = _normalize_driver_code(entry.get("driver"))
@@ -1623,112 +1661,191 @@ def ingest_session(season: int, rnd: int, session_type: str = "Race", force: boo
         )
         session_already_ingested = event and event.status == "ingested"
 
-        # Also check if lap_times exist for this race (for race-specific data)
+        # Also check whether final lap_times exist for this race (the live
+        # poller's provisional rows are replaced below)
         lap_data_exists = db.scalar(
-            sa.text("SELECT 1 FROM lap_times WHERE race_id = :rid LIMIT 1"),
-            {"rid": f"{season}-{rnd}"},
-        )
+            sa.select(LapTime.lap)
+            .where(
+                race_rows_clause(LapTime, season, rnd, lookup_race_key(db, season, rnd)),
+                LapTime.provisional.is_(False),
+            )
+            .limit(1)
+        ) is not None
 
     if session_already_ingested and not force:
         logger.info("%s-%s %s already ingested; skipping", season, rnd, session_type)
         return
 
-    with SessionLocal() as db:
-        # Store laps/stints only if this is race session and no lap data exists yet
-        # (Practice sessions don't need separate lap storage - we derive classifications from provider data)
-        is_race_session = normalized_session in ("race", "sprint_race")
-        if is_race_session and not lap_data_exists:
-            _store_laps(db, race_id, laps)
-            _store_stints(db, race_id, laps)
-        # Always store session classifications (supports amendments)
-        try:
-            _store_session_classifications(db, season, rnd, session_type, laps, provider, session_results)
-        except Exception as exc:
-            logger.exception("Failed to store session classifications for %s-%s %s: %s", season, rnd, session_type, exc)
+    from theundercut.scheduler_jobs import (
+        LIVE_POLL_LOCK_SECONDS,
+        acquire_live_poll_lock,
+        release_live_poll_lock,
+    )
+    from theundercut.services.live_ingestion import (
+        discard_live_laps,
+        end_live_session,
+        is_live_session_type,
+    )
 
-        # Fix numeric driver codes automatically (e.g., "63" -> "RUS")
+    # Hold the live poll lock from the handover until the live state is gone,
+    # so a poll still running cannot re-insert provisional rows or re-write
+    # the live state and snapshot after them. A running poll frees it within
+    # its TTL.
+    poll_lock = None
+    if is_live_session_type(session_type):
         try:
-            fixed_count = _fix_numeric_driver_codes(db, season, rnd, session_type)
-            if fixed_count > 0:
-                logger.info("Automatically fixed %d numeric driver codes for %s-%s %s",
-                           fixed_count, season, rnd, session_type)
-        except Exception as exc:
-            logger.warning("Failed to fix numeric driver codes for %s-%s %s: %s",
-                          season, rnd, session_type, exc)
-
-        # Variables to hold race context for strategy data
-        race_row = None
-        entry_map = None
+            poll_lock = acquire_live_poll_lock(wait_seconds=LIVE_POLL_LOCK_SECONDS)
+        except Exception as exc:  # pragma: no cover - Redis down: no poll runs either
+            logger.warning("Failed to take the live poll lock for %s-%s: %s", season, rnd, exc)
+        else:
+            if poll_lock is None:
+                logger.warning("Live poll lock still held; handing over %s-%s without it", season, rnd)
 
-        if weekend_payload:
-            # First ensure we have race/entry reference data (independent of DriveGrade)
+    try:
+        with SessionLocal() as db:
+            # Store laps/stints only if this is race session and no lap data exists yet
+            # (Practice sessions don't need separate lap storage - we derive classifications from provider data)
+            is_race_session = normalized_session in ("race", "sprint_race")
+            if is_race_session:
+                # The full session replaces the live poller's provisional rows
+                discard_live_laps(db, season, rnd)
+            if is_race_session and not lap_data_exists:
+                ensure_season_partitions(db, season)
+                race_key = ensure_race_key(db, season, rnd)
+                _store_laps(db, race_id, race_key, laps)
+                _store_stints(db, race_id, race_key, laps)
+            # Always store session classifications (supports amendments)
             try:
-                race_row, entry_map = _ensure_reference_entries(db, season, rnd, weekend_payload)
+                _store_session_classifications(db, season, rnd, session_type, laps, provider, session_results)
             except Exception as exc:
-                logger.exception("Failed to create reference entries for %s: %s", race_id, exc)
-
-            # Then compute DriveGrade scores (can fail without blocking strategy scoring)
-            try:
-                _store_driver_grade_outputs(
-                    db,
-                    season,
-                    rnd,
-                    weekend_payload,
-                    grade_source or provider.__class__.__name__,
-                )
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.exception("Failed to compute DriveGrade for %s: %s", race_id, exc)
-        else:
-            logger.warning("No Drive Grade weekend payload for %s", race_id)
-            # Fallback: Try to build minimal race/entry data from laps for strategy scoring
-            if is_race and not laps.empty:
-                try:
-                    fallback_payload = _build_minimal_weekend_from_laps(laps, season, rnd)
-                    if fallback_payload:
-                        race_row, entry_map = _ensure_reference_entries(db, season, rnd, fallback_payload)
-                        logger.info("Created fallback race context from laps for %s", race_id)
-                except Exception as exc:
-                    logger.warning("Failed to create fallback race context for %s: %s", race_id, exc)
+                logger.exception("Failed to store session classifications for %s-%s %s: %s", season, rnd, session_type, exc)
 
-        # Store strategy-related data (only for Race sessions with valid race context)
-        if is_race and race_row and entry_map:
-            # Store lap positions
+            # Fix numeric driver codes automatically (e.g., "63" -> "RUS")
             try:
-                _store_lap_positions(db, race_row, entry_map, laps)
+                fixed_count = _fix_numeric_driver_codes(db, season, rnd, session_type)
+                if fixed_count > 0:
+                    logger.info("Automatically fixed %d numeric driver codes for %s-%s %s",
+                               fixed_count, season, rnd, session_type)
             except Exception as exc:
-                logger.warning("Failed to store lap positions for %s: %s", race_id, exc)
+                logger.warning("Failed to fix numeric driver codes for %s-%s %s: %s",
+                              season, rnd, session_type, exc)
 
-            # Store race control events (SC, VSC, red flags)
-            if race_control is not None:
+            # Variables to hold race context for strategy data
+            race_row = None
+            entry_map = None
+
+            if weekend_payload:
+                # First ensure we have race/entry reference data (independent of DriveGrade)
                 try:
-                    _store_race_control_events(db, race_row, race_control)
+                    race_row, entry_map = _ensure_reference_entries(db, season, rnd, weekend_payload)
                 except Exception as exc:
-                    logger.warning("Failed to store race control events for %s: %s", race_id, exc)
+                    logger.exception("Failed to create reference entries for %s: %s", race_id, exc)
 
-            # Store weather data
-            if weather_data is not None:
+                # Then compute DriveGrade scores (can fail without blocking strategy scoring)
+                try:
+                    _store_driver_grade_outputs(
+                        db,
+                        season,
+                        rnd,
+                        weekend_payload,
+                        grade_source or provider.__class__.__name__,
+                    )
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.exception("Failed to compute DriveGrade for %s: %s", race_id, exc)
+            else:
+                logger.warning("No Drive Grade weekend payload for %s", race_id)
+                # Fallback: Try to build minimal race/entry data from laps for strategy scoring
+                if is_race and not laps.empty:
+                    try:
+                        fallback_payload = _build_minimal_weekend_from_laps(laps, season, rnd)
+                        if fallback_payload:
+                            race_row, entry_map = _ensure_reference_entries(db, season, rnd, fallback_payload)
+                            logger.info("Created fallback race context from laps for %s", race_id)
+                    except Exception as exc:
+                        logger.warning("Failed to create fallback race context for %s: %s", race_id, exc)
+
+            # Store strategy-related data (only for Race sessions with valid race context)
+            if is_race and race_row and entry_map:
+                # Store lap positions
                 try:
-                    _store_race_weather(db, race_row, weather_data, laps)
+                    _store_lap_positions(db, race_row, entry_map, laps)
                 except Exception as exc:
-                    logger.warning("Failed to store weather data for %s: %s", race_id, exc)
-
-            # Compute and store enhanced strategy scores
+                    logger.warning("Failed to store lap positions for %s: %s", race_id, exc)
+
+                # Store race control events (SC, VSC, red flags)
+                if race_control is not None:
+                    try:
+                        _store_race_control_events(db, race_row, race_control)
+                    except Exception as exc:
+                        logger.warning("Failed to store race control events for %s: %s", race_id, exc)
+
+                # Store weather data
+                if weather_data is not None:
+                    try:
+                        _store_race_weather(db, race_row, weather_data, laps)
+                    except Exception as exc:
+                        logger.warning("Failed to store weather data for %s: %s", race_id, exc)
+
+                # Compute and store enhanced strategy scores
+                try:
+                    _compute_and_store_strategy_scores(db, race_row, entry_map, laps, season, rnd)
+                except Exception as exc:
+                    logger.warning("Failed to compute strategy scores for %s: %s", race_id, exc)
+
+            # mark calendar row (use ilike for case-insensitive match since OpenF1 uses
+            # "Race", "Qualifying", etc. but callers may pass lowercase)
+            ev = (
+                db.query(CalendarEvent)
+                .filter_by(season=season, round=rnd)
+                .filter(CalendarEvent.session_type.ilike(session_type))
+                .one_or_none()
+            )
+            ingested_session = ev.session_type if ev else None
+            if ev:
+                ev.status = "ingested"
+            db.commit()
+        if is_live_session_type(session_type):
             try:
-                _compute_and_store_strategy_scores(db, race_row, entry_map, laps, season, rnd)
-            except Exception as exc:
-                logger.warning("Failed to compute strategy scores for %s: %s", race_id, exc)
-
-        # mark calendar row (use ilike for case-insensitive match since OpenF1 uses
-        # "Race", "Qualifying", etc. but callers may pass lowercase)
-        ev = (
-            db.query(CalendarEvent)
-            .filter_by(season=season, round=rnd)
-            .filter(CalendarEvent.session_type.ilike(session_type))
-            .one_or_none()
-        )
-        if ev:
-            ev.status = "ingested"
-        db.commit()
+                end_live_session(season, rnd, session_type)
+            except Exception as exc:  # pragma: no cover - live state expires on its own
+                logger.warning("Failed to clear live state for %s-%s %s: %s", season, rnd, session_type, exc)
+    finally:
+        if poll_lock is not None:
+            try:
+                release_live_poll_lock(poll_lock)
+            except Exception as exc:  # pragma: no cover - the lock TTL frees it
+                logger.warning("Failed to release the live poll lock: %s", exc)
+    # Replica reads of this season could still predate the commit
+    try:
+        pin_reads_to_primary(season)
+    except Exception as exc:  # pragma: no cover - routing hint should not block ingestion
+        logger.warning("Failed to pin %s reads to the primary: %s", season, exc)
+    # Standings carry forward from the previous round, so only this round on is rewritten
+    if normalized_session in STANDINGS_SESSION_TYPES:
+        try:
+            with SessionLocal() as db:
+                update_standings(db, season, rnd)
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to update standings for %s-%s: %s", season, rnd, exc)
+    if normalized_session == "race":
+        try:
+            with SessionLocal() as db:
+                refresh_race_summary(db, season, rnd)
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to refresh race summary for %s-%s: %s", season, rnd, exc)
+        # Re-grouped for the whole season so a re-ingested race is not counted twice
+        try:
+            with SessionLocal() as db:
+                refresh_season_aggregates(db, season)
+                db.commit()
+        except Exception as exc:
+            logger.warning("Failed to refresh season aggregates for %s: %s", season, exc)
+        try:
+            invalidate_homepage_cache()
+        except Exception as exc:  # pragma: no cover - cache should not block ingestion
+            logger.warning("Failed to invalidate homepage cache: %s", exc)
     try:
         invalidate_analytics_cache(season, rnd)
     except Exception as exc:  # pragma: no cover - cache should not block ingestion
@@ -1741,4 +1858,18 @@ def ingest_session(season: int, rnd: int, session_type: str = "Race", force: boo
         invalidate_strategy_cache(season, rnd)
     except Exception as exc:  # pragma: no cover - cache should not block ingestion
         logger.warning("Failed to invalidate strategy cache for %s-%s: %s", season, rnd, exc)
+    try:
+        bump_race_generation(season, rnd)
+    except Exception as exc:  # pragma: no cover - cache should not block ingestion
+        logger.warning("Failed to bump race generation for %s-%s: %s", season, rnd, exc)
+    # Write-through: rebuild the hot payloads now rather than on the next request
+    if normalized_session in WARM_SESSION_TYPES:
+        try:
+            with SessionLocal() as db:
+                warm_race_caches(db, season, rnd)
+        except Exception as exc:  # pragma: no cover - cache should not block ingestion
+            logger.warning("Failed to warm caches for %s-%s: %s", season, rnd, exc)
+    # Last, so clients refetching on the event see the new generation and warm caches
+    if ingested_session:
+        publish_session_status(season, rnd, ingested_session, "ingested")
     logger.info("%s %s complete: len(laps)=%s", race_id, session_type, len(laps))
@@ -0,0 +1,393 @@
+"""
+Bulk lap-data export built on server-side cursors.
+
+Rows are pulled with `yield_per` (a server-side cursor on PostgreSQL) and
+handed on in batches, so an export of any size never holds more than one
+batch in memory. Serializers turn the batch stream into Arrow IPC, Parquet,
+NDJSON or CSV bytes; all of them are deterministic for the same rows, which
+is what lets the API serve byte ranges of a regenerated export.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.orm import Session
+
+from theundercut.models import (
+    Driver,
+    Entry,
+    LapPosition,
+    LapTime,
+    Race,
+    Season,
+    TestingEvent,
+    TestingLap,
+    TestingSession,
+)
+from theundercut.services.race_keys import race_rows_clause
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pa = None
+    pq = None
+
+EXPORT_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """One exportable column: its SQL expression and Arrow type name."""
+
+    name: str
+    expression: Any
+    arrow_type: str
+
+
+RACE_LAP_COLUMNS: Dict[str, ExportColumn] = {
+    column.name: column
+    for column in (
+        ExportColumn("race_id", LapTime.race_id, "string"),
+        ExportColumn("driver", LapTime.driver, "string"),
+        ExportColumn("lap", LapTime.lap, "int32"),
+        ExportColumn("lap_ms", LapTime.lap_ms, "int64"),
+        ExportColumn("compound", LapTime.compound, "string"),
+        ExportColumn("stint_no", LapTime.stint_no, "int32"),
+        ExportColumn("pit", LapTime.pit, "bool"),
+    )
+}
+
+TESTING_LAP_COLUMNS: Dict[str, ExportColumn] = {
+    column.name: column
+    for column in (
+        ExportColumn("season", TestingEvent.season, "int32"),
+        ExportColumn("event_id", TestingEvent.event_id, "string"),
+        ExportColumn("day", TestingSession.day, "int32"),
+        ExportColumn("driver", TestingLap.driver, "string"),
+        ExportColumn("team", TestingLap.team, "string"),
+        ExportColumn("lap_number", TestingLap.lap_number, "int32"),
+        ExportColumn("lap_time_ms", TestingLap.lap_time_ms, "float64"),
+        ExportColumn("compound", TestingLap.compound, "string"),
+        ExportColumn("stint_number", TestingLap.stint_number, "int32"),
+        ExportColumn("sector_1_ms", TestingLap.sector_1_ms, "float64"),
+        ExportColumn("sector_2_ms", TestingLap.sector_2_ms, "float64"),
+        ExportColumn("sector_3_ms", TestingLap.sector_3_ms, "float64"),
+        ExportColumn("is_valid", TestingLap.is_valid, "bool"),
+    )
+}
+
+
+POSITION_COLUMNS: Dict[str, ExportColumn] = {
+    column.name: column
+    for column in (
+        ExportColumn("season", Season.year, "int32"),
+        ExportColumn("round", Race.round_number, "int32"),
+        ExportColumn("driver", Driver.code, "string"),
+        ExportColumn("lap_number", LapPosition.lap_number, "int32"),
+        ExportColumn("position", LapPosition.position, "int32"),
+        ExportColumn("gap_to_leader_ms", LapPosition.gap_to_leader_ms, "int64"),
+        ExportColumn("gap_to_ahead_ms", LapPosition.gap_to_ahead_ms, "int64"),
+    )
+}
+
+
+def project_columns(
+    available: Dict[str, ExportColumn],
+    requested: Optional[Sequence[str]],
+) -> List[ExportColumn]:
+    """Resolve a column projection, keeping the request order. Raises ValueError."""
+    if not requested:
+        return list(available.values())
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown columns: {', '.join(unknown)}. "
+            f"Available: {', '.join(available)}"
+        )
+    return [available[name] for name in dict.fromkeys(requested)]
+
+
+def _race_id_filter(
+    season: int,
+    season_to: Optional[int],
+    round_from: Optional[int],
+    round_to: Optional[int],
+):
+    """Filter lap_times by season and round ranges (season prunes partitions)."""
+    clause = LapTime.season.between(season, season_to or season)
+    if round_from is not None:
+        clause = and_(clause, LapTime.round >= round_from)
+    if round_to is not None:
+        clause = and_(clause, LapTime.round <= round_to)
+    return clause
+
+
+def race_laps_statement(
+    columns: Sequence[ExportColumn],
+    season: int,
+    rnd: Optional[int] = None,
+    drivers: Optional[Sequence[str]] = None,
+    *,
+    season_to: Optional[int] = None,
+    round_from: Optional[int] = None,
+    round_to: Optional[int] = None,
+    race_key: Optional[int] = None,
+) -> Select:
+    """
+    Select race laps for one round, or for season/round ranges (inclusive).
+    A whole season is exported when no round bounds are given. A single round
+    is read by its `race_key` (see `services.race_keys.lookup_race_key`).
+    """
+    stmt = select(*(column.expression for column in columns))
+    if rnd is not None and season_to is None:
+        stmt = stmt.where(race_rows_clause(LapTime, season, rnd, race_key))
+    else:
+        if rnd is not None:
+            round_from = round_to = rnd
+        stmt = stmt.where(_race_id_filter(season, season_to, round_from, round_to))
+    if drivers:
+        stmt = stmt.where(LapTime.driver.in_(drivers))
+    # Integer round, so a season lists rounds 1, 2, ... 10 rather than "1", "10", "2"
+    return stmt.order_by(LapTime.season, LapTime.round, LapTime.driver, LapTime.lap)
+
+
+def testing_laps_statement(
+    columns: Sequence[ExportColumn],
+    season: int,
+    event_id: Optional[str] = None,
+    day: Optional[int] = None,
+    drivers: Optional[Sequence[str]] = None,
+    *,
+    season_to: Optional[int] = None,
+) -> Select:
+    """Select testing laps for a season range, optionally one event and day."""
+    stmt = (
+        select(*(column.expression for column in columns))
+        .select_from(TestingLap)
+        .join(TestingSession, TestingLap.session_id == TestingSession.id)
+        .join(TestingEvent, TestingSession.event_id == TestingEvent.id)
+        .where(TestingEvent.season.between(season, season_to or season))
+    )
+    if event_id:
+        stmt = stmt.where(TestingEvent.event_id == event_id)
+    if day is not None:
+        stmt = stmt.where(TestingSession.day == day)
+    if drivers:
+        stmt = stmt.where(TestingLap.driver.in_(drivers))
+    return stmt.order_by(
+        TestingEvent.season,
+        TestingEvent.event_id,
+        TestingSession.day,
+        TestingLap.driver,
+        TestingLap.lap_number,
+    )
+
+
+def lap_positions_statement(
+    columns: Sequence[ExportColumn],
+    season: int,
+    drivers: Optional[Sequence[str]] = None,
+    *,
+    season_to: Optional[int] = None,
+    round_from: Optional[int] = None,
+    round_to: Optional[int] = None,
+) -> Select:
+    """Select per-lap positions for season/round ranges (inclusive)."""
+    stmt = (
+        select(*(column.expression for column in columns))
+        .select_from(LapPosition)
+        .join(Race, LapPosition.race_id == Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .join(Entry, LapPosition.entry_id == Entry.id)
+        .join(Driver, Entry.driver_id == Driver.id)
+        .where(Season.year.between(season, season_to or season))
+    )
+    if round_from is not None:
+        stmt = stmt.where(Race.round_number >= round_from)
+    if round_to is not None:
+        stmt = stmt.where(Race.round_number <= round_to)
+    if drivers:
+        stmt = stmt.where(Driver.code.in_(drivers))
+    # The row id breaks ties (shared or missing positions), so a regenerated
+    # export is byte-identical and Range resumes line up
+    return stmt.order_by(
+        Season.year, Race.round_number, LapPosition.lap_number, LapPosition.position, LapPosition.id
+    )
+
+
+# Row id per dataset, used to fingerprint an export for resumable downloads.
+_ID_COLUMNS = {
+    "laps": LapTime.id,
+    "testing_laps": TestingLap.id,
+    "positions": LapPosition.id,
+}
+
+
+def export_fingerprint(db: Session, dataset: str, stmt: Select) -> Tuple[int, Optional[int]]:
+    """
+    Row count and highest row id of an export's filtered rows.
+
+    Changes whenever rows are added or replaced, so it can back the ETag a
+    client sends back in If-Range when resuming a download.
+    """
+    id_column = _ID_COLUMNS[dataset]
+    fingerprint_stmt = stmt.with_only_columns(
+        func.count(id_column), func.max(id_column), maintain_column_froms=True
+    ).order_by(None)
+    count, max_id = db.execute(fingerprint_stmt).one()
+    return int(count or 0), max_id
+
+
+def iter_row_batches(
+    db: Session,
+    stmt: Select,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """Yield result rows in batches from a server-side cursor."""
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after each batch."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def ndjson_stream(
+    columns: Sequence[ExportColumn],
+    batches: Iterator[List[Tuple[Any, ...]]],
+) -> Iterator[bytes]:
+    """Serialize row batches as newline-delimited JSON, one chunk per batch."""
+    names = [column.name for column in columns]
+    for rows in batches:
+        if not rows:
+            continue
+        yield "".join(
+            json.dumps(dict(zip(names, row)), separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+def csv_stream(
+    columns: Sequence[ExportColumn],
+    batches: Iterator[List[Tuple[Any, ...]]],
+) -> Iterator[bytes]:
+    """Serialize row batches as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([column.name for column in columns])
+    for rows in batches:
+        if rows:
+            writer.writerows(rows)
+        chunk = buffer.getvalue()
+        if chunk:
+            yield chunk.encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def require_pyarrow() -> None:
+    """Raise RuntimeError when the optional pyarrow dependency is missing."""
+    if pa is None or pq is None:
+        raise RuntimeError("pyarrow is not installed; install the 'arrow' extra")
+
+
+def _arrow_schema(columns: Sequence[ExportColumn]):
+    factories = {
+        "string": pa.string,
+        "int32": pa.int32,
+        "int64": pa.int64,
+        "float64": pa.float64,
+        "bool": pa.bool_,
+    }
+    return pa.schema([(column.name, factories[column.arrow_type]()) for column in columns])
+
+
+def arrow_stream(
+    columns: Sequence[ExportColumn],
+    batches: Iterator[List[Tuple[Any, ...]]],
+    fmt: str = "arrow",
+) -> Iterator[bytes]:
+    """
+    Serialize row batches as an Arrow IPC stream (fmt="arrow") or a Parquet
+    file (fmt="parquet"), yielding bytes as each batch is written.
+    """
+    require_pyarrow()
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        write = writer.write_table
+        to_chunk = pa.Table.from_arrays
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+        to_chunk = pa.RecordBatch.from_arrays
+
+    try:
+        for rows in batches:
+            if not rows:
+                continue
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*rows), schema)
+            ]
+            write(to_chunk(arrays, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+__all__ = [
+    "ExportColumn",
+    "RACE_LAP_COLUMNS",
+    "TESTING_LAP_COLUMNS",
+    "POSITION_COLUMNS",
+    "EXPORT_BATCH_SIZE",
+    "project_columns",
+    "race_laps_statement",
+    "testing_laps_statement",
+    "lap_positions_statement",
+    "export_fingerprint",
+    "iter_row_batches",
+    "ndjson_stream",
+    "csv_stream",
+    "require_pyarrow",
+    "arrow_stream",
+]
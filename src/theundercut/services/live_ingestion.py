@@ -0,0 +1,494 @@
+"""
+Incremental lap ingestion while a race is live.
+
+The final ingest (`ingestion.ingest_session`) runs five minutes after a
+session ends. While a race's calendar status is `live`, `poll_live_session`
+asks OpenF1 only for what was published since the previous poll (`date>`
+cursors on laps, position and race_control), appends the new rows to
+lap_times (flagged `provisional`) and lap_positions and advances the cached
+analytics laps and the live snapshot in place. Cursors and per-driver state
+are kept in one Redis key per session; the final ingest replaces the
+provisional rows and clears it.
+"""
+from __future__ import annotations
+
+import bisect
+import datetime as dt
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from theundercut.adapters.db import SessionLocal
+from theundercut.adapters.openf1_loader import OPENF1_TIMEOUT, get_session_key, openf1_get
+from theundercut.adapters.redis_cache import redis_client
+from theundercut.models import Driver, Entry, LapPosition, LapTime
+from theundercut.services.analytics import LAP_COLUMNS
+from theundercut.services.cache import (
+    ANALYTICS_CACHE_PREFIX,
+    analytics_cache_key,
+    bump_race_generation,
+    decode_cache_payload,
+    encode_cache_payload,
+    live_cache_key,
+    normalize_session_type,
+    section_cache_key,
+)
+from theundercut.services.ingestion import SESSION_TYPE_MAP, ensure_season_partitions
+from theundercut.services.race_events import LIVE_LAPS_EVENT, publish_race_event
+from theundercut.services.race_keys import ensure_race_key, lookup_race_key, race_rows_clause
+
+logger = logging.getLogger(__name__)
+
+# Only the race owns its round's lap_times and lap_positions rows
+LIVE_SESSION_TYPES = ("race",)
+# Live state outlasts any session; the final ingest normally deletes it first
+LIVE_STATE_TTL_SECONDS = 6 * 3600
+# Race control messages kept in the live snapshot
+LIVE_RACE_CONTROL_LIMIT = 50
+
+
+def is_live_session_type(session_type: str) -> bool:
+    """True for session types the live poller ingests."""
+    return SESSION_TYPE_MAP.get(session_type, session_type.lower()) in LIVE_SESSION_TYPES
+
+
+def live_state_key(season: int, rnd: int, session_type: str) -> str:
+    """Redis key holding a live session's cursors and per-driver state."""
+    return f"{live_cache_key(season, rnd)}:state:{normalize_session_type(session_type)}"
+
+
+def _load_state(season: int, rnd: int, session_type: str) -> Optional[Dict[str, Any]]:
+    cached = redis_client.get(live_state_key(season, rnd, session_type))
+    return decode_cache_payload(cached) if cached else None
+
+
+def _parse_date(value: str) -> dt.datetime:
+    return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+# --- OpenF1 increments --------------------------------------------------------
+
+def _fetch_increments(client: httpx.Client, state: Dict[str, Any]) -> Dict[str, List[Dict]]:
+    """
+    Fetch what OpenF1 published since the stored cursors.
+
+    Laps use `date_start>=` because a lap is published when it starts and only
+    gets its duration when it ends; the cursor stays on the oldest open lap, so
+    each poll re-reads at most one lap per driver. Stints have no date, so they
+    are read from the oldest stint still running.
+    """
+    session_key = state["session_key"]
+    cursors = state["cursors"]
+    params = {"session_key": session_key}
+    laps = openf1_get(client, "laps", {**params, **_cursor("date_start>=", cursors.get("laps"))})
+    positions = openf1_get(client, "position", {**params, **_cursor("date>", cursors.get("position"))})
+    race_control = openf1_get(
+        client, "race_control", {**params, **_cursor("date>", cursors.get("race_control"))}
+    )
+    current_stints = [stint[0] for stint in state["stints"].values()]
+    stint_params = {"stint_number>=": min(current_stints)} if current_stints else {}
+    stints = openf1_get(client, "stints", {**params, **stint_params})
+    return {"laps": laps, "position": positions, "race_control": race_control, "stints": stints}
+
+
+def _cursor(name: str, value: Optional[str]) -> Dict[str, str]:
+    return {name: value} if value else {}
+
+
+def _refresh_drivers(client: httpx.Client, state: Dict[str, Any], numbers: List[str]) -> None:
+    """Fetch the session's driver acronyms when an unknown car number shows up."""
+    if all(number in state["drivers"] for number in numbers):
+        return
+    for row in openf1_get(client, "drivers", {"session_key": state["session_key"]}):
+        number = str(row.get("driver_number", ""))
+        state["drivers"][number] = row.get("name_acronym") or number
+
+
+def _completed_laps(state: Dict[str, Any], laps: List[Dict]) -> List[Dict]:
+    """
+    Laps finished since the last poll, and move the laps cursor.
+
+    A driver's newest lap without a duration is still running; it is held back
+    and the cursor stays on it. Earlier laps without one (e.g. after a red flag)
+    are final and stored with lap_ms -1, as the final ingest does.
+    """
+    laps = [lap for lap in laps if lap.get("lap_number") is not None]
+    latest: Dict[str, Dict] = {}
+    for lap in laps:
+        number = str(lap.get("driver_number"))
+        if number not in latest or lap["lap_number"] > latest[number]["lap_number"]:
+            latest[number] = lap
+    open_laps = [lap for lap in latest.values() if lap.get("lap_duration") is None]
+    open_ids = {id(lap) for lap in open_laps}
+
+    last_lap = state["last_lap"]
+    completed = [
+        lap for lap in laps
+        if id(lap) not in open_ids
+        and lap["lap_number"] > last_lap.get(str(lap.get("driver_number")), 0)
+    ]
+    starts = [lap["date_start"] for lap in (open_laps or laps) if lap.get("date_start")]
+    if starts:
+        pick = min if open_laps else max
+        state["cursors"]["laps"] = pick(starts, key=_parse_date)
+    return sorted(completed, key=lambda lap: (str(lap["driver_number"]), lap["lap_number"]))
+
+
+def _update_stints(state: Dict[str, Any], stints: List[Dict]) -> Dict[str, List[Tuple[int, int, Optional[str]]]]:
+    """Per-driver (lap_start, stint_number, compound) lists, keeping each driver's current stint."""
+    by_driver: Dict[str, Dict[int, Tuple[int, int, Optional[str]]]] = {}
+    for number, (stint_no, compound, lap_start) in state["stints"].items():
+        by_driver[number] = {stint_no: (lap_start, stint_no, compound)}
+    for stint in stints:
+        if stint.get("stint_number") is None:
+            continue
+        number = str(stint.get("driver_number"))
+        stint_no = stint["stint_number"]
+        by_driver.setdefault(number, {})[stint_no] = (stint.get("lap_start") or 1, stint_no, stint.get("compound"))
+    ordered = {}
+    for number, entries in by_driver.items():
+        ordered[number] = sorted(entries.values(), key=lambda entry: (entry[0], entry[1]))
+        lap_start, stint_no, compound = ordered[number][-1]
+        state["stints"][number] = [stint_no, compound, lap_start]
+    return ordered
+
+
+def _stint_for_lap(
+    stints: List[Tuple[int, int, Optional[str]]], lap_number: int
+) -> Tuple[Optional[int], Optional[str]]:
+    index = bisect.bisect_right(stints, lap_number, key=lambda entry: entry[0]) - 1
+    if index < 0:
+        return None, None
+    _, stint_no, compound = stints[index]
+    return stint_no, compound
+
+
+def _pit_for_lap(stints: List[Tuple[int, int, Optional[str]]], lap_number: int) -> Optional[bool]:
+    """
+    Whether the driver pitted at the end of a lap, as far as the stints show.
+
+    True when a stint starts on the next lap and False when a later stint
+    started after it; None while the lap is still in the driver's running
+    stint, since that stint may yet end on it. The final ingest fills it in.
+    """
+    starts = [entry[0] for entry in stints]
+    if lap_number + 1 in starts:
+        return True
+    return False if starts and starts[-1] > lap_number + 1 else None
+
+
+def _update_positions(state: Dict[str, Any], positions: List[Dict]) -> Dict[str, List[Tuple[dt.datetime, int]]]:
+    """Per-driver (date, position) timelines: the stored latest plus the new changes."""
+    timelines: Dict[str, List[Tuple[dt.datetime, int]]] = {
+        number: [(_parse_date(date), position)]
+        for number, (date, position) in state["positions"].items()
+    }
+    dates = []
+    for row in positions:
+        if row.get("date") is None or row.get("position") is None:
+            continue
+        number = str(row.get("driver_number"))
+        timelines.setdefault(number, []).append((_parse_date(row["date"]), int(row["position"])))
+        dates.append(row["date"])
+    if dates:
+        state["cursors"]["position"] = max(dates, key=_parse_date)
+    for number, timeline in timelines.items():
+        timeline.sort(key=lambda change: change[0])
+        date, position = timeline[-1]
+        state["positions"][number] = [date.isoformat(), position]
+    return timelines
+
+
+def _position_at(timeline: List[Tuple[dt.datetime, int]], when: dt.datetime) -> Optional[int]:
+    index = bisect.bisect_right(timeline, when, key=lambda change: change[0]) - 1
+    return timeline[index][1] if index >= 0 else None
+
+
+# --- Storage ------------------------------------------------------------------
+
+def _race_context(db: Session, season: int, rnd: int, state: Dict[str, Any]) -> None:
+    """Resolve the race key, and look up the entries until the weekend's reference rows exist."""
+    if state.get("race_key") and state.get("entries"):
+        return
+    race_key = ensure_race_key(db, season, rnd)
+    state["race_key"] = race_key
+    state["entries"] = dict(
+        db.execute(
+            select(Driver.code, Entry.id)
+            .join(Driver, Entry.driver_id == Driver.id)
+            .where(Entry.race_id == race_key)
+        ).all()
+    )
+
+
+def _store_live_rows(
+    db: Session,
+    season: int,
+    rnd: int,
+    state: Dict[str, Any],
+    lap_rows: List[Dict[str, Any]],
+) -> int:
+    """Append new laps (and their positions when the race's entries exist)."""
+    if not lap_rows:
+        return 0
+    race_id = f"{season}-{rnd}"
+    db.execute(
+        pg_insert(LapTime)
+        .values([
+            {
+                "season": season,
+                "round": rnd,
+                "race_key": state["race_key"],
+                "race_id": race_id,
+                "provisional": True,
+                **{column: row[column] for column in LAP_COLUMNS},
+            }
+            for row in lap_rows
+        ])
+        .on_conflict_do_nothing(index_elements=["season", "race_key", "driver", "lap"])
+    )
+    entries = state.get("entries") or {}
+    positions = [
+        {
+            "race_id": state["race_key"],
+            "entry_id": entries[row["driver"]],
+            "lap_number": row["lap"],
+            "position": row["position"],
+        }
+        for row in lap_rows
+        if row["position"] is not None and row["driver"] in entries
+    ]
+    if positions:
+        db.execute(
+            pg_insert(LapPosition)
+            .values(positions)
+            .on_conflict_do_nothing(index_elements=["race_id", "entry_id", "lap_number"])
+        )
+    return len(positions)
+
+
+def discard_live_laps(db: Session, season: int, rnd: int) -> int:
+    """Delete a round's provisional live lap rows before the final ingest stores the session."""
+    return (
+        db.query(LapTime)
+        .filter(
+            race_rows_clause(LapTime, season, rnd, lookup_race_key(db, season, rnd)),
+            LapTime.provisional.is_(True),
+        )
+        .delete(synchronize_session=False)
+    )
+
+
+# --- Cache increments ---------------------------------------------------------
+
+def _append_lap_columns(columns: Dict[str, List[Any]], lap_rows: List[Dict[str, Any]]) -> None:
+    # Keyed on (driver, lap) so a lap the table already holds is not listed twice
+    merged = {row[:2]: row for row in zip(*(columns[name] for name in LAP_COLUMNS))}
+    merged.update(
+        ((row["driver"], row["lap"]), tuple(row[name] for name in LAP_COLUMNS)) for row in lap_rows
+    )
+    rows = sorted(merged.values(), key=lambda row: (row[0], row[1] if row[1] is not None else -1))
+    for index, name in enumerate(LAP_COLUMNS):
+        columns[name] = [row[index] for row in rows]
+
+
+def _advance_analytics_cache(season: int, rnd: int, lap_rows: List[Dict[str, Any]]) -> None:
+    """
+    Append new laps to the cached analytics table and laps section in place.
+
+    Responses sliced from them (driver filters, `fields=` selections,
+    precompressed variants) are dropped and re-sliced without a query; the
+    stints, grade and car-number sections do not change during a session and
+    are kept.
+    """
+    base = analytics_cache_key(season, rnd)
+    laps_section = section_cache_key(base, "laps")
+    for key in (base, laps_section):
+        cached = redis_client.get(key)
+        if not cached:
+            continue
+        payload = decode_cache_payload(cached)
+        columns = payload.get("value") if key == laps_section else payload.get("laps")
+        if not isinstance(columns, dict):
+            continue
+        _append_lap_columns(columns, lap_rows)
+        if key == base:
+            payload["last_updated"] = dt.datetime.utcnow().isoformat() + "Z"
+        redis_client.set(key, encode_cache_payload(payload), keepttl=True)
+
+    kept = {base, laps_section} | {
+        section_cache_key(base, section) for section in ("stints", "driver_metric_grades", "car_numbers")
+    }
+    derived = [
+        key for key in redis_client.scan_iter(match=f"{ANALYTICS_CACHE_PREFIX}:{season}:{rnd}:*")
+        if key not in kept
+    ]
+    if derived:
+        redis_client.delete(*derived)
+
+
+def _advance_live_snapshot(
+    season: int,
+    rnd: int,
+    session_type: str,
+    state: Dict[str, Any],
+    race_control: List[Dict],
+) -> Dict[str, Any]:
+    """Fold this poll's increment into the live snapshot served to clients."""
+    key = live_cache_key(season, rnd)
+    cached = redis_client.get(key)
+    snapshot = decode_cache_payload(cached) if cached else {}
+    messages = snapshot.get("race_control", []) + race_control
+    drivers = state["drivers"]
+    snapshot.update({
+        "season": season,
+        "round": rnd,
+        "session_type": session_type,
+        "lap": max(state["last_lap"].values(), default=0),
+        "positions": sorted(
+            (
+                {"driver": drivers.get(number, number), "position": position}
+                for number, (_, position) in state["positions"].items()
+            ),
+            key=lambda row: row["position"],
+        ),
+        "race_control": messages[-LIVE_RACE_CONTROL_LIMIT:],
+        "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+    })
+    redis_client.setex(key, LIVE_STATE_TTL_SECONDS, encode_cache_payload(snapshot))
+    return snapshot
+
+
+# --- Entry points ---------------------------------------------------------------
+
+def _new_state(season: int, rnd: int, session_type: str) -> Optional[Dict[str, Any]]:
+    session_key = get_session_key(season, rnd, session_type)
+    if session_key is None:
+        return None
+    return {
+        "session_key": session_key,
+        "cursors": {},
+        "drivers": {},
+        "last_lap": {},
+        "stints": {},
+        "positions": {},
+    }
+
+
+def poll_live_session(
+    season: int,
+    rnd: int,
+    session_type: str = "Race",
+    client: Optional[httpx.Client] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Ingest one increment of a live session.
+
+    Returns the increment ({"laps", "positions", "race_control", "lap"}), or
+    None when OpenF1 has no session for it yet. A poll that finds nothing new
+    writes nothing to Postgres and leaves the caches alone.
+    """
+    state = _load_state(season, rnd, session_type) or _new_state(season, rnd, session_type)
+    if state is None:
+        logger.info("No OpenF1 session yet for live %s-%s %s", season, rnd, session_type)
+        return None
+
+    owns_client = client is None
+    client = client or httpx.Client(timeout=OPENF1_TIMEOUT)
+    try:
+        fetched = _fetch_increments(client, state)
+        laps = _completed_laps(state, fetched["laps"])
+        _refresh_drivers(client, state, [str(lap["driver_number"]) for lap in laps])
+    finally:
+        if owns_client:
+            client.close()
+
+    stints = _update_stints(state, fetched["stints"])
+    timelines = _update_positions(state, fetched["position"])
+    race_control = [
+        {key: row.get(key) for key in ("date", "lap_number", "category", "flag", "message")}
+        for row in fetched["race_control"]
+        if row.get("date")
+    ]
+    if race_control:
+        state["cursors"]["race_control"] = max((row["date"] for row in race_control), key=_parse_date)
+
+    lap_rows: List[Dict[str, Any]] = []
+    for lap in laps:
+        number = str(lap["driver_number"])
+        duration = lap.get("lap_duration")
+        stint_no, compound = _stint_for_lap(stints.get(number, []), lap["lap_number"])
+        position = None
+        if duration is not None and lap.get("date_start"):
+            lap_end = _parse_date(lap["date_start"]) + dt.timedelta(seconds=duration)
+            position = _position_at(timelines.get(number, []), lap_end)
+        lap_rows.append({
+            "driver": state["drivers"].get(number, number),
+            "lap": lap["lap_number"],
+            "lap_ms": round(duration * 1000) if duration is not None else -1,
+            "compound": compound,
+            "stint_no": stint_no if stint_no is not None else -1,
+            "pit": _pit_for_lap(stints.get(number, []), lap["lap_number"]),
+            "position": position,
+        })
+        state["last_lap"][number] = lap["lap_number"]
+
+    stored_positions = 0
+    if lap_rows:
+        with SessionLocal() as db:
+            if not state.get("partitions"):
+                ensure_season_partitions(db, season)
+                state["partitions"] = True
+            _race_context(db, season, rnd, state)
+            stored_positions = _store_live_rows(db, season, rnd, state, lap_rows)
+            db.commit()
+
+    redis_client.setex(
+        live_state_key(season, rnd, session_type), LIVE_STATE_TTL_SECONDS, encode_cache_payload(state)
+    )
+    if lap_rows or race_control or fetched["position"]:
+        snapshot = _advance_live_snapshot(season, rnd, session_type, state, race_control)
+    else:
+        snapshot = None
+    if lap_rows:
+        try:
+            _advance_analytics_cache(season, rnd, lap_rows)
+            bump_race_generation(season, rnd)
+        except Exception as exc:  # pragma: no cover - cache should not block ingestion
+            logger.warning("Failed to advance caches for live %s-%s: %s", season, rnd, exc)
+
+    logger.info(
+        "Live %s-%s %s: %d laps, %d positions, %d race control messages",
+        season, rnd, session_type, len(lap_rows), stored_positions, len(race_control),
+    )
+    increment = {
+        "laps": [{key: row[key] for key in ("driver", "lap", "lap_ms", "compound", "stint_no")} for row in lap_rows],
+        "positions": snapshot["positions"] if snapshot else [],
+        "race_control": race_control,
+        "lap": max(state["last_lap"].values(), default=0),
+    }
+    if snapshot is not None:
+        try:
+            publish_race_event(season, rnd, LIVE_LAPS_EVENT, {"session_type": session_type, **increment})
+        except Exception as exc:  # pragma: no cover - notifications should not block ingestion
+            logger.warning("Failed to publish live increment for %s-%s: %s", season, rnd, exc)
+    return increment
+
+
+def end_live_session(season: int, rnd: int, session_type: str) -> None:
+    """Drop a session's live cursors and snapshot once the final ingest has committed."""
+    redis_client.delete(live_state_key(season, rnd, session_type), live_cache_key(season, rnd))
+
+
+__all__ = [
+    "LIVE_SESSION_TYPES",
+    "is_live_session_type",
+    "live_state_key",
+    "poll_live_session",
+    "discard_live_laps",
+    "end_live_session",
+]
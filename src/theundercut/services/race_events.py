@@ -0,0 +1,70 @@
+"""
+Race event publishing over Redis pub/sub.
+
+Workers and the scheduler publish session status changes and live lap
+increments on one channel per race weekend. The API relays them to
+Server-Sent Events clients (`api.events`), so clients learn about changes
+without polling the weekend or results endpoints.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from theundercut.adapters.redis_cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+RACE_EVENTS_CHANNEL_PREFIX = "events:v1"
+
+# Event names sent to clients
+SESSION_STATUS_EVENT = "session_status"
+LIVE_LAPS_EVENT = "live_laps"
+
+
+def race_events_channel(season: int, rnd: int) -> str:
+    """Pub/sub channel carrying one race weekend's events."""
+    return f"{RACE_EVENTS_CHANNEL_PREFIX}:{season}:{rnd}"
+
+
+def parse_race_events_channel(channel: str) -> Optional[Tuple[int, int]]:
+    """(season, round) of a race events channel, or None for any other channel."""
+    prefix, _, rest = channel.rpartition(":")
+    prefix, _, season = prefix.rpartition(":")
+    if prefix != RACE_EVENTS_CHANNEL_PREFIX or not season.isdigit() or not rest.isdigit():
+        return None
+    return int(season), int(rest)
+
+
+def publish_race_event(
+    season: int,
+    rnd: int,
+    event: str,
+    data: Dict[str, Any],
+    client=None,
+) -> int:
+    """Publish an event for a race weekend; returns the number of API processes that received it."""
+    message = json.dumps({"event": event, "data": data}, separators=(",", ":"), default=str)
+    return int((client or redis_client).publish(race_events_channel(season, rnd), message))
+
+
+def publish_session_status(season: int, rnd: int, session_type: str, status: str) -> None:
+    """Announce a calendar status change; failures are logged, never raised."""
+    try:
+        publish_race_event(
+            season, rnd, SESSION_STATUS_EVENT, {"session_type": session_type, "status": status}
+        )
+    except Exception as exc:  # pragma: no cover - notifications should not block status changes
+        logger.warning("Failed to publish %s status for %s-%s: %s", session_type, season, rnd, exc)
+
+
+__all__ = [
+    "RACE_EVENTS_CHANNEL_PREFIX",
+    "SESSION_STATUS_EVENT",
+    "LIVE_LAPS_EVENT",
+    "race_events_channel",
+    "parse_race_events_channel",
+    "publish_race_event",
+    "publish_session_status",
+]
@@ -0,0 +1,96 @@
+"""
+Integer race keys for lap_times and stints.
+
+Rows are keyed by `race_key`, the core.races id of their race, next to the
+season partition key. Reads filter on (season, race_key), the leading columns
+of the tables' covering and unique indexes, and writers upsert against that
+unique index. The string race_id ("season-round") is only kept for
+compatibility.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from theundercut.models import Race, Season
+
+
+def _race_keys_statement(season: int, rounds: Iterable[int]):
+    # Duplicate core.races rows for a round resolve to the oldest, as in the backfill
+    return (
+        select(Race.round_number, Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .where(Season.year == season, Race.round_number.in_(list(rounds)))
+        .order_by(Race.round_number, Race.id.desc())
+    )
+
+
+def lookup_race_keys(db: Session, season: int, rounds: Iterable[int]) -> Dict[int, int]:
+    """core.races ids of the given rounds of a season (rounds without a row are left out)."""
+    return dict(db.execute(_race_keys_statement(season, rounds)).all())
+
+
+def lookup_race_key(db: Session, season: int, rnd: int) -> Optional[int]:
+    """core.races id of one round, or None when the race has no reference row."""
+    return lookup_race_keys(db, season, [rnd]).get(rnd)
+
+
+def race_rows_clause(model, season: int, rnd: int, race_key: Optional[int]) -> ColumnElement:
+    """
+    Filter a lap_times/stints model to one race.
+
+    Uses (season, race_key) when the race has a key. Stored rows always do in
+    Postgres, so the race_id fallback only serves races with no reference row
+    (which then have no rows either, outside of test databases).
+    """
+    if race_key is None:
+        return and_(model.season == season, model.race_id == f"{season}-{rnd}")
+    return and_(model.season == season, model.race_key == race_key)
+
+
+def race_column(model, season: int, rounds: Sequence[int], race_keys: Dict[int, int]):
+    """
+    Column identifying each row's race for a batch read of several rounds.
+
+    Returns (column, {value: round}): race_key when every round has a key,
+    else race_id (the same fallback as `race_rows_clause`). Reads filter with
+    `column.in_(values)` and order by the column to group rows per race.
+    """
+    if all(rnd in race_keys for rnd in rounds):
+        return model.race_key, {race_keys[rnd]: rnd for rnd in rounds}
+    return model.race_id, {f"{season}-{rnd}": rnd for rnd in rounds}
+
+
+def ensure_race_key(db: Session, season: int, rnd: int) -> int:
+    """
+    Return the round's core.races id, creating placeholder rows if needed.
+
+    Laps can be stored (by the live poller, or an ingest without a Drive
+    Grade weekend) before the reference rows exist. The placeholder race uses
+    the "{season}-{round}" slug that reference ingestion falls back to, and
+    that ingestion fills in its details later instead of adding a second row.
+    """
+    race_key = lookup_race_key(db, season, rnd)
+    if race_key is not None:
+        return race_key
+    season_row = db.query(Season).filter_by(year=season).one_or_none()
+    if season_row is None:
+        season_row = Season(year=season, status="active")
+        db.add(season_row)
+        db.flush()
+    race = Race(season_id=season_row.id, round_number=rnd, slug=f"{season}-{rnd}", session_type="R")
+    db.add(race)
+    db.flush()
+    return race.id
+
+
+__all__ = [
+    "ensure_race_key",
+    "lookup_race_key",
+    "lookup_race_keys",
+    "race_column",
+    "race_rows_clause",
+]
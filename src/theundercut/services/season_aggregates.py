@@ -0,0 +1,191 @@
+"""
+Season aggregates of Drive Grade and strategy scores.
+
+Per-season driver and constructor rows (average and total grade, component
+averages, strategy factor averages, races counted) are stored in
+core.season_driver_aggregates / core.season_constructor_aggregates.
+Ingestion refreshes the affected season after each race, so leaderboards read
+one table instead of every race's metrics.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from theundercut.models import (
+    Driver,
+    DriverMetrics,
+    Entry,
+    Race,
+    Season,
+    SeasonConstructorAggregate,
+    SeasonDriverAggregate,
+    StrategyScore,
+    Team,
+)
+
+# Aggregate column -> averaged source column
+GRADE_AVERAGES = {
+    "average_grade": DriverMetrics.total_grade,
+    "avg_consistency": DriverMetrics.consistency_score,
+    "avg_team_strategy": DriverMetrics.team_strategy_score,
+    "avg_racecraft": DriverMetrics.racecraft_score,
+    "avg_penalties": DriverMetrics.penalty_score,
+}
+STRATEGY_AVERAGES = {
+    "avg_strategy_score": StrategyScore.total_score,
+    "avg_pit_timing": StrategyScore.pit_timing_score,
+    "avg_tire_selection": StrategyScore.tire_selection_score,
+    "avg_safety_car": StrategyScore.safety_car_score,
+    "avg_weather": StrategyScore.weather_score,
+}
+AGGREGATE_FIELDS = (
+    "races",
+    "total_grade",
+    *GRADE_AVERAGES,
+    "strategy_races",
+    *STRATEGY_AVERAGES,
+    "calibration_profile",
+)
+
+
+def _season_select(season: int, key_column, races_expr, strategy_races_expr):
+    """One GROUP BY over the season's entries with their grade and strategy rows."""
+    return (
+        select(
+            key_column.label("key"),
+            races_expr.label("races"),
+            func.sum(DriverMetrics.total_grade).label("total_grade"),
+            *(func.avg(column).label(name) for name, column in GRADE_AVERAGES.items()),
+            strategy_races_expr.label("strategy_races"),
+            *(func.avg(column).label(name) for name, column in STRATEGY_AVERAGES.items()),
+            func.min(DriverMetrics.calibration_profile).label("min_profile"),
+            func.max(DriverMetrics.calibration_profile).label("max_profile"),
+        )
+        .select_from(Entry)
+        .join(Race, Entry.race_id == Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .join(Driver, Entry.driver_id == Driver.id)
+        .join(Team, Entry.team_id == Team.id)
+        .outerjoin(DriverMetrics, DriverMetrics.entry_id == Entry.id)
+        .outerjoin(StrategyScore, StrategyScore.entry_id == Entry.id)
+        .where(Season.year == season)
+        .group_by(key_column)
+        .having(func.count(DriverMetrics.id) + func.count(StrategyScore.id) > 0)
+    )
+
+
+def _row_values(row) -> Dict[str, Any]:
+    values = {field: getattr(row, field) for field in AGGREGATE_FIELDS if field != "calibration_profile"}
+    if row.min_profile == row.max_profile:
+        values["calibration_profile"] = row.min_profile
+    else:
+        values["calibration_profile"] = "mixed"
+    return values
+
+
+def _latest_teams(db: Session, season: int) -> Dict[str, str]:
+    """Each driver's team in their latest race of the season."""
+    rows = db.execute(
+        select(Driver.code, Team.name)
+        .select_from(Entry)
+        .join(Race, Entry.race_id == Race.id)
+        .join(Season, Race.season_id == Season.id)
+        .join(Driver, Entry.driver_id == Driver.id)
+        .join(Team, Entry.team_id == Team.id)
+        .where(Season.year == season)
+        .order_by(Race.round_number)
+    )
+    return {code: team for code, team in rows}
+
+
+def refresh_season_aggregates(db: Session, season: int) -> Dict[str, int]:
+    """
+    Recompute the driver and constructor aggregates of one season.
+
+    Runs one grouped query per table over that season only, so re-ingesting
+    or re-grading a race (e.g. after a calibration change) replaces its
+    contribution instead of adding it twice. Returns the rows written per
+    table; the caller commits.
+    """
+    now = datetime.now(timezone.utc)
+    driver_rows = db.execute(
+        _season_select(
+            season,
+            Driver.code,
+            func.count(DriverMetrics.id),
+            func.count(StrategyScore.id),
+        )
+    ).all()
+    graded_race = case((DriverMetrics.id.is_not(None), Entry.race_id))
+    scored_race = case((StrategyScore.id.is_not(None), Entry.race_id))
+    constructor_rows = db.execute(
+        _season_select(
+            season,
+            Team.name,
+            func.count(func.distinct(graded_race)),
+            func.count(func.distinct(scored_race)),
+        )
+    ).all()
+    teams = _latest_teams(db, season)
+
+    for model in (SeasonDriverAggregate, SeasonConstructorAggregate):
+        db.query(model).filter(model.season == season).delete(synchronize_session=False)
+    db.add_all(
+        SeasonDriverAggregate(
+            season=season,
+            driver_code=row.key,
+            team=teams.get(row.key),
+            updated_at=now,
+            **_row_values(row),
+        )
+        for row in driver_rows
+    )
+    db.add_all(
+        SeasonConstructorAggregate(season=season, team=row.key, updated_at=now, **_row_values(row))
+        for row in constructor_rows
+    )
+    db.flush()
+    return {"drivers": len(driver_rows), "constructors": len(constructor_rows)}
+
+
+def _aggregate_payload(row, name_fields: List[str]) -> Dict[str, Any]:
+    payload = {field: getattr(row, field) for field in name_fields}
+    for field in AGGREGATE_FIELDS:
+        value = getattr(row, field)
+        payload[field] = round(value, 2) if isinstance(value, float) else value
+    return payload
+
+
+def load_season_aggregates(db: Session, season: int) -> Optional[Dict[str, Any]]:
+    """Stored season leaderboards (best average grade first), or None if there are none."""
+    drivers = (
+        db.query(SeasonDriverAggregate)
+        .filter(SeasonDriverAggregate.season == season)
+        .order_by(SeasonDriverAggregate.average_grade.desc().nulls_last(), SeasonDriverAggregate.driver_code)
+        .all()
+    )
+    if not drivers:
+        return None
+    constructors = (
+        db.query(SeasonConstructorAggregate)
+        .filter(SeasonConstructorAggregate.season == season)
+        .order_by(SeasonConstructorAggregate.average_grade.desc().nulls_last(), SeasonConstructorAggregate.team)
+        .all()
+    )
+    updated = [row.updated_at for row in drivers if row.updated_at]
+    return {
+        "season": season,
+        "updated_at": max(updated).isoformat() if updated else None,
+        "drivers": [_aggregate_payload(row, ["driver_code", "team"]) for row in drivers],
+        "constructors": [_aggregate_payload(row, ["team"]) for row in constructors],
+    }
+
+
+__all__ = [
+    "refresh_season_aggregates",
+    "load_season_aggregates",
+]
@@ -1,19 +1,47 @@
 """
 Season standings service.
 
-Fetches driver and constructor championship standings, computing derived
+Serves driver and constructor championship standings, computing derived
 metrics like positions gained, projected points, and last-5-race performance.
+
+Standings are computed locally from session_classifications and stored per
+round in driver_standings/constructor_standings; ingestion updates them after
+each race or sprint. Jolpica is only a fallback for seasons without local
+rows and a periodic cross-check (`cross_check_standings`).
 """
 from __future__ import annotations
 
+import logging
+import re
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 import httpx
-from sqlalchemy import text
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 
+from theundercut.models import (
+    CalendarEvent,
+    Circuit,
+    ConstructorStanding,
+    DriverStanding,
+    Race,
+    RaceSummary,
+    Season,
+    SessionClassification,
+)
+
+logger = logging.getLogger(__name__)
+
 JOLPICA_BASE = "https://api.jolpi.ca/ergast/f1"
 
+# Sessions that award championship points, and the one that sets wins/grid.
+POINTS_SESSION_TYPES = ("race", "sprint_race")
+STANDINGS_SESSION_TYPES = POINTS_SESSION_TYPES + ("qualifying",)
+LAST_N_ROUNDS = 5
+# Unclassified finishers count as P20 in the finish/gain metrics, as before.
+UNCLASSIFIED_POSITION = 20
+
 
 def _fetch_driver_standings(season: int) -> List[Dict[str, Any]]:
     """Fetch driver standings from Jolpica API."""
@@ -253,9 +281,472 @@ def _compute_driver_metrics(races: List[Dict], driver_code: str) -> Dict[str, An
     }
 
 
+def _count_calendar_races(db: Session, season: int, fallback_completed: int) -> tuple[int, int]:
+    """Return (completed, remaining) race counts from the calendar."""
+    try:
+        result = db.execute(text("""
+            SELECT
+                COUNT(*) FILTER (WHERE session_type = 'Race' AND start_ts < NOW()) as completed,
+                COUNT(*) FILTER (WHERE session_type = 'Race' AND start_ts >= NOW()) as remaining
+            FROM calendar_events
+            WHERE season = :season
+        """), {"season": season})
+        row = result.fetchone()
+        if row:
+            return row[0] or 0, row[1] or 0
+    except Exception:
+        pass
+    return fallback_completed, 24 - fallback_completed  # Estimate
+
+
+# --- Local standings ------------------------------------------------------------
+
+def _new_driver_entry(code: str) -> Dict[str, Any]:
+    return {
+        "driver_code": code,
+        "driver_name": None,
+        "team": None,
+        "points": 0,
+        "round_points": 0,
+        "wins": 0,
+        "races": 0,
+        "poles": 0,
+        "start_pos_total": 0,
+        "finish_pos_total": 0,
+        "positions_gained": 0,
+        "recent_points": [],
+    }
+
+
+def _new_constructor_entry(team: str) -> Dict[str, Any]:
+    return {
+        "team": team,
+        "points": 0,
+        "round_points": 0,
+        "wins": 0,
+        "positions_gained": 0,
+        "recent_points": [],
+    }
+
+
+def _apply_round(
+    drivers: Dict[str, Dict[str, Any]],
+    constructors: Dict[str, Dict[str, Any]],
+    sessions: Dict[str, List[SessionClassification]],
+) -> None:
+    """Fold one round's race, sprint and qualifying rows into the running totals."""
+    grid = {
+        row.driver_code: row.position
+        for row in sessions.get("qualifying", [])
+        if row.position
+    }
+    driver_points: Dict[str, float] = defaultdict(float)
+    team_points: Dict[str, float] = defaultdict(float)
+
+    for session_type in POINTS_SESSION_TYPES:
+        for row in sessions.get(session_type, []):
+            entry = drivers.setdefault(row.driver_code, _new_driver_entry(row.driver_code))
+            entry["driver_name"] = row.driver_name or entry["driver_name"]
+            entry["team"] = row.team or entry["team"]
+            team = row.team or entry["team"] or "Unknown"
+            constructors.setdefault(team, _new_constructor_entry(team))
+            driver_points[row.driver_code] += row.points or 0
+            team_points[team] += row.points or 0
+
+    for row in sessions.get("race", []):
+        entry = drivers[row.driver_code]
+        team = constructors[row.team or entry["team"] or "Unknown"]
+        finish = row.position or UNCLASSIFIED_POSITION
+        start = grid.get(row.driver_code)
+        entry["races"] += 1
+        entry["finish_pos_total"] += finish
+        if start:
+            entry["start_pos_total"] += start
+            entry["positions_gained"] += start - finish
+            team["positions_gained"] += start - finish
+            if start == 1:
+                entry["poles"] += 1
+        if row.position == 1:
+            entry["wins"] += 1
+            team["wins"] += 1
+
+    for code, entry in drivers.items():
+        entry["round_points"] = driver_points.get(code, 0)
+        entry["points"] += entry["round_points"]
+        # pts_last_5 covers the rounds the driver took part in
+        if code in driver_points:
+            entry["recent_points"] = (entry["recent_points"] + [entry["round_points"]])[-LAST_N_ROUNDS:]
+    for team, entry in constructors.items():
+        entry["round_points"] = team_points.get(team, 0)
+        entry["points"] += entry["round_points"]
+        entry["recent_points"] = (entry["recent_points"] + [entry["round_points"]])[-LAST_N_ROUNDS:]
+
+
+def _ranked(entries: Dict[str, Dict[str, Any]], name_key: str) -> List[Dict[str, Any]]:
+    """Order entries by points, then wins, and number their positions."""
+    ordered = sorted(entries.values(), key=lambda e: (-e["points"], -e["wins"], e[name_key]))
+    return [{**entry, "position": idx} for idx, entry in enumerate(ordered, start=1)]
+
+
+def update_standings(db: Session, season: int, from_round: int = 1) -> int:
+    """
+    Recompute stored standings from `from_round` to the end of the season.
+
+    Totals carry on from the stored rows of the previous round, so ingesting a
+    race only rewrites that round (and any later ones, which matters when an
+    earlier result is amended). Returns the number of rounds written; the
+    caller commits.
+    """
+    prior_round = db.scalar(
+        select(func.max(DriverStanding.round)).where(
+            DriverStanding.season == season,
+            DriverStanding.round < from_round,
+        )
+    )
+    drivers: Dict[str, Dict[str, Any]] = {}
+    constructors: Dict[str, Dict[str, Any]] = {}
+    if prior_round is not None:
+        for row in db.query(DriverStanding).filter_by(season=season, round=prior_round):
+            entry = _new_driver_entry(row.driver_code)
+            entry.update(
+                {key: getattr(row, key) for key in entry if key != "driver_code"},
+                recent_points=list(row.recent_points or []),
+            )
+            drivers[row.driver_code] = entry
+        for row in db.query(ConstructorStanding).filter_by(season=season, round=prior_round):
+            entry = _new_constructor_entry(row.team)
+            entry.update(
+                {key: getattr(row, key) for key in entry if key != "team"},
+                recent_points=list(row.recent_points or []),
+            )
+            constructors[row.team] = entry
+
+    rows = (
+        db.query(SessionClassification)
+        .filter(
+            SessionClassification.season == season,
+            SessionClassification.round >= from_round,
+            SessionClassification.session_type.in_(STANDINGS_SESSION_TYPES),
+        )
+        .order_by(SessionClassification.round)
+        .all()
+    )
+    rounds: Dict[int, Dict[str, List[SessionClassification]]] = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        rounds[row.round][row.session_type].append(row)
+
+    for model in (DriverStanding, ConstructorStanding):
+        db.query(model).filter(
+            model.season == season,
+            model.round >= from_round,
+        ).delete(synchronize_session=False)
+
+    now = datetime.now(timezone.utc)
+    races_completed, races_remaining = _count_calendar_races(db, season, max(rounds, default=0))
+    written = 0
+    for rnd in sorted(rounds):
+        sessions = rounds[rnd]
+        if not any(sessions.get(stype) for stype in POINTS_SESSION_TYPES):
+            continue
+        _apply_round(drivers, constructors, sessions)
+        db.add_all(
+            DriverStanding(
+                season=season,
+                round=rnd,
+                races_completed=races_completed,
+                races_remaining=races_remaining,
+                updated_at=now,
+                **entry,
+            )
+            for entry in _ranked(drivers, "driver_code")
+        )
+        db.add_all(
+            ConstructorStanding(season=season, round=rnd, updated_at=now, **entry)
+            for entry in _ranked(constructors, "team")
+        )
+        written += 1
+    db.flush()
+    return written
+
+
+# FastF1/livetiming team names whose Jolpica constructorId is not their slug.
+CONSTRUCTOR_IDS = {
+    "Red Bull Racing": "red_bull",
+    "Red Bull": "red_bull",
+    "Haas F1 Team": "haas",
+    "Kick Sauber": "sauber",
+    "Alfa Romeo": "alfa",
+    "Alfa Romeo Racing": "alfa",
+    "Racing Bulls": "rb",
+    "RB F1 Team": "rb",
+    "Visa Cash App RB": "rb",
+    "Alpine F1 Team": "alpine",
+    "BWT Alpine F1 Team": "alpine",
+    "Aston Martin Aramco": "aston_martin",
+}
+
+
+def _constructor_id(team: str) -> str:
+    """Jolpica constructorId for a local team name (e.g. "Red Bull Racing" -> "red_bull")."""
+    return CONSTRUCTOR_IDS.get(team) or re.sub(r"[^a-z0-9]+", "_", team.lower()).strip("_")
+
+
+def _race_meta(db: Session, season: int, rnd: int) -> Dict[str, str]:
+    """Circuit and date of one round from the reference tables (or the calendar)."""
+    row = (
+        db.query(Race.start_time, Circuit.name)
+        .join(Season, Race.season_id == Season.id)
+        .outerjoin(Circuit, Race.circuit_id == Circuit.id)
+        .filter(Season.year == season, Race.round_number == rnd)
+        .first()
+    )
+    start_time, circuit = row if row else (None, None)
+    if start_time is None:
+        start_time = db.scalar(
+            select(CalendarEvent.start_ts).where(
+                CalendarEvent.season == season,
+                CalendarEvent.round == rnd,
+                CalendarEvent.session_type == "Race",
+            )
+        )
+    return {
+        "circuit": circuit or "",
+        "date": start_time.date().isoformat() if start_time else "",
+    }
+
+
+def race_summary_fields(db: Session, season: int, rnd: int) -> Dict[str, Any]:
+    """
+    The race_summary columns the standings payload reads, for one race.
+
+    Date, circuit, pole and the top-10 `last_race` results, from the stored
+    race and qualifying classifications. `refresh_race_summary` stores them at
+    ingest so `load_local_standings` does not rebuild them per request.
+    """
+    rows = (
+        db.query(SessionClassification)
+        .filter(
+            SessionClassification.season == season,
+            SessionClassification.round == rnd,
+            SessionClassification.session_type.in_(("race", "qualifying")),
+        )
+        .all()
+    )
+    grid = {
+        row.driver_code: row.position
+        for row in rows
+        if row.session_type == "qualifying" and row.position
+    }
+    race = sorted(
+        (row for row in rows if row.session_type == "race"),
+        key=lambda r: r.position or UNCLASSIFIED_POSITION + 1,
+    )
+    results = []
+    for row in race[:10]:
+        start = grid.get(row.driver_code, 0)
+        position = row.position or 0
+        results.append({
+            "position": position,
+            "driver_code": row.driver_code,
+            "driver_name": row.driver_name or row.driver_code,
+            "team": row.team or "Unknown",
+            "grid": start,
+            "points": row.points or 0,
+            "positions_gained": (start - position) if start > 0 and position > 0 else 0,
+            "status": "Finished" if position else "DNF",
+        })
+    meta = _race_meta(db, season, rnd)
+    return {
+        "race_date": meta["date"],
+        "circuit": meta["circuit"],
+        "pole": next((code for code, pos in grid.items() if pos == 1), None),
+        "results": results,
+    }
+
+
+def _stored_race_results(
+    summaries: List[RaceSummary],
+) -> tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build `last_race` and `race_summaries` from the season's race_summary rows."""
+    if not summaries:
+        return None, []
+    race_summaries = []
+    for summary in summaries:
+        podium = summary.podium or []
+        race_summaries.append({
+            "round": summary.round,
+            "race_name": summary.race_name or f"Round {summary.round}",
+            "circuit_id": "",
+            "date": summary.race_date or "",
+            "winner_code": summary.winner_code,
+            "winner_team": summary.winner_team or "Unknown",
+            "pole": summary.pole,
+            "second": podium[1]["driver"] if len(podium) > 1 else None,
+            "third": podium[2]["driver"] if len(podium) > 2 else None,
+        })
+    last = summaries[-1]
+    last_race = {
+        "round": last.round,
+        "race_name": last.race_name or f"Round {last.round}",
+        "date": last.race_date or "",
+        "circuit": last.circuit or "",
+        "results": last.results or [],
+    }
+    return last_race, race_summaries
+
+
+def _driver_payload(row: DriverStanding, races_completed: int) -> Dict[str, Any]:
+    races = row.races
+    driver_races = races if races > 0 else races_completed
+    return {
+        "driver_code": row.driver_code,
+        "driver_name": row.driver_name or row.driver_code,
+        "constructor_name": row.team or "Unknown",
+        "points": row.points,
+        "wins": row.wins,
+        "pts_last_5": sum(row.recent_points or []),
+        "points_per_race": round(row.points / driver_races, 1) if driver_races else 0,
+        "points_won_lost": 0,  # TODO: compute from expected vs actual
+        "alt_points": 0,  # TODO: compute alternate scoring
+        "total_races": races,
+        "poles": row.poles,
+        "avg_start_pos": round(row.start_pos_total / races, 1) if races else 0,
+        "avg_finish_pos": round(row.finish_pos_total / races, 1) if races else 0,
+        "positions_gained": row.positions_gained,
+        "positions_gained_per_race": round(row.positions_gained / races, 2) if races else 0,
+    }
+
+
+def _constructor_payload(row: ConstructorStanding) -> Dict[str, Any]:
+    return {
+        "constructor_id": _constructor_id(row.team),
+        "constructor_name": row.team,
+        "points": row.points,
+        "wins": row.wins,
+        "pts_last_5": sum(row.recent_points or []),
+        "positions_gained": row.positions_gained,
+        "points_won_lost": 0,
+        "alt_points": 0,
+    }
+
+
+def load_local_standings(db: Session, season: int) -> Optional[Dict[str, Any]]:
+    """
+    Read the latest stored standings for a season, or None if there are none.
+
+    Each table is one indexed query for the season's latest round, and
+    `last_race`/`race_summaries` come from the season's race_summary rows
+    (one more on their unique index). The race counts are the calendar's when
+    the standings were last written.
+    """
+    def _latest(model):
+        latest_round = (
+            select(func.max(model.round)).where(model.season == season).scalar_subquery()
+        )
+        return (
+            db.query(model)
+            .filter(model.season == season, model.round == latest_round)
+            .order_by(model.position)
+            .all()
+        )
+
+    driver_rows = _latest(DriverStanding)
+    if not driver_rows:
+        return None
+    constructor_rows = _latest(ConstructorStanding)
+
+    latest = driver_rows[0]
+    races_completed = latest.races_completed if latest.races_completed is not None else latest.round
+    races_remaining = latest.races_remaining if latest.races_remaining is not None else 0
+    last_race, race_summaries = _stored_race_results(
+        db.query(RaceSummary)
+        .filter(RaceSummary.season == season, RaceSummary.source == "classification")
+        .order_by(RaceSummary.round)
+        .all()
+    )
+    updated = [row.updated_at for row in driver_rows if row.updated_at]
+    return {
+        "season": season,
+        "last_updated": (max(updated) if updated else datetime.now(timezone.utc)).isoformat(),
+        "races_completed": races_completed,
+        "races_remaining": races_remaining,
+        "drivers": [_driver_payload(row, races_completed) for row in driver_rows],
+        "constructors": [_constructor_payload(row) for row in constructor_rows],
+        "last_race": last_race,
+        "race_summaries": race_summaries,
+    }
+
+
+def cross_check_standings(db: Session, season: int) -> Dict[str, Any]:
+    """
+    Compare stored points against Jolpica's standings.
+
+    Returns the mismatched drivers and constructors; `checked` is False when
+    either side has nothing to compare (e.g. Jolpica is down).
+    """
+    local = load_local_standings(db, season)
+    remote_drivers = _fetch_driver_standings(season)
+    remote_constructors = _fetch_constructor_standings(season)
+    if not local or not remote_drivers:
+        return {"season": season, "checked": False, "drivers": [], "constructors": []}
+
+    local_drivers = {d["driver_code"]: d["points"] for d in local["drivers"]}
+    driver_mismatches = []
+    for d in remote_drivers:
+        code = d.get("Driver", {}).get("code", "???")
+        remote_points = float(d.get("points", 0))
+        if local_drivers.get(code) != remote_points:
+            driver_mismatches.append(
+                {"driver_code": code, "local": local_drivers.get(code), "remote": remote_points}
+            )
+
+    # Team names differ between FastF1 and Jolpica ("Kick Sauber" vs "Sauber"),
+    # so constructors are matched on the Jolpica constructorId.
+    local_constructors = {c["constructor_id"]: c["points"] for c in local["constructors"]}
+    constructor_mismatches = []
+    for c in remote_constructors:
+        constructor = c.get("Constructor", {})
+        constructor_id = constructor.get("constructorId", "")
+        remote_points = float(c.get("points", 0))
+        if local_constructors.get(constructor_id) != remote_points:
+            constructor_mismatches.append({
+                "constructor_id": constructor_id,
+                "constructor_name": constructor.get("name", "Unknown"),
+                "local": local_constructors.get(constructor_id),
+                "remote": remote_points,
+            })
+
+    if driver_mismatches or constructor_mismatches:
+        logger.warning(
+            "Standings for %s differ from Jolpica: %d drivers, %d constructors",
+            season,
+            len(driver_mismatches),
+            len(constructor_mismatches),
+        )
+    return {
+        "season": season,
+        "checked": True,
+        "drivers": driver_mismatches,
+        "constructors": constructor_mismatches,
+    }
+
+
 def fetch_season_standings(db: Session, season: int) -> Dict[str, Any]:
     """
-    Fetch complete season standings with computed metrics.
+    Season standings, from the local tables when the season has any rows.
+
+    Falls back to Jolpica (`fetch_remote_standings`) for seasons that were
+    never ingested.
+    """
+    local = load_local_standings(db, season)
+    if local is not None:
+        return local
+    return fetch_remote_standings(db, season)
+
+
+def fetch_remote_standings(db: Session, season: int) -> Dict[str, Any]:
+    """
+    Fetch complete season standings with computed metrics from Jolpica.
 
     Returns:
         {
@@ -273,23 +764,7 @@ def fetch_season_standings(db: Session, season: int) -> Dict[str, Any]:
     races = _fetch_race_results(season, limit=24)  # Full season
 
     # Count races from calendar
-    races_completed = 0
-    races_remaining = 0
-    try:
-        result = db.execute(text("""
-            SELECT
-                COUNT(*) FILTER (WHERE session_type = 'Race' AND start_ts < NOW()) as completed,
-                COUNT(*) FILTER (WHERE session_type = 'Race' AND start_ts >= NOW()) as remaining
-            FROM calendar_events
-            WHERE season = :season
-        """), {"season": season})
-        row = result.fetchone()
-        if row:
-            races_completed = row[0] or 0
-            races_remaining = row[1] or 0
-    except Exception:
-        races_completed = len(races)
-        races_remaining = 24 - races_completed  # Estimate
+    races_completed, races_remaining = _count_calendar_races(db, season, len(races))
 
     # Transform driver standings
     drivers = []
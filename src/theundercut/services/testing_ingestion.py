@@ -1,23 +1,28 @@
 """
 Ingestion service for pre-season testing data.
 
-Uses FastF1 to fetch testing session lap data and stores it in the
-testing_events, testing_sessions, testing_laps, and testing_stints tables.
+Uses FastF1 (or OpenF1, see `ingest_openf1_testing`) to fetch testing
+session lap data and stores it in the testing_events, testing_sessions,
+testing_laps, and testing_stints tables.
 """
 
 from __future__ import annotations
 
 import datetime as dt
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple
 
+import httpx
 import pandas as pd
 import fastf1
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from theundercut.adapters.db import SessionLocal
+from theundercut.adapters.db import SessionLocal, pin_reads_to_primary
 from theundercut.adapters.fastf1_loader import CACHE_DIR
+from theundercut.adapters.openf1_loader import OPENF1_TIMEOUT, openf1_get
 from theundercut.models import (
     TestingEvent,
     TestingSession,
@@ -115,6 +120,113 @@ def _load_testing_laps(season: int, event_identifier: str | int) -> pd.DataFrame
             return pd.DataFrame()
 
 
+# Rows per multi-row INSERT; a 3-day test has tens of thousands of laps
+INSERT_CHUNK_SIZE = 5000
+
+LAP_COLUMNS = [
+    "driver",
+    "team",
+    "lap_number",
+    "lap_time_ms",
+    "compound",
+    "stint_number",
+    "sector_1_ms",
+    "sector_2_ms",
+    "sector_3_ms",
+    "is_valid",
+]
+
+
+def _column(laps_df: pd.DataFrame, name: str) -> pd.Series:
+    """A FastF1 column, or an all-missing one when the frame lacks it."""
+    if name in laps_df.columns:
+        return laps_df[name]
+    return pd.Series(None, index=laps_df.index, dtype=object)
+
+
+def _duration_ms(values: pd.Series) -> pd.Series:
+    """Timedelta (or already numeric) durations as float milliseconds; NaN when missing."""
+    if pd.api.types.is_timedelta64_dtype(values):
+        return values.dt.total_seconds() * 1000
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    return pd.to_timedelta(values, errors="coerce").dt.total_seconds() * 1000
+
+
+def _optional_text(values: pd.Series) -> pd.Series:
+    return values.astype(str).where(values.notna(), None)
+
+
+def _prepare_testing_laps(laps_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise FastF1 testing laps into testing_laps columns in one vectorised pass.
+
+    Rows without a driver code are dropped. Times become float milliseconds,
+    and a missing IsAccurate counts as valid.
+    """
+    driver = _column(laps_df, "Driver")
+    driver = driver.where(driver.notna(), "").astype(str).str.strip()
+    keep = ~driver.isin(["", "nan", "None"])
+    laps = laps_df.loc[keep]
+
+    is_valid = _column(laps, "IsAccurate")
+    return pd.DataFrame({
+        "driver": driver[keep],
+        "team": _optional_text(_column(laps, "Team")),
+        "lap_number": pd.to_numeric(_column(laps, "LapNumber"), errors="coerce").fillna(0).astype(int),
+        "lap_time_ms": _duration_ms(_column(laps, "LapTime")),
+        "compound": _optional_text(_column(laps, "Compound")),
+        "stint_number": pd.to_numeric(_column(laps, "Stint"), errors="coerce").astype("Int64"),
+        "sector_1_ms": _duration_ms(_column(laps, "Sector1Time")),
+        "sector_2_ms": _duration_ms(_column(laps, "Sector2Time")),
+        "sector_3_ms": _duration_ms(_column(laps, "Sector3Time")),
+        "is_valid": is_valid.where(is_valid.notna(), True).astype(bool),
+    }, index=laps.index)
+
+
+def _summarise_stints(laps: pd.DataFrame) -> pd.DataFrame:
+    """Per-(driver, stint) aggregates of prepared laps, matching testing_stints columns."""
+    stints = (
+        laps.dropna(subset=["stint_number"])
+        .groupby(["driver", "stint_number", "compound", "team"])
+        .agg(
+            start_lap=("lap_number", "min"),
+            end_lap=("lap_number", "max"),
+            lap_count=("lap_number", "count"),
+            avg_pace_ms=("lap_time_ms", "mean"),
+        )
+        .reset_index()
+    )
+    stints["stint_number"] = stints["stint_number"].astype(int)
+    return stints
+
+
+def _records(frame: pd.DataFrame, session_id: int) -> List[Dict]:
+    """Rows as insert dicts with Python scalars and None for missing values."""
+    plain = frame.astype(object).where(frame.notna(), None)
+    plain.insert(0, "session_id", session_id)
+    return plain.to_dict("records")
+
+
+def _insert_ignoring_duplicates(db: Session, model, records: List[Dict], key: List[str]) -> None:
+    # ON CONFLICT DO NOTHING keeps re-ingests idempotent
+    for start in range(0, len(records), INSERT_CHUNK_SIZE):
+        stmt = pg_insert(model).values(records[start:start + INSERT_CHUNK_SIZE])
+        db.execute(stmt.on_conflict_do_nothing(index_elements=key))
+
+
+def _store_prepared_laps(db: Session, session_id: int, laps: pd.DataFrame) -> int:
+    records = _records(laps[LAP_COLUMNS], session_id)
+    _insert_ignoring_duplicates(db, TestingLap, records, ["session_id", "driver", "lap_number"])
+    return len(records)
+
+
+def _store_prepared_stints(db: Session, session_id: int, laps: pd.DataFrame) -> int:
+    records = _records(_summarise_stints(laps), session_id)
+    _insert_ignoring_duplicates(db, TestingStint, records, ["session_id", "driver", "stint_number"])
+    return len(records)
+
+
 def _store_testing_laps(
     db: Session,
     session_id: int,
@@ -127,63 +239,7 @@ def _store_testing_laps(
     """
     if laps_df.empty:
         return 0
-
-    # Prepare lap records
-    records = []
-    for _, row in laps_df.iterrows():
-        driver_raw = row.get("Driver")
-        if pd.isna(driver_raw) or driver_raw is None:
-            continue
-        driver = str(driver_raw).strip()
-        if not driver or driver == "nan" or driver == "None":
-            continue
-
-        lap_time = row.get("LapTime")
-        lap_time_ms = None
-        if pd.notna(lap_time):
-            if hasattr(lap_time, "total_seconds"):
-                lap_time_ms = lap_time.total_seconds() * 1000
-            else:
-                lap_time_ms = float(lap_time) if lap_time else None
-
-        # Extract sector times
-        s1 = row.get("Sector1Time")
-        s2 = row.get("Sector2Time")
-        s3 = row.get("Sector3Time")
-
-        sector_1_ms = s1.total_seconds() * 1000 if pd.notna(s1) and hasattr(s1, "total_seconds") else None
-        sector_2_ms = s2.total_seconds() * 1000 if pd.notna(s2) and hasattr(s2, "total_seconds") else None
-        sector_3_ms = s3.total_seconds() * 1000 if pd.notna(s3) and hasattr(s3, "total_seconds") else None
-
-        # Check validity
-        is_valid = row.get("IsAccurate", True)
-        if pd.isna(is_valid):
-            is_valid = True
-
-        records.append({
-            "session_id": session_id,
-            "driver": driver,
-            "team": str(row.get("Team", "")) if pd.notna(row.get("Team")) else None,
-            "lap_number": int(row.get("LapNumber", 0)) if pd.notna(row.get("LapNumber")) else 0,
-            "lap_time_ms": lap_time_ms,
-            "compound": str(row.get("Compound", "")) if pd.notna(row.get("Compound")) else None,
-            "stint_number": int(row.get("Stint", 0)) if pd.notna(row.get("Stint")) else None,
-            "sector_1_ms": sector_1_ms,
-            "sector_2_ms": sector_2_ms,
-            "sector_3_ms": sector_3_ms,
-            "is_valid": bool(is_valid),
-        })
-
-    if not records:
-        return 0
-
-    # Use ON CONFLICT DO NOTHING for idempotent inserts
-    stmt = pg_insert(TestingLap).values(records)
-    stmt = stmt.on_conflict_do_nothing(
-        index_elements=["session_id", "driver", "lap_number"]
-    )
-    result = db.execute(stmt)
-    return len(records)
+    return _store_prepared_laps(db, session_id, _prepare_testing_laps(laps_df))
 
 
 def _compute_and_store_stints(
@@ -198,58 +254,23 @@ def _compute_and_store_stints(
     """
     if laps_df.empty:
         return 0
+    return _store_prepared_stints(db, session_id, _prepare_testing_laps(laps_df))
 
-    # Group laps by driver and stint
-    stint_data = (
-        laps_df
-        .groupby(["Driver", "Stint", "Compound", "Team"])
-        .agg(
-            start_lap=("LapNumber", "min"),
-            end_lap=("LapNumber", "max"),
-            lap_count=("LapNumber", "count"),
-            avg_pace=("LapTime", "mean"),
-        )
-        .reset_index()
-    )
 
-    records = []
-    for _, row in stint_data.iterrows():
-        driver = str(row.get("Driver", ""))
-        if not driver or driver == "nan":
-            continue
-
-        stint_number = row.get("Stint")
-        if pd.isna(stint_number):
-            continue
-
-        avg_pace = row.get("avg_pace")
-        avg_pace_ms = None
-        if pd.notna(avg_pace):
-            if hasattr(avg_pace, "total_seconds"):
-                avg_pace_ms = avg_pace.total_seconds() * 1000
-
-        records.append({
-            "session_id": session_id,
-            "driver": driver,
-            "team": str(row.get("Team", "")) if pd.notna(row.get("Team")) else None,
-            "stint_number": int(stint_number),
-            "compound": str(row.get("Compound", "")) if pd.notna(row.get("Compound")) else None,
-            "start_lap": int(row.get("start_lap", 0)) if pd.notna(row.get("start_lap")) else None,
-            "end_lap": int(row.get("end_lap", 0)) if pd.notna(row.get("end_lap")) else None,
-            "lap_count": int(row.get("lap_count", 0)) if pd.notna(row.get("lap_count")) else 0,
-            "avg_pace_ms": avg_pace_ms,
-        })
-
-    if not records:
-        return 0
+def _store_testing_day(
+    db: Session,
+    session_id: int,
+    laps_df: pd.DataFrame,
+) -> Tuple[int, int]:
+    """
+    Store a day's laps and their stints from a single preparation pass.
 
-    # Use ON CONFLICT DO NOTHING for idempotent inserts
-    stmt = pg_insert(TestingStint).values(records)
-    stmt = stmt.on_conflict_do_nothing(
-        index_elements=["session_id", "driver", "stint_number"]
-    )
-    db.execute(stmt)
-    return len(records)
+    Returns (laps inserted, stints created).
+    """
+    if laps_df.empty:
+        return 0, 0
+    laps = _prepare_testing_laps(laps_df)
+    return _store_prepared_laps(db, session_id, laps), _store_prepared_stints(db, session_id, laps)
 
 
 def ingest_testing_event(
@@ -330,6 +351,10 @@ def ingest_testing_event(
 
         db.commit()
 
+    try:
+        pin_reads_to_primary(season)
+    except Exception as exc:  # pragma: no cover - routing hint should not block ingestion
+        logger.warning("Failed to pin %s reads to the primary: %s", season, exc)
     return results
 
 
@@ -410,12 +435,9 @@ def ingest_testing_day(
             results["status"] = "no_data"
             return
 
-        # Store laps
-        laps_count = _store_testing_laps(db, session.id, laps_df)
+        # Store laps and their stints
+        laps_count, stints_count = _store_testing_day(db, session.id, laps_df)
         results["laps_count"] = laps_count
-
-        # Compute and store stints
-        stints_count = _compute_and_store_stints(db, session.id, laps_df)
         results["stints_count"] = stints_count
 
         # Update session status
@@ -505,3 +527,229 @@ def sync_testing_events(season: int) -> List[Dict]:
         db.commit()
 
     return synced
+
+
+# --- OpenF1 testing ingest ---------------------------------------------------
+
+# Concurrent OpenF1 requests; OpenF1 answers bursts above a few per second with 429
+OPENF1_MAX_WORKERS = 4
+OPENF1_DAY_ENDPOINTS = ("laps", "stints", "drivers")
+
+_TESTING_DAY_NAME = re.compile(r"^Day\s+(\d+)$", re.IGNORECASE)
+
+
+def _slug(value: str) -> str:
+    value = value.lower().replace(" ", "_").replace("-", "_")
+    return "".join(c for c in value if c.isalnum() or c == "_")
+
+
+def discover_openf1_testing_sessions(season: int, client: Optional[httpx.Client] = None) -> List[Dict]:
+    """
+    Find a season's testing days in OpenF1.
+
+    Testing days are the sessions named "Day N". Each meeting that has them
+    is one test, numbered by start date. The event ids match the ones
+    ingestion has always used (e.g. "bahrain_pre_season_test_1").
+    """
+    own_client = client is None
+    client = client or httpx.Client(timeout=OPENF1_TIMEOUT)
+    try:
+        sessions = openf1_get(client, "sessions", {"year": season})
+    finally:
+        if own_client:
+            client.close()
+
+    meetings: Dict[int, List[Dict]] = {}
+    for session in sessions:
+        match = _TESTING_DAY_NAME.match(str(session.get("session_name") or "").strip())
+        if match:
+            meetings.setdefault(session.get("meeting_key"), []).append({**session, "day": int(match.group(1))})
+
+    days = []
+    ordered = sorted(meetings.values(), key=lambda rows: min(str(r.get("date_start") or "") for r in rows))
+    for test_number, rows in enumerate(ordered, start=1):
+        circuit_id = _slug(str(rows[0].get("country_name") or rows[0].get("location") or "unknown"))
+        for row in sorted(rows, key=lambda r: r["day"]):
+            date_start = row.get("date_start")
+            days.append({
+                "test_number": test_number,
+                "event_id": f"{circuit_id}_pre_season_test_{test_number}",
+                "event_name": f"Pre-Season Test {test_number}",
+                "circuit_id": circuit_id,
+                "day": row["day"],
+                "session_key": row.get("session_key"),
+                "date": dt.date.fromisoformat(date_start[:10]) if date_start else None,
+            })
+    return days
+
+
+def _openf1_testing_laps(laps: List[Dict], stints: List[Dict], drivers: List[Dict]) -> pd.DataFrame:
+    """Shape one OpenF1 testing day like a FastF1 laps frame (Driver, LapTime, Stint, ...)."""
+    if not laps:
+        return pd.DataFrame()
+    frame = pd.DataFrame(laps).dropna(subset=["driver_number", "lap_number"])
+    frame = frame.astype({"driver_number": int, "lap_number": float})
+    driver_info = (
+        pd.DataFrame(drivers or [], columns=["driver_number", "name_acronym", "team_name"])
+        .dropna(subset=["driver_number"])
+        .astype({"driver_number": int})
+        .drop_duplicates("driver_number")
+    )
+    frame = frame.merge(driver_info, on="driver_number", how="left").sort_values("lap_number")
+
+    stint_rows = pd.DataFrame(
+        stints or [], columns=["driver_number", "stint_number", "lap_start", "lap_end", "compound"]
+    ).dropna(subset=["driver_number", "lap_start"])
+    if not stint_rows.empty:
+        # Each lap takes the latest stint starting at or before it, if the stint reaches it
+        frame = pd.merge_asof(
+            frame,
+            stint_rows.astype({"driver_number": int, "lap_start": float}).sort_values("lap_start"),
+            left_on="lap_number",
+            right_on="lap_start",
+            by="driver_number",
+        )
+        outside = frame["lap_end"].notna() & (frame["lap_number"] > frame["lap_end"])
+        frame.loc[outside, ["stint_number", "compound"]] = None
+    else:
+        frame["stint_number"] = None
+        frame["compound"] = None
+
+    def _seconds(column: str) -> pd.Series:
+        values = frame[column] if column in frame.columns else pd.Series(float("nan"), index=frame.index)
+        return pd.to_timedelta(pd.to_numeric(values, errors="coerce"), unit="s")
+
+    pit_out = frame["is_pit_out_lap"] if "is_pit_out_lap" in frame.columns else False
+    return pd.DataFrame({
+        "Driver": frame["name_acronym"].fillna("D" + frame["driver_number"].astype(str)),
+        "Team": frame["team_name"],
+        "LapNumber": frame["lap_number"],
+        "LapTime": _seconds("lap_duration"),
+        "Compound": frame["compound"],
+        "Stint": frame["stint_number"],
+        "Sector1Time": _seconds("duration_sector_1"),
+        "Sector2Time": _seconds("duration_sector_2"),
+        "Sector3Time": _seconds("duration_sector_3"),
+        "IsAccurate": pd.Series(pit_out, index=frame.index).ne(True),
+    })
+
+
+def _fetch_openf1_days(session_keys: List[int], max_workers: int) -> Dict[int, Dict[str, List[Dict]]]:
+    """Fetch laps, stints and drivers of every session key with bounded concurrency."""
+    fetched: Dict[int, Dict[str, List[Dict]]] = {key: {} for key in session_keys}
+    with httpx.Client(timeout=OPENF1_TIMEOUT) as client, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(openf1_get, client, endpoint, {"session_key": key}): (key, endpoint)
+            for key in session_keys
+            for endpoint in OPENF1_DAY_ENDPOINTS
+        }
+        for future in as_completed(futures):
+            key, endpoint = futures[future]
+            fetched[key][endpoint] = future.result()
+    return fetched
+
+
+def _get_or_create_openf1_day(db: Session, season: int, day_info: Dict, days: List[Dict]) -> TestingSession:
+    event = (
+        db.query(TestingEvent)
+        .filter(TestingEvent.season == season, TestingEvent.event_id == day_info["event_id"])
+        .one_or_none()
+    )
+    if not event:
+        dates = [d["date"] for d in days if d["event_id"] == day_info["event_id"] and d["date"]]
+        event = TestingEvent(
+            season=season,
+            event_id=day_info["event_id"],
+            event_name=day_info["event_name"],
+            circuit_id=day_info["circuit_id"],
+            total_days=len([d for d in days if d["event_id"] == day_info["event_id"]]),
+            start_date=min(dates) if dates else None,
+            end_date=max(dates) if dates else None,
+            status="scheduled",
+        )
+        db.add(event)
+        db.flush()
+
+    session = (
+        db.query(TestingSession)
+        .filter(TestingSession.event_id == event.id, TestingSession.day == day_info["day"])
+        .one_or_none()
+    )
+    if not session:
+        session = TestingSession(event_id=event.id, day=day_info["day"], date=day_info["date"], status="scheduled")
+        db.add(session)
+        db.flush()
+    return session
+
+
+def ingest_openf1_testing(
+    season: int,
+    force: bool = False,
+    max_workers: int = OPENF1_MAX_WORKERS,
+) -> Dict:
+    """
+    Ingest every testing day of a season from OpenF1.
+
+    Session keys are discovered from the season's sessions. Days that still
+    need data are fetched concurrently, with laps, stints and drivers in
+    parallel and at most `max_workers` requests in flight. They are then
+    bulk-loaded in one transaction, each day in its own savepoint. Days that already have laps are skipped
+    unless `force` is set.
+
+    Returns:
+        Dict with ingestion results
+    """
+    results = {
+        "season": season,
+        "events": 0,
+        "days_ingested": 0,
+        "days_skipped": 0,
+        "total_laps": 0,
+        "total_stints": 0,
+        "errors": [],
+    }
+    days = discover_openf1_testing_sessions(season)
+    if not days:
+        logger.warning("No OpenF1 testing sessions found for %d", season)
+        return results
+    results["events"] = len({d["event_id"] for d in days})
+
+    with SessionLocal() as db:
+        pending: List[Tuple[Dict, TestingSession]] = []
+        for day_info in days:
+            session = _get_or_create_openf1_day(db, season, day_info, days)
+            has_laps = db.query(TestingLap.id).filter(TestingLap.session_id == session.id).first()
+            if has_laps and not force:
+                results["days_skipped"] += 1
+                continue
+            pending.append((day_info, session))
+
+        fetched = _fetch_openf1_days([info["session_key"] for info, _ in pending], max_workers)
+
+        for day_info, session in pending:
+            data = fetched[day_info["session_key"]]
+            try:
+                laps_df = _openf1_testing_laps(data.get("laps"), data.get("stints"), data.get("drivers"))
+                # Savepoint per day: a failed store rolls back only its own rows
+                with db.begin_nested():
+                    laps_count, stints_count = _store_testing_day(db, session.id, laps_df)
+            except Exception as exc:
+                results["errors"].append(f"{day_info['event_id']} day {day_info['day']}: {exc}")
+                logger.exception("Failed to store OpenF1 testing day %s: %s", day_info, exc)
+                continue
+            if laps_count:
+                session.status = "completed"
+                results["days_ingested"] += 1
+                results["total_laps"] += laps_count
+                results["total_stints"] += stints_count
+
+        for event in db.query(TestingEvent).filter(TestingEvent.season == season):
+            if event.sessions and all(s.status == "completed" for s in event.sessions):
+                event.status = "completed"
+        db.commit()
+
+    try:
+        pin_reads_to_primary(season)
+    except Exception as exc:  # pragma: no cover - routing hint should not block ingestion
+        logger.warning("Failed to pin %s reads to the primary: %s", season, exc)
+    return results
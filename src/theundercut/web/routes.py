@@ -8,12 +8,21 @@ from typing import Optional, List
 from fastapi import APIRouter, Request, Query, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-
-from theundercut.adapters.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from theundercut.adapters.db import get_async_db, run_sync_db
+from theundercut.adapters.redis_cache import async_redis_client
+from theundercut.services.cache import (
+    decode_cache_payload,
+    encode_cache_payload,
+    homepage_cache_key,
+)
 from theundercut.services.homepage import get_homepage_data
 from theundercut.services.standings import fetch_season_standings
 
+# Ingestion invalidates the entry when it writes a new race summary.
+HOMEPAGE_CACHE_TTL_SECONDS = 300
+
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
@@ -21,9 +30,15 @@ router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-async def homepage(request: Request, db: Session = Depends(get_db)):
+async def homepage(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Homepage dashboard with latest race and standings."""
-    data = get_homepage_data(db)
+    cache_key = homepage_cache_key()
+    cached = await async_redis_client.get(cache_key)
+    if cached:
+        data = decode_cache_payload(cached)
+    else:
+        data = await run_sync_db(db, get_homepage_data)
+        await async_redis_client.setex(cache_key, HOMEPAGE_CACHE_TTL_SECONDS, encode_cache_payload(data))
 
     return templates.TemplateResponse(
         "home/index.html",
@@ -8,8 +8,8 @@ from datetime import datetime, timezone
 from fastapi.testclient import TestClient
 
 from theundercut.api.main import app
-from theundercut.adapters.db import get_db
 from theundercut.models import Circuit, CircuitCharacteristics
+from tests.conftest import override_db
 
 
 @pytest.fixture
@@ -28,7 +28,7 @@ def client(mock_db_session):
         finally:
             pass
 
-    app.dependency_overrides[get_db] = override_get_db
+    override_db(override_get_db)
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
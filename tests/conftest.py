@@ -68,7 +68,7 @@ def seed_sample_race(session, season=2024, rnd=1):
     return race_id
 
 
-__all__ = ["seed_sample_race"]
+__all__ = ["override_async_db", "override_db", "seed_sample_race"]
 import os
 from pathlib import Path
 
@@ -83,3 +83,73 @@ def _fastf1_cache(tmp_path, monkeypatch):
 @pytest.fixture()
 def db_session_factory(session_factory):
     return session_factory
+
+
+def override_db(get_session):
+    """
+    Serve every database dependency from `get_session` (a get_db-style generator).
+
+    Covers the primary, the read replica and the async dependencies. Async
+    routes receive the sync session, so `run_sync_db` runs their builders in
+    the threadpool; `override_async_db` exercises the AsyncSession path.
+    """
+    from theundercut.adapters.db import get_async_db, get_async_read_db, get_db, get_read_db
+    from theundercut.api.main import app
+
+    for dependency in (get_db, get_read_db, get_async_db, get_async_read_db):
+        app.dependency_overrides[dependency] = get_session
+
+
+def override_async_db(async_factory):
+    """Serve the async database dependencies from AsyncSessions made by `async_factory`."""
+    from theundercut.adapters.db import get_async_db, get_async_read_db
+    from theundercut.api.main import app
+
+    async def _get_async_db():
+        async with async_factory() as session:
+            yield session
+
+    for dependency in (get_async_db, get_async_read_db):
+        app.dependency_overrides[dependency] = _get_async_db
+
+
+def _attach_schemas(directory):
+    def _attach(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        for schema in ("core", "config", "validation"):
+            cursor.execute(f"ATTACH DATABASE '{directory / schema}.db' AS {schema}")
+        cursor.close()
+    return _attach
+
+
+@pytest.fixture()
+def async_session_factory(tmp_path):
+    """
+    (sync, async) session factories on one SQLite file database.
+
+    Seed through the sync factory; the async one runs on aiosqlite. NullPool
+    keeps aiosqlite connections from outliving the event loop of a request.
+    """
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from theundercut.adapters.db import async_database_url
+
+    url = f"sqlite:///{tmp_path / 'main.db'}"
+    sync_engine = create_engine(url, future=True)
+    sa.event.listen(sync_engine, "connect", _attach_schemas(tmp_path))
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    sa.event.listen(async_engine.sync_engine, "connect", _attach_schemas(tmp_path))
+
+    yield (
+        sessionmaker(bind=sync_engine, future=True),
+        async_sessionmaker(bind=async_engine, expire_on_commit=False),
+    )
+
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
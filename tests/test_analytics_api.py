@@ -2,10 +2,11 @@ import json
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from theundercut.adapters.db import run_sync_db
 from theundercut.api.main import app
-from theundercut.adapters.db import get_db
-from tests.conftest import seed_sample_race
+from tests.conftest import override_async_db, override_db, seed_sample_race
 
 
 class DummyRedis:
@@ -18,6 +19,59 @@ class DummyRedis:
     def setex(self, key, ttl, value):
         self.store[key] = value
 
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return DummyPipeline(self)
+
+
+class DummyPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, value))
+
+    def execute(self):
+        for key, value in self.commands:
+            self.redis.store[key] = value
+        return [True] * len(self.commands)
+
+
+class AsyncDummyRedis:
+    """Async view over a DummyRedis store, standing in for the async client."""
+
+    def __init__(self, sync):
+        self.sync = sync
+
+    async def get(self, key):
+        return self.sync.get(key)
+
+    async def mget(self, keys):
+        return self.sync.mget(keys)
+
+    def pipeline(self, transaction=True):
+        return AsyncDummyPipeline(self.sync)
+
+
+class AsyncDummyPipeline(DummyPipeline):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self):
+        return DummyPipeline.execute(self)
+
+
+def _use_cache(monkeypatch, dummy_cache):
+    monkeypatch.setattr(
+        "theundercut.api.v1.analytics.async_redis_client", AsyncDummyRedis(dummy_cache)
+    )
+
 
 def _override_dependency(session_factory):
     def _get_db():
@@ -33,9 +87,9 @@ def test_analytics_endpoint_returns_payload(session_factory, monkeypatch):
     SessionLocal = session_factory
     seed_sample_race(SessionLocal())
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.analytics.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -45,11 +99,16 @@ def test_analytics_endpoint_returns_payload(session_factory, monkeypatch):
     assert len(body["laps"]) == 4
     assert dummy_cache.store  # cache populated
 
+    # a single full-race table is cached, whatever the filter
+    assert list(dummy_cache.store) == ["analytics:v1:2024:1:all"]
+
     # force cache hit with new payload
     key = next(iter(dummy_cache.store))
-    dummy_cache.store[key] = json.dumps({"cached": True})
+    cached_table = json.loads(dummy_cache.store[key])
+    cached_table["laps"]["lap_ms"] = [1, 2, 3, 4]
+    dummy_cache.store[key] = json.dumps(cached_table)
     resp_cached = client.get("/api/v1/analytics/2024/1")
-    assert resp_cached.json() == {"cached": True}
+    assert [lap["lap_ms"] for lap in resp_cached.json()["laps"]] == [1, 2, 3, 4]
 
     app.dependency_overrides.clear()
 
@@ -58,9 +117,9 @@ def test_analytics_endpoint_driver_filter(session_factory, monkeypatch):
     SessionLocal = session_factory
     seed_sample_race(SessionLocal())
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.analytics.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -69,4 +128,288 @@ def test_analytics_endpoint_driver_filter(session_factory, monkeypatch):
     body = resp.json()
     assert {lap["driver"] for lap in body["laps"]} == {"VER"}
 
+    # the filtered request is served from the full-race table
+    assert list(dummy_cache.store) == ["analytics:v1:2024:1:all"]
+    resp_ham = client.get("/api/v1/analytics/2024/1", params={"drivers": ["HAM"]})
+    assert {lap["driver"] for lap in resp_ham.json()["laps"]} == {"HAM"}
+
+    app.dependency_overrides.clear()
+
+
+def test_analytics_endpoint_conditional_get(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal())
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+
+    client = TestClient(app)
+
+    first = client.get("/api/v1/analytics/2024/1")
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    # stable across rebuilds even though last_updated changes
+    dummy_cache.store.clear()
+    assert client.get("/api/v1/analytics/2024/1").headers["etag"] == etag
+
+    not_modified = client.get("/api/v1/analytics/2024/1", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    # a new race generation invalidates the validator
+    dummy_cache.store["generation:v1:2024:1"] = "1"
+    refreshed = client.get("/api/v1/analytics/2024/1", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+    app.dependency_overrides.clear()
+
+
+def test_analytics_endpoint_serves_precompressed_variant(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal())
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    binary_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.analytics.redis_binary_client", binary_cache)
+    monkeypatch.setattr("theundercut.services.cache.PRECOMPRESS_MIN_BYTES", 0)
+
+    client = TestClient(app)
+
+    first = client.get("/api/v1/analytics/2024/1", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert len(first.json()["laps"]) == 4
+    assert "analytics:v1:2024:1:response:enc:gzip" in binary_cache.store
+
+    # served from the stored variant without rebuilding the table
+    dummy_cache.store.clear()
+    second = client.get("/api/v1/analytics/2024/1", headers={"Accept-Encoding": "gzip"})
+    assert second.headers["content-encoding"] == "gzip"
+    assert second.json() == first.json()
+    assert "analytics:v1:2024:1:all" not in dummy_cache.store
+
+    plain = client.get("/api/v1/analytics/2024/1", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json()["laps"] == first.json()["laps"]
+
+    app.dependency_overrides.clear()
+
+
+def test_columnar_format_returns_arrays_per_driver(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal())
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+
+    client = TestClient(app)
+
+    resp = client.get("/api/v1/analytics/2024/1", params={"format": "columnar"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["format"] == "columnar"
+    assert set(body["laps"]) == {"VER", "HAM"}
+    assert body["laps"]["VER"]["lap"] == [1, 2]
+    assert set(body["laps"]["VER"]) == {"lap", "lap_ms", "compound", "stint_no", "pit"}
+    assert body["stints"]["HAM"]["compound"] == ["MED"]
+
+    filtered = client.get(
+        "/api/v1/analytics/2024/1", params={"format": "columnar", "drivers": ["HAM"]}
+    ).json()
+    assert set(filtered["laps"]) == {"HAM"}
+
+    laps = client.get("/api/v1/race/2024/1/laps", params={"format": "columnar"}).json()
+    assert laps["VER"] == {"lap": [1, 2], "lap_ms": [90000.0, 90500.0]}
+
+    assert client.get("/api/v1/analytics/2024/1", params={"format": "xml"}).status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+def test_season_analytics_batches_cache_lookups(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal(), rnd=1)
+    seed_sample_race(SessionLocal(), rnd=2)
+    seed_sample_race(SessionLocal(), rnd=3)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+
+    client = TestClient(app)
+
+    # Warm round 2 through the single-race endpoint first.
+    assert client.get("/api/v1/analytics/2024/2").status_code == 200
+
+    built = []
+    from theundercut.services import analytics as analytics_service
+    original = analytics_service.build_race_analytics_tables
+
+    def _tracking_build(db, season, rounds):
+        built.append(list(rounds))
+        return original(db, season, rounds)
+
+    monkeypatch.setattr(
+        "theundercut.api.v1.analytics.build_race_analytics_tables", _tracking_build
+    )
+
+    resp = client.get("/api/v1/analytics/2024", params={"drivers": ["VER"]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["rounds"] == [1, 2, 3]
+    assert [race["race"]["round"] for race in body["races"]] == [1, 2, 3]
+    assert all({lap["driver"] for lap in race["laps"]} == {"VER"} for race in body["races"])
+    # Only the misses were built, together.
+    assert built == [[1, 3]]
+    assert "analytics:v1:2024:3:all" in dummy_cache.store
+
+    resp = client.get("/api/v1/analytics/2024", params={"rounds": [3, 1]})
+    assert resp.json()["rounds"] == [1, 3]
+    assert built == [[1, 3]]
+
+    assert client.get(
+        "/api/v1/analytics/2024", params={"rounds": list(range(1, 40))}
+    ).status_code == 400
+
+    app.dependency_overrides.clear()
+
+
+def test_season_analytics_revalidates_without_round_query(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal(), rnd=1)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    client = TestClient(app)
+
+    etag = client.get("/api/v1/analytics/2024").headers["etag"]
+
+    def _no_query(db, season):
+        raise AssertionError("a 304 should not query the round list")
+
+    monkeypatch.setattr("theundercut.api.v1.analytics.season_analytics_rounds", _no_query)
+    not_modified = client.get("/api/v1/analytics/2024", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    # Any round's new data moves the season generation too
+    dummy_cache.store["generation:v1:2024"] = "1"
+    monkeypatch.undo()
+    _use_cache(monkeypatch, dummy_cache)
+    refreshed = client.get("/api/v1/analytics/2024", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+
+    app.dependency_overrides.clear()
+
+
+def test_analytics_fields_load_only_needed_sections(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal())
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+
+    built_sections = []
+    from theundercut.services import analytics as analytics_service
+    original = analytics_service.build_race_analytics_tables
+
+    def _tracking_build(db, season, rounds, sections=analytics_service.ANALYTICS_TABLE_SECTIONS):
+        built_sections.append(list(sections))
+        return original(db, season, rounds, sections)
+
+    monkeypatch.setattr(
+        "theundercut.api.v1.analytics.build_race_analytics_tables", _tracking_build
+    )
+
+    client = TestClient(app)
+
+    resp = client.get("/api/v1/analytics/2024/1", params={"fields": "stints"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body) == {"race", "last_updated", "stints"}
+    assert built_sections == [["stints", "car_numbers"]]
+
+    # Grades need the metric grades and the laps for the heuristic fallback,
+    # built together; the cached stints section is not rebuilt.
+    body = client.get(
+        "/api/v1/analytics/2024/1", params={"fields": ["stints", "driver_pace_grades"]}
+    ).json()
+    assert set(body) == {"race", "last_updated", "stints", "driver_pace_grades"}
+    assert body["driver_pace_grades"][0]["source"] == "lap_time_heuristic"
+    assert built_sections == [["stints", "car_numbers"], ["laps", "driver_metric_grades"]]
+    assert "analytics:v1:2024:1:all:section:laps" in dummy_cache.store
+
+    assert client.get(
+        "/api/v1/analytics/2024/1", params={"fields": "weather"}
+    ).status_code == 400
+
+    app.dependency_overrides.clear()
+
+
+def test_analytics_fields_cache_ignores_driver_filter(session_factory, monkeypatch):
+    SessionLocal = session_factory
+    seed_sample_race(SessionLocal())
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    client = TestClient(app)
+
+    body = client.get(
+        "/api/v1/analytics/2024/1", params={"fields": "stints", "drivers": "VER"}
+    ).json()
+    assert {row["driver"] for row in body["stints"]} == {"VER"}
+    assert not [key for key in dummy_cache.store if ":fields:" in key]
+
+    body = client.get("/api/v1/analytics/2024/1", params={"fields": "stints"}).json()
+    assert {row["driver"] for row in body["stints"]} == {"VER", "HAM"}
+    assert [key for key in dummy_cache.store if ":fields:" in key] == [
+        "analytics:v1:2024:1:all:fields:stints:rows"
+    ]
+
+    # The cached unfiltered selection is not served to a filtered request
+    body = client.get(
+        "/api/v1/analytics/2024/1", params={"fields": "stints", "drivers": "HAM"}
+    ).json()
+    assert {row["driver"] for row in body["stints"]} == {"HAM"}
+
+    app.dependency_overrides.clear()
+
+
+def test_analytics_endpoint_runs_on_async_session(async_session_factory, monkeypatch):
+    SessionLocal, AsyncSessionLocal = async_session_factory
+    seed_sample_race(SessionLocal())
+
+    override_async_db(AsyncSessionLocal)
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+
+    sessions = []
+
+    async def _recording_run_sync_db(db, fn, *args, **kwargs):
+        sessions.append(type(db))
+        return await run_sync_db(db, fn, *args, **kwargs)
+
+    monkeypatch.setattr("theundercut.api.v1.analytics.run_sync_db", _recording_run_sync_db)
+
+    client = TestClient(app)
+
+    body = client.get("/api/v1/analytics/2024/1").json()
+    assert len(body["laps"]) == 4
+    assert {grade["driver"] for grade in body["driver_pace_grades"]} == {"VER", "HAM"}
+
+    dummy_cache.store.clear()
+    season = client.get("/api/v1/analytics/2024", params={"drivers": ["HAM"]}).json()
+    assert season["rounds"] == [1]
+    assert {lap["driver"] for lap in season["races"][0]["laps"]} == {"HAM"}
+
+    assert sessions and all(issubclass(kind, AsyncSession) for kind in sessions)
+
     app.dependency_overrides.clear()
@@ -1,5 +1,10 @@
 from theundercut.models import Driver, DriverMetrics, Entry, Race, Season, Team
-from theundercut.services.analytics import fetch_race_analytics
+from theundercut.services.analytics import (
+    analytics_table_sections,
+    build_race_analytics_table,
+    fetch_race_analytics,
+    slice_race_analytics,
+)
 from tests.conftest import seed_sample_race
 
 
@@ -53,3 +58,43 @@ def test_fetch_race_analytics_uses_driver_metrics(db_session):
     payload = fetch_race_analytics(db_session, 2024, 1)
     assert payload["driver_pace_grades"][0]["source"] == "drive_grade_db"
     assert payload["driver_pace_grades"][0]["total_grade"] == 88.5
+
+
+def test_slice_race_analytics_reuses_table_for_filters(db_session):
+    seed_sample_race(db_session)
+
+    table = build_race_analytics_table(db_session, 2024, 1)
+
+    assert table["laps"]["driver"] == ["HAM", "HAM", "VER", "VER"]
+    assert set(table["stints"]) == {"driver", "stint_no", "compound", "laps", "avg_lap_ms"}
+
+    full = slice_race_analytics(table)
+    ham = slice_race_analytics(table, ["HAM"])
+    assert len(full["laps"]) == 4
+    assert {lap["driver"] for lap in ham["laps"]} == {"HAM"}
+    assert [grade["driver"] for grade in ham["driver_pace_grades"]] == ["HAM"]
+
+
+def test_slice_race_analytics_matches_car_numbers():
+    table = {
+        "race": {"season": 2024, "round": 1},
+        "last_updated": "2024-03-02T16:00:00Z",
+        "laps": {
+            "driver": ["HAM", "VER"], "lap": [1, 1], "lap_ms": [91000, 90000],
+            "compound": ["SOFT", "SOFT"], "stint_no": [1, 1], "pit": [False, False],
+        },
+        "car_numbers": {"44": "HAM", "1": "VER"},
+    }
+
+    by_number = slice_race_analytics(table, ["44"], fields=["laps"])
+    by_code = slice_race_analytics(table, ["VER"], fields=["laps"])
+
+    assert [lap["driver"] for lap in by_number["laps"]] == ["HAM"]
+    assert [lap["driver"] for lap in by_code["laps"]] == ["VER"]
+
+
+def test_analytics_table_sections_include_laps_for_pace_grades():
+    assert analytics_table_sections(["stints"]) == ["stints", "car_numbers"]
+    assert analytics_table_sections(["driver_pace_grades"]) == [
+        "laps", "driver_metric_grades", "car_numbers",
+    ]
@@ -21,6 +21,7 @@ EXPECTED_MODULES = [
     "analytics",
     "circuits",
     "race",
+    "season",
     "standings",
     "strategy",
     "testing",
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+from redis.exceptions import RedisError
+
+from theundercut.adapters import db as db_adapter
+from theundercut.adapters.db import async_database_url, run_sync_db
+from theundercut.models import LapTime
+
+
+def _lap_count(session, race_id):
+    return session.execute(
+        sa.select(sa.func.count(LapTime.id)).where(LapTime.race_id == race_id)
+    ).scalar_one()
+
+
+def test_async_database_url_maps_drivers():
+    assert (
+        async_database_url("postgresql://user:secret@db:5432/undercut")
+        == "postgresql+asyncpg://user:secret@db:5432/undercut"
+    )
+    assert (
+        async_database_url("postgresql+psycopg2://db/undercut")
+        == "postgresql+asyncpg://db/undercut"
+    )
+    assert async_database_url("sqlite:///local.db") == "sqlite+aiosqlite:///local.db"
+
+
+def test_async_database_url_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        async_database_url("mysql://db/undercut")
+
+
+def test_run_sync_db_uses_threadpool_for_sync_session(db_session):
+    db_session.add(LapTime(race_id="2024-1", driver="VER", lap=1, lap_ms=90000))
+    db_session.commit()
+
+    assert asyncio.run(run_sync_db(db_session, _lap_count, "2024-1")) == 1
+
+
+def test_run_sync_db_runs_builder_on_async_session(tmp_path):
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    db_path = tmp_path / "async.db"
+    sync_engine = sa.create_engine(f"sqlite:///{db_path}")
+    LapTime.__table__.create(sync_engine)
+    with sync_engine.begin() as conn:
+        conn.execute(
+            sa.insert(LapTime.__table__),
+            [
+                {"race_id": "2024-1", "race_key": 1, "driver": "VER", "lap": 1, "lap_ms": 90000},
+                {"race_id": "2024-1", "race_key": 1, "driver": "HAM", "lap": 1, "lap_ms": 91000},
+            ],
+        )
+    sync_engine.dispose()
+
+    async def _run():
+        engine = create_async_engine(async_database_url(f"sqlite:///{db_path}"))
+        try:
+            async with AsyncSession(engine) as db:
+                return await run_sync_db(db, _lap_count, "2024-1")
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(_run()) == 2
+
+
+class _PinRedis:
+    def __init__(self, keys=(), fail=False):
+        self.keys = set(keys)
+        self.fail = fail
+        self.calls = 0
+
+    def exists(self, key):
+        self.calls += 1
+        if self.fail:
+            raise RedisError("down")
+        return int(key in self.keys)
+
+
+class _Conn:
+    def __init__(self, **path_params):
+        self.path_params = path_params
+
+
+class _Closing:
+    def __init__(self, target):
+        self.target = target
+
+    def close(self):
+        pass
+
+
+def _read_session(monkeypatch, pins, conn):
+    primary, replica = object(), object()
+    monkeypatch.setattr(db_adapter, "read_engine", object())
+    monkeypatch.setattr(db_adapter, "SessionLocal", lambda: _Closing(primary))
+    monkeypatch.setattr(db_adapter, "ReadSessionLocal", lambda: _Closing(replica))
+    monkeypatch.setattr(db_adapter, "redis_client", pins)
+    session = next(db_adapter.get_read_db(conn)).target
+    return "replica" if session is replica else "primary"
+
+
+def test_get_read_db_uses_replica_unless_season_pinned(monkeypatch):
+    pins = _PinRedis(keys={db_adapter.primary_pin_key(2024)})
+
+    assert _read_session(monkeypatch, pins, _Conn(season="2025")) == "replica"
+    assert _read_session(monkeypatch, pins, _Conn(season="2024")) == "primary"
+    assert _read_session(monkeypatch, pins, _Conn()) == "replica"
+
+
+def test_get_read_db_falls_back_to_primary_when_redis_fails(monkeypatch):
+    assert _read_session(monkeypatch, _PinRedis(fail=True), _Conn(season="2024")) == "primary"
+
+
+def test_get_read_db_without_replica_skips_pin_lookup(monkeypatch):
+    pins = _PinRedis()
+    monkeypatch.setattr(db_adapter, "redis_client", pins)
+    monkeypatch.setattr(db_adapter, "SessionLocal", lambda: _Closing("primary"))
+
+    assert next(db_adapter.get_read_db(_Conn(season="2024"))).target == "primary"
+    assert pins.calls == 0
+
+
+def test_pin_reads_to_primary_expires_after_lag_window(monkeypatch):
+    calls = []
+
+    class _Recorder:
+        def setex(self, key, ttl, value):
+            calls.append((key, ttl))
+
+    monkeypatch.setattr(db_adapter, "redis_client", _Recorder())
+    db_adapter.pin_reads_to_primary(2024)
+
+    assert calls == [("db:primary:2024", db_adapter.settings.read_after_write_seconds)]
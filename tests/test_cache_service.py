@@ -1,3 +1,6 @@
+import gzip
+import json
+
 from theundercut.services import cache
 
 
@@ -34,3 +37,55 @@ def test_invalidate_analytics_cache_deletes_matching(monkeypatch):
     cache.invalidate_analytics_cache(2024, 1)
     assert set(dummy.deleted) == {"analytics:v1:2024:1:all", "analytics:v1:2024:1:HAM"}
     assert "analytics:v1:2024:2:all" in dummy.keys  # untouched
+
+
+def test_encode_cache_payload_keeps_small_payloads_plain():
+    encoded = cache.encode_cache_payload({"cached": True})
+    assert not encoded.startswith(cache.COMPRESSED_PAYLOAD_MARKER)
+    assert cache.decode_cache_payload(encoded) == {"cached": True}
+
+
+def test_encode_cache_payload_compresses_large_payloads():
+    payload = {
+        "laps": [
+            {"driver": "VER", "lap": lap, "lap_ms": 90000 + lap, "compound": "SOFT"}
+            for lap in range(1, 500)
+        ]
+    }
+    before = cache.cache_codec_stats()["bytes_saved"]
+
+    encoded = cache.encode_cache_payload(payload)
+
+    assert encoded.startswith(cache.COMPRESSED_PAYLOAD_MARKER)
+    assert len(encoded) < len(json.dumps(payload)) / 4
+    assert cache.decode_cache_payload(encoded) == payload
+    assert cache.cache_codec_stats()["bytes_saved"] > before
+
+
+def test_decode_cache_payload_reads_legacy_json():
+    legacy = json.dumps({"laps": [], "stints": []})
+    assert cache.decode_cache_payload(legacy) == {"laps": [], "stints": []}
+    assert cache.decode_cache_payload(legacy.encode("utf-8")) == {"laps": [], "stints": []}
+
+
+def test_store_encoded_variants_writes_gzip_next_to_payload():
+    class BinaryRedis:
+        def __init__(self):
+            self.store = {}
+
+        def setex(self, key, ttl, value):
+            self.store[key] = value
+
+        def get(self, key):
+            return self.store.get(key)
+
+    client = BinaryRedis()
+    body = json.dumps({"laps": list(range(2000))}).encode("utf-8")
+
+    variants = cache.store_encoded_variants("testing:laps:x", 60, body, client)
+
+    assert "gzip" in variants
+    assert gzip.decompress(client.store["testing:laps:x:enc:gzip"]) == body
+    assert cache.get_encoded_variant("testing:laps:x", "gzip", client) == variants["gzip"]
+    # tiny bodies are not worth compressing
+    assert cache.store_encoded_variants("small", 60, b"{}", client) == {}
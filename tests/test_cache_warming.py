@@ -0,0 +1,79 @@
+import json
+
+from theundercut.services import cache_warming
+from tests.conftest import seed_sample_race
+
+
+class DummyRedis:
+    def __init__(self):
+        self.store = {}
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+class DownRedis:
+    def ping(self):
+        raise ConnectionError("redis down")
+
+
+def test_warm_race_caches_writes_hot_payloads(db_session, monkeypatch):
+    seed_sample_race(db_session)
+    dummy = DummyRedis()
+    monkeypatch.setattr(cache_warming, "redis_client", dummy)
+    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy)
+    monkeypatch.setattr(
+        "theundercut.services.standings.fetch_season_standings",
+        lambda _db, season: {"season": season, "drivers": []},
+    )
+    monkeypatch.setattr(
+        "theundercut.api.v1.circuits.get_circuit_history", lambda season, circuit_id: None
+    )
+
+    timings = cache_warming.warm_race_caches(db_session, 2024, 1)
+
+    assert "analytics:v1:2024:1:all" in dummy.store
+    assert "weekend:v1:2024:1" in dummy.store
+    assert json.loads(dummy.store["standings:v1:2024"]) == {"season": 2024, "drivers": []}
+    # no classifications / strategy scores seeded -> nothing cached for those
+    assert "session:v1:2024:1:race" not in dummy.store
+    assert "strategy:2024:1" not in dummy.store
+    assert timings["analytics"] is not None
+    assert timings["strategy"] is None
+
+
+def test_warm_race_caches_skips_when_redis_down(db_session, monkeypatch):
+    monkeypatch.setattr(cache_warming, "redis_client", DownRedis())
+    assert cache_warming.warm_race_caches(db_session, 2024, 1) == {}
+
+
+def test_warm_race_caches_skips_weekend_with_failed_sections(db_session, monkeypatch):
+    seed_sample_race(db_session)
+    dummy = DummyRedis()
+    monkeypatch.setattr(cache_warming, "redis_client", dummy)
+    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy)
+    monkeypatch.setattr(
+        "theundercut.services.standings.fetch_season_standings",
+        lambda _db, season: {"season": season, "drivers": []},
+    )
+
+    def _history_down(season, circuit_id):
+        raise ConnectionError("jolpica down")
+
+    monkeypatch.setattr("theundercut.api.v1.circuits.get_circuit_history", _history_down)
+
+    timings = cache_warming.warm_race_caches(db_session, 2024, 1)
+
+    assert "weekend:v1:2024:1" not in dummy.store
+    assert timings["weekend"] is None
+    assert "analytics:v1:2024:1:all" in dummy.store
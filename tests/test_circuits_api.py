@@ -6,6 +6,8 @@ from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 
 from theundercut.api.main import app
+from theundercut.api.v1.circuits import JOLPICA_BASE
+from tests.conftest import override_db
 
 
 class DummyRedis:
@@ -19,6 +21,15 @@ class DummyRedis:
     def setex(self, key, ttl, value):
         self.store[key] = value
 
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
 
 # Sample Jolpica API responses
 SAMPLE_CIRCUITS = [
@@ -180,7 +191,6 @@ def test_get_circuits_caching(client, mock_redis, monkeypatch):
 
 def test_get_circuit_detail(client, monkeypatch, session_factory):
     """Test that get_circuit_detail returns full circuit analytics."""
-    from theundercut.adapters.db import get_db
 
     def _override_dependency():
         session = session_factory()
@@ -189,7 +199,7 @@ def test_get_circuit_detail(client, monkeypatch, session_factory):
         finally:
             session.close()
 
-    app.dependency_overrides[get_db] = _override_dependency
+    override_db(_override_dependency)
 
     mock_circuit_info = MagicMock()
     mock_circuit_info.status_code = 200
@@ -262,7 +272,6 @@ def test_get_circuit_detail(client, monkeypatch, session_factory):
 
 def test_get_circuit_detail_not_found(client, monkeypatch, session_factory):
     """Test that get_circuit_detail returns error for invalid circuit."""
-    from theundercut.adapters.db import get_db
 
     def _override_dependency():
         session = session_factory()
@@ -271,7 +280,7 @@ def test_get_circuit_detail_not_found(client, monkeypatch, session_factory):
         finally:
             session.close()
 
-    app.dependency_overrides[get_db] = _override_dependency
+    override_db(_override_dependency)
 
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -294,6 +303,60 @@ def test_get_circuit_detail_not_found(client, monkeypatch, session_factory):
     app.dependency_overrides.clear()
 
 
+def test_get_circuit_detail_fields_skip_unneeded_lookups(client, mock_redis, session_factory):
+    """Only the lookups behind the selected fields run, and sections are cached."""
+
+    def _override_dependency():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    override_db(_override_dependency)
+
+    mock_circuit_info = MagicMock()
+    mock_circuit_info.json.return_value = {
+        "MRData": {"CircuitTable": {"Circuits": [SAMPLE_CIRCUIT_INFO]}}
+    }
+    requested_urls = []
+
+    def mock_get(url):
+        requested_urls.append(url)
+        return mock_circuit_info
+
+    with patch("theundercut.api.v1.circuits.httpx.Client") as mock_client:
+        mock_client_instance = MagicMock()
+        mock_client_instance.get.side_effect = mock_get
+        mock_client.return_value.__enter__.return_value = mock_client_instance
+
+        resp = client.get(
+            "/api/v1/circuits/2024/silverstone", params={"fields": "circuit,strategy_patterns"}
+        )
+        again = client.get("/api/v1/circuits/2024/silverstone", params={"fields": ["circuit"]})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body) == {"season", "circuit", "strategy_patterns"}
+    assert body["circuit"]["name"] == "Silverstone Circuit"
+    # No historical results or qualifying lookups for these fields.
+    assert f"{JOLPICA_BASE}/circuits/silverstone.json" in requested_urls
+    assert not [url for url in requested_urls if "results" in url or "qualifying" in url]
+
+    # The second selection reuses the cached circuit section.
+    lookups = len(requested_urls)
+    assert again.json()["circuit"] == body["circuit"]
+    assert len(requested_urls) == lookups
+    assert "circuit_detail:v1:2024:silverstone:section:circuit" in mock_redis.store
+    assert "circuit_detail:v1:2024:silverstone:fields:circuit,strategy_patterns" in mock_redis.store
+
+    assert client.get(
+        "/api/v1/circuits/2024/silverstone", params={"fields": "bogus"}
+    ).status_code == 400
+
+    app.dependency_overrides.clear()
+
+
 def test_get_circuit_trends(client, monkeypatch):
     """Test that get_circuit_trends returns multi-season lap times."""
     mock_results = MagicMock()
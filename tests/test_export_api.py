@@ -0,0 +1,234 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from theundercut.api.main import app
+from theundercut.models import Driver, Entry, LapPosition, Race, Season, Team
+from theundercut.api.v1 import export as export_api
+from theundercut.services import lap_export
+from tests.conftest import override_db, seed_sample_race
+
+
+class DummyRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = str(value)
+
+
+def _override_dependency(session_factory):
+    def _get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    return _get_db
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    monkeypatch.setattr(export_api, "redis_client", DummyRedis())
+    session = session_factory()
+    seed_sample_race(session)
+    seed_sample_race(session, rnd=2)
+    seed_sample_race(session, season=2023, rnd=5)
+    session.close()
+    override_db(_override_dependency(session_factory))
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_export_laps_arrow_stream(client):
+    pa = pytest.importorskip("pyarrow")
+
+    resp = client.get(
+        "/api/v1/export/laps",
+        params={"season": 2024, "drivers": ["VER"], "columns": ["race_id", "lap", "lap_ms"]},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.column_names == ["race_id", "lap", "lap_ms"]
+    assert table.num_rows == 4  # two rounds x two VER laps
+    assert table.column("race_id").to_pylist() == ["2024-1", "2024-1", "2024-2", "2024-2"]
+
+
+def test_export_laps_parquet_single_round(client, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    monkeypatch.setattr(lap_export, "EXPORT_BATCH_SIZE", 1)
+    resp = client.get("/api/v1/export/laps", params={"season": 2024, "round": 1, "format": "parquet"})
+
+    assert resp.status_code == 200
+    table = pq.read_table(io.BytesIO(resp.content))
+    assert table.num_rows == 4
+    assert set(table.column("driver").to_pylist()) == {"VER", "HAM"}
+
+
+def test_export_rejects_unknown_columns(client):
+    resp = client.get("/api/v1/export/laps", params={"season": 2024, "columns": ["nope"]})
+    assert resp.status_code == 400
+
+
+def test_export_without_pyarrow_returns_501(client, monkeypatch):
+    monkeypatch.setattr(lap_export, "pa", None)
+    resp = client.get("/api/v1/export/laps", params={"season": 2024})
+    assert resp.status_code == 501
+    assert "pyarrow" in resp.json()["detail"]
+
+
+def _seed_positions(session):
+    season = Season(year=2024)
+    team = Team(name="Red Bull")
+    driver = Driver(code="VER")
+    session.add_all([season, team, driver])
+    session.flush()
+    race = Race(season_id=season.id, round_number=3, slug="2024-3")
+    session.add(race)
+    session.flush()
+    entry = Entry(race_id=race.id, driver_id=driver.id, team_id=team.id)
+    session.add(entry)
+    session.flush()
+    session.add_all(
+        LapPosition(race_id=race.id, entry_id=entry.id, lap_number=lap, position=1, gap_to_leader_ms=0)
+        for lap in (1, 2, 3)
+    )
+    session.commit()
+
+
+def test_export_laps_ndjson_season_range(client):
+    resp = client.get(
+        "/api/v1/export/laps",
+        params={"season": 2023, "season_to": 2024, "round_to": 1, "drivers": ["VER"], "format": "ndjson"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert "etag" in resp.headers
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    # Round 5 of 2023 and round 2 of 2024 fall outside round_to=1.
+    assert [(row["race_id"], row["lap"]) for row in rows] == [("2024-1", 1), ("2024-1", 2)]
+
+
+def test_export_laps_csv_batches(client, monkeypatch):
+    monkeypatch.setattr(lap_export, "EXPORT_BATCH_SIZE", 3)
+    resp = client.get(
+        "/api/v1/export/laps",
+        params={"season": 2024, "columns": ["race_id", "driver", "lap"], "format": "csv"},
+    )
+
+    assert resp.status_code == 200
+    rows = list(csv.reader(io.StringIO(resp.text)))
+    assert rows[0] == ["race_id", "driver", "lap"]
+    assert len(rows) == 9
+    assert rows[1] == ["2024-1", "HAM", "1"]
+
+
+def test_export_range_resumes_download(client, monkeypatch):
+    monkeypatch.setattr(lap_export, "EXPORT_BATCH_SIZE", 2)
+    params = {"season": 2024, "format": "ndjson"}
+    full = client.get("/api/v1/export/laps", params=params)
+    etag = full.headers["etag"]
+
+    partial = client.get(
+        "/api/v1/export/laps",
+        params=params,
+        headers={"Range": "bytes=100-", "If-Range": etag},
+    )
+
+    assert partial.status_code == 206
+    total = len(full.content)
+    assert partial.headers["content-range"] == f"bytes 100-{total - 1}/{total}"
+    assert partial.headers["content-length"] == str(total - 100)
+    assert partial.content == full.content[100:]
+
+    bounded = client.get("/api/v1/export/laps", params=params, headers={"Range": "bytes=10-19"})
+    assert bounded.status_code == 206
+    assert bounded.content == full.content[10:20]
+
+
+def test_export_range_serializes_once_per_etag(client, monkeypatch):
+    calls = []
+    original = export_api._serialize
+
+    def _counting_serialize(*args):
+        calls.append(args[2])
+        return original(*args)
+
+    monkeypatch.setattr(export_api, "_serialize", _counting_serialize)
+    params = {"season": 2024, "format": "ndjson"}
+
+    first = client.get("/api/v1/export/laps", params=params, headers={"Range": "bytes=10-"})
+    second = client.get("/api/v1/export/laps", params=params, headers={"Range": "bytes=20-"})
+
+    # Only the first resume serializes the export to learn its length
+    assert len(calls) == 3
+    assert first.content[10:] == second.content
+
+
+def test_export_laps_orders_rounds_numerically(client, session_factory):
+    session = session_factory()
+    seed_sample_race(session, rnd=10)
+    session.close()
+
+    resp = client.get(
+        "/api/v1/export/laps",
+        params={"season": 2024, "drivers": ["VER"], "columns": ["race_id"], "format": "csv"},
+    )
+
+    rows = list(csv.reader(io.StringIO(resp.text)))[1:]
+    assert [row[0] for row in rows] == ["2024-1", "2024-1", "2024-2", "2024-2", "2024-10", "2024-10"]
+
+
+def test_export_range_with_stale_validator_sends_full_body(client):
+    params = {"season": 2024, "format": "csv"}
+    full = client.get("/api/v1/export/laps", params=params)
+
+    resp = client.get(
+        "/api/v1/export/laps",
+        params=params,
+        headers={"Range": "bytes=5-", "If-Range": '"stale"'},
+    )
+
+    assert resp.status_code == 200
+    assert resp.content == full.content
+
+
+def test_export_unsatisfiable_range(client):
+    resp = client.get(
+        "/api/v1/export/laps",
+        params={"season": 2024, "format": "csv"},
+        headers={"Range": "bytes=999999-"},
+    )
+
+    assert resp.status_code == 416
+    assert resp.headers["content-range"].startswith("bytes */")
+
+
+def test_export_positions_ndjson(client, session_factory):
+    session = session_factory()
+    _seed_positions(session)
+    session.close()
+
+    resp = client.get(
+        "/api/v1/export/positions",
+        params={"season": 2024, "round_from": 3, "round_to": 3, "columns": ["round", "driver", "lap_number", "position"]},
+    )
+
+    assert resp.status_code == 200
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert rows == [
+        {"round": 3, "driver": "VER", "lap_number": lap, "position": 1} for lap in (1, 2, 3)
+    ]
+    assert 'filename="positions-2024-3.ndjson"' in resp.headers["content-disposition"]
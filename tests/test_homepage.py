@@ -9,9 +9,10 @@ from theundercut.services.homepage import (
     get_latest_race,
     get_podium,
     get_homepage_data,
+    refresh_race_summary,
     _get_race_name,
 )
-from theundercut.models import LapTime
+from theundercut.models import LapTime, RaceSummary, SessionClassification
 
 
 class TestGetCurrentSeason:
@@ -174,3 +175,71 @@ class TestGetHomepageData:
                 assert data["season"] == 2024
                 assert data["latest_race"] is None
                 assert data["podium"] == []
+
+
+class TestRefreshRaceSummary:
+    """Tests for the materialized race summary."""
+
+    def _seed_laps(self, db_session, race_id="2025-3"):
+        db_session.add_all([
+            LapTime(race_id=race_id, driver="VER", lap=1, lap_ms=90000),
+            LapTime(race_id=race_id, driver="VER", lap=2, lap_ms=88500),
+            LapTime(race_id=race_id, driver="NOR", lap=1, lap_ms=90500),
+            LapTime(race_id=race_id, driver="NOR", lap=2, lap_ms=88200),
+            LapTime(race_id=race_id, driver="HAM", lap=1, lap_ms=91000),
+        ])
+        db_session.commit()
+
+    def test_uses_race_classification(self, db_session):
+        """Podium and team map come from the classification when present."""
+        self._seed_laps(db_session)
+        for position, (code, team) in enumerate([("NOR", "McLaren"), ("VER", "Red Bull"), ("HAM", "Ferrari")], start=1):
+            db_session.add(SessionClassification(
+                season=2025, round=3, session_type="race", driver_code=code, team=team, position=position,
+            ))
+        db_session.commit()
+
+        values = refresh_race_summary(db_session, 2025, 3)
+        db_session.commit()
+
+        assert values["source"] == "classification"
+        row = db_session.query(RaceSummary).filter_by(season=2025, round=3).one()
+        assert row.winner_code == "NOR"
+        assert [p["driver"] for p in row.podium] == ["NOR", "VER", "HAM"]
+        assert row.team_map["VER"] == "Red Bull"
+        assert (row.fastest_lap_driver, row.fastest_lap_ms, row.fastest_lap_number) == ("NOR", 88200, 2)
+        assert row.laps_completed == 2
+
+    def test_falls_back_to_lap_heuristic_and_updates_in_place(self, db_session):
+        """Without a classification the lap-count podium is stored; reruns update the row."""
+        self._seed_laps(db_session)
+
+        refresh_race_summary(db_session, 2025, 3)
+        refresh_race_summary(db_session, 2025, 3)
+        db_session.commit()
+
+        rows = db_session.query(RaceSummary).filter_by(season=2025, round=3).all()
+        assert len(rows) == 1
+        assert rows[0].source == "laps"
+        assert rows[0].winner_code == "VER"
+
+    def test_returns_none_without_data(self, db_session):
+        assert refresh_race_summary(db_session, 2025, 9) is None
+        assert db_session.query(RaceSummary).count() == 0
+
+    def test_homepage_data_reads_latest_summary(self, db_session):
+        """get_homepage_data serves the newest summary without touching lap_times."""
+        self._seed_laps(db_session, "2025-3")
+        self._seed_laps(db_session, "2025-4")
+        refresh_race_summary(db_session, 2025, 3)
+        refresh_race_summary(db_session, 2025, 4)
+        db_session.commit()
+
+        with patch('theundercut.services.homepage.get_current_season') as current_season:
+            data = get_homepage_data(db_session)
+
+        current_season.assert_not_called()
+        assert data["season"] == 2025
+        assert data["latest_race"]["round"] == 4
+        assert data["latest_race"]["race_id"] == "2025-4"
+        assert data["podium"][0]["driver"] == "VER"
@@ -5,9 +5,8 @@ import pytest
 from fastapi.testclient import TestClient
 
 from theundercut.api.main import app
-from theundercut.adapters.db import get_db
 from theundercut.models import LapTime
-from tests.conftest import seed_sample_race
+from tests.conftest import override_db, seed_sample_race
 
 
 class DummyRedis:
@@ -23,6 +22,23 @@ class DummyRedis:
         self.store[key] = value
 
 
+class AsyncDummyRedis(DummyRedis):
+    """Async variant for the homepage route's cache."""
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture(autouse=True)
+def homepage_cache(monkeypatch):
+    cache = AsyncDummyRedis()
+    monkeypatch.setattr("theundercut.web.routes.async_redis_client", cache)
+    return cache
+
+
 def _override_dependency(session_factory):
     """Create a dependency override for database session."""
     def _get_db():
@@ -80,7 +96,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -99,7 +115,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -121,7 +137,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -147,7 +163,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -170,7 +186,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -192,7 +208,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -214,7 +230,7 @@ class TestHomepageE2E:
         _seed_homepage_data(session)
         session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
@@ -233,7 +249,7 @@ class TestHomepageE2E:
         SessionLocal = session_factory
         # Don't seed any data
 
-        app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+        override_db(_override_dependency(SessionLocal))
         dummy_cache = DummyRedis()
         monkeypatch.setattr("theundercut.api.v1.standings.redis_client", dummy_cache)
 
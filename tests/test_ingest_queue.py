@@ -0,0 +1,107 @@
+"""Tests for queueing session ingestion on the RQ worker."""
+from theundercut.services import ingest_queue
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+class FakeJob:
+    def __init__(self, status):
+        self.status = status
+
+    def get_status(self, refresh=True):
+        return self.status
+
+
+class FakeQueue:
+    jobs = {}
+    enqueued = []
+
+    def __init__(self, name, connection=None):
+        self.name = name
+
+    def fetch_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def enqueue(self, func, *args, job_id=None, **kwargs):
+        self.enqueued.append((func, args, job_id, kwargs))
+        self.jobs[job_id] = FakeJob("queued")
+
+
+def _fake_queue(monkeypatch):
+    monkeypatch.setattr(FakeQueue, "jobs", {})
+    monkeypatch.setattr(FakeQueue, "enqueued", [])
+    monkeypatch.setattr(ingest_queue, "Queue", FakeQueue)
+
+
+def test_enqueue_dedupes_concurrent_requests(monkeypatch):
+    _fake_queue(monkeypatch)
+    client = FakeRedis()
+
+    assert ingest_queue.enqueue_session_ingest(2026, 3, "Race", client=client) is True
+    assert ingest_queue.enqueue_session_ingest(2026, 3, "Race", client=client) is False
+
+    assert len(FakeQueue.enqueued) == 1
+    func, args, job_id, kwargs = FakeQueue.enqueued[0]
+    assert func is ingest_queue.run_session_ingest
+    assert args == (2026, 3, "Race")
+    assert job_id == "2026-3-Race"
+    assert list(client.store) == [ingest_queue.ingest_pending_key(2026, 3, "Race")]
+
+
+def test_enqueue_skips_live_scheduler_job(monkeypatch):
+    _fake_queue(monkeypatch)
+    FakeQueue.jobs["2026-3-Qualifying"] = FakeJob("scheduled")
+    client = FakeRedis()
+
+    assert ingest_queue.enqueue_session_ingest(2026, 3, "Qualifying", client=client) is False
+    assert FakeQueue.enqueued == []
+    # No marker is left behind, so a request after that job finishes can queue again
+    assert client.store == {}
+
+    FakeQueue.jobs["2026-3-Qualifying"] = FakeJob("finished")
+    assert ingest_queue.enqueue_session_ingest(2026, 3, "Qualifying", client=client) is True
+
+
+def test_enqueue_failure_releases_marker(monkeypatch):
+    class BrokenQueue(FakeQueue):
+        def enqueue(self, *args, **kwargs):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(ingest_queue, "Queue", BrokenQueue)
+    monkeypatch.setattr(BrokenQueue, "jobs", {})
+    client = FakeRedis()
+
+    try:
+        ingest_queue.enqueue_session_ingest(2026, 3, "Race", client=client)
+    except ConnectionError:
+        pass
+    assert client.store == {}
+
+
+def test_run_session_ingest_clears_marker(monkeypatch):
+    client = FakeRedis()
+    client.store[ingest_queue.ingest_pending_key(2026, 3, "Race")] = "2026-3-Race"
+    monkeypatch.setattr(ingest_queue, "redis_client", client)
+    calls = []
+    monkeypatch.setattr(
+        "theundercut.services.ingestion.ingest_session",
+        lambda season, rnd, session_type="Race", force=False: calls.append((season, rnd, session_type, force)),
+    )
+
+    ingest_queue.run_session_ingest(2026, 3, "Race")
+
+    assert calls == [(2026, 3, "Race", False)]
+    assert client.store == {}
@@ -272,3 +272,47 @@ def test_ingest_session_handles_overlapping_calendar_names(db_session_factory, m
 
     assert sprint_event.status == "ingested"
     assert sq_event.status == "scheduled"
+
+
+def test_final_race_ingest_holds_live_poll_lock(db_session_factory, monkeypatch, patch_provider):
+    from theundercut import scheduler_jobs
+    from theundercut.services import live_ingestion
+
+    class LockRedis:
+        def __init__(self):
+            self.store = {scheduler_jobs.LIVE_POLL_LOCK_KEY: "running-poll"}
+
+        def set(self, key, value, nx=False, ex=None):
+            if nx and key in self.store:
+                return None
+            self.store[key] = value
+            return True
+
+        def get(self, key):
+            return self.store.get(key)
+
+        def delete(self, key):
+            self.store.pop(key, None)
+
+    lock_redis = LockRedis()
+    holders = []
+    monkeypatch.setattr(ingestion, "SessionLocal", db_session_factory)
+    monkeypatch.setattr(scheduler_jobs, "redis_client", lock_redis)
+    # The running poll finishes while the ingest waits for it
+    monkeypatch.setattr(scheduler_jobs.time, "sleep", lambda seconds: lock_redis.delete(scheduler_jobs.LIVE_POLL_LOCK_KEY))
+    monkeypatch.setattr(
+        live_ingestion, "discard_live_laps",
+        lambda db, season, rnd: holders.append(lock_redis.get(scheduler_jobs.LIVE_POLL_LOCK_KEY)),
+    )
+    monkeypatch.setattr(
+        live_ingestion, "end_live_session",
+        lambda season, rnd, session_type: holders.append(lock_redis.get(scheduler_jobs.LIVE_POLL_LOCK_KEY)),
+    )
+
+    ingestion.ingest_session(2024, 1)
+
+    # A poll cannot write between the discard and the cleared live state
+    assert len(holders) == 2
+    assert holders[0] == holders[1]
+    assert holders[0] not in (None, "running-poll")
+    assert scheduler_jobs.LIVE_POLL_LOCK_KEY not in lock_redis.store
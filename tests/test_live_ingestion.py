@@ -0,0 +1,308 @@
+"""Tests for incremental live lap ingestion."""
+import datetime as dt
+import fnmatch
+import json
+
+import pytest
+
+from theundercut.models import (
+    CalendarEvent,
+    Driver,
+    Entry,
+    LapPosition,
+    LapTime,
+    Race,
+    Season,
+    Team,
+)
+from theundercut.services import cache, live_ingestion, race_events
+from theundercut.services.analytics import ANALYTICS_TABLE_FORMAT
+from theundercut.services.cache import (
+    analytics_cache_key,
+    decode_cache_payload,
+    encode_cache_payload,
+    fields_cache_key,
+    live_cache_key,
+    race_generation_key,
+)
+
+T0 = dt.datetime(2026, 3, 8, 15, 0, tzinfo=dt.timezone.utc)
+
+
+def _at(seconds):
+    return (T0 + dt.timedelta(seconds=seconds)).isoformat()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, keepttl=False, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+        return 1
+
+    def scan_iter(self, match):
+        return [key for key in list(self.store) if fnmatch.fnmatch(key, match)]
+
+
+class FakeOpenF1:
+    """Serves one canned response per endpoint per poll and records the params."""
+
+    def __init__(self, polls):
+        self.polls = polls
+        self.poll = 0
+        self.calls = []
+
+    def __call__(self, client, endpoint, params):
+        self.calls.append((self.poll, endpoint, params))
+        if endpoint == "drivers":
+            return [
+                {"driver_number": 1, "name_acronym": "VER"},
+                {"driver_number": 44, "name_acronym": "HAM"},
+            ]
+        return self.polls[self.poll].get(endpoint, [])
+
+
+def _lap(number, lap, start, duration):
+    return {"driver_number": number, "lap_number": lap, "date_start": _at(start), "lap_duration": duration}
+
+
+POLLS = [
+    {
+        "laps": [
+            _lap(1, 1, 0, 90.0), _lap(1, 2, 90, None),
+            _lap(44, 1, 0, 91.5), _lap(44, 2, 91.5, None),
+        ],
+        "position": [
+            {"driver_number": 1, "position": 1, "date": _at(0)},
+            {"driver_number": 44, "position": 2, "date": _at(0)},
+        ],
+        "stints": [
+            {"driver_number": 1, "stint_number": 1, "lap_start": 1, "compound": "SOFT"},
+            {"driver_number": 44, "stint_number": 1, "lap_start": 1, "compound": "MEDIUM"},
+        ],
+        "race_control": [
+            {"date": _at(5), "lap_number": 1, "category": "Flag", "flag": "GREEN", "message": "GREEN LIGHT"},
+        ],
+    },
+    {
+        # Re-read from the oldest open lap
+        "laps": [
+            _lap(1, 2, 90, 89.0), _lap(1, 3, 179, None),
+            _lap(44, 2, 91.5, 88.0), _lap(44, 3, 179.5, None),
+        ],
+        "position": [
+            {"driver_number": 44, "position": 1, "date": _at(150)},
+            {"driver_number": 1, "position": 2, "date": _at(150)},
+        ],
+        "stints": [
+            {"driver_number": 1, "stint_number": 1, "lap_start": 1, "compound": "SOFT"},
+            {"driver_number": 1, "stint_number": 2, "lap_start": 3, "compound": "HARD"},
+            {"driver_number": 44, "stint_number": 1, "lap_start": 1, "compound": "MEDIUM"},
+        ],
+    },
+    {},
+]
+
+
+@pytest.fixture
+def live(monkeypatch, session_factory):
+    fake_redis = FakeRedis()
+    openf1 = FakeOpenF1(POLLS)
+    monkeypatch.setattr(live_ingestion, "redis_client", fake_redis)
+    monkeypatch.setattr(cache, "redis_client", fake_redis)
+    monkeypatch.setattr(race_events, "redis_client", fake_redis)
+    monkeypatch.setattr(live_ingestion, "SessionLocal", session_factory)
+    monkeypatch.setattr(live_ingestion, "get_session_key", lambda season, rnd, session_type: 9999)
+    monkeypatch.setattr(live_ingestion, "openf1_get", openf1)
+    return fake_redis, openf1
+
+
+def _poll(openf1, index):
+    openf1.poll = index
+    return live_ingestion.poll_live_session(2026, 2, "Race", client=object())
+
+
+def _seed_race(session):
+    season = Season(year=2026)
+    team = Team(name="Red Bull")
+    drivers = [Driver(code="VER"), Driver(code="HAM")]
+    session.add_all([season, team, *drivers])
+    session.flush()
+    race = Race(season_id=season.id, round_number=2, slug="2026-2")
+    session.add(race)
+    session.flush()
+    session.add_all(Entry(race_id=race.id, driver_id=driver.id, team_id=team.id) for driver in drivers)
+    session.commit()
+    return race.id
+
+
+def test_poll_appends_completed_laps_and_moves_cursors(live, db_session):
+    fake_redis, openf1 = live
+    race_key = _seed_race(db_session)
+
+    first = _poll(openf1, 0)
+
+    assert [(row["driver"], row["lap"], row["lap_ms"]) for row in first["laps"]] == [
+        ("VER", 1, 90000), ("HAM", 1, 91500),
+    ]
+    assert first["race_control"][0]["message"] == "GREEN LIGHT"
+    rows = db_session.query(LapTime).order_by(LapTime.driver).all()
+    assert [(row.driver, row.lap, row.compound, row.stint_no, row.season, row.round) for row in rows] == [
+        ("HAM", 1, "MEDIUM", 1, 2026, 2), ("VER", 1, "SOFT", 1, 2026, 2),
+    ]
+    assert {row.race_key for row in rows} == {race_key}
+
+    second = _poll(openf1, 1)
+
+    # Only the open laps are re-read, and only the new ones are stored
+    laps_params = [params for poll, endpoint, params in openf1.calls if poll == 1 and endpoint == "laps"]
+    assert laps_params == [{"session_key": 9999, "date_start>=": _at(90)}]
+    position_params = [params for poll, endpoint, params in openf1.calls if poll == 1 and endpoint == "position"]
+    assert position_params == [{"session_key": 9999, "date>": _at(0)}]
+    assert [(row["driver"], row["lap"]) for row in second["laps"]] == [("VER", 2), ("HAM", 2)]
+    assert db_session.query(LapTime).count() == 4
+    assert second["lap"] == 2
+    # VER's new stint marks lap 2 as the in-lap; HAM's running stint leaves it open
+    pits = {(row.driver, row.lap): row.pit for row in db_session.query(LapTime)}
+    assert pits == {("VER", 1): None, ("VER", 2): True, ("HAM", 1): None, ("HAM", 2): None}
+
+    positions = {
+        (row.entry_id, row.lap_number): row.position
+        for row in db_session.query(LapPosition)
+    }
+    entries = {code: entry_id for code, entry_id in db_session.query(Driver.code, Entry.id).join(Entry)}
+    assert positions[(entries["VER"], 1)] == 1
+    assert positions[(entries["HAM"], 1)] == 2
+    assert positions[(entries["VER"], 2)] == 2
+    assert positions[(entries["HAM"], 2)] == 1
+
+    snapshot = decode_cache_payload(fake_redis.get(live_cache_key(2026, 2)))
+    assert snapshot["lap"] == 2
+    assert [row["driver"] for row in snapshot["positions"]] == ["HAM", "VER"]
+
+    channel, message = fake_redis.published[-1]
+    assert channel == "events:v1:2026:2"
+    assert message["event"] == "live_laps"
+    assert [(row["driver"], row["lap"]) for row in message["data"]["laps"]] == [("VER", 2), ("HAM", 2)]
+
+
+def test_quiet_poll_writes_nothing(live, db_session):
+    fake_redis, openf1 = live
+    _poll(openf1, 0)
+    _poll(openf1, 1)
+    generation = fake_redis.get(race_generation_key(2026, 2))
+
+    quiet = _poll(openf1, 2)
+
+    assert quiet["laps"] == []
+    assert len(fake_redis.published) == 2
+    assert db_session.query(LapTime).count() == 4
+    assert fake_redis.get(race_generation_key(2026, 2)) == generation
+
+
+def test_poll_advances_cached_analytics_laps(live):
+    fake_redis, openf1 = live
+    table_key = analytics_cache_key(2026, 2)
+    fake_redis.store[table_key] = encode_cache_payload({
+        "format": ANALYTICS_TABLE_FORMAT,
+        "race": {"season": 2026, "round": 2},
+        "last_updated": "2026-03-08T15:00:00Z",
+        "laps": {
+            "driver": ["VER"], "lap": [1], "lap_ms": [90000],
+            "compound": ["SOFT"], "stint_no": [1], "pit": [False],
+        },
+        "stints": {"driver": [], "stint_no": [], "compound": [], "laps": [], "avg_lap_ms": []},
+        "driver_metric_grades": [],
+    })
+    selection_key = fields_cache_key(table_key, ["laps"])
+    fake_redis.store[selection_key] = encode_cache_payload({"laps": []})
+    fake_redis.store[f"{table_key}:section:laps"] = encode_cache_payload({"value": {
+        "driver": ["VER"], "lap": [1], "lap_ms": [90000],
+        "compound": ["SOFT"], "stint_no": [1], "pit": [False],
+    }})
+
+    _poll(openf1, 0)
+
+    table = decode_cache_payload(fake_redis.get(table_key))
+    assert list(zip(table["laps"]["driver"], table["laps"]["lap"])) == [("HAM", 1), ("VER", 1)]
+    section = decode_cache_payload(fake_redis.get(f"{table_key}:section:laps"))
+    assert section["value"]["driver"] == ["HAM", "VER"]
+    assert selection_key not in fake_redis.store
+    assert fake_redis.get(race_generation_key(2026, 2)) == 1
+
+
+def test_final_ingest_handover_discards_live_rows(live, db_session):
+    fake_redis, openf1 = live
+    _poll(openf1, 0)
+    assert {row.provisional for row in db_session.query(LapTime)} == {True}
+    db_session.add(LapTime(season=2026, round=2, race_id="2026-2", driver="VER", lap=9, provisional=False))
+    db_session.commit()
+    # The handover reads the rows, not the live state, which may have expired
+    fake_redis.store.clear()
+
+    assert live_ingestion.discard_live_laps(db_session, 2026, 2) == 2
+    db_session.commit()
+    live_ingestion.end_live_session(2026, 2, "Race")
+
+    assert [(row.driver, row.lap) for row in db_session.query(LapTime)] == [("VER", 9)]
+    assert live_ingestion.live_state_key(2026, 2, "Race") not in fake_redis.store
+    assert live_cache_key(2026, 2) not in fake_redis.store
+
+
+def test_scheduler_polls_only_live_races(monkeypatch, db_session):
+    from unittest.mock import MagicMock, patch
+
+    from theundercut.scheduler_jobs import LIVE_POLL_LOCK_KEY, _utc_now, poll_live_sessions
+
+    now = _utc_now()
+    for session_type, status in (("Race", "live"), ("Qualifying", "live"), ("Race", "ingested")):
+        db_session.add(CalendarEvent(
+            season=2026,
+            round=2 if status == "live" else 1,
+            session_type=session_type,
+            start_ts=now - dt.timedelta(minutes=30),
+            end_ts=now + dt.timedelta(hours=1),
+            status=status,
+        ))
+    db_session.commit()
+
+    polled = []
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(live_ingestion, "poll_live_session", lambda *args: polled.append(args))
+    monkeypatch.setattr("theundercut.scheduler_jobs.redis_client", fake_redis)
+    with patch("theundercut.scheduler_jobs.SessionLocal") as mock_session_local:
+        mock_session_local.return_value.__enter__.return_value = db_session
+        mock_session_local.return_value.__exit__ = MagicMock()
+        poll_live_sessions()
+
+        assert polled == [(2026, 2, "Race")]
+        assert fake_redis.store == {}
+
+        # A run that overlaps a slow previous poll is skipped
+        fake_redis.store[LIVE_POLL_LOCK_KEY] = "previous"
+        poll_live_sessions()
+
+    assert polled == [(2026, 2, "Race")]
+    assert fake_redis.store == {LIVE_POLL_LOCK_KEY: "previous"}
@@ -0,0 +1,115 @@
+"""Tests for `since=` delta reads of race laps and positions."""
+from fastapi.testclient import TestClient
+
+from theundercut.api.main import app
+from theundercut.models import Driver, Entry, LapPosition, LapTime, Race, Season, Team
+from tests.conftest import override_db, seed_sample_race
+
+
+class DummyRedis:
+    def get(self, key):
+        return None
+
+
+def _override_dependency(session_factory):
+    def _get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    return _get_db
+
+
+def _client(session_factory, monkeypatch):
+    override_db(_override_dependency(session_factory))
+    monkeypatch.setattr("theundercut.api.v1.race.redis_client", DummyRedis())
+    return TestClient(app)
+
+
+def _seed_positions(session, season=2024, rnd=1):
+    season_row = Season(year=season)
+    team = Team(name="Red Bull")
+    drivers = {code: Driver(code=code) for code in ("VER", "HAM")}
+    session.add_all([season_row, team, *drivers.values()])
+    session.flush()
+    race = Race(season_id=season_row.id, round_number=rnd, slug=f"{season}-{rnd}")
+    session.add(race)
+    session.flush()
+    entries = {}
+    for code, driver in drivers.items():
+        entries[code] = Entry(race_id=race.id, driver_id=driver.id, team_id=team.id)
+        session.add(entries[code])
+    session.flush()
+    for lap, order in ((1, ("VER", "HAM")), (2, ("HAM", "VER"))):
+        for position, code in enumerate(order, start=1):
+            session.add(LapPosition(
+                race_id=race.id, entry_id=entries[code].id, lap_number=lap, position=position
+            ))
+    session.commit()
+    return race.id, entries
+
+
+def test_laps_since_lap_number_returns_newer_laps_and_cursor(session_factory, monkeypatch):
+    seed_sample_race(session_factory())
+    client = _client(session_factory, monkeypatch)
+
+    # Without a cursor the response is unchanged
+    assert len(client.get("/api/v1/race/2024/1/laps").json()) == 4
+
+    body = client.get("/api/v1/race/2024/1/laps", params={"since": 1}).json()
+    assert body["since"] == "1"
+    assert [(row["driver"], row["lap"]) for row in body["laps"]] == [("HAM", 2), ("VER", 2)]
+    assert body["next_cursor"].startswith("seq:")
+
+    # Nothing new: same cursor, no rows
+    again = client.get("/api/v1/race/2024/1/laps", params={"since": body["next_cursor"]}).json()
+    assert again["laps"] == []
+    assert again["next_cursor"] == body["next_cursor"]
+
+    # A lap written later shows up after the sequence cursor
+    session = session_factory()
+    session.add(LapTime(race_id="2024-1", driver="VER", lap=3, lap_ms=89900, compound="MED", stint_no=1, pit=False))
+    session.commit()
+    session.close()
+
+    delta = client.get(
+        "/api/v1/race/2024/1/laps", params={"since": body["next_cursor"], "format": "columnar"}
+    ).json()
+    assert delta["laps"] == {"VER": {"lap": [3], "lap_ms": [89900.0]}}
+    assert delta["next_cursor"] != body["next_cursor"]
+
+    app.dependency_overrides.clear()
+
+
+def test_laps_since_rejects_invalid_cursor(session_factory, monkeypatch):
+    client = _client(session_factory, monkeypatch)
+
+    resp = client.get("/api/v1/race/2024/1/laps", params={"since": "seq:abc"})
+    assert resp.status_code == 400
+
+    app.dependency_overrides.clear()
+
+
+def test_positions_since_cursor(session_factory, monkeypatch):
+    session = session_factory()
+    race_id, entries = _seed_positions(session)
+    client = _client(session_factory, monkeypatch)
+
+    full = client.get("/api/v1/race/2024/1/positions").json()
+    assert [(row["lap"], row["driver"], row["position"]) for row in full["positions"]] == [
+        (1, "VER", 1), (1, "HAM", 2), (2, "HAM", 1), (2, "VER", 2),
+    ]
+    assert full["since"] is None
+
+    delta = client.get("/api/v1/race/2024/1/positions", params={"since": 1}).json()
+    assert [row["driver"] for row in delta["positions"]] == ["HAM", "VER"]
+
+    session.add(LapPosition(race_id=race_id, entry_id=entries["HAM"].id, lap_number=3, position=1))
+    session.commit()
+    session.close()
+
+    later = client.get("/api/v1/race/2024/1/positions", params={"since": delta["next_cursor"]}).json()
+    assert [(row["lap"], row["driver"]) for row in later["positions"]] == [(3, "HAM")]
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,163 @@
+"""Tests for race event publishing and the SSE relay."""
+import asyncio
+import json
+
+from theundercut.api.events import RaceEventBroker, format_sse
+from theundercut.api.main import app
+from theundercut.api.v1 import race as race_module
+from theundercut.services import race_events
+from theundercut.services.race_events import (
+    parse_race_events_channel,
+    publish_race_event,
+    race_events_channel,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+
+class FakePubSub:
+    """Replays published messages, then waits like an idle subscription."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.patterns = []
+        self.closed = False
+
+    async def psubscribe(self, pattern):
+        self.patterns.append(pattern)
+
+    async def listen(self):
+        for channel, data in self.messages:
+            yield {"type": "pmessage", "channel": channel, "data": data}
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeAsyncRedis:
+    def __init__(self, messages=(), snapshot=None):
+        self.pubsubs = []
+        self.messages = list(messages)
+        self.snapshot = snapshot
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        pubsub = FakePubSub(self.messages)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+    async def get(self, key):
+        return self.snapshot
+
+
+def _message(event, data):
+    return json.dumps({"event": event, "data": data})
+
+
+def test_publish_and_parse_channel():
+    client = FakeRedis()
+
+    assert publish_race_event(2026, 3, "session_status", {"status": "live"}, client=client) == 1
+
+    channel, message = client.published[0]
+    assert channel == race_events_channel(2026, 3)
+    assert parse_race_events_channel(channel) == (2026, 3)
+    assert json.loads(message) == {"event": "session_status", "data": {"status": "live"}}
+    assert parse_race_events_channel("weekend:v1:2026:3") is None
+
+
+def test_publish_session_status_swallows_errors(monkeypatch):
+    class BrokenRedis:
+        def publish(self, channel, message):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(race_events, "redis_client", BrokenRedis())
+    race_events.publish_session_status(2026, 3, "Race", "live")
+
+
+def test_dispatch_formats_once_for_every_client_of_the_race():
+    async def _run():
+        broker = RaceEventBroker(client=FakeAsyncRedis(), queue_size=2)
+        watching = [broker.subscribe(2026, 3) for _ in range(3)]
+        other = broker.subscribe(2026, 4)
+
+        delivered = broker.dispatch(race_events_channel(2026, 3), _message("session_status", {"status": "live"}))
+
+        assert delivered == 3
+        assert other.empty()
+        chunks = {queue.get_nowait() for queue in watching}
+        assert chunks == {format_sse("session_status", {"status": "live"})}
+
+        # A client that stops reading keeps only the newest messages
+        for lap in (1, 2, 3):
+            broker.dispatch(race_events_channel(2026, 4), _message("live_laps", {"lap": lap}))
+        assert [json.loads(other.get_nowait().split("data: ")[1])["lap"] for _ in range(2)] == [2, 3]
+
+        assert broker.dispatch(race_events_channel(2026, 5), _message("live_laps", {})) == 0
+        assert broker.dispatch(race_events_channel(2026, 3), "not json") == 0
+
+    asyncio.run(_run())
+
+
+def test_one_subscription_serves_every_stream():
+    async def _run():
+        client = FakeAsyncRedis([(race_events_channel(2026, 3), _message("live_laps", {"lap": 7}))])
+        broker = RaceEventBroker(client=client)
+        streams = [broker.stream(2026, 3, initial="event: live_snapshot\ndata: {}\n\n") for _ in range(2)]
+
+        for stream in streams:
+            assert await stream.__anext__() == "event: live_snapshot\ndata: {}\n\n"
+        for stream in streams:
+            assert await stream.__anext__() == format_sse("live_laps", {"lap": 7})
+
+        assert len(client.pubsubs) == 1
+        assert client.pubsubs[0].patterns == ["events:v1:*"]
+        assert broker.client_count == 2
+        for stream in streams:
+            await stream.aclose()
+        assert broker.client_count == 0
+
+    asyncio.run(_run())
+
+
+def test_stream_sends_heartbeats_when_idle():
+    async def _run():
+        broker = RaceEventBroker(client=FakeAsyncRedis())
+        stream = broker.stream(2026, 3, heartbeat=0.01)
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        await stream.aclose()
+
+    asyncio.run(_run())
+
+
+def test_events_endpoint_streams_snapshot_and_events(monkeypatch):
+    client = FakeAsyncRedis(
+        [(race_events_channel(2026, 3), _message("session_status", {"session_type": "Race", "status": "ingested"}))],
+        snapshot=json.dumps({"lap": 12}),
+    )
+    monkeypatch.setattr(race_module, "race_event_broker", RaceEventBroker(client=client))
+    monkeypatch.setattr(race_module, "async_redis_client", client)
+    assert any(route.path == "/api/v1/race/{season}/{round}/events" for route in app.routes)
+
+    async def _run():
+        # The stream never ends, so read it from the route directly
+        response = await race_module.stream_race_events(2026, 3)
+        assert response.media_type == "text/event-stream"
+        assert response.headers["cache-control"] == "no-cache"
+        body = response.body_iterator
+        first = await body.__anext__()
+        second = await body.__anext__()
+        await body.aclose()
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first == 'event: live_snapshot\ndata: {"lap":12}\n\n'
+    assert second.startswith("event: session_status\n")
+    assert json.loads(second.split("data: ")[1])["status"] == "ingested"
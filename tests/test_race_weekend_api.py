@@ -1,5 +1,6 @@
 """Tests for the Race Weekend API endpoints."""
 import json
+import time
 from datetime import datetime, timedelta
 
 import pytest
@@ -7,8 +8,8 @@ from fastapi.testclient import TestClient
 
 from theundercut.api.main import app
 from theundercut.api.v1 import race as race_module
-from theundercut.adapters.db import get_db
 from theundercut.models import CalendarEvent, SessionClassification
+from tests.conftest import override_db
 
 
 class DummyRedis:
@@ -32,6 +33,64 @@ class DummyRedis:
             return [k for k in self.store.keys() if pattern in k]
         return list(self.store.keys())
 
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+
+class AsyncDummyRedis:
+    """Async view over a DummyRedis store, standing in for the async client."""
+    def __init__(self, sync):
+        self.sync = sync
+        self.round_trips = 0
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.sync.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.round_trips += 1
+        self.sync.setex(key, ttl, value)
+
+    def pipeline(self, transaction=True):
+        return AsyncDummyPipeline(self)
+
+
+class AsyncDummyPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.commands.append(lambda: self.client.sync.get(key))
+
+    def setex(self, key, ttl, value):
+        self.commands.append(lambda: self.client.sync.setex(key, ttl, value))
+
+    async def execute(self):
+        self.client.round_trips += 1
+        results = [command() for command in self.commands]
+        self.commands = []
+        return results
+
+
+def _use_cache(monkeypatch, dummy_cache):
+    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    async_cache = AsyncDummyRedis(dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.race.async_redis_client", async_cache)
+    return async_cache
+
 
 def _override_dependency(session_factory):
     def _get_db():
@@ -125,7 +184,7 @@ def seed_completed_race_weekend(session, *, season=2026, rnd=2, hours_since_race
 
 
 def test_weekend_endpoint_backfills_results(monkeypatch, session_factory):
-    """Ensure GET /weekend triggers ingestion for completed sessions without results."""
+    """GET /weekend queues ingestion of completed sessions without results and reports them pending."""
     SessionLocal = session_factory
     db = SessionLocal()
     season, rnd = seed_race_weekend(db)
@@ -134,45 +193,68 @@ def test_weekend_endpoint_backfills_results(monkeypatch, session_factory):
     db.query(SessionClassification).delete()
     db.commit()
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
-    ingested_sessions: list[str] = []
+    queued_sessions: list[str] = []
+    building = []
 
     def fake_trigger(season_arg: int, round_arg: int, session_label: str):
-        ingested_sessions.append(session_label)
-        normalized = race_module._normalize_session_name(session_label)
-        with SessionLocal() as session:
-            session.add(SessionClassification(
-                season=season_arg,
-                round=round_arg,
-                session_type=normalized,
-                driver_code="VER",
-                driver_name="Max Verstappen",
-                team="Red Bull",
-                position=1,
-                time_ms=90123,
-                gap_ms=None,
-                laps=20,
-            ))
-            session.commit()
+        # Jobs are enqueued after the database build, not from inside it
+        assert not building
+        queued_sessions.append(session_label)
+        return True
+
+    from theundercut.api.v1 import race as race_api
+    original_build = race_api.build_weekend_sections
+
+    def tracking_build(*args, **kwargs):
+        building.append(True)
+        try:
+            return original_build(*args, **kwargs)
+        finally:
+            building.pop()
 
     monkeypatch.setattr("theundercut.api.v1.race._trigger_session_ingest", fake_trigger)
+    monkeypatch.setattr("theundercut.api.v1.race.build_weekend_sections", tracking_build)
 
     client = TestClient(app)
     resp = client.get(f"/api/v1/race/{season}/{rnd}/weekend")
     assert resp.status_code == 200
     body = resp.json()
 
-    # FP1 should now have results populated via the backfill hook
-    assert body["sessions"]["fp1"]["results"][0]["driver_code"] == "VER"
-    # Ensure we attempted to ingest at least one completed session
-    assert any("fp1" in label.lower() for label in ingested_sessions)
+    # The request does not wait for ingestion: FP1 is reported as pending
+    assert body["sessions"]["fp1"] is None
+    assert "fp1" in body["meta"]["pending"]
+    # Ensure we queued at least one completed session, and not the upcoming race
+    assert any("fp1" in label.lower() for label in queued_sessions)
+    assert "race" not in body["meta"]["pending"]
 
     app.dependency_overrides.clear()
 
 
+def test_trigger_ingest_endpoint_queues_job(monkeypatch):
+    """The admin ingest endpoint enqueues instead of ingesting inline."""
+    calls = []
+
+    def fake_enqueue(season, rnd, session_type, force=False):
+        calls.append((season, rnd, session_type, force))
+        return len(calls) == 1
+
+    monkeypatch.setattr("theundercut.api.v1.race.enqueue_session_ingest", fake_enqueue)
+
+    client = TestClient(app)
+    first = client.post("/api/v1/race/2026/1/ingest", params={"session": "Qualifying"})
+    second = client.post("/api/v1/race/2026/1/ingest", params={"session": "Qualifying"})
+
+    assert first.status_code == 202
+    assert first.json()["status"] == "pending"
+    assert first.json()["job_id"] == "2026-1-Qualifying"
+    assert "already pending" in second.json()["message"]
+    assert calls == [(2026, 1, "Qualifying", False), (2026, 1, "Qualifying", False)]
+
+
 def test_weekend_summary_endpoint(monkeypatch, session_factory):
     """The weekend summary endpoint should return the current display weekend and next preview."""
     SessionLocal = session_factory
@@ -181,9 +263,9 @@ def test_weekend_summary_endpoint(monkeypatch, session_factory):
     seed_race_weekend(db, season=season, rnd=1)
     seed_completed_race_weekend(db, season=season, rnd=2, hours_since_race_end=48)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
     monkeypatch.setattr("theundercut.api.v1.race.fetch_season_standings", lambda _db, _season: {"races_completed": 1})
 
     client = TestClient(app)
@@ -199,15 +281,181 @@ def test_weekend_summary_endpoint(monkeypatch, session_factory):
     app.dependency_overrides.clear()
 
 
+def test_weekend_summary_reads_both_weekends_in_one_round_trip(monkeypatch, session_factory):
+    """Both summary weekends come from one pipelined read; builds are written back in one more."""
+    SessionLocal = session_factory
+    db = SessionLocal()
+    season = 2026
+    seed_race_weekend(db, season=season, rnd=1)
+    seed_completed_race_weekend(db, season=season, rnd=2, hours_since_race_end=48)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    async_cache = _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.race.fetch_season_standings", lambda _db, _season: {"races_completed": 1})
+    monkeypatch.setattr("theundercut.api.v1.race._trigger_session_ingest", lambda *args: None)
+    monkeypatch.setattr(
+        "theundercut.api.v1.race._load_circuit_history",
+        lambda season, rnd, circuit_id, circuit_name, errors: race_module.CircuitHistory(
+            circuit_id=circuit_id, circuit_name=circuit_name, previous_year=None
+        ),
+    )
+
+    client = TestClient(app)
+    assert client.get(f"/api/v1/race/{season}/weekend/summary").status_code == 200
+    assert async_cache.round_trips == 2
+    assert "weekend:v1:2026:1" in dummy_cache.store
+    assert "weekend:v1:2026:2" in dummy_cache.store
+
+    resp = client.get(f"/api/v1/race/{season}/weekend/summary")
+    assert resp.status_code == 200
+    assert resp.json()["next_weekend"]["schedule"]["round"] == 2
+    assert async_cache.round_trips == 3
+
+    app.dependency_overrides.clear()
+
+
+def test_weekend_reuses_cached_session_results(monkeypatch, session_factory):
+    """Session results cached by the results endpoint are not rebuilt for the weekend."""
+    SessionLocal = session_factory
+    db = SessionLocal()
+    seed_race_weekend(db)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.race._trigger_session_ingest", lambda *args: None)
+    cached_fp1 = {"season": 2026, "round": 1, "session_type": "fp1", "results": []}
+    dummy_cache.store["session:v1:2026:1:fp1"] = json.dumps(cached_fp1)
+
+    queried = []
+    original_build = race_module.build_session_results_by_type
+
+    def _recording_build(db, season, round_num, session_types):
+        queried.append(list(session_types))
+        return original_build(db, season, round_num, session_types)
+
+    monkeypatch.setattr("theundercut.api.v1.race.build_session_results_by_type", _recording_build)
+
+    client = TestClient(app)
+    resp = client.get("/api/v1/race/2026/1/weekend", params={"fields": "sessions"})
+    assert resp.status_code == 200
+    assert resp.json()["sessions"]["fp1"] == cached_fp1
+    # One classification query, for the uncached session types only.
+    assert len(queried) == 1
+    assert "fp1" not in queried[0]
+    assert "fp2" in queried[0]
+
+    app.dependency_overrides.clear()
+
+
+def test_weekend_remote_lookups_run_alongside_db_sections(monkeypatch, session_factory):
+    """A slow history lookup overlaps the database work instead of adding to it."""
+    SessionLocal = session_factory
+    db = SessionLocal()
+    seed_race_weekend(db)
+
+    override_db(_override_dependency(SessionLocal))
+    _use_cache(monkeypatch, DummyRedis())
+    monkeypatch.setattr("theundercut.api.v1.race._trigger_session_ingest", lambda *args: None)
+
+    def _slow_history(season, rnd, circuit_id, circuit_name, errors):
+        time.sleep(0.4)
+        return race_module.CircuitHistory(circuit_id=circuit_id, circuit_name=circuit_name, previous_year=None)
+
+    original_build = race_module.build_session_results_by_type
+
+    def _slow_sessions(*args):
+        time.sleep(0.4)
+        return original_build(*args)
+
+    monkeypatch.setattr("theundercut.api.v1.race._load_circuit_history", _slow_history)
+    monkeypatch.setattr("theundercut.api.v1.race.build_session_results_by_type", _slow_sessions)
+
+    client = TestClient(app)
+    started = time.monotonic()
+    resp = client.get("/api/v1/race/2026/1/weekend")
+    elapsed = time.monotonic() - started
+
+    assert resp.status_code == 200
+    assert resp.json()["history"]["circuit_id"] == "circuit_2026_1"
+    assert elapsed < 0.75
+
+    app.dependency_overrides.clear()
+
+
+def test_weekend_remote_budget_returns_partial_data(monkeypatch, session_factory):
+    """Lookups past the budget are reported and left uncached; the rest is served."""
+    SessionLocal = session_factory
+    db = SessionLocal()
+    seed_race_weekend(db)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.race._trigger_session_ingest", lambda *args: None)
+    monkeypatch.setattr("theundercut.api.v1.race.WEEKEND_REMOTE_BUDGET_SECONDS", 0.1)
+
+    def _stuck_history(*args):
+        time.sleep(1)
+
+    monkeypatch.setattr("theundercut.api.v1.race._load_circuit_history", _stuck_history)
+
+    client = TestClient(app)
+    resp = client.get("/api/v1/race/2026/1/weekend")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["history"] is None
+    assert body["sessions"]["fp1"]["results"][0]["driver_code"] == "VER"
+    assert any(error.startswith("history:") for error in body["meta"]["errors"])
+
+    # Partial responses are not cached; the completed sections are.
+    assert "weekend:v1:2026:1" not in dummy_cache.store
+    assert "weekend:v1:2026:1:section:history" not in dummy_cache.store
+    assert "weekend:v1:2026:1:section:sessions" in dummy_cache.store
+
+    app.dependency_overrides.clear()
+
+
+def test_weekend_with_errors_is_not_cached_whole(monkeypatch, session_factory):
+    """A payload reporting errors is served but not cached; the next request retries."""
+    SessionLocal = session_factory
+    db = SessionLocal()
+    seed_race_weekend(db)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr(
+        "theundercut.api.v1.race._load_circuit_history",
+        lambda season, rnd, circuit_id, circuit_name, errors: race_module.CircuitHistory(
+            circuit_id=circuit_id, circuit_name=circuit_name, previous_year=None
+        ),
+    )
+
+    def _failing_sessions(*args):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr("theundercut.api.v1.race.build_session_results_by_type", _failing_sessions)
+
+    client = TestClient(app)
+    body = client.get("/api/v1/race/2026/1/weekend").json()
+    assert any(error.startswith("sessions:") for error in body["meta"]["errors"])
+    assert "weekend:v1:2026:1" not in dummy_cache.store
+    assert "weekend:v1:2026:1:section:schedule" in dummy_cache.store
+
+    app.dependency_overrides.clear()
+
+
 def test_race_schedule_endpoint(session_factory, monkeypatch):
     """Test GET /api/v1/race/{season}/{round}/schedule returns schedule."""
     SessionLocal = session_factory
     db = SessionLocal()
     seed_race_weekend(db)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -233,9 +481,9 @@ def test_race_schedule_not_found(session_factory, monkeypatch):
     """Test GET /api/v1/race/{season}/{round}/schedule returns 404 when not found."""
     SessionLocal = session_factory
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -251,9 +499,9 @@ def test_session_results_endpoint(session_factory, monkeypatch):
     db = SessionLocal()
     seed_race_weekend(db)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -278,9 +526,9 @@ def test_qualifying_results_endpoint(session_factory, monkeypatch):
     db = SessionLocal()
     seed_race_weekend(db)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -303,9 +551,9 @@ def test_session_results_not_found(session_factory, monkeypatch):
     db = SessionLocal()
     seed_race_weekend(db)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -322,9 +570,9 @@ def test_weekend_aggregated_endpoint(session_factory, monkeypatch):
     db = SessionLocal()
     seed_race_weekend(db)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
 
@@ -361,9 +609,15 @@ def test_weekend_endpoint_caching(session_factory, monkeypatch):
     db = SessionLocal()
     seed_race_weekend(db)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr(
+        "theundercut.api.v1.race._load_circuit_history",
+        lambda season, rnd, circuit_id, circuit_name, errors: race_module.CircuitHistory(
+            circuit_id=circuit_id, circuit_name=circuit_name, previous_year=None
+        ),
+    )
 
     client = TestClient(app)
 
@@ -389,15 +643,63 @@ def test_weekend_endpoint_caching(session_factory, monkeypatch):
     app.dependency_overrides.clear()
 
 
+def test_weekend_fields_only_load_selected_sections(session_factory, monkeypatch):
+    """fields=timeline skips the history lookup and classification queries."""
+    SessionLocal = session_factory
+    db = SessionLocal()
+    seed_race_weekend(db)
+
+    override_db(_override_dependency(SessionLocal))
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+
+    def _unexpected(*args, **kwargs):
+        raise AssertionError("section should not be loaded")
+
+    monkeypatch.setattr("theundercut.api.v1.race._load_circuit_history", _unexpected)
+    monkeypatch.setattr("theundercut.api.v1.race.build_session_results_by_type", _unexpected)
+
+    client = TestClient(app)
+
+    resp = client.get("/api/v1/race/2026/1/weekend", params={"fields": "timeline"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body) == {"timeline", "meta"}
+    assert body["timeline"]["state"] == "during-weekend"
+    assert "weekend:v1:2026:1:section:timeline" in dummy_cache.store
+    assert "weekend:v1:2026:1:fields:timeline" in dummy_cache.store
+
+    monkeypatch.undo()
+    _use_cache(monkeypatch, dummy_cache)
+    monkeypatch.setattr("theundercut.api.v1.race._trigger_session_ingest", lambda *args: None)
+    resp = client.get("/api/v1/race/2026/1/weekend", params={"fields": ["sessions", "timeline"]})
+    body = resp.json()
+    assert set(body) == {"timeline", "sessions", "meta"}
+    assert body["sessions"]["fp1"]["results"][0]["driver_code"] == "VER"
+
+    assert client.get(
+        "/api/v1/race/2026/1/weekend", params={"fields": "weather"}
+    ).status_code == 400
+
+    # Invalidation drops every selection and section entry for the weekend.
+    monkeypatch.setattr("theundercut.services.cache.redis_client", dummy_cache)
+    from theundercut.services.cache import invalidate_schedule_cache
+
+    invalidate_schedule_cache(2026, 1)
+    assert not [key for key in dummy_cache.store if key.startswith("weekend:v1:2026:1")]
+
+    app.dependency_overrides.clear()
+
+
 def test_weekend_timeline_post_race(session_factory, monkeypatch):
     """Timeline should report post-race within 24h of race end."""
     SessionLocal = session_factory
     db = SessionLocal()
     seed_completed_race_weekend(db, hours_since_race_end=6)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
     resp = client.get("/api/v1/race/2026/2/weekend")
@@ -415,9 +717,9 @@ def test_weekend_timeline_off_week_after_window(session_factory, monkeypatch):
     db = SessionLocal()
     seed_completed_race_weekend(db, rnd=3, hours_since_race_end=36)
 
-    app.dependency_overrides[get_db] = _override_dependency(SessionLocal)
+    override_db(_override_dependency(SessionLocal))
     dummy_cache = DummyRedis()
-    monkeypatch.setattr("theundercut.api.v1.race.redis_client", dummy_cache)
+    _use_cache(monkeypatch, dummy_cache)
 
     client = TestClient(app)
     resp = client.get("/api/v1/race/2026/3/weekend")
@@ -427,3 +729,21 @@ def test_weekend_timeline_off_week_after_window(session_factory, monkeypatch):
     assert body["timeline"]["is_active"] is False
 
     app.dependency_overrides.clear()
+
+
+def test_live_snapshot_served_from_cache(monkeypatch):
+    """The live snapshot is read from Redis only, and 404s outside a live race."""
+    dummy_cache = DummyRedis()
+    _use_cache(monkeypatch, dummy_cache)
+    dummy_cache.setex(
+        "live:v1:2026:2",
+        60,
+        json.dumps({"season": 2026, "round": 2, "lap": 12, "positions": [{"driver": "VER", "position": 1}]}),
+    )
+
+    client = TestClient(app)
+    resp = client.get("/api/v1/race/2026/2/live")
+    assert resp.status_code == 200
+    assert resp.json()["lap"] == 12
+
+    assert client.get("/api/v1/race/2026/3/live").status_code == 404
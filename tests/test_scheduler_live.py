@@ -28,7 +28,8 @@ class TestMarkSessionsLive:
 
         # Import and call the function with mocked SessionLocal
         with patch("theundercut.scheduler_jobs.SessionLocal") as mock_session_local, \
-             patch("theundercut.scheduler_jobs.invalidate_race_weekend_cache") as mock_invalidate:
+             patch("theundercut.scheduler_jobs.invalidate_race_weekend_cache") as mock_invalidate, \
+             patch("theundercut.scheduler_jobs.publish_session_status") as mock_publish:
             mock_session_local.return_value.__enter__.return_value = db_session
             mock_session_local.return_value.__exit__ = MagicMock()
 
@@ -39,6 +40,8 @@ class TestMarkSessionsLive:
         db_session.refresh(session)
         assert session.status == "live"
         mock_invalidate.assert_called_once_with(2026, 1)
+        # SSE clients hear about the change without polling
+        mock_publish.assert_called_once_with(2026, 1, "race", "live")
 
     def test_ignores_future_sessions(self, db_session):
         """Sessions that haven't started yet should remain 'scheduled'."""
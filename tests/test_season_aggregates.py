@@ -0,0 +1,161 @@
+"""Tests for precomputed season aggregates."""
+import pytest
+from fastapi.testclient import TestClient
+
+from theundercut.api.main import app
+from theundercut.models import (
+    Driver,
+    DriverMetrics,
+    Entry,
+    Race,
+    Season,
+    SeasonConstructorAggregate,
+    SeasonDriverAggregate,
+    StrategyScore,
+    Team,
+)
+from theundercut.services.season_aggregates import (
+    load_season_aggregates,
+    refresh_season_aggregates,
+)
+from tests.conftest import override_db
+
+
+def _override_dependency(session_factory):
+    def _get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    return _get_db
+
+
+def _seed_season(session, year=2024):
+    season = Season(year=year)
+    red_bull = Team(name="Red Bull")
+    mclaren = Team(name="McLaren")
+    drivers = {code: Driver(code=code) for code in ("VER", "PER", "NOR")}
+    session.add_all([season, red_bull, mclaren, *drivers.values()])
+    session.flush()
+    # (driver, team, grade, strategy score) per round; None = not computed
+    rounds = {
+        1: [("VER", red_bull, 90.0, 80.0), ("PER", red_bull, 70.0, 60.0), ("NOR", mclaren, 80.0, None)],
+        2: [("VER", red_bull, 80.0, 70.0), ("PER", mclaren, 60.0, 50.0), ("NOR", mclaren, 85.0, 75.0)],
+    }
+    for rnd, rows in rounds.items():
+        race = Race(season_id=season.id, round_number=rnd, slug=f"{year}-{rnd}")
+        session.add(race)
+        session.flush()
+        for code, team, grade, strategy in rows:
+            entry = Entry(race_id=race.id, driver_id=drivers[code].id, team_id=team.id)
+            session.add(entry)
+            session.flush()
+            session.add(DriverMetrics(
+                entry_id=entry.id,
+                calibration_profile="baseline",
+                consistency_score=grade,
+                team_strategy_score=grade,
+                racecraft_score=grade,
+                penalty_score=100.0,
+                total_grade=grade,
+            ))
+            if strategy is not None:
+                session.add(StrategyScore(
+                    entry_id=entry.id,
+                    total_score=strategy,
+                    pit_timing_score=strategy,
+                    tire_selection_score=strategy,
+                    safety_car_score=strategy,
+                    weather_score=strategy,
+                    calibration_profile="default",
+                    calibration_version="v1",
+                ))
+    session.commit()
+
+
+def test_refresh_season_aggregates_groups_drivers_and_teams(db_session):
+    _seed_season(db_session)
+
+    assert refresh_season_aggregates(db_session, 2024) == {"drivers": 3, "constructors": 2}
+    db_session.commit()
+
+    drivers = {row.driver_code: row for row in db_session.query(SeasonDriverAggregate)}
+    assert drivers["VER"].races == 2
+    assert drivers["VER"].total_grade == pytest.approx(170.0)
+    assert drivers["VER"].average_grade == pytest.approx(85.0)
+    assert drivers["VER"].avg_strategy_score == pytest.approx(75.0)
+    assert drivers["NOR"].strategy_races == 1
+    assert drivers["NOR"].avg_strategy_score == pytest.approx(75.0)
+    assert drivers["PER"].team == "McLaren"  # latest race
+    assert drivers["VER"].calibration_profile == "baseline"
+
+    teams = {row.team: row for row in db_session.query(SeasonConstructorAggregate)}
+    assert teams["Red Bull"].races == 2
+    assert teams["Red Bull"].average_grade == pytest.approx(80.0)
+    assert teams["McLaren"].races == 2
+    assert teams["McLaren"].strategy_races == 1
+    assert teams["McLaren"].average_grade == pytest.approx(75.0)
+
+
+def test_refresh_season_aggregates_replaces_previous_rows(db_session):
+    _seed_season(db_session)
+    refresh_season_aggregates(db_session, 2024)
+    db_session.commit()
+
+    # Re-grading a race must replace its contribution, not add to it
+    ver_round_2 = (
+        db_session.query(DriverMetrics)
+        .join(Entry, DriverMetrics.entry_id == Entry.id)
+        .join(Race, Entry.race_id == Race.id)
+        .join(Driver, Entry.driver_id == Driver.id)
+        .filter(Driver.code == "VER", Race.round_number == 2)
+        .one()
+    )
+    ver_round_2.total_grade = 100.0
+    ver_round_2.calibration_profile = "aggressive"
+    db_session.commit()
+
+    refresh_season_aggregates(db_session, 2024)
+    db_session.commit()
+
+    assert db_session.query(SeasonDriverAggregate).count() == 3
+    ver = db_session.query(SeasonDriverAggregate).filter_by(driver_code="VER").one()
+    assert ver.races == 2
+    assert ver.total_grade == pytest.approx(190.0)
+    assert ver.calibration_profile == "mixed"
+
+
+def test_load_season_aggregates_orders_by_average_grade(db_session):
+    _seed_season(db_session)
+    refresh_season_aggregates(db_session, 2024)
+    db_session.commit()
+
+    payload = load_season_aggregates(db_session, 2024)
+
+    assert [row["driver_code"] for row in payload["drivers"]] == ["VER", "NOR", "PER"]
+    assert [row["team"] for row in payload["constructors"]] == ["Red Bull", "McLaren"]
+    assert load_season_aggregates(db_session, 2023) is None
+
+
+def test_season_aggregates_endpoint(session_factory):
+    session = session_factory()
+    _seed_season(session)
+    refresh_season_aggregates(session, 2024)
+    session.commit()
+    session.close()
+
+    override_db(_override_dependency(session_factory))
+    client = TestClient(app)
+
+    resp = client.get("/api/v1/season/2024/aggregates")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["season"] == 2024
+    assert body["drivers"][0]["driver_code"] == "VER"
+    assert body["drivers"][0]["average_grade"] == 85.0
+    assert body["constructors"][0]["team"] == "Red Bull"
+
+    assert client.get("/api/v1/season/2019/aggregates").status_code == 404
+
+    app.dependency_overrides.clear()
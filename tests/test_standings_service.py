@@ -0,0 +1,176 @@
+"""Tests for locally computed championship standings."""
+from theundercut.models import ConstructorStanding, DriverStanding, SessionClassification
+from theundercut.services import standings as standings_service
+from theundercut.services.homepage import refresh_race_summary
+
+
+def _add_results(db, season, rnd, session_type, rows):
+    for position, (code, team, points) in enumerate(rows, start=1):
+        db.add(SessionClassification(
+            season=season,
+            round=rnd,
+            session_type=session_type,
+            driver_code=code,
+            driver_name=f"Driver {code}",
+            team=team,
+            position=position,
+            points=points,
+        ))
+
+
+def _seed_two_rounds(db, season=2025):
+    _add_results(db, season, 1, "qualifying", [("NOR", "McLaren", None), ("VER", "Red Bull", None), ("PIA", "McLaren", None)])
+    _add_results(db, season, 1, "race", [("VER", "Red Bull", 25), ("NOR", "McLaren", 18), ("PIA", "McLaren", 15)])
+    _add_results(db, season, 2, "sprint_race", [("PIA", "McLaren", 8), ("NOR", "McLaren", 7), ("VER", "Red Bull", 6)])
+    _add_results(db, season, 2, "qualifying", [("PIA", "McLaren", None), ("NOR", "McLaren", None), ("VER", "Red Bull", None)])
+    _add_results(db, season, 2, "race", [("PIA", "McLaren", 25), ("VER", "Red Bull", 18), ("NOR", "McLaren", 15)])
+    db.commit()
+
+
+def test_update_standings_accumulates_race_and_sprint_points(db_session):
+    _seed_two_rounds(db_session)
+
+    assert standings_service.update_standings(db_session, 2025) == 2
+    db_session.commit()
+
+    rows = {
+        row.driver_code: row
+        for row in db_session.query(DriverStanding).filter_by(season=2025, round=2)
+    }
+    assert rows["VER"].points == 49
+    assert rows["PIA"].points == 48
+    assert rows["PIA"].wins == 1
+    assert rows["PIA"].poles == 1
+    assert rows["VER"].recent_points == [25, 24]
+    assert [rows[code].position for code in ("VER", "PIA", "NOR")] == [1, 2, 3]
+
+    teams = {
+        row.team: row
+        for row in db_session.query(ConstructorStanding).filter_by(season=2025, round=2)
+    }
+    assert teams["McLaren"].points == 88
+    assert teams["McLaren"].position == 1
+
+
+def test_update_standings_from_round_carries_previous_totals(db_session):
+    _seed_two_rounds(db_session)
+    standings_service.update_standings(db_session, 2025)
+    db_session.commit()
+
+    # Amend round 2 only; round 1 totals are reused rather than recomputed
+    db_session.query(SessionClassification).filter_by(
+        season=2025, round=2, session_type="race", driver_code="VER"
+    ).update({"points": 0})
+    db_session.commit()
+
+    assert standings_service.update_standings(db_session, 2025, from_round=2) == 1
+    db_session.commit()
+
+    ver = db_session.query(DriverStanding).filter_by(season=2025, round=2, driver_code="VER").one()
+    assert ver.points == 31
+    assert db_session.query(DriverStanding).filter_by(season=2025, round=1).count() == 3
+
+
+def test_fetch_season_standings_reads_local_tables(db_session, monkeypatch):
+    _seed_two_rounds(db_session)
+    standings_service.update_standings(db_session, 2025)
+    for rnd in (1, 2):
+        refresh_race_summary(db_session, 2025, rnd)
+    db_session.commit()
+
+    def _no_rebuild(*_args, **_kwargs):
+        raise AssertionError("reads should not rebuild the race context")
+
+    monkeypatch.setattr(standings_service, "race_summary_fields", _no_rebuild)
+    monkeypatch.setattr(standings_service, "_count_calendar_races", _no_rebuild)
+
+    def _no_remote(*_args, **_kwargs):
+        raise AssertionError("Jolpica should not be called when local standings exist")
+
+    monkeypatch.setattr(standings_service, "fetch_remote_standings", _no_remote)
+
+    payload = standings_service.fetch_season_standings(db_session, 2025)
+
+    assert [d["driver_code"] for d in payload["drivers"]] == ["VER", "PIA", "NOR"]
+    assert payload["drivers"][0]["pts_last_5"] == 49
+    assert payload["constructors"][0]["constructor_id"] == "mclaren"
+    assert payload["last_race"]["round"] == 2
+    assert payload["last_race"]["results"][0]["driver_code"] == "PIA"
+    assert [s["winner_code"] for s in payload["race_summaries"]] == ["VER", "PIA"]
+    assert payload["race_summaries"][0]["pole"] == "NOR"
+    assert payload["race_summaries"][1]["second"] == "VER"
+    assert payload["last_race"]["results"][1]["grid"] == 3
+    assert payload["races_completed"] == 2
+
+
+def test_fetch_season_standings_falls_back_to_jolpica(db_session, monkeypatch):
+    monkeypatch.setattr(
+        standings_service,
+        "fetch_remote_standings",
+        lambda _db, season: {"season": season, "drivers": [], "source": "remote"},
+    )
+
+    assert standings_service.fetch_season_standings(db_session, 2019)["source"] == "remote"
+
+
+def test_cross_check_reports_mismatches(db_session, monkeypatch):
+    _seed_two_rounds(db_session)
+    standings_service.update_standings(db_session, 2025)
+    db_session.commit()
+    monkeypatch.setattr(
+        standings_service,
+        "_fetch_driver_standings",
+        lambda _season: [
+            {"Driver": {"code": "VER"}, "points": "49"},
+            {"Driver": {"code": "PIA"}, "points": "50"},
+        ],
+    )
+    monkeypatch.setattr(
+        standings_service,
+        "_fetch_constructor_standings",
+        lambda _season: [
+            {"Constructor": {"constructorId": "mclaren", "name": "McLaren"}, "points": "88"},
+            {"Constructor": {"constructorId": "red_bull", "name": "Red Bull"}, "points": "49"},
+        ],
+    )
+
+    report = standings_service.cross_check_standings(db_session, 2025)
+
+    assert report["checked"] is True
+    assert report["drivers"] == [{"driver_code": "PIA", "local": 48, "remote": 50}]
+    assert report["constructors"] == []
+
+
+def test_cross_check_matches_renamed_teams_and_half_points(db_session, monkeypatch):
+    # Spa 2021 style half points, with FastF1's team names
+    _add_results(db_session, 2021, 12, "race", [
+        ("VER", "Red Bull Racing", 12.5),
+        ("RUS", "Williams", 9),
+        ("HAM", "Mercedes", 7.5),
+    ])
+    db_session.commit()
+    standings_service.update_standings(db_session, 2021)
+    db_session.commit()
+    monkeypatch.setattr(
+        standings_service,
+        "_fetch_driver_standings",
+        lambda _season: [
+            {"Driver": {"code": "VER"}, "points": "12.5"},
+            {"Driver": {"code": "HAM"}, "points": "7.5"},
+        ],
+    )
+    monkeypatch.setattr(
+        standings_service,
+        "_fetch_constructor_standings",
+        lambda _season: [
+            {"Constructor": {"constructorId": "red_bull", "name": "Red Bull"}, "points": "12.5"},
+            {"Constructor": {"constructorId": "mercedes", "name": "Mercedes"}, "points": "7.5"},
+        ],
+    )
+
+    report = standings_service.cross_check_standings(db_session, 2021)
+
+    assert report["drivers"] == []
+    assert report["constructors"] == []
+    payload = standings_service.load_local_standings(db_session, 2021)
+    assert payload["constructors"][0]["constructor_id"] == "red_bull"
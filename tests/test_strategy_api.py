@@ -0,0 +1,122 @@
+from fastapi.testclient import TestClient
+
+from theundercut.api.main import app
+from theundercut.models import Driver, Entry, Race, Season, StrategyScore, Team
+from tests.conftest import override_db
+
+
+class DummyRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+
+class AsyncDummyRedis:
+    """Async view over a DummyRedis store, standing in for the async client."""
+
+    def __init__(self, sync):
+        self.sync = sync
+
+    async def get(self, key):
+        return self.sync.get(key)
+
+    async def mget(self, keys):
+        return self.sync.mget(keys)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.sync.setex(key, ttl, value)
+
+    async def execute(self):
+        return []
+
+
+def _override_dependency(session_factory):
+    def _get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    return _get_db
+
+
+def _seed_scores(session):
+    season = Season(year=2024)
+    team = Team(name="Red Bull")
+    drivers = [Driver(code="VER"), Driver(code="PER")]
+    session.add_all([season, team, *drivers])
+    session.flush()
+    for rnd in (1, 2, 3):
+        race = Race(season_id=season.id, round_number=rnd, slug=f"2024-{rnd}")
+        session.add(race)
+        session.flush()
+        if rnd == 3:
+            continue  # scores not computed yet
+        for index, driver in enumerate(drivers):
+            entry = Entry(race_id=race.id, driver_id=driver.id, team_id=team.id)
+            session.add(entry)
+            session.flush()
+            session.add(
+                StrategyScore(
+                    entry_id=entry.id,
+                    total_score=80.0 - index * 10,
+                    pit_timing_score=80.0,
+                    tire_selection_score=80.0,
+                    safety_car_score=80.0,
+                    weather_score=80.0,
+                    calibration_profile="default",
+                    calibration_version="v1",
+                )
+            )
+    session.commit()
+
+
+def test_season_strategy_scores(session_factory, monkeypatch):
+    session = session_factory()
+    _seed_scores(session)
+    session.close()
+
+    override_db(_override_dependency(session_factory))
+    dummy_cache = DummyRedis()
+    monkeypatch.setattr("theundercut.api.v1.strategy.async_redis_client", AsyncDummyRedis(dummy_cache))
+    client = TestClient(app)
+
+    resp = client.get("/api/v1/strategy/2024")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["rounds"] == [1, 2, 3]
+    assert [race["round"] for race in body["races"]] == [1, 2]
+    assert [score["driver_code"] for score in body["races"][0]["scores"]] == ["VER", "PER"]
+    assert "strategy:2024:1" in dummy_cache.store
+
+    # The single-race endpoint reads the entry the batch endpoint cached.
+    single = client.get("/api/v1/strategy/2024/2")
+    assert single.json()["scores"][0]["driver_code"] == "VER"
+
+    subset = client.get("/api/v1/strategy/2024", params={"rounds": [2]}).json()
+    assert [race["round"] for race in subset["races"]] == [2]
+
+    app.dependency_overrides.clear()
@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 
 from theundercut.api.main import app
 from theundercut.models import TestingEvent, TestingSession, TestingLap, TestingStint
+from tests.conftest import override_db
 
 
 class DummyRedis:
@@ -22,6 +23,19 @@ class DummyRedis:
         self.store[key] = value
 
 
+class AsyncDummyRedis:
+    """Async view over a DummyRedis store, standing in for the async client."""
+
+    def __init__(self, sync):
+        self.sync = sync
+
+    async def get(self, key):
+        return self.sync.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.sync.setex(key, ttl, value)
+
+
 @pytest.fixture
 def mock_redis():
     """Fixture providing a mock Redis client."""
@@ -31,7 +45,7 @@ def mock_redis():
 @pytest.fixture
 def client(mock_redis, monkeypatch):
     """Fixture providing a test client with mocked Redis."""
-    monkeypatch.setattr("theundercut.api.v1.testing.redis_client", mock_redis)
+    monkeypatch.setattr("theundercut.api.v1.testing.async_redis_client", AsyncDummyRedis(mock_redis))
     return TestClient(app)
 
 
@@ -180,7 +194,6 @@ class TestGetTestingEvents:
 
     def test_returns_events_for_season(self, client, session_factory, monkeypatch):
         """Test that get_testing_events returns all events for a season."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -189,7 +202,7 @@ class TestGetTestingEvents:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         # Seed data
         with session_factory() as session:
@@ -211,7 +224,6 @@ class TestGetTestingEvents:
 
     def test_returns_empty_for_no_events(self, client, session_factory, monkeypatch):
         """Test that get_testing_events returns empty list when no events exist."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -220,7 +232,7 @@ class TestGetTestingEvents:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         resp = client.get("/api/v1/testing/2025")
 
@@ -233,7 +245,6 @@ class TestGetTestingEvents:
 
     def test_uses_cache(self, client, mock_redis, session_factory, monkeypatch):
         """Test that get_testing_events uses Redis cache."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -242,7 +253,7 @@ class TestGetTestingEvents:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         # Pre-populate cache
         cached_data = {
@@ -265,7 +276,6 @@ class TestGetTestingDay:
 
     def test_returns_day_data(self, client, session_factory, monkeypatch):
         """Test that get_testing_day returns correct day data."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -274,7 +284,7 @@ class TestGetTestingDay:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         with session_factory() as session:
             seed_testing_data(session)
@@ -309,11 +319,17 @@ class TestGetTestingDay:
         assert len(ver["stints"]) == 1
         assert ver["stints"][0]["compound"] == "SOFT"
 
+        # Invalid laps count towards total_laps but never set the best lap
+        lec = next(r for r in results if r["driver"] == "LEC")
+        assert lec["best_lap_ms"] == 92000.0
+        assert lec["best_lap_compound"] == "HARD"
+        assert lec["total_laps"] == 2
+        assert [s["stint_number"] for s in lec["stints"]] == [1, 2]
+
         app.dependency_overrides.clear()
 
     def test_filters_by_drivers(self, client, session_factory, monkeypatch):
         """Test that get_testing_day filters by driver codes."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -322,7 +338,7 @@ class TestGetTestingDay:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         with session_factory() as session:
             seed_testing_data(session)
@@ -343,7 +359,6 @@ class TestGetTestingDay:
 
     def test_returns_404_for_invalid_event(self, client, session_factory, monkeypatch):
         """Test that get_testing_day returns 404 for non-existent event."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -352,7 +367,7 @@ class TestGetTestingDay:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         resp = client.get("/api/v1/testing/2024/nonexistent_event/1")
 
@@ -363,7 +378,6 @@ class TestGetTestingDay:
 
     def test_returns_404_for_invalid_day(self, client, session_factory, monkeypatch):
         """Test that get_testing_day returns 404 for non-existent day."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -372,7 +386,7 @@ class TestGetTestingDay:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         with session_factory() as session:
             seed_testing_data(session)
@@ -390,7 +404,6 @@ class TestGetTestingLaps:
 
     def test_returns_paginated_laps(self, client, session_factory, monkeypatch):
         """Test that get_testing_laps returns paginated lap data."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -399,7 +412,7 @@ class TestGetTestingLaps:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         with session_factory() as session:
             seed_testing_data(session)
@@ -423,9 +436,36 @@ class TestGetTestingLaps:
 
         app.dependency_overrides.clear()
 
+    def test_conditional_get_returns_304(self, client, session_factory, monkeypatch):
+        """Test that a matching If-None-Match is answered with 304."""
+
+        def _override_dependency():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        override_db(_override_dependency)
+
+        with session_factory() as session:
+            seed_testing_data(session)
+
+        url = "/api/v1/testing/2024/pre_season_test/1/laps?limit=10"
+        first = client.get(url)
+        etag = first.headers["etag"]
+
+        cached = client.get(url)
+        assert cached.headers["etag"] == etag
+
+        resp = client.get(url, headers={"If-None-Match": f"W/{etag}"})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+
+        app.dependency_overrides.clear()
+
     def test_filters_by_drivers(self, client, session_factory, monkeypatch):
         """Test that get_testing_laps filters by driver codes."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -434,7 +474,7 @@ class TestGetTestingLaps:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         with session_factory() as session:
             seed_testing_data(session)
@@ -452,7 +492,6 @@ class TestGetTestingLaps:
 
     def test_pagination_offset(self, client, session_factory, monkeypatch):
         """Test that pagination offset works correctly."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -461,7 +500,7 @@ class TestGetTestingLaps:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         with session_factory() as session:
             seed_testing_data(session)
@@ -477,9 +516,37 @@ class TestGetTestingLaps:
 
         app.dependency_overrides.clear()
 
+    def test_keyset_pagination_follows_next_cursor(self, client, session_factory, monkeypatch):
+        """Test that next_cursor pages through laps in (driver, lap) order."""
+
+        def _override_dependency():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        override_db(_override_dependency)
+
+        with session_factory() as session:
+            seed_testing_data(session)
+
+        first = client.get("/api/v1/testing/2024/pre_season_test/1/laps?limit=4").json()
+        assert first["next_cursor"] == "LEC:2"
+
+        resp = client.get(f"/api/v1/testing/2024/pre_season_test/1/laps?limit=4&after={first['next_cursor']}")
+        assert resp.status_code == 200
+        second = resp.json()
+        assert [(lap["driver"], lap["lap_number"]) for lap in second["laps"]] == [("VER", 1), ("VER", 2)]
+        assert second["next_cursor"] is None
+
+        bad = client.get("/api/v1/testing/2024/pre_season_test/1/laps?after=VER")
+        assert bad.status_code == 400
+
+        app.dependency_overrides.clear()
+
     def test_returns_404_for_invalid_event(self, client, session_factory, monkeypatch):
         """Test that get_testing_laps returns 404 for non-existent event."""
-        from theundercut.adapters.db import get_db
 
         def _override_dependency():
             session = session_factory()
@@ -488,7 +555,7 @@ class TestGetTestingLaps:
             finally:
                 session.close()
 
-        app.dependency_overrides[get_db] = _override_dependency
+        override_db(_override_dependency)
 
         resp = client.get("/api/v1/testing/2024/nonexistent_event/1/laps")
 
@@ -146,6 +146,29 @@ class TestStoreLaps:
             assert stored[0].driver == "VER"
 
 
+class TestPrepareLaps:
+    """Tests for the vectorised lap preparation shared by laps and stints."""
+
+    def test_converts_times_and_fills_defaults(self):
+        from theundercut.services.testing_ingestion import _prepare_testing_laps
+
+        laps = _prepare_testing_laps(pd.DataFrame({
+            "Driver": [" VER", "nan", "HAM"],
+            "LapNumber": [1.0, 1.0, None],
+            "LapTime": [pd.Timedelta(seconds=90.5), pd.NaT, pd.NaT],
+            "Sector1Time": [pd.Timedelta(seconds=25.25), pd.NaT, pd.NaT],
+            "Stint": [1.0, 1.0, None],
+        }))
+
+        assert laps["driver"].tolist() == ["VER", "HAM"]
+        assert laps["lap_time_ms"].iloc[0] == pytest.approx(90500.0)
+        assert laps["sector_1_ms"].iloc[0] == pytest.approx(25250.0)
+        assert pd.isna(laps["sector_2_ms"]).all()  # column missing from FastF1 frame
+        assert laps["lap_number"].tolist() == [1, 0]
+        assert laps["is_valid"].tolist() == [True, True]
+        assert laps["team"].isna().all()
+
+
 class TestComputeStints:
     """Tests for _compute_and_store_stints function."""
 
@@ -406,3 +429,119 @@ class TestSyncTestingEvents:
                 TestingEvent.event_id == "pre_season_test"
             ).first()
             assert event.start_date == datetime.date(2024, 2, 21)
+
+
+class TestOpenF1TestingIngest:
+    """Tests for the OpenF1 testing ingest."""
+
+    SESSIONS = [
+        {"session_key": 102, "session_name": "Day 2", "meeting_key": 1, "date_start": "2026-02-12T07:00:00", "country_name": "Bahrain"},
+        {"session_key": 101, "session_name": "Day 1", "meeting_key": 1, "date_start": "2026-02-11T07:00:00", "country_name": "Bahrain"},
+        {"session_key": 201, "session_name": "Day 1", "meeting_key": 2, "date_start": "2026-02-18T07:00:00", "country_name": "Bahrain"},
+        {"session_key": 900, "session_name": "Race", "meeting_key": 3, "date_start": "2026-03-08T04:00:00", "country_name": "Australia"},
+    ]
+
+    @staticmethod
+    def _day(session_key):
+        return {
+            "laps": [
+                {"driver_number": 1, "lap_number": 1, "lap_duration": 95.5, "duration_sector_1": 30.0, "is_pit_out_lap": True},
+                {"driver_number": 1, "lap_number": 2, "lap_duration": 92.25, "duration_sector_1": 29.0, "is_pit_out_lap": False},
+                {"driver_number": 1, "lap_number": 3, "lap_duration": 91.0, "duration_sector_1": 28.5, "is_pit_out_lap": False},
+                {"driver_number": 44, "lap_number": 1, "lap_duration": None, "is_pit_out_lap": True},
+            ],
+            "stints": [
+                {"driver_number": 1, "stint_number": 1, "lap_start": 1, "lap_end": 2, "compound": "SOFT"},
+                {"driver_number": 1, "stint_number": 2, "lap_start": 3, "lap_end": 3, "compound": "HARD"},
+            ],
+            "drivers": [
+                {"driver_number": 1, "name_acronym": "VER", "team_name": "Red Bull Racing"},
+                {"driver_number": 44, "name_acronym": "HAM", "team_name": "Ferrari"},
+            ],
+        }
+
+    def _fake_get(self, calls):
+        def _get(client, endpoint, params):
+            calls.append((endpoint, params))
+            if endpoint == "sessions":
+                return self.SESSIONS
+            return self._day(params["session_key"])[endpoint]
+        return _get
+
+    def test_discovers_testing_days(self, monkeypatch):
+        from theundercut.services import testing_ingestion
+
+        monkeypatch.setattr(testing_ingestion, "openf1_get", self._fake_get([]))
+
+        days = testing_ingestion.discover_openf1_testing_sessions(2026)
+
+        assert [(d["event_id"], d["day"], d["session_key"]) for d in days] == [
+            ("bahrain_pre_season_test_1", 1, 101),
+            ("bahrain_pre_season_test_1", 2, 102),
+            ("bahrain_pre_season_test_2", 1, 201),
+        ]
+        assert days[0]["date"] == datetime.date(2026, 2, 11)
+
+    def test_ingests_all_days_and_skips_existing(self, session_factory, monkeypatch):
+        from theundercut.services import testing_ingestion
+
+        calls = []
+        monkeypatch.setattr(testing_ingestion, "SessionLocal", session_factory)
+        monkeypatch.setattr(testing_ingestion, "openf1_get", self._fake_get(calls))
+        monkeypatch.setattr(testing_ingestion, "pin_reads_to_primary", lambda season: None)
+
+        result = testing_ingestion.ingest_openf1_testing(2026, max_workers=2)
+
+        assert result["events"] == 2
+        assert result["days_ingested"] == 3
+        assert result["total_laps"] == 12
+        assert result["errors"] == []
+
+        with session_factory() as db:
+            event = db.query(TestingEvent).filter_by(event_id="bahrain_pre_season_test_1").one()
+            assert event.total_days == 2
+            assert event.start_date == datetime.date(2026, 2, 11)
+            assert event.status == "completed"
+            laps = {
+                lap.lap_number: lap
+                for lap in db.query(TestingLap).filter_by(driver="VER").join(TestingSession)
+                .filter(TestingSession.event_id == event.id, TestingSession.day == 1)
+            }
+            assert laps[2].lap_time_ms == pytest.approx(92250.0)
+            assert laps[2].sector_1_ms == pytest.approx(29000.0)
+            assert laps[2].compound == "SOFT"
+            assert laps[3].stint_number == 2
+            assert laps[1].is_valid is False  # pit-out lap
+            assert db.query(TestingStint).filter_by(driver="VER").count() == 6
+
+        calls.clear()
+        again = testing_ingestion.ingest_openf1_testing(2026)
+        assert again["days_skipped"] == 3
+        assert [endpoint for endpoint, _ in calls] == ["sessions"]
+
+    def test_failed_day_rolls_back_only_its_rows(self, session_factory, monkeypatch):
+        from theundercut.services import testing_ingestion
+
+        monkeypatch.setattr(testing_ingestion, "SessionLocal", session_factory)
+        monkeypatch.setattr(testing_ingestion, "openf1_get", self._fake_get([]))
+        monkeypatch.setattr(testing_ingestion, "pin_reads_to_primary", lambda season: None)
+        store_stints = testing_ingestion._store_prepared_stints
+        stored = []
+
+        def _fail_second_day(db, session_id, laps):
+            stored.append(session_id)
+            if len(stored) == 2:
+                raise ValueError("bad stints")
+            return store_stints(db, session_id, laps)
+
+        monkeypatch.setattr(testing_ingestion, "_store_prepared_stints", _fail_second_day)
+
+        result = testing_ingestion.ingest_openf1_testing(2026)
+
+        assert result["days_ingested"] == 2
+        assert len(result["errors"]) == 1
+        with session_factory() as db:
+            # The failed day's laps were written before its stints; they are rolled back
+            assert db.query(TestingLap).filter_by(session_id=stored[1]).count() == 0
+            assert db.query(TestingLap).count() == 8
+            assert db.get(TestingSession, stored[1]).status != "completed"